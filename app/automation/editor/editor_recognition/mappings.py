@@ -13,7 +13,7 @@ from engine.configs.settings import settings
 from engine.utils.cache.fingerprint import (
     Fingerprint as _FP,
     build_fingerprints_for_detections,
-    compare_fingerprints_l1,
+    compare_fingerprints_l1_matrix,
     compute_layout_signature_for_model as _compute_layout_sig,
     load_cached_fingerprints,
 )
@@ -117,33 +117,43 @@ def build_fingerprint_filters(
                     if len(models) <= 1 and len(detections) <= 1:
                         continue
                     det_indices = mappings.name_to_det_indices.get(name, [])
-                    allowed: set[tuple[str, int]] = set()
+                    model_ids: list[str] = []
+                    model_fps: list[_FP] = []
                     for model in models:
                         model_id = getattr(model, "id", "")
                         cached_item = cached["items"].get(model_id)
                         if not cached_item:
                             continue
-                        model_fp = _FP(
-                            ratios=list(cached_item.get("ratios", [])),
-                            nearest_distance=float(cached_item.get("nearest_distance", 0.0)),
-                            neighbor_count=int(cached_item.get("neighbor_count", 0)),
-                            neighbors_indices=None,
-                            center=(
-                                float(cached_item.get("center", [0.0, 0.0])[0]),
-                                float(cached_item.get("center", [0.0, 0.0])[1]),
-                            ),
-                        )
-                        for det_idx in det_indices:
-                            detection_fp = det_fp_map.get(int(det_idx))
-                            if not detection_fp:
-                                continue
-                            dist = compare_fingerprints_l1(
-                                model_fp,
-                                detection_fp,
-                                min_overlap_neighbors=int(settings.FINGERPRINT_MIN_OVERLAP),
+                        model_ids.append(model_id)
+                        model_fps.append(
+                            _FP(
+                                ratios=list(cached_item.get("ratios", [])),
+                                nearest_distance=float(cached_item.get("nearest_distance", 0.0)),
+                                neighbor_count=int(cached_item.get("neighbor_count", 0)),
+                                neighbors_indices=None,
+                                center=(
+                                    float(cached_item.get("center", [0.0, 0.0])[0]),
+                                    float(cached_item.get("center", [0.0, 0.0])[1]),
+                                ),
                             )
-                            if dist <= float(settings.FINGERPRINT_MAX_DIST):
-                                allowed.add((model_id, int(det_idx)))
+                        )
+                    det_fp_pairs = [
+                        (int(det_idx), det_fp_map[int(det_idx)])
+                        for det_idx in det_indices
+                        if det_fp_map.get(int(det_idx))
+                    ]
+                    # 同名的全部 模型×检测 组合一次性算出距离矩阵
+                    distance_matrix = compare_fingerprints_l1_matrix(
+                        model_fps,
+                        [detection_fp for _det_idx, detection_fp in det_fp_pairs],
+                        min_overlap_neighbors=int(settings.FINGERPRINT_MIN_OVERLAP),
+                    )
+                    max_distance = float(settings.FINGERPRINT_MAX_DIST)
+                    allowed: set[tuple[str, int]] = set()
+                    for model_id, distance_row in zip(model_ids, distance_matrix):
+                        for (det_idx, _detection_fp), dist in zip(det_fp_pairs, distance_row):
+                            if dist <= max_distance:
+                                allowed.add((model_id, det_idx))
                     if allowed:
                         allowed_pairs_by_title[name] = allowed
                         if settings.FINGERPRINT_DEBUG_LOG:
@@ -26,7 +26,7 @@ from engine.nodes.port_index_mapper import map_port_index_to_name
 from app.automation import capture as editor_capture
 from engine.nodes import NodeDef
 from app.automation.vision.ocr_utils import extract_chinese
-from engine.utils.text.text_similarity import levenshtein_distance
+from engine.utils.text.text_similarity import EditDistanceIndex
 from app.automation.editor.node_library_provider import (
     get_node_library,
     get_workspace_root,
@@ -60,12 +60,12 @@ _recognition_cache: Optional[Dict] = None
 _title_mapping_logs: List[Dict[str, object]] = []
 _chinese_lookup_cache: Optional[Dict[str, List[str]]] = None
 _chinese_lookup_source_id: Optional[int] = None
-_chinese_length_index: Optional[Dict[int, List[str]]] = None
+_chinese_name_index: Optional[EditDistanceIndex] = None
 _title_mapping_cache: Dict[str, Tuple[str, Optional[int], bool]] = {}
 _title_mapping_source_id: Optional[int] = None
-_chinese_bigram_index: Optional[Dict[str, List[str]]] = None
-_chinese_initial_index: Optional[Dict[str, List[str]]] = None
-_MAX_TITLE_CANDIDATES = 128
+# 近似映射的接受阈值：相似度≥0.83，或距离≤1
+_TITLE_ACCEPT_RATIO = 0.83
+_TITLE_ACCEPT_MAX_DISTANCE = 1
 
 
 def invalidate_cache() -> None:
@@ -93,113 +93,37 @@ def _ensure_node_library() -> Dict[str, NodeDef]:
 
 
 def _get_chinese_lookup(lib: Dict[str, NodeDef]) -> Dict[str, List[str]]:
-    global _chinese_lookup_cache, _chinese_lookup_source_id, _chinese_length_index, _title_mapping_cache, _title_mapping_source_id
+    global _chinese_lookup_cache, _chinese_lookup_source_id, _chinese_name_index, _title_mapping_cache, _title_mapping_source_id
     if _chinese_lookup_cache is None or _chinese_lookup_source_id != id(lib):
         chinese_to_full_names: Dict[str, List[str]] = {}
-        length_index: Dict[int, List[str]] = {}
         for node_def in lib.values():
             full_name = node_def.name
             cn_name = extract_chinese(full_name)
             if not cn_name:
                 continue
             chinese_to_full_names.setdefault(cn_name, []).append(full_name)
-            length_index.setdefault(len(cn_name), []).append(cn_name)
         _chinese_lookup_cache = chinese_to_full_names
-        _chinese_length_index = length_index
         _chinese_lookup_source_id = id(lib)
-        _rebuild_chinese_name_indices(chinese_to_full_names)
+        _chinese_name_index = EditDistanceIndex(chinese_to_full_names.keys())
         _title_mapping_cache = {}
         _title_mapping_source_id = _chinese_lookup_source_id
     return _chinese_lookup_cache
 
 
-def _get_length_index() -> Dict[int, List[str]]:
-    return _chinese_length_index or {}
+def _get_chinese_name_index() -> EditDistanceIndex:
+    return _chinese_name_index if _chinese_name_index is not None else EditDistanceIndex()
 
 
-def _extract_bigrams(value: str) -> List[str]:
-    normalized = (value or "").strip()
-    if len(normalized) <= 1:
-        return [normalized] if normalized else []
-    seen: set[str] = set()
-    grams: List[str] = []
-    for index in range(len(normalized) - 1):
-        gram = normalized[index:index + 2]
-        if gram not in seen:
-            seen.add(gram)
-            grams.append(gram)
-    return grams
+def _max_acceptable_title_distance(title_length: int) -> int:
+    """能被接受阈值放行的最大编辑距离（用作近邻索引的查询半径）。
 
-
-def _rebuild_chinese_name_indices(chinese_lookup: Dict[str, List[str]]) -> None:
-    global _chinese_bigram_index, _chinese_initial_index
-    bigram_index: Dict[str, List[str]] = {}
-    initial_index: Dict[str, List[str]] = {}
-    for name in chinese_lookup.keys():
-        if not name:
-            continue
-        for gram in _extract_bigrams(name):
-            bigram_index.setdefault(gram, []).append(name)
-        initial_index.setdefault(name[0], []).append(name)
-    _chinese_bigram_index = bigram_index
-    _chinese_initial_index = initial_index
-
-
-def _get_bigram_index() -> Dict[str, List[str]]:
-    return _chinese_bigram_index or {}
-
-
-def _get_initial_index() -> Dict[str, List[str]]:
-    return _chinese_initial_index or {}
-
-
-def _collect_length_based_candidates(target_len: int) -> List[str]:
-    if target_len <= 0:
-        return []
-    length_index = _get_length_index()
-    tolerance = 1 if target_len <= 4 else 2
-    names: List[str] = []
-    seen: set[str] = set()
-    for delta in range(-tolerance, tolerance + 1):
-        bucket_len = target_len + delta
-        if bucket_len <= 0:
-            continue
-        for name in length_index.get(bucket_len, []):
-            if name not in seen:
-                seen.add(name)
-                names.append(name)
-    return names
-
-
-def _extend_candidates(buffer: List[str], seen: set[str], items: List[str]) -> None:
-    for item in items:
-        if item in seen:
-            continue
-        seen.add(item)
-        buffer.append(item)
-        if len(buffer) >= _MAX_TITLE_CANDIDATES:
-            break
-
-
-def _collect_candidate_names(title_cn: str, chinese_lookup: Dict[str, List[str]]) -> List[str]:
-    target_len = len(title_cn)
-    candidates: List[str] = []
-    seen: set[str] = set()
-    grams = _extract_bigrams(title_cn)
-    bigram_index = _get_bigram_index()
-    for gram in grams:
-        _extend_candidates(candidates, seen, bigram_index.get(gram, []))
-        if len(candidates) >= _MAX_TITLE_CANDIDATES:
-            break
-    if len(candidates) < 4 and title_cn:
-        initial_list = _get_initial_index().get(title_cn[0], [])
-        _extend_candidates(candidates, seen, initial_list)
-    if len(candidates) < 4:
-        length_candidates = _collect_length_based_candidates(target_len)
-        _extend_candidates(candidates, seen, length_candidates)
-    if not candidates:
-        _extend_candidates(candidates, seen, list(chinese_lookup.keys()))
-    return candidates
+    候选名长度不超过 标题长度 + 距离，距离为 d 时最长长度取 标题长度 + d 是最宽松的情形；
+    按与 `_map_title_to_library` 相同的浮点表达式逐个判定，半径外的距离一定会被拒绝。
+    """
+    distance = _TITLE_ACCEPT_MAX_DISTANCE
+    while 1.0 - (float(distance + 1) / float(title_length + distance + 1)) >= _TITLE_ACCEPT_RATIO:
+        distance += 1
+    return distance
 
 
 def _map_title_to_library(title_cn: str) -> Tuple[str, Optional[int], bool]:
@@ -210,6 +134,9 @@ def _map_title_to_library(title_cn: str) -> Tuple[str, Optional[int], bool]:
     - 先按“库名取中文”做精确匹配且唯一 → 返回完整库名（含英文/符号）。
     - 否则做变长近似匹配（Levenshtein）：选全局最小且唯一；相似度≥0.83 或 距离≤1 才接受。
     - 多解或跨类别重名时放弃回退，维持原中文标题。
+
+    近似匹配通过编辑距离索引在“可能被接受的最大距离”内检索库中全部中文名：
+    半径外的名称无论是否唯一都会被阈值拒绝，因此最优解与并列判定与逐个比较全库一致。
     """
     global _title_mapping_cache, _title_mapping_source_id
     lib = _ensure_node_library()
@@ -240,19 +167,13 @@ def _map_title_to_library(title_cn: str) -> Tuple[str, Optional[int], bool]:
         return _finalize(exact_unique[0], None, True)
 
     # 2) 变长近似匹配（全局唯一最优）
+    matches = _get_chinese_name_index().search(title_cn, _max_acceptable_title_distance(len(title_cn)))
     best_cn: Optional[str] = None
     best_dist: Optional[int] = None
     tie = False
-    candidate_names = _collect_candidate_names(title_cn, chinese_lookup)
-
-    for cn_name in candidate_names:
-        distance_value = levenshtein_distance(title_cn, cn_name)
-        if best_dist is None or distance_value < int(best_dist):
-            best_dist = int(distance_value)
-            best_cn = cn_name
-            tie = False
-        elif best_dist is not None and int(distance_value) == int(best_dist):
-            tie = True
+    if matches:
+        best_dist, best_cn = matches[0]
+        tie = len(matches) > 1 and matches[1][0] == best_dist
 
     if best_cn is None or tie:
         return _finalize(title_cn, None, False)
@@ -260,7 +181,7 @@ def _map_title_to_library(title_cn: str) -> Tuple[str, Optional[int], bool]:
     # 接受阈值：相似度≥0.83（例如 6→5），或距离≤1
     max_len = max(len(title_cn), len(best_cn))
     similarity = 1.0 - (float(best_dist) / float(max_len if max_len > 0 else 1))
-    accept = (similarity >= 0.83) or (int(best_dist) <= 1)
+    accept = (similarity >= _TITLE_ACCEPT_RATIO) or (int(best_dist) <= _TITLE_ACCEPT_MAX_DISTANCE)
     if not accept:
         return _finalize(title_cn, None, False)
 
@@ -357,6 +357,14 @@ def _parse_cli(argv: Sequence[str]) -> argparse.Namespace:
         action="store_true",
         help="禁用校验缓存（默认启用）",
     )
+    validate_graphs_parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="并行校验的进程数（默认 1 为串行；0 表示使用全部 CPU 核心）",
+    )
     validate_graphs_parser.add_argument(
         "--no-composite-struct-check",
         dest="disable_composite_struct_check",
@@ -398,6 +406,7 @@ def _run_validate_graphs(parsed_args: argparse.Namespace, workspace_root: Path)
         workspace_root,
         strict_entity_wire_only=parsed_args.strict_entity_wire_only,
         use_cache=not parsed_args.disable_cache,
+        workers=(os.cpu_count() or 1) if parsed_args.jobs == 0 else parsed_args.jobs,
     )
 
     all_issues: List[EngineIssue] = list(report.issues)
@@ -475,6 +484,10 @@ def main(argv: Sequence[str] | None = None) -> int:
 
 
 if __name__ == "__main__":
+    # 冻结环境下 `--jobs` 使用多进程校验：子进程需经 freeze_support 分流，避免重复执行 CLI 主流程
+    import multiprocessing
+
+    multiprocessing.freeze_support()
     sys.exit(main())
 
 
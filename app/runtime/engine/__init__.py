@@ -1,12 +1,7 @@
 """运行时引擎模块 - 执行器与运行时环境"""
 
+from .event_scheduler import EventScheduler, ScheduledEvent
 from .game_state import GameRuntime
-from .trace_logging import TraceEvent, TraceRecorder
-
-__all__ = ["GameRuntime", "TraceRecorder", "TraceEvent"]
-
-
-
-
-
+from .trace_logging import JsonlTraceSink, TraceEvent, TraceRecorder
 
+__all__ = ["GameRuntime", "EventScheduler", "ScheduledEvent", "TraceRecorder", "TraceEvent", "JsonlTraceSink"]
@@ -0,0 +1,150 @@
+"""离散事件调度器：优先队列 + 虚拟时钟。
+
+- 定时器触发、延迟事件与嵌套的事件/信号派发都以 (时间, 序号) 入队，按时间顺序出队执行；
+  同一时刻的事件按入队顺序执行（先进先出）；
+- 时钟是虚拟的：默认快进模式下直接跳到下一个事件的时间点，数小时的游戏内定时逻辑可在毫秒级跑完；
+  关闭快进时按 `time_scale` 以墙钟节奏等待（time_scale=2.0 表示两倍速）；
+- 取消采用惰性删除：只标记句柄，出队时跳过，不在堆中查找。
+"""
+
+import heapq
+import itertools
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class ScheduledEvent:
+    """调度句柄：可通过 `EventScheduler.cancel` 或 `cancel()` 取消尚未执行的事件。"""
+
+    __slots__ = ("when", "callback", "args", "cancelled")
+
+    def __init__(self, when: float, callback: Callable[..., Any], args: Tuple[Any, ...]):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def __repr__(self):
+        state = "已取消" if self.cancelled else "待执行"
+        return f"<ScheduledEvent t={self.when} {getattr(self.callback, '__name__', self.callback)} {state}>"
+
+
+class EventScheduler:
+    """基于 heapq 的离散事件循环。
+
+    Args:
+        fast_forward: True 时虚拟时钟直接跳到下一个事件；False 时按墙钟节奏等待。
+        time_scale: 非快进模式下的时间倍率（虚拟秒 / 墙钟秒）。
+        sleep: 非快进模式下的等待函数，默认 `time.sleep`。
+    """
+
+    def __init__(
+        self,
+        *,
+        fast_forward: bool = True,
+        time_scale: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if time_scale <= 0:
+            raise ValueError(f"time_scale 必须为正数：{time_scale}")
+        self.fast_forward = fast_forward
+        self.time_scale = float(time_scale)
+        self._sleep = sleep
+        self._queue: List[Tuple[float, int, ScheduledEvent]] = []
+        self._sequence = itertools.count()
+        self._now = 0.0
+        self.executed_count = 0
+
+    @property
+    def now(self) -> float:
+        """当前虚拟时间（秒）。"""
+        return self._now
+
+    # ------------------------ 入队 ------------------------
+
+    def call_at(self, when: float, callback: Callable[..., Any], *args: Any) -> ScheduledEvent:
+        """在虚拟时间 `when` 执行回调；早于当前时间的按当前时间处理。"""
+        event = ScheduledEvent(max(float(when), self._now), callback, args)
+        heapq.heappush(self._queue, (event.when, next(self._sequence), event))
+        return event
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> ScheduledEvent:
+        if delay < 0:
+            raise ValueError(f"delay 不能为负数：{delay}")
+        return self.call_at(self._now + delay, callback, *args)
+
+    def call_soon(self, callback: Callable[..., Any], *args: Any) -> ScheduledEvent:
+        """在当前时刻、已入队的同刻事件之后执行。"""
+        return self.call_at(self._now, callback, *args)
+
+    def cancel(self, event: Optional[ScheduledEvent]) -> None:
+        if event is not None:
+            event.cancel()
+
+    # ------------------------ 查询 ------------------------
+
+    def _discard_cancelled_head(self) -> None:
+        queue = self._queue
+        while queue and queue[0][2].cancelled:
+            heapq.heappop(queue)
+
+    def next_time(self) -> Optional[float]:
+        """下一个待执行事件的时间；队列为空时返回 None。"""
+        self._discard_cancelled_head()
+        return self._queue[0][0] if self._queue else None
+
+    @property
+    def pending_count(self) -> int:
+        return sum(1 for _, _, event in self._queue if not event.cancelled)
+
+    # ------------------------ 执行 ------------------------
+
+    def _advance_clock(self, target: float) -> None:
+        if target <= self._now:
+            return
+        if not self.fast_forward:
+            self._sleep((target - self._now) / self.time_scale)
+        self._now = target
+
+    def _run_next(self) -> None:
+        when, _, event = heapq.heappop(self._queue)
+        self._advance_clock(when)
+        self.executed_count += 1
+        event.callback(*event.args)
+
+    def run_until(self, until: float) -> int:
+        """执行时间不晚于 `until` 的所有事件（含执行过程中新入队的），返回执行数量。
+
+        结束后时钟停在 `until`（不会回拨）。
+        """
+        executed = 0
+        while True:
+            self._discard_cancelled_head()
+            if not self._queue or self._queue[0][0] > until:
+                break
+            self._run_next()
+            executed += 1
+        self._advance_clock(until)
+        return executed
+
+    def run_for(self, n_events: int) -> int:
+        """按时间顺序最多执行 `n_events` 个事件，返回实际执行数量（队列耗尽时提前结束）。"""
+        executed = 0
+        while executed < n_events:
+            self._discard_cancelled_head()
+            if not self._queue:
+                break
+            self._run_next()
+            executed += 1
+        return executed
+
+    def clear(self) -> None:
+        for _, _, event in self._queue:
+            event.cancel()
+        self._queue.clear()
+
+
+__all__ = ["EventScheduler", "ScheduledEvent"]
@@ -1,9 +1,15 @@
 """游戏状态管理 - 变量、实体、事件系统"""
 
-from typing import Any, Dict, List, Optional, Callable, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Callable, Tuple
+import inspect
 import random
 
+from app.runtime.engine.event_scheduler import EventScheduler, ScheduledEvent
 from app.runtime.engine.trace_logging import TraceRecorder
+from engine.utils.logging.log_backend import LOG_LEVEL_DEBUG, Logger, get_logger
+
+
+TIMER_EVENT_NAME = "定时器触发时"
 
 
 class MockEntity:
@@ -21,9 +27,23 @@ class MockEntity:
 
 
 class GameRuntime:
-    """游戏运行时环境"""
+    """游戏运行时环境
+
+    事件派发由离散事件调度器驱动（虚拟时钟）：
+    - 定时器、延迟事件按虚拟时间排队，调用 `run_until(t)` / `run_for(n)` 推进；
+    - 事件处理器内再次触发的事件/信号不递归执行，而是在当前时刻排队，
+      由最外层的 `trigger_event` 依次派发，深层信号链不会增长 Python 调用栈。
+
+    日志经由 `logger`（默认共享的 "runtime" Logger）输出：变量写入、事件派发等逐操作日志为 DEBUG 级，
+    高速模拟时可 `game.logger.set_level(LOG_LEVEL_INFO)` 或更高，被过滤的日志不会格式化参数。
+
+    Args:
+        fast_forward: True（默认）时虚拟时钟直接跳到下一个事件；False 时按 `time_scale` 以墙钟节奏运行。
+        time_scale: 非快进模式下的时间倍率。
+        logger: 运行时日志入口；None 表示使用 `get_logger("runtime")`。
+    """
     
-    def __init__(self):
+    def __init__(self, *, fast_forward: bool = True, time_scale: float = 1.0, logger: Optional[Logger] = None):
         # 变量系统
         self.custom_variables = {}  # 自定义变量 {entity_id: {var_name: value}}
         self.graph_variables = {}   # 节点图变量 {var_name: value}
@@ -35,6 +55,10 @@ class GameRuntime:
         
         # 事件系统
         self.event_handlers: Dict[str, List[Tuple[Callable, Optional[str]]]] = {}
+        self.scheduler = EventScheduler(fast_forward=fast_forward, time_scale=time_scale)
+        self._dispatch_active = False
+        # 处理器可接受的参数名；None 表示接受 **kwargs
+        self._handler_param_names: Dict[Callable, Optional[FrozenSet[str]]] = {}
         
         # 节点图挂载系统
         self.attached_graphs = {}  # {entity_id: [graph_instances]}
@@ -42,14 +66,19 @@ class GameRuntime:
         # Mock系统状态
         self.music_volume = 100
         self.current_music = None
-        self.timers = {}
+        self.timers: Dict[str, Dict[str, Any]] = {}  # {timer_key: {duration, is_loop, deadline, loop_count, handle}}
 
-        # 运行期事件追踪
-        self.trace_recorder = TraceRecorder()
+        # 运行期事件追踪与日志
+        self.trace_recorder: Optional[TraceRecorder] = TraceRecorder()
+        self.logger: Logger = logger if logger is not None else get_logger("runtime")
         
         # 创建一些默认实体
         self._create_default_entities()
 
+    def is_tracing(self, kind: str) -> bool:
+        """热路径在构造追踪参数之前预先判断（追踪关闭或该 kind 被过滤时为 False）。"""
+        return self.trace_recorder is not None and self.trace_recorder.is_enabled_for(kind)
+
     def record_trace_event(self, kind: str, message: str, **details: Any) -> None:
         """将运行时事件写入 TraceRecorder，便于统一的执行链路追踪。"""
         if self.trace_recorder is None:
@@ -80,13 +109,16 @@ class GameRuntime:
     ):
         """统一的变量写入辅助，负责存值、日志与事件通知。"""
         storage[key] = value
-        print(f"[{log_prefix}] {log_target} = {value}")
-        self.record_trace_event(
-            kind="variable",
-            message=f"{log_prefix}:{log_target}",
-            value=value,
-            trigger_event=trigger_event,
-        )
+        # 逐操作日志：先比较级别再调用，日志关闭时热路径上不产生函数调用
+        if self.logger.level <= LOG_LEVEL_DEBUG:
+            self.logger.debug("[{}] {} = {}", log_prefix, log_target, value)
+        if self.is_tracing("variable"):
+            self.record_trace_event(
+                kind="variable",
+                message=f"{log_prefix}:{log_target}",
+                value=value,
+                trigger_event=trigger_event,
+            )
         if trigger_event and event_var_name:
             self.trigger_event(f"变量变化_{event_var_name}", value=value)
     
@@ -166,7 +198,7 @@ class GameRuntime:
         entity_id = f"entity_{self.entity_counter}"
         entity = MockEntity(entity_id, name)
         self.entities[entity_id] = entity
-        print(f"[创建实体] {name} (ID:{entity_id})")
+        self.logger.info("[创建实体] {} (ID:{})", name, entity_id)
         return entity
     
     def destroy_entity(self, entity):
@@ -175,10 +207,10 @@ class GameRuntime:
         if entity_id in self.entities:
             entity_name = self.entities[entity_id].name
             del self.entities[entity_id]
-            print(f"[销毁实体] {entity_name}")
+            self.logger.info("[销毁实体] {}", entity_name)
             self._cleanup_entity_state(entity_id)
         else:
-            print(f"[警告] 尝试销毁不存在的实体: {entity_id}")
+            self.logger.warn("[警告] 尝试销毁不存在的实体: {}", entity_id)
 
     def _cleanup_entity_state(self, entity_id: str):
         """销毁实体后联动清理所有挂靠状态（变量、定时器、事件、节点图）。"""
@@ -187,7 +219,7 @@ class GameRuntime:
         timer_prefix = f"{entity_id}_"
         timers_to_remove = [key for key in self.timers.keys() if key.startswith(timer_prefix)]
         for timer_key in timers_to_remove:
-            del self.timers[timer_key]
+            self.scheduler.cancel(self.timers.pop(timer_key)["handle"])
         for event_name in list(self.event_handlers.keys()):
             remaining_handlers = [
                 (handler, owner_id)
@@ -212,21 +244,83 @@ class GameRuntime:
     def trigger_event(self, event_name: str, **kwargs):
         """触发事件
         
+        在事件处理器或调度器回调内部调用时，事件在当前虚拟时刻排队（先进先出），
+        而不是递归派发；最外层调用返回前会派发完当前时刻的全部排队事件。
+        
         Args:
             event_name: 事件名称
             **kwargs: 事件参数
         """
-        print(f"[事件触发] {event_name}")
-        self.record_trace_event(
-            kind="event",
-            message=event_name,
-            payload=dict(kwargs),
-        )
+        if self._dispatch_active:
+            self.scheduler.call_soon(self._dispatch_event, event_name, kwargs)
+            return
+        self._dispatch_active = True
+        try:
+            self._dispatch_event(event_name, kwargs)
+            self.scheduler.run_until(self.scheduler.now)
+        finally:
+            self._dispatch_active = False
+
+    def _dispatch_event(
+        self,
+        event_name: str,
+        kwargs: Dict[str, Any],
+        owner_id: Optional[str] = None,
+        match_signature: bool = False,
+    ):
+        """调用事件处理器。
+
+        - owner_id 非空时仅派发给该实体上挂载的处理器（及未指定挂载实体的处理器）；
+        - match_signature 为 True 时按处理器签名裁剪参数（处理器只声明了部分事件参数时使用）。
+        """
+        if self.logger.level <= LOG_LEVEL_DEBUG:
+            self.logger.debug("[事件触发] {}", event_name)
+        if self.is_tracing("event"):
+            self.record_trace_event(
+                kind="event",
+                message=event_name,
+                payload=dict(kwargs),
+                virtual_time=self.scheduler.now,
+            )
         
         # 调用注册的处理器
         if event_name in self.event_handlers:
-            for handler, _ in self.event_handlers[event_name]:
-                handler(**kwargs)
+            for handler, handler_owner_id in self.event_handlers[event_name]:
+                if owner_id is not None and handler_owner_id not in (None, owner_id):
+                    continue
+                accepted = self._get_handler_param_names(handler) if match_signature else None
+                if accepted is None:
+                    handler(**kwargs)
+                else:
+                    handler(**{key: value for key, value in kwargs.items() if key in accepted})
+
+    def schedule_event(self, delay: float, event_name: str, **kwargs) -> ScheduledEvent:
+        """在 `delay` 秒（虚拟时间）后触发事件，返回可取消的调度句柄。"""
+        return self.scheduler.call_later(delay, self._dispatch_event, event_name, kwargs)
+
+    # ========== 虚拟时钟 ==========
+
+    @property
+    def now(self) -> float:
+        """当前虚拟时间（秒）。"""
+        return self.scheduler.now
+
+    def _run_scheduler(self, run: Callable[[], int]) -> int:
+        if self._dispatch_active:
+            raise RuntimeError("不能在事件处理器内部推进虚拟时钟")
+        self._dispatch_active = True
+        try:
+            return run()
+        finally:
+            self._dispatch_active = False
+
+    def run_until(self, until: float) -> int:
+        """推进虚拟时钟到 `until`，按时间顺序派发期间到期的定时器/延迟事件，返回执行的调度项数量。"""
+        return self._run_scheduler(lambda: self.scheduler.run_until(until))
+
+    def run_for(self, n_events: int) -> int:
+        """按时间顺序最多执行 `n_events` 个调度项，返回实际执行数量。"""
+        return self._run_scheduler(lambda: self.scheduler.run_for(n_events))
     
     def register_event_handler(self, event_name: str, handler: Callable, owner=None):
         """注册事件处理器
@@ -280,7 +374,7 @@ class GameRuntime:
         Returns:
             graph_instance: 节点图实例
         """
-        print(f"[节点图挂载] {graph_class.__name__} → {owner_entity}")
+        self.logger.info("[节点图挂载] {} → {}", graph_class.__name__, owner_entity)
         
         # 创建节点图实例
         graph_instance = graph_class(self, owner_entity)
@@ -302,48 +396,93 @@ class GameRuntime:
         """播放音乐（Mock）"""
         self.current_music = music_index
         self.music_volume = volume
-        print(f"[音乐] 播放音乐#{music_index}, 音量={volume}")
+        self.logger.info("[音乐] 播放音乐#{}, 音量={}", music_index, volume)
     
     def stop_music(self):
         """停止音乐（Mock）"""
         self.current_music = None
-        print(f"[音乐] 停止播放")
+        self.logger.info("[音乐] 停止播放")
     
     def play_sound(self, sound_index: int, volume: int = 100):
         """播放音效（Mock）"""
-        print(f"[音效] 播放音效#{sound_index}, 音量={volume}")
+        self.logger.info("[音效] 播放音效#{}, 音量={}", sound_index, volume)
     
     def play_effect(self, effect_id: str, entity, position=None):
         """播放特效（Mock）"""
-        entity_name = entity.name if isinstance(entity, MockEntity) else str(entity)
-        print(f"[特效] 在{entity_name}播放特效: {effect_id}")
+        entity_name = entity.name if isinstance(entity, MockEntity) else entity
+        self.logger.info("[特效] 在{}播放特效: {}", entity_name, effect_id)
     
     def start_timer(self, entity, timer_name: str, duration: float, is_loop: bool = False):
-        """启动定时器（Mock）"""
+        """启动定时器：`duration` 秒（虚拟时间）后向挂载在该实体上的处理器派发【定时器触发时】。
+
+        同名定时器重复启动时重新计时；循环定时器按固定周期重新入队（不累计派发耗时）。
+        """
+        if duration < 0 or (is_loop and duration <= 0):
+            raise ValueError(f"定时器'{timer_name}'的时长无效：{duration}")
         entity_id = self._get_entity_id(entity)
         timer_key = f"{entity_id}_{timer_name}"
+        previous = self.timers.get(timer_key)
+        if previous is not None:
+            self.scheduler.cancel(previous["handle"])
+        deadline = self.scheduler.now + duration
         self.timers[timer_key] = {
             "duration": duration,
             "is_loop": is_loop,
-            "remaining": duration
+            "deadline": deadline,
+            "loop_count": 0,
+            "handle": self.scheduler.call_at(deadline, self._fire_timer, timer_key, entity, timer_name),
         }
-        print(f"[定时器] 启动定时器'{timer_name}', 时长={duration}秒, 循环={is_loop}")
+        self.logger.debug("[定时器] 启动定时器'{}', 时长={}秒, 循环={}", timer_name, duration, is_loop)
     
     def stop_timer(self, entity, timer_name: str):
         """停止定时器（Mock）"""
         entity_id = self._get_entity_id(entity)
         timer_key = f"{entity_id}_{timer_name}"
         if timer_key in self.timers:
+            self.scheduler.cancel(self.timers.pop(timer_key)["handle"])
+            self.logger.debug("[定时器] 停止定时器'{}'", timer_name)
+
+    def _fire_timer(self, timer_key: str, entity, timer_name: str):
+        timer = self.timers.get(timer_key)
+        if timer is None:
+            return
+        loop_count = timer["loop_count"]
+        if timer["is_loop"]:
+            timer["loop_count"] = loop_count + 1
+            timer["deadline"] += timer["duration"]
+            timer["handle"] = self.scheduler.call_at(
+                timer["deadline"], self._fire_timer, timer_key, entity, timer_name
+            )
+        else:
             del self.timers[timer_key]
-            print(f"[定时器] 停止定时器'{timer_name}'")
+
+        entity_id = self._get_entity_id(entity)
+        event_kwargs = {
+            "事件源实体": entity,
+            "事件源GUID": entity_id,
+            "定时器名称": timer_name,
+            "定时器序列序号": 1,
+            "循环次数": loop_count,
+        }
+        # 不同节点图对定时器事件声明的参数不同（部分只声明前三个），按处理器签名裁剪参数
+        self._dispatch_event(TIMER_EVENT_NAME, event_kwargs, owner_id=entity_id, match_signature=True)
+
+    def _get_handler_param_names(self, handler: Callable) -> Optional[FrozenSet[str]]:
+        if handler not in self._handler_param_names:
+            parameters = inspect.signature(handler).parameters.values()
+            if any(param.kind is inspect.Parameter.VAR_KEYWORD for param in parameters):
+                self._handler_param_names[handler] = None
+            else:
+                self._handler_param_names[handler] = frozenset(param.name for param in parameters)
+        return self._handler_param_names[handler]
     
     def show_ui(self, ui_name: str, player_entity):
         """显示UI（Mock）"""
-        print(f"[UI] 显示界面: {ui_name}")
+        self.logger.info("[UI] 显示界面: {}", ui_name)
     
     def hide_ui(self, ui_name: str, player_entity):
         """隐藏UI（Mock）"""
-        print(f"[UI] 隐藏界面: {ui_name}")
+        self.logger.info("[UI] 隐藏界面: {}", ui_name)
     
     # ========== 工具方法 ==========
     
@@ -357,5 +496,5 @@ class GameRuntime:
     
     def log(self, message: str):
         """输出日志"""
-        print(f"[日志] {message}")
+        self.logger.info("[日志] {}", message)
 
@@ -3,7 +3,8 @@
 import time
 from typing import Any, Callable, Dict, List, Optional
 
-from app.runtime.engine.trace_logging import TraceRecorder
+from app.runtime.engine.trace_logging import TRACE_LEVEL_DEBUG, TRACE_LEVEL_INFO, TraceRecorder
+from engine.utils.logging.log_backend import Logger, get_logger
 
 
 class NodeExecutor:
@@ -21,8 +22,16 @@ class NodeExecutor:
         self.breakpoints = set()   # 断点
         self.trace_enabled = False  # 是否启用追踪
         self.trace_recorder: Optional[TraceRecorder] = getattr(game_runtime, "trace_recorder", None)
+        self.logger: Logger = getattr(game_runtime, "logger", None) or get_logger("runtime")
 
-    def _record_trace(self, kind: str, message: str, stack: List[str], **details: Any) -> None:
+    def _record_trace(
+        self,
+        kind: str,
+        message: str,
+        stack: List[str],
+        level: int = TRACE_LEVEL_INFO,
+        **details: Any,
+    ) -> None:
         if self.trace_recorder is None:
             return
         self.trace_recorder.record(
@@ -30,9 +39,13 @@ class NodeExecutor:
             kind=kind,
             message=message,
             stack=stack,
+            level=level,
             **details,
         )
 
+    def _is_trace_recording(self, kind: str, level: int) -> bool:
+        return self.trace_recorder is not None and self.trace_recorder.is_enabled_for(kind, level)
+
     @staticmethod
     def _summarize_call(args, kwargs) -> Dict[str, Any]:
         return {
@@ -42,23 +55,29 @@ class NodeExecutor:
     
     def execute_node(self, node_name: str, node_func: Callable, *args, **kwargs):
         """执行单个节点"""
-        call_stack = list(self.execution_stack)
-        call_stack.append(node_name)
-        call_signature = self._summarize_call(args, kwargs)
+        # 先判断是否需要记录，避免在追踪被过滤时仍为每次节点调用构造栈与调用签名
+        record_start = self._is_trace_recording("start", TRACE_LEVEL_DEBUG)
+        record_finish = self._is_trace_recording("finish", TRACE_LEVEL_DEBUG)
+        call_stack: List[str] = []
+        if record_start or record_finish or node_name in self.breakpoints:
+            call_stack = list(self.execution_stack)
+            call_stack.append(node_name)
         start_time = time.perf_counter()
-        self._record_trace(
-            kind="start",
-            message=node_name,
-            stack=call_stack,
-            call_signature=call_signature,
-        )
+        if record_start:
+            self._record_trace(
+                kind="start",
+                message=node_name,
+                stack=call_stack,
+                level=TRACE_LEVEL_DEBUG,
+                call_signature=self._summarize_call(args, kwargs),
+            )
         if self.trace_enabled:
-            print(f"[执行追踪] 开始执行节点: {node_name}")
+            self.logger.debug("[执行追踪] 开始执行节点: {}", node_name)
             self.execution_stack.append(node_name)
         
         # 检查断点
         if node_name in self.breakpoints:
-            print(f"[断点] 在节点 {node_name} 处暂停")
+            self.logger.info("[断点] 在节点 {} 处暂停", node_name)
             self._record_trace(
                 kind="breakpoint",
                 message=node_name,
@@ -68,40 +87,42 @@ class NodeExecutor:
         
         # 执行节点
         result = node_func(*args, **kwargs)
-        duration_ms = (time.perf_counter() - start_time) * 1000.0
-        self._record_trace(
-            kind="finish",
-            message=node_name,
-            stack=call_stack,
-            duration_ms=duration_ms,
-            result_type=type(result).__name__,
-        )
+        if record_finish:
+            duration_ms = (time.perf_counter() - start_time) * 1000.0
+            self._record_trace(
+                kind="finish",
+                message=node_name,
+                stack=call_stack,
+                level=TRACE_LEVEL_DEBUG,
+                duration_ms=duration_ms,
+                result_type=type(result).__name__,
+            )
         if self.trace_enabled:
             self.execution_stack.pop()
-            print(f"[执行追踪] 完成执行节点: {node_name}, 返回值: {result}")
+            self.logger.debug("[执行追踪] 完成执行节点: {}, 返回值: {}", node_name, result)
         
         return result
     
     def add_breakpoint(self, node_name: str):
         """添加断点"""
         self.breakpoints.add(node_name)
-        print(f"[断点] 已在节点 {node_name} 添加断点")
+        self.logger.info("[断点] 已在节点 {} 添加断点", node_name)
     
     def remove_breakpoint(self, node_name: str):
         """移除断点"""
         if node_name in self.breakpoints:
             self.breakpoints.remove(node_name)
-            print(f"[断点] 已移除节点 {node_name} 的断点")
+            self.logger.info("[断点] 已移除节点 {} 的断点", node_name)
     
     def enable_trace(self):
         """启用执行追踪"""
         self.trace_enabled = True
-        print("[执行追踪] 已启用")
+        self.logger.info("[执行追踪] 已启用")
     
     def disable_trace(self):
         """禁用执行追踪"""
         self.trace_enabled = False
-        print("[执行追踪] 已禁用")
+        self.logger.info("[执行追踪] 已禁用")
     
     def get_execution_stack(self) -> List[str]:
         """获取当前执行栈"""
@@ -1,9 +1,28 @@
+"""运行期事件追踪：定长环形缓冲 + 记录前过滤/采样 + 批量 sink + JSONL 导出。
+
+- 事件以紧凑元组写入预分配的环形缓冲，超出容量时覆盖最旧事件（`dropped_count` 记录被覆盖数量）；
+- 级别/类型过滤与采样在构造任何事件对象之前完成，被过滤的事件几乎零开销；
+- `TraceEvent` 仅在读取（`events`/`as_list`）或投递给 sink 时按需构造；
+- 批量 sink 按 `batch_size` 攒批投递，`JsonlTraceSink` 将批次追加写入 JSONL 文件，便于执行监控面板流式读取。
+"""
+
+import json
 import time
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+TRACE_LEVEL_DEBUG = 10
+TRACE_LEVEL_INFO = 20
+TRACE_LEVEL_WARNING = 30
+
+DEFAULT_TRACE_CAPACITY = 20000
 
+# (source, kind, message, timestamp, stack, details, level)
+_TraceRow = Tuple[str, str, str, float, Tuple[str, ...], Dict[str, Any], int]
 
-@dataclass
+
+@dataclass(slots=True)
 class TraceEvent:
     source: str
     kind: str
@@ -11,6 +30,7 @@ class TraceEvent:
     timestamp: float
     stack: List[str]
     details: Dict[str, Any]
+    level: int = field(default=TRACE_LEVEL_INFO)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -18,17 +38,132 @@ class TraceEvent:
             "kind": self.kind,
             "message": self.message,
             "timestamp": self.timestamp,
+            "level": self.level,
             "stack": list(self.stack),
             "details": dict(self.details),
         }
 
 
+def _row_to_event(row: _TraceRow) -> TraceEvent:
+    source, kind, message, timestamp, stack, details, level = row
+    return TraceEvent(
+        source=source,
+        kind=kind,
+        message=message,
+        timestamp=timestamp,
+        stack=list(stack),
+        details=details,
+        level=level,
+    )
+
+
+def _encode_event_line(event: TraceEvent) -> str:
+    # details 可能携带实体/自定义对象，无法直接 JSON 序列化时退化为字符串表示
+    return json.dumps(event.to_dict(), ensure_ascii=False, default=str)
+
+
+def write_trace_events_jsonl(path: Path, events: Iterable[TraceEvent], *, append: bool = False) -> int:
+    """将事件逐行写入 JSONL 文件，返回写入的行数。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, "a" if append else "w", encoding="utf-8") as file_obj:
+        for event in events:
+            file_obj.write(_encode_event_line(event))
+            file_obj.write("\n")
+            written += 1
+    return written
+
+
+def read_trace_events_jsonl(path: Path, offset: int = 0) -> Tuple[List[TraceEvent], int]:
+    """从字节偏移 `offset` 起读取完整的 JSONL 行，返回（事件列表，新的偏移）。
+
+    供执行监控面板增量轮询：仅消费以换行结尾的完整行，尚未写完的末行留到下次读取。
+    """
+    if not path.exists():
+        return [], offset
+    with open(path, "rb") as file_obj:
+        file_obj.seek(offset)
+        chunk = file_obj.read()
+    complete_length = chunk.rfind(b"\n") + 1
+    events: List[TraceEvent] = []
+    for line in chunk[:complete_length].splitlines():
+        if not line.strip():
+            continue
+        payload = json.loads(line.decode("utf-8"))
+        events.append(
+            TraceEvent(
+                source=str(payload.get("source", "")),
+                kind=str(payload.get("kind", "")),
+                message=str(payload.get("message", "")),
+                timestamp=float(payload.get("timestamp", 0.0)),
+                stack=list(payload.get("stack") or []),
+                details=dict(payload.get("details") or {}),
+                level=int(payload.get("level", TRACE_LEVEL_INFO)),
+            )
+        )
+    return events, offset + complete_length
+
+
+class JsonlTraceSink:
+    """批量 sink：将每个批次追加写入 JSONL 文件（一次打开、一次写入）。"""
+
+    def __init__(self, path: Path, *, truncate: bool = True) -> None:
+        self.path = Path(path)
+        if truncate:
+            write_trace_events_jsonl(self.path, [])
+
+    def __call__(self, events: List[TraceEvent]) -> None:
+        write_trace_events_jsonl(self.path, events, append=True)
+
+
 class TraceRecorder:
-    """轻量级事件追踪记录器，用于捕获运行期的节点执行与信号事件。"""
+    """轻量级事件追踪记录器，用于捕获运行期的节点执行与信号事件。
+
+    Args:
+        sink: 逐事件回调（每条被记录的事件立即投递）。
+        capacity: 环形缓冲容量；超出后覆盖最旧事件。
+        min_level: 低于该级别的事件在记录前直接丢弃。
+        kinds: 仅记录这些 kind；None 表示不限。
+        sample_every: DEBUG 级事件按 kind 分别计数，每 N 条保留 1 条（INFO 及以上不采样）；
+            成对出现的 start/finish 因此保留同一批节点执行。
+        batch_sink: 批量回调，累计 `batch_size` 条或调用 `flush()` 时投递。
+        batch_size: 批量回调的批大小。
+    """
 
-    def __init__(self, sink: Optional[Callable[[TraceEvent], None]] = None) -> None:
-        self.events: List[TraceEvent] = []
+    def __init__(
+        self,
+        sink: Optional[Callable[[TraceEvent], None]] = None,
+        *,
+        capacity: int = DEFAULT_TRACE_CAPACITY,
+        min_level: int = TRACE_LEVEL_DEBUG,
+        kinds: Optional[Iterable[str]] = None,
+        sample_every: int = 1,
+        batch_sink: Optional[Callable[[List[TraceEvent]], None]] = None,
+        batch_size: int = 256,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError(f"capacity 必须为正数：{capacity}")
+        if sample_every <= 0:
+            raise ValueError(f"sample_every 必须为正数：{sample_every}")
         self.sink = sink
+        self.capacity = int(capacity)
+        self.min_level = int(min_level)
+        self.kinds: Optional[frozenset] = frozenset(kinds) if kinds is not None else None
+        self.sample_every = int(sample_every)
+        self.batch_sink = batch_sink
+        self.batch_size = max(1, int(batch_size))
+        self._rows: List[Optional[_TraceRow]] = [None] * self.capacity
+        self._next_index = 0
+        self._size = 0
+        self._sample_counters: Dict[str, int] = {}
+        self._pending: List[_TraceRow] = []
+        self.dropped_count = 0
+
+    def is_enabled_for(self, kind: str, level: int = TRACE_LEVEL_INFO) -> bool:
+        """调用方可在构造事件参数（栈、调用签名等）之前预先判断是否需要记录。"""
+        if level < self.min_level:
+            return False
+        return self.kinds is None or kind in self.kinds
 
     def record(
         self,
@@ -37,28 +172,79 @@ class TraceRecorder:
         message: str,
         *,
         stack: Optional[List[str]] = None,
+        level: int = TRACE_LEVEL_INFO,
         **details: Any,
-    ) -> TraceEvent:
-        event_stack = list(stack) if stack else []
-        event = TraceEvent(
-            source=source,
-            kind=kind,
-            message=message,
-            timestamp=time.time(),
-            stack=event_stack,
-            details=dict(details),
-        )
-        self.events.append(event)
+    ) -> bool:
+        """记录一条事件；返回是否被记录（被过滤或采样丢弃时返回 False）。"""
+        if level < self.min_level:
+            return False
+        if self.kinds is not None and kind not in self.kinds:
+            return False
+        if level < TRACE_LEVEL_INFO and self.sample_every > 1:
+            sample_count = self._sample_counters.get(kind, 0) + 1
+            if sample_count < self.sample_every:
+                self._sample_counters[kind] = sample_count
+                return False
+            self._sample_counters[kind] = 0
+
+        row: _TraceRow = (source, kind, message, time.time(), tuple(stack) if stack else (), details, level)
+        if self._size == self.capacity:
+            self.dropped_count += 1
+        else:
+            self._size += 1
+        self._rows[self._next_index] = row
+        self._next_index = (self._next_index + 1) % self.capacity
+
         if self.sink is not None:
-            self.sink(event)
-        return event
+            self.sink(_row_to_event(row))
+        if self.batch_sink is not None:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+        return True
+
+    def flush(self) -> None:
+        """将尚未投递的事件交给批量 sink。"""
+        if self.batch_sink is None or not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        self.batch_sink([_row_to_event(row) for row in pending])
 
     def set_sink(self, sink: Optional[Callable[[TraceEvent], None]]) -> None:
         self.sink = sink
 
+    def set_batch_sink(self, batch_sink: Optional[Callable[[List[TraceEvent]], None]], batch_size: int = 256) -> None:
+        self.flush()
+        self.batch_sink = batch_sink
+        self.batch_size = max(1, int(batch_size))
+
     def clear(self) -> None:
-        self.events.clear()
+        self._rows = [None] * self.capacity
+        self._next_index = 0
+        self._size = 0
+        self._sample_counters = {}
+        self._pending = []
+        self.dropped_count = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _iter_rows(self) -> Iterable[_TraceRow]:
+        start = (self._next_index - self._size) % self.capacity
+        for offset in range(self._size):
+            row = self._rows[(start + offset) % self.capacity]
+            if row is not None:
+                yield row
+
+    @property
+    def events(self) -> List[TraceEvent]:
+        """缓冲区内的事件（从旧到新）。"""
+        return [_row_to_event(row) for row in self._iter_rows()]
 
     def as_list(self) -> List[TraceEvent]:
-        return list(self.events)
+        return self.events
 
+    def export_jsonl(self, path: Path) -> int:
+        """将缓冲区内的全部事件导出为 JSONL 文件，返回导出的事件数。"""
+        return write_trace_events_jsonl(Path(path), (_row_to_event(row) for row in self._iter_rows()))
@@ -87,6 +87,8 @@ class GraphScene(
         self.layout_registry_context = LayoutRegistryContext.from_settings()
         self.node_items: dict[str, NodeGraphicsItem] = {}
         self.edge_items: dict[str, EdgeGraphicsItem] = {}
+        # 节点几何版本号：节点图形项增删或尺寸重算时递增，小地图据此判断是否需要整体重建
+        self.node_geometry_revision: int = 0
         # 邻接索引: 记录每个节点关联的连线图形项，避免在拖动节点或移动命令中遍历全图
         # 键为节点 ID，值为包含 EdgeGraphicsItem 的集合
         self._edges_by_node_id: dict[str, set[EdgeGraphicsItem]] = {}
@@ -235,6 +237,17 @@ class GraphScene(
         if not edge_set:
             return []
         return list(edge_set)
+
+    def get_connected_input_port_names(self, node_id: str) -> set[str]:
+        """返回给定节点已连线的输入端口名（基于邻接索引，O(度数)）。"""
+        edge_set = self._edges_by_node_id.get(node_id)
+        if not edge_set:
+            return set()
+        return {
+            edge_item.dst.name
+            for edge_item in edge_set
+            if edge_item.dst.node_item.node.id == node_id
+        }
     
     def _promote_flow_outputs_for_layout(self, model_copy: GraphModel, node_library: Dict) -> None:
         """
@@ -312,6 +325,10 @@ class GraphScene(
         self._refresh_all_ports(affected_node_ids or None)
         return True
     
+    def touch_node_geometry_revision(self) -> None:
+        """节点图形项的增删或尺寸/外观变化后调用，递增节点几何版本号。"""
+        self.node_geometry_revision += 1
+
     def add_node_item(self, node: NodeModel) -> NodeGraphicsItem:
         # 信号/结构体节点的 UI 侧模型预处理下沉到 service，GraphScene 不直接写业务规则。
         prepare_signal_node_model_for_scene(node)
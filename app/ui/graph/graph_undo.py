@@ -535,11 +535,11 @@ class RenamePortCommand(Command):
                 continue
             if self.is_input:
                 if edge.dst_node == self.node_id and edge.dst_port == old_name:
-                    edge.dst_port = new_name
+                    self.model.update_edge_endpoints(edge, dst_port=new_name)
                     changed.append(edge_id)
             else:
                 if edge.src_node == self.node_id and edge.src_port == old_name:
-                    edge.src_port = new_name
+                    self.model.update_edge_endpoints(edge, src_port=new_name)
                     changed.append(edge_id)
         return changed
 
@@ -1,36 +1,61 @@
 """自动排版控制器
 
-负责节点图的自动排版逻辑（验证、克隆布局、差异合并、同步）。
+负责节点图的自动排版逻辑（验证、后台布局任务、差异合并、同步）。
 """
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Optional
 
-from PyQt6 import QtWidgets
+from PyQt6 import QtCore, QtWidgets
 from app.ui.foundation.toast_notification import ToastNotification
+from app.ui.graph.graph_view.top_right.controls_manager import TopRightControlsManager
 
 from engine.graph import validate_graph
+from engine.layout import LayoutDelta, get_shared_layout_job_runner
+from engine.layout.internal.layout_algorithm import LAYOUT_STAGE_LABELS, LAYOUT_STAGES
+from engine.layout.internal.layout_job import (
+    LAYOUT_JOB_CANCELLED,
+    LAYOUT_JOB_FAILED,
+    LAYOUT_JOB_FINISHED,
+    LAYOUT_JOB_PROGRESS,
+    apply_layout_delta,
+)
 from engine.validate import validate_files
 
 if TYPE_CHECKING:
     from app.ui.graph.graph_view import GraphView
 
 
+_AUTO_LAYOUT_BUTTON_TEXT = "⚡ 自动排版"
+
+
+@dataclass
+class _AutoLayoutJob:
+    """一个进行中的后台排版任务及其提交时的场景快照。"""
+
+    view: "GraphView"
+    scene: object
+    edit_stamp: tuple
+
+
 class AutoLayoutController:
     """自动排版控制器
     
     管理自动排版的完整流程：
     1. 排版前回调（可选重载）
     2. 验证节点图
-    3. 克隆模型并执行就地布局
-    4. 差异合并（新增/删除节点与连线）
-    5. 同步坐标与基本块
-    6. 更新图形项
-    7. 排版完成回调
+    3. 将模型克隆提交到后台排版进程（主线程不阻塞，按阶段显示进度）
+    4. 排版期间若用户再次编辑或再次点击，则以新任务取代旧任务
+    5. 差异合并（新增/删除副本节点与连线、坐标与基本块），只增量更新图形项
+    6. 排版完成回调
     """
     
     _workspace_path = Path(__file__).resolve().parents[5]
+    _POLL_INTERVAL_MS = 50
+    _active_jobs: Dict[int, _AutoLayoutJob] = {}
+    _poll_timer: Optional[QtCore.QTimer] = None
 
     @classmethod
     def run(cls, view: "GraphView") -> None:
@@ -81,109 +106,170 @@ class AutoLayoutController:
                 ToastNotification.show_message(view, toast_message, "warning")
             return
         
-        # 没有错误，执行自动排版（基于克隆就地布局 + 差异合并）
-
-        # 在回填坐标前：与“增强版”布局结果进行双向同步（新增与删除）
-        # 统一策略：通过引擎 LayoutService 获取增强后的克隆模型（含跨块复制/清理），随后用“差异合并”同步到当前模型。
-        from engine.layout import LayoutService
-        model_node_ids_before = set(view.scene().model.nodes.keys())
-        model_edge_ids_before = set(view.scene().model.edges.keys())
-        scene_obj = view.scene()
-        node_lib = getattr(scene_obj, "node_library", None) if scene_obj is not None else None
-        result = LayoutService.compute_layout(
-            view.scene().model,
-            node_library=node_lib,
-            include_augmented_model=True,
+        cls._submit_layout_job(view)
+
+    @classmethod
+    def cancel(cls, view: "GraphView") -> None:
+        """取消该视图正在进行的自动排版。"""
+        if not any(job.view is view for job in cls._active_jobs.values()):
+            return
+        get_shared_layout_job_runner().cancel()
+
+    # === 后台任务 ===
+
+    @staticmethod
+    def _compute_edit_stamp(scene) -> tuple:
+        """场景编辑状态指纹：模型对象、撤销栈与连线版本号任一变化即视为用户已再次编辑。"""
+        model = scene.model
+        undo_manager = getattr(scene, "undo_manager", None)
+        undo_stack = getattr(undo_manager, "undo_stack", None) or []
+        redo_stack = getattr(undo_manager, "redo_stack", None) or []
+        return (
+            id(model),
+            len(undo_stack),
+            id(undo_stack[-1]) if undo_stack else None,
+            len(redo_stack),
+            model.get_edges_revision(),
+            len(model.nodes),
+        )
+
+    @classmethod
+    def _submit_layout_job(cls, view: "GraphView") -> None:
+        scene = view.scene()
+        node_lib = getattr(scene, "node_library", None)
+        job_id = get_shared_layout_job_runner().submit(
+            scene.model,
             workspace_path=cls._workspace_path,
+            use_node_library=bool(node_lib),
         )
-        _augmented = getattr(result, "augmented_model", None)
-        if _augmented is None:
+        # 新任务会取代所有旧任务：旧任务的取消事件到达前先从活动表移除同一视图的记录
+        for stale_job_id in [jid for jid, job in cls._active_jobs.items() if job.view is view]:
+            cls._active_jobs.pop(stale_job_id, None)
+        cls._active_jobs[job_id] = _AutoLayoutJob(view=view, scene=scene, edit_stamp=cls._compute_edit_stamp(scene))
+        cls._show_progress(view, None)
+        cls._ensure_poll_timer()
+
+    @classmethod
+    def _ensure_poll_timer(cls) -> None:
+        if cls._poll_timer is None:
+            cls._poll_timer = QtCore.QTimer()
+            cls._poll_timer.setInterval(cls._POLL_INTERVAL_MS)
+            cls._poll_timer.timeout.connect(cls._poll_layout_jobs)
+        if not cls._poll_timer.isActive():
+            cls._poll_timer.start()
+
+    @classmethod
+    def _poll_layout_jobs(cls) -> None:
+        runner = get_shared_layout_job_runner()
+        for event in runner.poll_events():
+            job = cls._active_jobs.get(event.job_id)
+            if job is None:
+                continue
+            if event.kind == LAYOUT_JOB_PROGRESS:
+                cls._show_progress(job.view, event.stage)
+                continue
+            cls._active_jobs.pop(event.job_id, None)
+            if event.kind == LAYOUT_JOB_FINISHED:
+                if cls._is_job_stale(job):
+                    cls._submit_layout_job(job.view)
+                else:
+                    cls._apply_layout_result(job.view, event.delta)
+            elif event.kind == LAYOUT_JOB_FAILED:
+                cls._restore_button(job.view)
+                print(f"[自动排版] 后台排版失败：\n{event.error}")
+                if isinstance(job.view, QtWidgets.QWidget):
+                    ToastNotification.show_message(job.view, "自动排版失败，详情见控制台输出。", "error")
+            elif event.kind == LAYOUT_JOB_CANCELLED:
+                cls._restore_button(job.view)
+
+        # 排版期间用户再次编辑：以当前模型重新提交，旧任务在下一个阶段边界处停止
+        for job in list(cls._active_jobs.values()):
+            if job.view.scene() is None:
+                cls.cancel(job.view)
+            elif cls._is_job_stale(job):
+                cls._submit_layout_job(job.view)
+
+        if not cls._active_jobs and cls._poll_timer is not None:
+            cls._poll_timer.stop()
+
+    @classmethod
+    def _is_job_stale(cls, job: _AutoLayoutJob) -> bool:
+        scene = job.view.scene()
+        return scene is not job.scene or cls._compute_edit_stamp(scene) != job.edit_stamp
+
+    @staticmethod
+    def _show_progress(view: "GraphView", stage: Optional[str]) -> None:
+        button = getattr(view, "auto_layout_button", None)
+        if button is None:
             return
-        augmented_node_ids = set(_augmented.nodes.keys())
-        augmented_edge_ids = set(_augmented.edges.keys())
-        
-        # 合并新增节点（例如：跨块复制产生的副本）
-        nodes_to_add = augmented_node_ids - model_node_ids_before
-        for nid in nodes_to_add:
-            view.scene().model.nodes[nid] = _augmented.nodes[nid]
-        
-        # 合并新增连线（例如：副本→副本 或 副本→目标 的新边）
-        edges_to_add = augmented_edge_ids - model_edge_ids_before
-        for eid in edges_to_add:
-            view.scene().model.edges[eid] = _augmented.edges[eid]
-        
-        # 删除在就地布局中被移除的旧连线（例如：应当被替换/去重的原始跨块边）
-        edges_to_remove = model_edge_ids_before - augmented_edge_ids
-        if edges_to_remove:
-            for eid in list(edges_to_remove):
-                # 先移除场景图形项
-                edge_item = view.scene().edge_items.pop(eid, None)
-                if edge_item:
-                    view.scene().removeItem(edge_item)
-                # 再移除模型中的边
-                view.scene().model.edges.pop(eid, None)
-        
-        # 删除在就地布局中被清理掉的孤立副本节点（仅删除副本节点，避免误删用户节点）
-        nodes_to_remove = model_node_ids_before - augmented_node_ids
-        for nid in list(nodes_to_remove):
-            node_obj = view.scene().model.nodes.get(nid)
-            if node_obj and getattr(node_obj, "is_data_node_copy", False):
-                # 先删除与之相关的边的图形项与模型记录
-                to_del_edge_ids = [eid for eid, e in view.scene().model.edges.items() if e.src_node == nid or e.dst_node == nid]
-                for eid in to_del_edge_ids:
-                    edge_item = view.scene().edge_items.pop(eid, None)
-                    if edge_item:
-                        view.scene().removeItem(edge_item)
-                    view.scene().model.edges.pop(eid, None)
-                # 移除节点图形项
-                node_item = view.scene().node_items.pop(nid, None)
-                if node_item:
-                    view.scene().removeItem(node_item)
-                # 移除节点本身
-                view.scene().model.nodes.pop(nid, None)
-
-        # 将坐标与基本块回填到模型（坐标来源统一使用 _augmented，确保与合并来源一致）
-        positions_from_augmented = {nid: tuple(node.pos) for nid, node in _augmented.nodes.items()}
-        for node_id, pos_tuple in positions_from_augmented.items():
-            if node_id in view.scene().model.nodes:
-                view.scene().model.nodes[node_id].pos = (float(pos_tuple[0]), float(pos_tuple[1]))
-        # 基本块同样来自 _augmented，避免首次点击时坐标/块集合不一致
-        view.scene().model.basic_blocks = list(getattr(result, "basic_blocks", None) or _augmented.basic_blocks or [])
-        # 回填布局Y调试信息（来自 _augmented）
-        debug_map_aug = getattr(_augmented, "_layout_y_debug_info", {}) or {}
-        if debug_map_aug:
-            setattr(view.scene().model, "_layout_y_debug_info", dict(debug_map_aug))
-
-        # 检查是否有新节点（如副本节点）需要添加到场景
-        model_node_ids = set(view.scene().model.nodes.keys())
-        scene_node_ids = set(view.scene().node_items.keys())
-        new_node_ids = model_node_ids - scene_node_ids
-
-        if new_node_ids:
-            # 添加新节点（如跨块复制产生的副本）到场景
-            for node_id in new_node_ids:
-                node = view.scene().model.nodes[node_id]
-                view.scene().add_node_item(node)
-
-        # 同步模型位置到图形项（包括新添加的）
-        for node_id, node_item in view.scene().node_items.items():
-            if node_id in view.scene().model.nodes:
-                model_pos = view.scene().model.nodes[node_id].pos
-                node_item.setPos(model_pos[0], model_pos[1])
+        if stage in LAYOUT_STAGES:
+            text = f"⏳ {LAYOUT_STAGE_LABELS[stage]} ({LAYOUT_STAGES.index(stage) + 1}/{len(LAYOUT_STAGES)})"
+        else:
+            text = "⏳ 排版中…"
+        button.setText(text)
+        button.adjustSize()
+        TopRightControlsManager.update_position(view)
 
-        # 基于模型重建所有连线图形项，避免多次自动排版后 UI 与模型脱节
-        scene_edges = view.scene().edge_items
+    @staticmethod
+    def _restore_button(view: "GraphView") -> None:
+        button = getattr(view, "auto_layout_button", None)
+        if button is None:
+            return
+        button.setText(_AUTO_LAYOUT_BUTTON_TEXT)
+        button.adjustSize()
+        TopRightControlsManager.update_position(view)
+
+    @classmethod
+    def _apply_layout_result(cls, view: "GraphView", delta: LayoutDelta) -> None:
+        """将排版差异合并到模型，并只增量更新受影响的图形项（不重建场景）。"""
+        cls._restore_button(view)
         scene = view.scene()
-        for edge_id in list(scene_edges.keys()):
-            edge_item = scene_edges.pop(edge_id, None)
-            if edge_item is not None:
-                scene.removeItem(edge_item)
+        changes = apply_layout_delta(scene.model, delta)
+
+        # 先移除连线与副本节点，再添加新增项；移除连线后目标节点可能需要重新显示常量输入框
+        relayout_node_ids = set()
+        for edge_id in changes.removed_edge_ids:
+            edge_item = scene.edge_items.pop(edge_id, None)
+            if edge_item is None:
+                continue
+            relayout_node_ids.add(edge_item.dst.node_item.node.id)
+            scene._unregister_edge_for_nodes(edge_item)
+            scene.removeItem(edge_item)
+        for node_id in changes.removed_node_ids:
+            scene._remove_node_graphics(node_id)
+
+        # 兜底对齐：场景中残留的、模型已不存在的连线图形项
+        for edge_id in [eid for eid in scene.edge_items if eid not in scene.model.edges]:
+            edge_item = scene.edge_items.pop(edge_id)
+            scene._unregister_edge_for_nodes(edge_item)
+            scene.removeItem(edge_item)
+
+        previous_bulk_flag = bool(getattr(scene, "is_bulk_adding_items", False))
+        scene.is_bulk_adding_items = True
+        try:
+            for node_id in changes.added_node_ids:
+                if node_id not in scene.node_items:
+                    scene.add_node_item(scene.model.nodes[node_id])
+            for edge_id, edge in scene.model.edges.items():
+                if edge_id not in scene.edge_items:
+                    scene.add_edge_item(edge)
+            scene._deferred_port_layout_node_ids.update(
+                node_id for node_id in relayout_node_ids if node_id in scene.node_items
+            )
+            scene.flush_deferred_port_layouts()
+        finally:
+            scene.is_bulk_adding_items = previous_bulk_flag
+
+        # 同步坐标：只移动位置发生变化的节点（新增节点在 add_node_item 时已按模型坐标放置）
+        for node_id in changes.moved_node_ids:
+            node_item = scene.node_items.get(node_id)
+            if node_item is not None:
+                model_pos = scene.model.nodes[node_id].pos
+                node_item.setPos(model_pos[0], model_pos[1])
+        scene.rebuild_scene_rect_and_minimap()
 
-        for edge in scene.model.edges.values():
-            scene.add_edge_item(edge)
-        
         # 触发场景重绘以显示基本块
-        view.scene().update()
+        scene.update()
         # 通知外部：自动排版已完成
         if getattr(view, 'on_auto_layout_completed', None):
             view.on_auto_layout_completed()
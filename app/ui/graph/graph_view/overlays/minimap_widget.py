@@ -1,161 +1,276 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from PyQt6 import QtCore, QtGui, QtWidgets
 from PyQt6.QtCore import Qt
 
+from app.ui.foundation.theme_manager import Colors
+from app.ui.graph.graph_palette import GraphPalette
+from app.ui.graph.logic.minimap_logic import (
+    MINIMAP_PADDING,
+    MiniMapProjection,
+    MiniMapSnapshot,
+    MiniMapTileGrid,
+    build_minimap_snapshot,
+    mark_footprints,
+    minimap_scene_rect,
+    tiles_bounding_rect,
+)
+
 if TYPE_CHECKING:
-    pass
+    from engine.graph.models.graph_model import NodeModel
+
+
+# 小地图配色键 → 节点矩形颜色（与节点标题栏主色一致）
+_MINIMAP_NODE_COLORS: Dict[str, str] = {
+    "query": GraphPalette.CATEGORY_QUERY,
+    "event": GraphPalette.CATEGORY_EVENT,
+    "compute": GraphPalette.CATEGORY_COMPUTE,
+    "execution": GraphPalette.CATEGORY_EXECUTION,
+    "flow": GraphPalette.CATEGORY_FLOW,
+    "composite": Colors.NODE_HEADER_COMPOSITE_START,
+    "virtual_in": GraphPalette.CATEGORY_VIRTUAL_IN,
+    "virtual_out": GraphPalette.CATEGORY_VIRTUAL_OUT,
+    "default": GraphPalette.CATEGORY_DEFAULT,
+}
 
 
 class MiniMapWidget(QtWidgets.QWidget):
-    """小地图组件 - 显示整个节点图的缩略视图"""
-    
+    """小地图组件 - 显示整个节点图的缩略视图
+
+    不再调用 QGraphicsScene.render 渲染整图：缩略图由 GraphModel 派生的紧凑几何
+    （节点矩形、类别配色、简化连线折线）直接绘制，重建成本与端口/文本绘制无关。
+    节点移动时只重绘受影响的瓦片；节点增删或尺寸变化、连线变化或节点移出显示范围时才整体重建。
+    """
+
     def __init__(self, parent_view: 'QtWidgets.QGraphicsView', scene, parent=None):
         super().__init__(parent or parent_view.viewport())
         self.parent_view = parent_view
         self.main_scene = scene
-        
+
         self.setFixedSize(200, 150)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        
+
         # 拖拽状态
         self.dragging = False
         self.drag_start_pos = None
-        
+
         # 样式
         self.background_color = QtGui.QColor(40, 40, 40, 200)
         self.viewport_rect_color = QtGui.QColor(100, 150, 255, 120)
         self.viewport_border_color = QtGui.QColor(100, 150, 255, 255)
-        
-        # 缓存的场景边界（用于稳定小地图显示）
-        self._cached_scene_rect: QtCore.QRectF = None
-        self._update_cached_rect()
-        
-        # 渲染缓存与节流（避免每次绘制都完整渲染场景）
-        self._cached_scene_pixmap: QtGui.QPixmap | None = None
+        self.edge_color = QtGui.QColor(GraphPalette.EDGE_DATA)
+        self.edge_color.setAlpha(150)
+        self._node_colors = {key: QtGui.QColor(value) for key, value in _MINIMAP_NODE_COLORS.items()}
+
+        # 缩略图几何快照、坐标映射与瓦片化的渲染缓存
+        self._snapshot: Optional[MiniMapSnapshot] = None
+        self._structure_signature: Optional[Tuple[int, ...]] = None
+        self._projection: Optional[MiniMapProjection] = None
+        self._cached_image: Optional[QtGui.QImage] = None
+        self._tile_grid: Optional[MiniMapTileGrid] = None
         self._cache_dirty: bool = True
+
+        # 整体重建（结构变化）：100ms trailing-edge 防抖
         self._rebuild_timer = QtCore.QTimer(self)
         self._rebuild_timer.setSingleShot(True)
         self._rebuild_timer.timeout.connect(self._rebuild_cache)
-        
-        # 监听场景变化，合并触发缓存重建
+        # 增量重绘（节点移动）：合并一帧内的多次移动
+        self._tile_timer = QtCore.QTimer(self)
+        self._tile_timer.setSingleShot(True)
+        self._tile_timer.timeout.connect(self._flush_dirty_tiles)
+
+        # 场景变化只做 O(1) 的结构检查；节点移动由场景通过 notify_node_moved 精确通知
         if hasattr(self.main_scene, "changed"):
-            self.main_scene.changed.connect(self._schedule_cache_rebuild)
-        if hasattr(self.main_scene, "sceneRectChanged"):
-            self.main_scene.sceneRectChanged.connect(self._schedule_cache_rebuild)
-    
-    def _update_cached_rect(self) -> None:
-        """更新缓存的场景边界（动态显示所有节点的实际范围）"""
-        if not self.main_scene:
-            return
-        
-        # 获取所有节点的实际边界
-        items_rect = self.main_scene.itemsBoundingRect()
-        if items_rect.isEmpty():
-            # 使用默认的小区域（而不是之前的大区域）
-            self._cached_scene_rect = QtCore.QRectF(-200, -200, 400, 400)
-            return
-        
-        # 添加适当的边距（让节点不贴边，但不过度扩展）
-        margin = 200
-        new_rect = items_rect.adjusted(-margin, -margin, margin, margin)
-        
-        # 始终使用实际节点边界，动态更新小地图显示范围
-        # 这样小地图会实时反映节点的实际分布情况
-        self._cached_scene_rect = new_rect
-    
+            self.main_scene.changed.connect(self._on_scene_changed)
+        self._rebuild_cache()
+
+    def _current_structure_signature(self) -> Optional[Tuple[int, ...]]:
+        model = getattr(self.main_scene, "model", None)
+        if model is None:
+            return None
+        # 数量相同的替换（删一加一）、连线端点改写与节点尺寸重算都要能被察觉
+        return (
+            id(model),
+            len(model.nodes),
+            len(model.edges),
+            model.get_edges_revision(),
+            int(getattr(self.main_scene, "node_geometry_revision", 0)),
+        )
+
+    def _on_scene_changed(self, _regions=None) -> None:
+        """场景变更：节点/连线结构或节点几何变化时调度整体重建（移动由 notify_node_moved 增量处理）。"""
+        if self._current_structure_signature() != self._structure_signature:
+            self._schedule_cache_rebuild()
+
+    def _node_scene_geometry(self, node: 'NodeModel') -> Optional[Tuple[float, float, float, float]]:
+        """优先使用图形项的当前位置与包围盒（拖动中模型位置尚未回写）。"""
+        node_items = getattr(self.main_scene, "node_items", None) or {}
+        node_item = node_items.get(node.id)
+        if node_item is None:
+            return None
+        pos = node_item.pos()
+        rect = node_item.boundingRect()
+        return (pos.x() + rect.x(), pos.y() + rect.y(), rect.width(), rect.height())
+
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
-        """绘制小地图（使用缓存的场景缩略图 + 实时视口矩形叠加）"""
+        """绘制小地图（使用缓存的缩略图 + 实时视口矩形叠加）"""
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
-        
+
         # 背景与边框
         painter.fillRect(self.rect(), self.background_color)
         painter.setPen(QtGui.QPen(QtGui.QColor(80, 80, 80), 1))
         painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
-        
+
         if not self.main_scene:
             return
-        
+
         # 若缓存无效，调度一次重建（合并 100ms 内的变化）
-        if self._cache_dirty or self._cached_scene_pixmap is None:
+        if self._cache_dirty or self._cached_image is None:
             self._schedule_cache_rebuild()
-        
-        # 绘制缓存的场景缩略图
-        if self._cached_scene_pixmap is not None:
-            painter.drawPixmap(0, 0, self._cached_scene_pixmap)
-        
-        # 叠加当前可视区域矩形（仅计算叠加，不重渲染主场景）
-        scene_rect = self._cached_scene_rect
-        if scene_rect is None or scene_rect.isEmpty():
+
+        if self._cached_image is not None:
+            painter.drawImage(0, 0, self._cached_image)
+
+        # 叠加当前可视区域矩形（仅计算叠加，不重绘缩略图）
+        projection = self._projection
+        if projection is None:
             return
-        minimap_padding = 5
-        minimap_rect = self.rect().adjusted(minimap_padding, minimap_padding, -minimap_padding, -minimap_padding)
-        scale_x = minimap_rect.width() / scene_rect.width()
-        scale_y = minimap_rect.height() / scene_rect.height()
-        scale = min(scale_x, scale_y)
-        scaled_scene_width = scene_rect.width() * scale
-        scaled_scene_height = scene_rect.height() * scale
-        offset_x = minimap_padding + (minimap_rect.width() - scaled_scene_width) / 2
-        offset_y = minimap_padding + (minimap_rect.height() - scaled_scene_height) / 2
         viewport_scene_rect = self.parent_view.mapToScene(self.parent_view.viewport().rect()).boundingRect()
-        viewport_mini_x = (viewport_scene_rect.x() - scene_rect.x()) * scale + offset_x
-        viewport_mini_y = (viewport_scene_rect.y() - scene_rect.y()) * scale + offset_y
-        viewport_mini_w = viewport_scene_rect.width() * scale
-        viewport_mini_h = viewport_scene_rect.height() * scale
-        viewport_mini_rect = QtCore.QRectF(viewport_mini_x, viewport_mini_y, viewport_mini_w, viewport_mini_h)
+        mini_x, mini_y, mini_w, mini_h = projection.map_rect(
+            (viewport_scene_rect.x(), viewport_scene_rect.y(), viewport_scene_rect.width(), viewport_scene_rect.height())
+        )
+        viewport_mini_rect = QtCore.QRectF(mini_x, mini_y, mini_w, mini_h)
         painter.fillRect(viewport_mini_rect, self.viewport_rect_color)
         painter.setPen(QtGui.QPen(self.viewport_border_color, 2))
         painter.drawRect(viewport_mini_rect)
 
     def _schedule_cache_rebuild(self) -> None:
-        """调度重建小地图场景缓存（100ms 防抖，按“最后一次变更”触发）。
+        """调度重建小地图缓存（100ms 防抖，按“最后一次变更”触发）。
 
-        使用 trailing-edge 防抖策略：每次场景变更都会重启计时器，只有在连续 100ms
-        内没有新的变更时才真正重建缓存，避免长时间拖动或批量操作期间反复全图渲染。
+        使用 trailing-edge 防抖策略：每次结构变更都会重启计时器，只有在连续 100ms
+        内没有新的变更时才真正重建缓存，避免批量操作期间反复重建。
         """
         self._cache_dirty = True
         # QTimer.start 会在计时器已激活时自动重置，等效于“延后执行”
         self._rebuild_timer.start(100)
 
     def _rebuild_cache(self) -> None:
-        """重建小地图的场景渲染缓存"""
-        if not self.main_scene:
-            return
-        # 更新边界一次（避免在 paintEvent 里每帧获取 itemsBoundingRect）
-        self._update_cached_rect()
-        scene_rect = self._cached_scene_rect
-        if scene_rect is None or scene_rect.isEmpty():
-            self._cached_scene_pixmap = None
+        """由 GraphModel 重建几何快照与整张缩略图"""
+        self._rebuild_timer.stop()
+        self._tile_timer.stop()
+        model = getattr(self.main_scene, "model", None)
+        if model is None:
+            self._snapshot = None
+            self._projection = None
+            self._cached_image = None
             self._cache_dirty = False
             self.update()
             return
-        # 构建与小地图同尺寸的位图并将场景渲染进去
-        image = QtGui.QImage(self.width(), self.height(), QtGui.QImage.Format.Format_ARGB32_Premultiplied)
-        image.fill(QtGui.QColor(0, 0, 0, 0))
-        image_painter = QtGui.QPainter(image)
-        # 背景与边框在正常绘制时已覆盖，这里仅渲染场景到内边距区域
-        minimap_padding = 5
-        minimap_rect = QtCore.QRectF(minimap_padding, minimap_padding, self.width() - 2 * minimap_padding, self.height() - 2 * minimap_padding)
-        scale_x = minimap_rect.width() / scene_rect.width()
-        scale_y = minimap_rect.height() / scene_rect.height()
-        scale = min(scale_x, scale_y)
-        scaled_scene_width = scene_rect.width() * scale
-        scaled_scene_height = scene_rect.height() * scale
-        offset_x = minimap_padding + (minimap_rect.width() - scaled_scene_width) / 2
-        offset_y = minimap_padding + (minimap_rect.height() - scaled_scene_height) / 2
-        target_rect = QtCore.QRectF(offset_x, offset_y, scaled_scene_width, scaled_scene_height)
-        image_painter.setClipRect(minimap_rect)
-        # 直接按计算后的目标矩形渲染一次主场景
-        self.main_scene.render(image_painter, target_rect, scene_rect)
-        image_painter.end()
-        self._cached_scene_pixmap = QtGui.QPixmap.fromImage(image)
+        self._snapshot = build_minimap_snapshot(model, self._node_scene_geometry)
+        self._structure_signature = self._current_structure_signature()
+        self._projection = MiniMapProjection.fit(minimap_scene_rect(self._snapshot), self.width(), self.height())
+        self._cached_image = QtGui.QImage(self.width(), self.height(), QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+        self._tile_grid = MiniMapTileGrid(self.width(), self.height())
+        self._tile_grid.mark_all()
         self._cache_dirty = False
-        # 刷新以显示新缓存
+        self._flush_dirty_tiles()
+
+    def notify_node_moved(self, node_id: str, x: float, y: float) -> None:
+        """节点图形项位置变化：更新快照并标记受影响的瓦片（节点移出显示范围时整体重建）。"""
+        snapshot = self._snapshot
+        projection = self._projection
+        if snapshot is None or projection is None or self._tile_grid is None:
+            self._schedule_cache_rebuild()
+            return
+        node_items = getattr(self.main_scene, "node_items", None) or {}
+        node_item = node_items.get(node_id)
+        if node_item is not None:
+            bounding = node_item.boundingRect()
+            x, y = x + bounding.x(), y + bounding.y()
+        footprints = snapshot.move_node(node_id, x, y)
+        if footprints is None:
+            return
+        if not projection.contains_scene_rect(footprints[1]):
+            self._schedule_cache_rebuild()
+            return
+        mark_footprints(self._tile_grid, projection, footprints)
+        if not self._tile_timer.isActive():
+            self._tile_timer.start(16)
+
+    def _flush_dirty_tiles(self) -> None:
+        """只重绘脏瓦片：清空瓦片区域后重绘与之相交的节点矩形与连线折线。"""
+        snapshot = self._snapshot
+        projection = self._projection
+        grid = self._tile_grid
+        image = self._cached_image
+        if snapshot is None or projection is None or grid is None or image is None or not grid.has_dirty():
+            return
+        tiles = grid.take_dirty()
+        clip_region = QtGui.QRegion()
+        for tile in tiles:
+            tile_x, tile_y, tile_w, tile_h = grid.tile_rect(tile)
+            clip_region = clip_region.united(QtCore.QRect(int(tile_x), int(tile_y), int(tile_w), int(tile_h)))
+        dirty_x, dirty_y, dirty_w, dirty_h = tiles_bounding_rect(grid, tiles)
+        scene_left, scene_top = projection.to_scene(dirty_x, dirty_y)
+        scene_right, scene_bottom = projection.to_scene(dirty_x + dirty_w, dirty_y + dirty_h)
+        node_indices, edge_indices = snapshot.query(
+            (scene_left, scene_top, scene_right - scene_left, scene_bottom - scene_top)
+        )
+
+        painter = QtGui.QPainter(image)
+        painter.setClipRegion(clip_region)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode.CompositionMode_Source)
+        painter.fillRect(image.rect(), QtGui.QColor(0, 0, 0, 0))
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode.CompositionMode_SourceOver)
+        # 内边距之外不绘制（与背景边框保持间距）
+        padding = int(MINIMAP_PADDING)
+        painter.setClipRect(
+            QtCore.QRect(padding, padding, self.width() - 2 * padding, self.height() - 2 * padding),
+            Qt.ClipOperation.IntersectClip,
+        )
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        self._paint_edges(painter, snapshot, projection, edge_indices)
+        self._paint_nodes(painter, snapshot, projection, node_indices)
+        painter.end()
         self.update()
-    
+
+    def _paint_edges(
+        self,
+        painter: QtGui.QPainter,
+        snapshot: MiniMapSnapshot,
+        projection: MiniMapProjection,
+        edge_indices: List[int],
+    ) -> None:
+        painter.setPen(QtGui.QPen(self.edge_color, 1))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        for edge_index in edge_indices:
+            polyline = QtGui.QPolygonF(
+                [QtCore.QPointF(*projection.to_minimap(x, y)) for x, y in snapshot.edge_polyline(edge_index)]
+            )
+            painter.drawPolyline(polyline)
+
+    def _paint_nodes(
+        self,
+        painter: QtGui.QPainter,
+        snapshot: MiniMapSnapshot,
+        projection: MiniMapProjection,
+        node_indices: List[int],
+    ) -> None:
+        # 按配色键分组批量绘制，减少画刷切换
+        rects_by_color: Dict[str, List[QtCore.QRectF]] = {}
+        for node_index in node_indices:
+            mini_x, mini_y, mini_w, mini_h = projection.map_rect(snapshot.node_rect(node_index))
+            rects_by_color.setdefault(snapshot.color_keys[node_index], []).append(
+                QtCore.QRectF(mini_x, mini_y, max(1.0, mini_w), max(1.0, mini_h))
+            )
+        painter.setPen(Qt.PenStyle.NoPen)
+        for color_key, rects in rects_by_color.items():
+            painter.setBrush(self._node_colors.get(color_key, self._node_colors["default"]))
+            painter.drawRects(rects)
+
     def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
         """鼠标按下 - 开始拖拽或跳转"""
         if event.button() == Qt.MouseButton.LeftButton:
@@ -163,61 +278,31 @@ class MiniMapWidget(QtWidgets.QWidget):
             self.drag_start_pos = event.pos()
             self._jump_to_position(event.pos())
             event.accept()
-    
+
     def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
         """鼠标移动 - 拖拽跳转"""
         if self.dragging:
             self._jump_to_position(event.pos())
             event.accept()
-    
+
     def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
         """鼠标释放 - 结束拖拽"""
         if event.button() == Qt.MouseButton.LeftButton:
             self.dragging = False
             event.accept()
-    
+
     def _jump_to_position(self, mini_map_pos: QtCore.QPoint) -> None:
         """根据小地图上的点击位置跳转主视图"""
-        if not self.main_scene:
-            return
-        
-        # 使用缓存的场景边界（与绘制时一致）
-        scene_rect = self._cached_scene_rect
-        if scene_rect is None or scene_rect.isEmpty():
+        if not self.main_scene or self._projection is None:
             return
-        
-        # 使用与paintEvent完全相同的计算逻辑
-        minimap_padding = 5
-        minimap_rect = self.rect().adjusted(minimap_padding, minimap_padding, -minimap_padding, -minimap_padding)
-        
-        # 计算缩放比例（保持宽高比）
-        scale_x = minimap_rect.width() / scene_rect.width()
-        scale_y = minimap_rect.height() / scene_rect.height()
-        scale = min(scale_x, scale_y)
-        
-        # 计算缩放后的场景大小
-        scaled_scene_width = scene_rect.width() * scale
-        scaled_scene_height = scene_rect.height() * scale
-        
-        # 计算偏移，使场景在小地图中居中
-        offset_x = minimap_padding + (minimap_rect.width() - scaled_scene_width) / 2
-        offset_y = minimap_padding + (minimap_rect.height() - scaled_scene_height) / 2
-        
-        # 将小地图坐标转换为场景坐标
-        # 反向公式：场景坐标 = (小地图坐标 - 偏移) / 缩放比例 + 场景起点
-        scene_x = (mini_map_pos.x() - offset_x) / scale + scene_rect.x()
-        scene_y = (mini_map_pos.y() - offset_y) / scale + scene_rect.y()
-        
-        # 跳转到场景坐标
+        # 使用与绘制一致的坐标映射，将小地图坐标转换为场景坐标
+        scene_x, scene_y = self._projection.to_scene(mini_map_pos.x(), mini_map_pos.y())
         self.parent_view.centerOn(scene_x, scene_y)
-    
+
     def update_viewport_rect(self) -> None:
         """更新可视区域矩形"""
         self.update()
-    
-    def reset_cached_rect(self) -> None:
-        """重置缓存的边界（删除节点后可能需要）"""
-        self._cached_scene_rect = None
-        self._update_cached_rect()
-        self.update()
 
+    def reset_cached_rect(self) -> None:
+        """重置缓存的边界（批量构建或删除节点后调用）"""
+        self._rebuild_cache()
@@ -24,6 +24,11 @@ if TYPE_CHECKING:
 NODE_PADDING = 10
 ROW_HEIGHT = UI_ROW_HEIGHT
 BRANCH_PLUS_EXTRA_ROWS = 1
+NODE_CORNER_RADIUS = 12
+# 细节层级阈值（视图缩放比例）：低于该值时不绘制端口标签、常量框背景与警告标记
+NODE_LOD_PORT_LABELS = 0.5
+# 低于该值时连标题文字也省略，仅保留标题色块与轮廓
+NODE_LOD_TITLE_TEXT = 0.3
 
 
 class NodeGraphicsItem(QtWidgets.QGraphicsItem):
@@ -31,6 +36,11 @@ class NodeGraphicsItem(QtWidgets.QGraphicsItem):
         super().__init__()
         self.node = node
         self.title_font = ui_fonts.ui_font(11, bold=True)
+        self._label_font = ui_fonts.ui_font(9)
+        self._warning_font = ui_fonts.ui_font(11, bold=True)
+        # 节点外观（标题栏路径/渐变、轮廓路径）缓存：仅在尺寸或分类相关属性变化时重建
+        self._chrome_cache_key: Optional[tuple] = None
+        self._chrome_cache: Optional[tuple[QtGui.QPainterPath, QtGui.QBrush, QtGui.QPainterPath]] = None
         self._ports_in: List[PortGraphicsItem] = []
         self._ports_out: List[PortGraphicsItem] = []
         self._flow_in: Optional[PortGraphicsItem] = None
@@ -177,14 +187,10 @@ class NodeGraphicsItem(QtWidgets.QGraphicsItem):
 
     def _collect_connected_input_ports(self) -> set[str]:
         """收集所有已连线的输入端口名称，用于布局与行内编辑判定。"""
-        connected_input_ports: set[str] = set()
         scene_ref = self.scene()
         if not scene_ref:
-            return connected_input_ports
-        for edge_item in scene_ref.edge_items.values():
-            if edge_item.dst.node_item == self:
-                connected_input_ports.add(edge_item.dst.name)
-        return connected_input_ports
+            return set()
+        return scene_ref.get_connected_input_port_names(self.node.id)
 
     def _create_font_metrics(self) -> tuple[QtGui.QFontMetrics, QtGui.QFontMetrics]:
         """构造标签与输入文本的字体度量，用于宽度估算。"""
@@ -511,27 +517,29 @@ class NodeGraphicsItem(QtWidgets.QGraphicsItem):
             header_height,
             total_input_rows,
         )
+        if hasattr(scene_ref, "touch_node_geometry_revision"):
+            scene_ref.touch_node_geometry_revision()
 
     def boundingRect(self) -> QtCore.QRectF:
         return getattr(self, '_rect', QtCore.QRectF(0, 0, 280, 140))
 
-    def paint(self, painter: QtGui.QPainter, option, widget=None) -> None:
-        r = self.boundingRect()
-        header_h = ROW_HEIGHT + 10
-        corner_radius = 12
-        
-        # 选中状态的高亮效果（使用主题主色系描边，与全局渐变高亮保持一致）
-        if self.isSelected():
-            glow_pen = QtGui.QPen(QtGui.QColor(Colors.PRIMARY))
-            glow_pen.setWidth(4)
-            painter.setPen(glow_pen)
-            painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
-            painter.drawRoundedRect(r.adjusted(-2, -2, 2, 2), 14, 14)
-        
-        # 绘制标题栏背景（带圆角的顶部）
+    def _get_node_chrome(
+        self, r: QtCore.QRectF, header_h: float
+    ) -> tuple[QtGui.QPainterPath, QtGui.QBrush, QtGui.QPainterPath]:
+        """返回（标题栏路径, 标题栏渐变画刷, 整体轮廓路径），按尺寸与分类相关属性缓存。"""
+        cache_key = (
+            r.x(), r.y(), r.width(), r.height(), header_h,
+            self.node.category,
+            self.node.is_virtual_pin,
+            self.node.is_virtual_pin_input,
+            getattr(self.node, 'composite_id', None),
+        )
+        if self._chrome_cache is not None and self._chrome_cache_key == cache_key:
+            return self._chrome_cache
+
+        corner_radius = NODE_CORNER_RADIUS
         # 创建标题栏路径 - 只在顶部有圆角
         title_path = QtGui.QPainterPath()
-        
         # 从左下角开始
         title_path.moveTo(r.left(), r.top() + header_h)
         # 左边直线到圆角开始处
@@ -546,15 +554,38 @@ class NodeGraphicsItem(QtWidgets.QGraphicsItem):
         title_path.lineTo(r.right(), r.top() + header_h)
         # 封闭路径
         title_path.closeSubpath()
-        
+
         # 使用渐变填充标题栏
         grad = QtGui.QLinearGradient(r.topLeft(), r.topRight())
         grad.setColorAt(0.0, self._category_color_start())
         grad.setColorAt(1.0, self._category_color_end())
-        painter.fillPath(title_path, QtGui.QBrush(grad))
+
+        # 整体轮廓（圆角矩形）
+        outline_path = QtGui.QPainterPath()
+        outline_path.addRoundedRect(r, corner_radius, corner_radius)
+
+        self._chrome_cache_key = cache_key
+        self._chrome_cache = (title_path, QtGui.QBrush(grad), outline_path)
+        return self._chrome_cache
+
+    def paint(self, painter: QtGui.QPainter, option, widget=None) -> None:
+        r = self.boundingRect()
+        header_h = ROW_HEIGHT + 10
+        level_of_detail = QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        title_path, title_brush, outline_path = self._get_node_chrome(r, header_h)
+        
+        # 选中状态的高亮效果（使用主题主色系描边，与全局渐变高亮保持一致）
+        if self.isSelected():
+            glow_pen = QtGui.QPen(QtGui.QColor(Colors.PRIMARY))
+            glow_pen.setWidth(4)
+            painter.setPen(glow_pen)
+            painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+            painter.drawRoundedRect(r.adjusted(-2, -2, 2, 2), 14, 14)
+        
+        # 绘制标题栏背景（带圆角的顶部）
+        painter.fillPath(title_path, title_brush)
         
         # 绘制内容区域背景（70%不透明度，半透明有底色）
-        content_rect = QtCore.QRectF(r.left(), r.top() + header_h, r.width(), r.height() - header_h)
         content_color = QtGui.QColor(GraphPalette.NODE_CONTENT_BG)
         content_color.setAlpha(int(255 * 0.7))  # 70%不透明度，半透明有底色
         painter.setBrush(content_color)
@@ -564,9 +595,11 @@ class NodeGraphicsItem(QtWidgets.QGraphicsItem):
         painter.setPen(pen)
         
         # 绘制整体轮廓（圆角矩形）
-        path = QtGui.QPainterPath()
-        path.addRoundedRect(r, corner_radius, corner_radius)
-        painter.drawPath(path)
+        painter.drawPath(outline_path)
+
+        # 缩放过小时文字不可辨认，跳过全部文本绘制
+        if level_of_detail < NODE_LOD_TITLE_TEXT:
+            return
 
         # title text
         painter.setFont(self.title_font)
@@ -583,17 +616,12 @@ class NodeGraphicsItem(QtWidgets.QGraphicsItem):
         title_rect = QtCore.QRectF(r.left(), r.top(), r.width(), header_h)
         painter.drawText(title_rect.adjusted(12, 0, -12, 0), QtCore.Qt.AlignmentFlag.AlignVCenter | QtCore.Qt.AlignmentFlag.AlignLeft, title_text)
 
+        if level_of_detail < NODE_LOD_PORT_LABELS:
+            return
+
         # port labels (including flow ports) - 所有标签都使用亮色
-        painter.setFont(ui_fonts.ui_font(9))
+        painter.setFont(self._label_font)
         painter.setPen(QtGui.QColor(GraphPalette.TEXT_LABEL))  # 统一使用亮色
-        header_h = ROW_HEIGHT + 10
-        
-        # 检查哪些输入端口有连线
-        connected_input_ports = set()
-        if self.scene():
-            for edge_item in self.scene().edge_items.values():
-                if edge_item.dst.node_item == self:
-                    connected_input_ports.add(edge_item.dst.name)
         
         # draw input port labels（使用真实行索引映射）
         input_start_y = header_h + NODE_PADDING
@@ -603,8 +631,6 @@ class NodeGraphicsItem(QtWidgets.QGraphicsItem):
                 continue
             row_index = self._input_row_index_map.get(p.name, 0)
             label_y = input_start_y + row_index * ROW_HEIGHT
-            is_flow = p.name == '流程入' or '流程' in p.name.lower()
-            has_connection = p.name in connected_input_ports
             
             # 输入标签：端口右侧开始，左对齐
             painter.setPen(QtGui.QColor(GraphPalette.TEXT_LABEL))  # 确保标签是亮色
@@ -673,10 +699,10 @@ class NodeGraphicsItem(QtWidgets.QGraphicsItem):
                             
                             # 绘制警告感叹号（在输入框位置）
                             painter.setPen(warning_color)
-                            painter.setFont(ui_fonts.ui_font(11, bold=True))
+                            painter.setFont(self._warning_font)
                             warning_rect = QtCore.QRectF(r.width() * 0.35, label_y, 20, ROW_HEIGHT)
                             painter.drawText(warning_rect, QtCore.Qt.AlignmentFlag.AlignVCenter | QtCore.Qt.AlignmentFlag.AlignCenter, "!")
-                            painter.setFont(ui_fonts.ui_font(9))  # 恢复字体
+                            painter.setFont(self._label_font)  # 恢复字体
                             break
 
     def _category_color_start(self) -> QtGui.QColor:
@@ -1,3 +1,9 @@
+from .minimap_logic import (
+    MiniMapProjection,
+    MiniMapSnapshot,
+    MiniMapTileGrid,
+    build_minimap_snapshot,
+)
 from .signal_logic import (
     SignalBindingContext,
     SignalPortSyncPlan,
@@ -14,6 +20,10 @@ from .struct_logic import (
 )
 
 __all__ = [
+    "MiniMapProjection",
+    "MiniMapSnapshot",
+    "MiniMapTileGrid",
+    "build_minimap_snapshot",
     "SignalBindingContext",
     "SignalPortSyncPlan",
     "build_signal_node_def_proxy",
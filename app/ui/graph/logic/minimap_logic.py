@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from engine.graph.models.graph_model import GraphModel, NodeModel
+
+
+# 与 NodeGraphicsItem.boundingRect 的缺省尺寸保持一致（图形项尚未布局时使用）
+DEFAULT_NODE_WIDTH = 280.0
+DEFAULT_NODE_HEIGHT = 140.0
+# 小地图场景边界在节点包围盒外扩的边距（场景坐标）
+MINIMAP_SCENE_MARGIN = 200.0
+# 小地图内边距（像素）与瓦片边长（像素）
+MINIMAP_PADDING = 5.0
+MINIMAP_TILE_SIZE = 32
+
+# 节点类别 → 小地图配色键（简化版与完整版类别名归一）
+_CATEGORY_COLOR_KEYS = {
+    "查询": "query",
+    "查询节点": "query",
+    "事件": "event",
+    "事件节点": "event",
+    "运算": "compute",
+    "运算节点": "compute",
+    "执行": "execution",
+    "执行节点": "execution",
+    "流程控制": "flow",
+    "流程控制节点": "flow",
+    "复合": "composite",
+    "复合节点": "composite",
+}
+
+SceneRect = Tuple[float, float, float, float]
+NodeGeometryProvider = Callable[[NodeModel], Optional[SceneRect]]
+
+
+def minimap_color_key(node: NodeModel) -> str:
+    """节点在小地图上的配色键（与节点标题栏配色规则一致：虚拟引脚 > 复合节点 > 类别）。"""
+    if node.is_virtual_pin:
+        return "virtual_in" if node.is_virtual_pin_input else "virtual_out"
+    if node.composite_id:
+        return "composite"
+    return _CATEGORY_COLOR_KEYS.get(node.category, "default")
+
+
+def _union_rect(first: Optional[SceneRect], second: Optional[SceneRect]) -> Optional[SceneRect]:
+    if first is None:
+        return second
+    if second is None:
+        return first
+    left = min(first[0], second[0])
+    top = min(first[1], second[1])
+    right = max(first[0] + first[2], second[0] + second[2])
+    bottom = max(first[1] + first[3], second[1] + second[3])
+    return (left, top, right - left, bottom - top)
+
+
+def _rects_intersect(first: SceneRect, second: SceneRect) -> bool:
+    return not (
+        first[0] + first[2] < second[0]
+        or second[0] + second[2] < first[0]
+        or first[1] + first[3] < second[1]
+        or second[1] + second[3] < first[1]
+    )
+
+
+@dataclass(frozen=True)
+class MiniMapProjection:
+    """场景坐标 ↔ 小地图像素坐标的等比映射（场景居中于内边距区域）。"""
+
+    scene_rect: SceneRect
+    scale: float
+    offset_x: float
+    offset_y: float
+
+    @classmethod
+    def fit(cls, scene_rect: SceneRect, width: float, height: float, padding: float = MINIMAP_PADDING) -> "MiniMapProjection":
+        inner_width = max(1.0, width - 2 * padding)
+        inner_height = max(1.0, height - 2 * padding)
+        scale = min(inner_width / scene_rect[2], inner_height / scene_rect[3])
+        offset_x = padding + (inner_width - scene_rect[2] * scale) / 2
+        offset_y = padding + (inner_height - scene_rect[3] * scale) / 2
+        return cls(scene_rect=scene_rect, scale=scale, offset_x=offset_x, offset_y=offset_y)
+
+    def to_minimap(self, scene_x: float, scene_y: float) -> Tuple[float, float]:
+        return (
+            (scene_x - self.scene_rect[0]) * self.scale + self.offset_x,
+            (scene_y - self.scene_rect[1]) * self.scale + self.offset_y,
+        )
+
+    def to_scene(self, minimap_x: float, minimap_y: float) -> Tuple[float, float]:
+        return (
+            (minimap_x - self.offset_x) / self.scale + self.scene_rect[0],
+            (minimap_y - self.offset_y) / self.scale + self.scene_rect[1],
+        )
+
+    def map_rect(self, rect: SceneRect) -> SceneRect:
+        left, top = self.to_minimap(rect[0], rect[1])
+        return (left, top, rect[2] * self.scale, rect[3] * self.scale)
+
+    def contains_scene_rect(self, rect: SceneRect) -> bool:
+        scene = self.scene_rect
+        return (
+            rect[0] >= scene[0]
+            and rect[1] >= scene[1]
+            and rect[0] + rect[2] <= scene[0] + scene[2]
+            and rect[1] + rect[3] <= scene[1] + scene[3]
+        )
+
+
+class MiniMapSnapshot:
+    """小地图绘制所需的紧凑几何：节点矩形数组、配色键与简化连线。
+
+    - 节点矩形按 (x, y, w, h) 平铺存放在 array('d') 中，序号与 node_ids 对应；
+    - 连线只记录两端节点序号，折线在绘制时由端点矩形推导（源节点右缘中点 → 目标节点左缘中点的三段折线）；
+    - 不含端口、文本等细节，绘制成本只与节点/连线数量相关。
+    """
+
+    def __init__(self) -> None:
+        self.node_ids: List[str] = []
+        self.color_keys: List[str] = []
+        self.rects = array("d")
+        self.edge_endpoints = array("l")
+        self._index_by_node_id: Dict[str, int] = {}
+        self._edge_indices_by_node: Dict[int, List[int]] = {}
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_endpoints) // 2
+
+    def add_node(self, node_id: str, rect: SceneRect, color_key: str) -> None:
+        self._index_by_node_id[node_id] = len(self.node_ids)
+        self.node_ids.append(node_id)
+        self.color_keys.append(color_key)
+        self.rects.extend(rect)
+
+    def add_edge(self, src_node_id: str, dst_node_id: str) -> None:
+        src_index = self._index_by_node_id.get(src_node_id)
+        dst_index = self._index_by_node_id.get(dst_node_id)
+        if src_index is None or dst_index is None:
+            return
+        edge_index = self.edge_count
+        self.edge_endpoints.extend((src_index, dst_index))
+        self._edge_indices_by_node.setdefault(src_index, []).append(edge_index)
+        if dst_index != src_index:
+            self._edge_indices_by_node.setdefault(dst_index, []).append(edge_index)
+
+    def index_of(self, node_id: str) -> Optional[int]:
+        return self._index_by_node_id.get(node_id)
+
+    def node_rect(self, node_index: int) -> SceneRect:
+        offset = node_index * 4
+        rects = self.rects
+        return (rects[offset], rects[offset + 1], rects[offset + 2], rects[offset + 3])
+
+    def edge_polyline(self, edge_index: int) -> Tuple[Tuple[float, float], ...]:
+        src_x, src_y, src_w, src_h = self.node_rect(self.edge_endpoints[edge_index * 2])
+        dst_x, dst_y, _dst_w, dst_h = self.node_rect(self.edge_endpoints[edge_index * 2 + 1])
+        start = (src_x + src_w, src_y + src_h / 2)
+        end = (dst_x, dst_y + dst_h / 2)
+        middle_x = (start[0] + end[0]) / 2
+        return (start, (middle_x, start[1]), (middle_x, end[1]), end)
+
+    def edge_bounds(self, edge_index: int) -> SceneRect:
+        points = self.edge_polyline(edge_index)
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        return (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+
+    def bounds(self) -> Optional[SceneRect]:
+        bounds: Optional[SceneRect] = None
+        for node_index in range(self.node_count):
+            bounds = _union_rect(bounds, self.node_rect(node_index))
+        return bounds
+
+    def footprint(self, node_index: int) -> SceneRect:
+        """节点及其关联连线覆盖的场景区域（节点移动时需要重绘的范围）。"""
+        footprint = self.node_rect(node_index)
+        for edge_index in self._edge_indices_by_node.get(node_index, ()):
+            footprint = _union_rect(footprint, self.edge_bounds(edge_index))
+        return footprint
+
+    def move_node(self, node_id: str, x: float, y: float) -> Optional[Tuple[SceneRect, SceneRect]]:
+        """更新节点位置，返回移动前后的覆盖区域；节点不存在或位置未变时返回 None。"""
+        node_index = self._index_by_node_id.get(node_id)
+        if node_index is None:
+            return None
+        offset = node_index * 4
+        if self.rects[offset] == x and self.rects[offset + 1] == y:
+            return None
+        before = self.footprint(node_index)
+        self.rects[offset] = x
+        self.rects[offset + 1] = y
+        return before, self.footprint(node_index)
+
+    def query(self, rect: SceneRect) -> Tuple[List[int], List[int]]:
+        """返回与场景矩形相交的（节点序号列表, 连线序号列表）。"""
+        node_indices = [
+            node_index for node_index in range(self.node_count) if _rects_intersect(self.node_rect(node_index), rect)
+        ]
+        edge_indices = [
+            edge_index for edge_index in range(self.edge_count) if _rects_intersect(self.edge_bounds(edge_index), rect)
+        ]
+        return node_indices, edge_indices
+
+
+def build_minimap_snapshot(model: GraphModel, geometry_of: Optional[NodeGeometryProvider] = None) -> MiniMapSnapshot:
+    """从 GraphModel 构建小地图几何快照。
+
+    Args:
+        geometry_of: 可选的节点场景矩形提供者（例如取自图形项的位置与包围盒）；
+            返回 None 时回退到 NodeModel.pos + 缺省尺寸。
+    """
+    snapshot = MiniMapSnapshot()
+    for node_id, node in model.nodes.items():
+        rect = geometry_of(node) if geometry_of is not None else None
+        if rect is None:
+            pos = node.pos or (0.0, 0.0)
+            rect = (float(pos[0]), float(pos[1]), DEFAULT_NODE_WIDTH, DEFAULT_NODE_HEIGHT)
+        snapshot.add_node(node_id, rect, minimap_color_key(node))
+    for edge in model.edges.values():
+        snapshot.add_edge(edge.src_node, edge.dst_node)
+    return snapshot
+
+
+def minimap_scene_rect(snapshot: MiniMapSnapshot, margin: float = MINIMAP_SCENE_MARGIN) -> SceneRect:
+    """小地图显示的场景范围：节点包围盒外扩边距；空图使用默认小区域。"""
+    bounds = snapshot.bounds()
+    if bounds is None or bounds[2] <= 0 or bounds[3] <= 0:
+        return (-200.0, -200.0, 400.0, 400.0)
+    return (bounds[0] - margin, bounds[1] - margin, bounds[2] + 2 * margin, bounds[3] + 2 * margin)
+
+
+class MiniMapTileGrid:
+    """小地图像素空间的瓦片网格：记录需要重绘的瓦片。"""
+
+    def __init__(self, width: int, height: int, tile_size: int = MINIMAP_TILE_SIZE) -> None:
+        self.tile_size = max(1, int(tile_size))
+        self.columns = max(1, -(-int(width) // self.tile_size))
+        self.rows = max(1, -(-int(height) // self.tile_size))
+        self._dirty: Set[Tuple[int, int]] = set()
+
+    def mark_all(self) -> None:
+        self._dirty = {(column, row) for column in range(self.columns) for row in range(self.rows)}
+
+    def mark_rect(self, rect: SceneRect) -> None:
+        """标记与像素矩形相交的瓦片（越界部分被裁剪）。"""
+        size = self.tile_size
+        first_column = max(0, int(rect[0] // size))
+        first_row = max(0, int(rect[1] // size))
+        last_column = min(self.columns - 1, int((rect[0] + rect[2]) // size))
+        last_row = min(self.rows - 1, int((rect[1] + rect[3]) // size))
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                self._dirty.add((column, row))
+
+    def has_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def take_dirty(self) -> List[Tuple[int, int]]:
+        dirty = sorted(self._dirty)
+        self._dirty = set()
+        return dirty
+
+    def tile_rect(self, tile: Tuple[int, int]) -> SceneRect:
+        size = self.tile_size
+        return (float(tile[0] * size), float(tile[1] * size), float(size), float(size))
+
+
+def tiles_bounding_rect(grid: MiniMapTileGrid, tiles: Sequence[Tuple[int, int]]) -> Optional[SceneRect]:
+    bounds: Optional[SceneRect] = None
+    for tile in tiles:
+        bounds = _union_rect(bounds, grid.tile_rect(tile))
+    return bounds
+
+
+def mark_footprints(
+    grid: MiniMapTileGrid,
+    projection: MiniMapProjection,
+    footprints: Iterable[SceneRect],
+    stroke_margin: float = 1.0,
+) -> None:
+    """把场景覆盖区域映射到小地图像素空间并标记对应瓦片（外扩描边宽度）。"""
+    for footprint in footprints:
+        left, top, width, height = projection.map_rect(footprint)
+        grid.mark_rect((left - stroke_margin, top - stroke_margin, width + 2 * stroke_margin, height + 2 * stroke_margin))
+
+
+__all__ = [
+    "MINIMAP_PADDING",
+    "MINIMAP_TILE_SIZE",
+    "MiniMapProjection",
+    "MiniMapSnapshot",
+    "MiniMapTileGrid",
+    "build_minimap_snapshot",
+    "mark_footprints",
+    "minimap_color_key",
+    "minimap_scene_rect",
+    "tiles_bounding_rect",
+]
@@ -514,9 +514,9 @@ class SceneInteractionMixin:
         """节点位置发生变化时由 `NodeGraphicsItem.itemChange` 调用。
         
         - 负责刷新与该节点相连的连线路径（基于邻接索引或 edge_items 扫描）；
+        - 通知小地图增量更新该节点的缩略矩形；
         - 不直接更新 `NodeModel.pos`，模型位置仅通过 `MoveNodeCommand` 统一更新。
         """
-        _ = new_pos  # 预留参数，便于后续扩展对齐/吸附等行为
         node_id = node_item.node.id
 
         # 优先使用 GraphScene 提供的邻接索引接口（O(度数)）
@@ -536,3 +536,9 @@ class SceneInteractionMixin:
         for edge_item in edges_for_node:
             edge_item.update_path()
 
+        # 小地图只重绘该节点及其连线覆盖的瓦片
+        for view in self.views():
+            mini_map = getattr(view, "mini_map", None)
+            if mini_map is not None and hasattr(mini_map, "notify_node_moved"):
+                mini_map.notify_node_moved(node_id, new_pos[0], new_pos[1])
+
@@ -194,6 +194,8 @@ class SceneModelOpsMixin:
         node_item = self.node_items.pop(node_id, None)
         if node_item:
             self.removeItem(node_item)
+            if hasattr(self, "touch_node_geometry_revision"):
+                self.touch_node_geometry_revision()
         
         # 重新布局受影响的节点,以显示之前被隐藏的输入框
         for affected_node_id in affected_nodes:
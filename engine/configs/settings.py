@@ -178,6 +178,23 @@ class Settings:
     # 默认 5，设为 0 表示不限制
     LAYOUT_DEBUG_MAX_PORTS: int = 5
 
+    # 按事件区域并行的块内布局：块识别与跨块复制仍串行完成，
+    # 随后各事件区域的“块内数据节点放置 + 块内坐标计算”交给进程池并发执行，结果与串行逐字节一致。
+    # 进程池启动与模型传输有固定开销，只对事件处理器很多的大图有收益。
+    # 默认 False（关闭，串行执行）
+    LAYOUT_PARALLEL_EVENT_REGIONS: bool = False
+    # 并行 worker 数，0 表示使用 CPU 核数；不足 2 时自动回退为串行
+    LAYOUT_PARALLEL_WORKERS: int = 0
+    # 事件区域数量达到该值才启用并行（区域过少时进程池开销大于收益）
+    LAYOUT_PARALLEL_MIN_EVENT_REGIONS: int = 8
+
+    # 事件区域布局缓存：以区域子图的结构哈希为键，复用未变化区域的块内布局（块几何），
+    # 编辑-保存-重载时只需重新计算被修改的事件处理器；块识别、跨块复制与块间排版仍整图重算。
+    # 默认 True（开启）
+    LAYOUT_REGION_CACHE_ENABLED: bool = True
+    # 区域缓存的最大条目数（进程内 LRU）
+    LAYOUT_REGION_CACHE_MAX_ENTRIES: int = 512
+
     # ========== 基本块可视化选项 ==========
     
     # 是否显示基本块矩形框（半透明背景）
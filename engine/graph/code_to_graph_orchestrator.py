@@ -86,7 +86,13 @@ class CodeToGraphParser:
         graph_name: str = "未命名节点图",
         *,
         tree: Optional[ast.Module] = None,
+        apply_layout: bool = True,
     ) -> GraphModel:
+        """解析类结构 Graph Code 为 GraphModel。
+
+        apply_layout=False 时跳过末尾的自动布局（节点坐标保持默认值、不生成基本块与数据副本），
+        供只关心图结构的调用方使用。
+        """
         if self.verbose:
             log_info("[CodeToGraphParser] 开始解析代码...")
 
@@ -212,9 +218,10 @@ class CodeToGraphParser:
         GraphSemanticPass.apply(graph_model)
 
         # 布局（调用点保持不变）
-        apply_layout_quietly(graph_model)
-        if self.verbose:
-            log_info("[CodeToGraphParser] 自动布局完成")
+        if apply_layout:
+            apply_layout_quietly(graph_model)
+            if self.verbose:
+                log_info("[CodeToGraphParser] 自动布局完成")
 
         # 清理模块常量上下文，避免跨文件残留
         clear_module_constants_context()
@@ -562,10 +562,12 @@ class ClassFormatParser:
             target.nodes[new_id] = node
         
         for edge_id, edge in source.edges.items():
-            if edge.src_node in id_mapping:
-                edge.src_node = id_mapping[edge.src_node]
-            if edge.dst_node in id_mapping:
-                edge.dst_node = id_mapping[edge.dst_node]
+            if edge.src_node in id_mapping or edge.dst_node in id_mapping:
+                source.update_edge_endpoints(
+                    edge,
+                    src_node=id_mapping.get(edge.src_node),
+                    dst_node=id_mapping.get(edge.dst_node),
+                )
             new_edge_id = self._ensure_unique_id(edge_id, target.edges)
             if new_edge_id != edge_id:
                 edge.id = new_edge_id
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import ast
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Any, Sequence, Mapping
+from typing import List, Dict, Tuple, Optional, Any, Sequence, Mapping, Union
 from collections import defaultdict
 from datetime import datetime
 import re
@@ -221,11 +221,12 @@ class GraphCodeParser:
         # 使用延迟导入避免在引擎初始化早期引入 `engine.signal` → `engine.validate` → `engine.graph` 的循环依赖。
         self._signal_repo = None
     
-    def parse_file(self, code_file: Path) -> Tuple[GraphModel, Dict[str, Any]]:
+    def parse_file(self, code_file: Path, *, apply_layout: bool = True) -> Tuple[GraphModel, Dict[str, Any]]:
         """解析节点图代码文件为 GraphModel 和元数据
         
         Args:
             code_file: 文件路径
+            apply_layout: 是否执行解析末尾的自动布局；仅需图结构时传 False
             
         Returns:
             (GraphModel, metadata字典)
@@ -233,33 +234,78 @@ class GraphCodeParser:
         Raises:
             GraphParseError: 解析失败时抛出
         """
-        # 文件路径用于错误信息
-        file_path_str = str(code_file)
-        
         # 1. 读取文件内容
         with open(code_file, 'r', encoding='utf-8') as f:
             code = f.read()
         
-        # 2. 仅支持类结构格式（虚拟挂载架构）。判定失败直接报错。
+        return self._parse_source(code, code_file, apply_layout=apply_layout)
+    
+    def parse_code(
+        self,
+        code: str,
+        virtual_path: Union[str, Path] = "<memory>.py",
+        *,
+        tree: Optional[ast.Module] = None,
+        apply_layout: bool = True,
+    ) -> Tuple[GraphModel, Dict[str, Any]]:
+        """解析内存中的节点图源码为 GraphModel 和元数据（不读写磁盘）
+        
+        Args:
+            code: 源代码
+            virtual_path: 虚拟文件路径，仅用于错误信息与 metadata["source_file"]；
+                相对路径视为相对工作区根目录（与当前工作目录无关）
+            tree: 可选的已解析 AST（调用方已 `ast.parse` 过时传入，避免重复解析）
+            apply_layout: 是否执行解析末尾的自动布局；仅需图结构时传 False
+            
+        Returns:
+            (GraphModel, metadata字典)
+            
+        Raises:
+            GraphParseError: 解析失败时抛出
+        """
+        code_file = Path(virtual_path)
+        if not code_file.is_absolute():
+            code_file = self.workspace_path / code_file
+        return self._parse_source(code, code_file, tree=tree, apply_layout=apply_layout)
+    
+    def _parse_source(
+        self,
+        code: str,
+        code_file: Path,
+        *,
+        tree: Optional[ast.Module] = None,
+        apply_layout: bool = True,
+    ) -> Tuple[GraphModel, Dict[str, Any]]:
+        # 仅支持类结构格式（虚拟挂载架构）。判定失败直接报错。
         if not is_class_structure_format(code):
             raise GraphParseError(
-                f"当前节点图文件不符合类结构 Python 格式。文件: {file_path_str}"
+                f"当前节点图文件不符合类结构 Python 格式。文件: {code_file}"
             )
         # 新格式：类结构（虚拟挂载架构）
-        return self._parse_class_structure(code, code_file)
+        return self._parse_class_structure(code, code_file, tree=tree, apply_layout=apply_layout)
     
-    def _parse_class_structure(self, code: str, code_file: Path) -> Tuple[GraphModel, Dict[str, Any]]:
+    def _parse_class_structure(
+        self,
+        code: str,
+        code_file: Path,
+        *,
+        tree: Optional[ast.Module] = None,
+        apply_layout: bool = True,
+    ) -> Tuple[GraphModel, Dict[str, Any]]:
         """解析类结构格式的节点图，委托CodeToGraphParser
         
         Args:
             code: 源代码
-            code_file: 文件路径
+            code_file: 文件路径（可为虚拟路径）
+            tree: 可选的已解析 AST
+            apply_layout: 是否执行自动布局
             
         Returns:
             (GraphModel, metadata)
         """
         # 1. 提取元数据
-        tree = ast.parse(code)
+        if tree is None:
+            tree = ast.parse(code)
         metadata_obj = extract_metadata_from_code(code)
         metadata = {
             "graph_id": metadata_obj.graph_id,
@@ -274,7 +320,7 @@ class GraphCodeParser:
         graph_name = metadata.get("graph_name", "未命名节点图")
         
         # 2. 委托CodeToGraphParser解析
-        graph_model = self._code_parser.parse_code(code, graph_name, tree=tree)
+        graph_model = self._code_parser.parse_code(code, graph_name, tree=tree, apply_layout=apply_layout)
         
         # 3. 设置元数据到GraphModel
         graph_model.graph_id = metadata.get("graph_id", graph_model.graph_id)
@@ -5,6 +5,8 @@ from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from engine.utils.cache.frozen_payload import thaw_payload
+
 
 @dataclass
 class GraphConfig:
@@ -48,8 +50,9 @@ class GraphConfig:
             graph_type=data.get("graph_type", "server"),
             folder_path=data.get("folder_path", ""),
             description=data.get("description", ""),
-            data=data.get("data", {}),
-            metadata=data.get("metadata", {})
+            # data/metadata 会被编辑与 update_timestamp 等就地修改：对缓存的只读视图做深层解冻
+            data=thaw_payload(data.get("data", {})),
+            metadata=thaw_payload(data.get("metadata", {}))
         )
     
     def update_timestamp(self) -> None:
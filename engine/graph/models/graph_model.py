@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 from datetime import datetime
 
 
@@ -193,17 +193,130 @@ class EdgeModel:
     dst_port: str
 
 
+class _EdgeTable(Dict[str, EdgeModel]):
+    """`GraphModel.edges` 的字典实现：记录增删次数（`version`），供连线版本号感知外部直接增删。"""
+
+    version = 0
+
+    def __setitem__(self, key: str, value: EdgeModel) -> None:
+        dict.__setitem__(self, key, value)
+        self.version += 1
+
+    def __delitem__(self, key: str) -> None:
+        dict.__delitem__(self, key)
+        self.version += 1
+
+    def pop(self, *args):
+        self.version += 1
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self.version += 1
+        return dict.popitem(self)
+
+    def clear(self) -> None:
+        self.version += 1
+        dict.clear(self)
+
+    def update(self, *args, **kwargs) -> None:
+        self.version += 1
+        dict.update(self, *args, **kwargs)
+
+    def setdefault(self, key: str, default: Optional[EdgeModel] = None):
+        self.version += 1
+        return dict.setdefault(self, key, default)
+
+    def __ior__(self, other):
+        self.version += 1
+        return dict.__ior__(self, other)
+
+
+class _EdgeAdjacency:
+    """连线邻接索引：按节点与 (节点, 端口) 分组的出边/入边，组内保持 `edges` 的插入顺序。"""
+
+    __slots__ = ("out_by_node", "in_by_node", "out_by_port", "in_by_port", "_ordinals", "_next_ordinal")
+
+    def __init__(self, edges: Iterable[Tuple[str, EdgeModel]] = ()) -> None:
+        self.out_by_node: Dict[str, Dict[str, EdgeModel]] = {}
+        self.in_by_node: Dict[str, Dict[str, EdgeModel]] = {}
+        self.out_by_port: Dict[Tuple[str, str], Dict[str, EdgeModel]] = {}
+        self.in_by_port: Dict[Tuple[str, str], Dict[str, EdgeModel]] = {}
+        # 连线在 `edges` 中的相对顺序：改写端点后把连线插回新分组中的正确位置
+        self._ordinals: Dict[str, int] = {}
+        self._next_ordinal = 0
+        for edge_id, edge in edges:
+            self.add(edge_id, edge)
+
+    def add(self, edge_id: str, edge: EdgeModel) -> None:
+        self._ordinals[edge_id] = self._next_ordinal
+        self._next_ordinal += 1
+        self.out_by_node.setdefault(edge.src_node, {})[edge_id] = edge
+        self.in_by_node.setdefault(edge.dst_node, {})[edge_id] = edge
+        self.out_by_port.setdefault((edge.src_node, edge.src_port), {})[edge_id] = edge
+        self.in_by_port.setdefault((edge.dst_node, edge.dst_port), {})[edge_id] = edge
+
+    def remove(self, edge_id: str, edge: EdgeModel) -> None:
+        self._ordinals.pop(edge_id, None)
+        _discard_from_bucket(self.out_by_node, edge.src_node, edge_id)
+        _discard_from_bucket(self.in_by_node, edge.dst_node, edge_id)
+        _discard_from_bucket(self.out_by_port, (edge.src_node, edge.src_port), edge_id)
+        _discard_from_bucket(self.in_by_port, (edge.dst_node, edge.dst_port), edge_id)
+
+    def relocate(self, edge_id: str, edge: EdgeModel, old_endpoints: Tuple[str, str, str, str]) -> None:
+        """端点改写后移动连线所在分组；端点未变的分组保持原位，新分组按 `edges` 顺序插入。"""
+        old_src_node, old_src_port, old_dst_node, old_dst_port = old_endpoints
+        self._move(self.out_by_node, old_src_node, edge.src_node, edge_id, edge)
+        self._move(self.in_by_node, old_dst_node, edge.dst_node, edge_id, edge)
+        self._move(self.out_by_port, (old_src_node, old_src_port), (edge.src_node, edge.src_port), edge_id, edge)
+        self._move(self.in_by_port, (old_dst_node, old_dst_port), (edge.dst_node, edge.dst_port), edge_id, edge)
+
+    def _move(
+        self,
+        buckets: Dict[Any, Dict[str, EdgeModel]],
+        old_key: Any,
+        new_key: Any,
+        edge_id: str,
+        edge: EdgeModel,
+    ) -> None:
+        if old_key == new_key:
+            return
+        _discard_from_bucket(buckets, old_key, edge_id)
+        bucket = buckets.setdefault(new_key, {})
+        bucket[edge_id] = edge
+        ordinals = self._ordinals
+        ordinal = ordinals.get(edge_id)
+        if ordinal is None or len(bucket) == 1:
+            return
+        if all(ordinals.get(other_id, -1) < ordinal for other_id in bucket if other_id != edge_id):
+            return
+        ordered = sorted(bucket.items(), key=lambda item: ordinals.get(item[0], -1))
+        bucket.clear()
+        bucket.update(ordered)
+
+
+def _discard_from_bucket(buckets: Dict[Any, Dict[str, EdgeModel]], key: Any, edge_id: str) -> None:
+    bucket = buckets.get(key)
+    if bucket is None:
+        return
+    bucket.pop(edge_id, None)
+    if not bucket:
+        del buckets[key]
+
+
 class GraphModel:
     def __init__(self, graph_id: str = "", graph_name: str = "", description: str = "") -> None:
         self.graph_id = graph_id
         self.graph_name = graph_name
         self.description = description
         self.nodes: Dict[str, NodeModel] = {}
-        self.edges: Dict[str, EdgeModel] = {}
         # 连线版本号：用于让依赖 edges 的缓存具备可靠失效条件。
-        # 注意：若外部直接原地修改 EdgeModel 字段（而非通过 GraphModel API），
-        # 需要调用 `touch_edges_revision()` 主动触发失效。
-        self._edges_revision: int = 0
+        # `edges` 的增删（含外部直接操作字典）会自动计入；改写已有连线的端点请使用
+        # `update_edge_endpoints()`，绕过它原地修改 EdgeModel 字段时需调用 `touch_edges_revision()`。
+        self._edges_touch_count: int = 0
+        self._edges: _EdgeTable = _EdgeTable()
+        # 邻接索引及其对应的连线版本号；不一致时在下次查询时重建
+        self._adjacency: Optional[_EdgeAdjacency] = None
+        self._adjacency_stamp: Optional[int] = None
         self.graph_variables: List[dict] = []  # 节点图变量列表（存储序列化后的GraphVariableConfig）
         # 元数据（所属模板、实例、信号绑定、结构体绑定等）
         self.metadata: Dict[str, Any] = {}
@@ -230,9 +343,25 @@ class GraphModel:
         self._next_id += 1
         return new_id
 
+    @property
+    def edges(self) -> Dict[str, EdgeModel]:
+        return self._edges
+
+    @edges.setter
+    def edges(self, value: Dict[str, EdgeModel]) -> None:
+        # 整体替换：累计旧表的增删次数，保证版本号单调递增
+        self._edges_touch_count += self._edges.version + 1
+        table = _EdgeTable()
+        dict.update(table, value)
+        self._edges = table
+
     # -------- 变更版本号（用于缓存失效）--------
+    @property
+    def _edges_revision(self) -> int:
+        return self._edges_touch_count + self._edges.version
+
     def _touch_edges_revision(self) -> None:
-        self._edges_revision += 1
+        self._edges_touch_count += 1
 
     def touch_edges_revision(self) -> None:
         """显式触发“连线已变更”的版本号递增。
@@ -246,7 +375,83 @@ class GraphModel:
     def get_edges_revision(self) -> int:
         """获取当前连线版本号（用于调试与缓存策略）。"""
         return int(self._edges_revision)
+
+    # -------- 连线邻接索引（O(度数) 查询）--------
+    def _current_adjacency_stamp(self) -> int:
+        return self._edges_revision
+
+    def _peek_adjacency(self) -> Optional[_EdgeAdjacency]:
+        """返回仍然有效的邻接索引；失效或尚未构建时返回 None（不触发重建）。"""
+        if self._adjacency is not None and self._adjacency_stamp == self._current_adjacency_stamp():
+            return self._adjacency
+        return None
+
+    def _get_adjacency(self) -> _EdgeAdjacency:
+        adjacency = self._peek_adjacency()
+        if adjacency is None:
+            adjacency = _EdgeAdjacency(self._edges.items())
+            self._adjacency = adjacency
+            self._adjacency_stamp = self._current_adjacency_stamp()
+        return adjacency
+
+    def _commit_adjacency(self, adjacency: Optional[_EdgeAdjacency]) -> None:
+        """经 GraphModel API 增删连线并同步更新索引后，将索引标记为与当前版本一致。"""
+        if adjacency is not None:
+            self._adjacency_stamp = self._current_adjacency_stamp()
+
+    def get_outgoing_edges(self, node_id: str) -> List[EdgeModel]:
+        """以 node_id 为源节点的全部连线（按 edges 插入顺序）。"""
+        bucket = self._get_adjacency().out_by_node.get(node_id)
+        return list(bucket.values()) if bucket else []
+
+    def get_incoming_edges(self, node_id: str) -> List[EdgeModel]:
+        """以 node_id 为目标节点的全部连线（按 edges 插入顺序）。"""
+        bucket = self._get_adjacency().in_by_node.get(node_id)
+        return list(bucket.values()) if bucket else []
+
+    def get_port_edges(self, node_id: str, port_name: str, is_input: bool) -> List[EdgeModel]:
+        """连接到指定端口的全部连线（is_input=True 表示该端口为目标端）。"""
+        adjacency = self._get_adjacency()
+        buckets = adjacency.in_by_port if is_input else adjacency.out_by_port
+        bucket = buckets.get((node_id, port_name))
+        return list(bucket.values()) if bucket else []
+
+    def remove_edge(self, edge_id: str) -> Optional[EdgeModel]:
+        """删除一条连线并返回它（不存在时返回 None）。"""
+        if edge_id not in self._edges:
+            return None
+        adjacency = self._peek_adjacency()
+        edge = self._edges.pop(edge_id)
+        if adjacency is not None:
+            adjacency.remove(edge_id, edge)
+        self._commit_adjacency(adjacency)
+        return edge
     
+    def update_edge_endpoints(
+        self,
+        edge: EdgeModel,
+        *,
+        src_node: Optional[str] = None,
+        src_port: Optional[str] = None,
+        dst_node: Optional[str] = None,
+        dst_port: Optional[str] = None,
+    ) -> None:
+        """原地改写本图中一条连线的端点（保持 edge.id 不变），同步更新邻接索引与连线版本号。"""
+        adjacency = self._peek_adjacency()
+        old_endpoints = (edge.src_node, edge.src_port, edge.dst_node, edge.dst_port)
+        if src_node is not None:
+            edge.src_node = src_node
+        if src_port is not None:
+            edge.src_port = src_port
+        if dst_node is not None:
+            edge.dst_node = dst_node
+        if dst_port is not None:
+            edge.dst_port = dst_port
+        if adjacency is not None:
+            adjacency.relocate(edge.id, edge, old_endpoints)
+        self._touch_edges_revision()
+        self._commit_adjacency(adjacency)
+
     def add_node(self, title: str, category: str, input_names: List[str], output_names: List[str], pos=(0.0, 0.0)) -> NodeModel:
         node_id = self.gen_id("node")
         node = NodeModel(id=node_id, title=title, category=category, pos=pos)
@@ -259,19 +464,17 @@ class GraphModel:
     def add_edge(self, src_node: str, src_port: str, dst_node: str, dst_port: str) -> EdgeModel:
         edge_id = self.gen_id("edge")
         edge = EdgeModel(id=edge_id, src_node=src_node, src_port=src_port, dst_node=dst_node, dst_port=dst_port)
-        self.edges[edge_id] = edge
-        self._touch_edges_revision()
+        adjacency = self._peek_adjacency()
+        self._edges[edge_id] = edge
+        if adjacency is not None:
+            adjacency.add(edge_id, edge)
+        self._commit_adjacency(adjacency)
         return edge
     
     def add_edge_if_absent(self, src_node: str, src_port: str, dst_node: str, dst_port: str) -> Optional[EdgeModel]:
         """若相同连线不存在则添加，否则返回None。"""
-        for existing_edge in self.edges.values():
-            if (
-                existing_edge.src_node == src_node
-                and existing_edge.src_port == src_port
-                and existing_edge.dst_node == dst_node
-                and existing_edge.dst_port == dst_port
-            ):
+        for existing_edge in self.get_port_edges(src_node, src_port, False):
+            if existing_edge.dst_node == dst_node and existing_edge.dst_port == dst_port:
                 return None
         return self.add_edge(src_node, src_port, dst_node, dst_port)
     
@@ -354,12 +557,13 @@ class GraphModel:
         if node_id not in self.nodes:
             return
         # remove edges connected
-        to_del = [eid for eid, e in self.edges.items() if e.src_node == node_id or e.dst_node == node_id]
+        adjacency = self._get_adjacency()
+        to_del = dict.fromkeys(adjacency.out_by_node.get(node_id, {}))
+        to_del.update(dict.fromkeys(adjacency.in_by_node.get(node_id, {})))
         for eid in to_del:
-            self.edges.pop(eid, None)
+            adjacency.remove(eid, self._edges.pop(eid))
         self.nodes.pop(node_id, None)
-        if to_del:
-            self._touch_edges_revision()
+        self._commit_adjacency(adjacency)
     
     def has_port_connections(self, node_id: str, port_name: str, is_input: bool) -> bool:
         """检查指定端口是否有连线
@@ -372,14 +576,9 @@ class GraphModel:
         Returns:
             是否有连线连接到该端口
         """
-        for edge in self.edges.values():
-            if is_input:
-                if edge.dst_node == node_id and edge.dst_port == port_name:
-                    return True
-            else:
-                if edge.src_node == node_id and edge.src_port == port_name:
-                    return True
-        return False
+        adjacency = self._get_adjacency()
+        buckets = adjacency.in_by_port if is_input else adjacency.out_by_port
+        return (node_id, port_name) in buckets
     
     def remove_port_connections(self, node_id: str, port_name: str, is_input: bool) -> List[str]:
         """删除指定端口的所有连线
@@ -392,22 +591,12 @@ class GraphModel:
         Returns:
             被删除的边的ID列表
         """
-        removed_edges = []
-        to_del = []
-        
-        for edge_id, edge in self.edges.items():
-            if is_input:
-                if edge.dst_node == node_id and edge.dst_port == port_name:
-                    to_del.append(edge_id)
-            else:
-                if edge.src_node == node_id and edge.src_port == port_name:
-                    to_del.append(edge_id)
-        
-        for edge_id in to_del:
-            self.edges.pop(edge_id, None)
-            removed_edges.append(edge_id)
-        if removed_edges:
-            self._touch_edges_revision()
+        adjacency = self._get_adjacency()
+        buckets = adjacency.in_by_port if is_input else adjacency.out_by_port
+        removed_edges = list(buckets.get((node_id, port_name), {}))
+        for edge_id in removed_edges:
+            adjacency.remove(edge_id, self._edges.pop(edge_id))
+        self._commit_adjacency(adjacency)
         return removed_edges
     
     def sync_composite_nodes_from_library(self, node_library: Dict) -> int:
@@ -131,20 +131,23 @@ def _update_edges_after_port_sync(
         if i < len(new_outputs):
             output_mapping[old_name] = new_outputs[i]
     
-    # 更新所有相关的连线
-    for edge in graph.edges.values():
+    # 更新所有相关的连线（先取出出边/入边快照，改写端口名会调整邻接索引的分桶）
+    outgoing_edges = graph.get_outgoing_edges(node_id)
+    incoming_edges = graph.get_incoming_edges(node_id)
+    for edge in outgoing_edges:
         # 更新源端口（输出端口）
-        if edge.src_node == node_id and edge.src_port in output_mapping:
+        if edge.src_port in output_mapping:
             old_port = edge.src_port
             new_port = output_mapping[old_port]
             if old_port != new_port:
-                edge.src_port = new_port
-        
+                graph.update_edge_endpoints(edge, src_port=new_port)
+    
+    for edge in incoming_edges:
         # 更新目标端口（输入端口）
-        if edge.dst_node == node_id and edge.dst_port in input_mapping:
+        if edge.dst_port in input_mapping:
             old_port = edge.dst_port
             new_port = input_mapping[old_port]
             if old_port != new_port:
-                edge.dst_port = new_port
+                graph.update_edge_endpoints(edge, dst_port=new_port)
 
 
@@ -5,6 +5,8 @@
 from __future__ import annotations
 from typing import Dict, List, TYPE_CHECKING, Tuple, Any
 
+from engine.utils.cache.frozen_payload import thaw_payload
+
 if TYPE_CHECKING:
     from engine.graph.models.graph_model import GraphModel, NodeModel, EdgeModel, PortModel, BasicBlock
 
@@ -144,7 +146,8 @@ def deserialize_graph(data: dict) -> "GraphModel":
         graph_name=data.get("graph_name", ""),
         description=data.get("description", "")
     )
-    graph.metadata = data.get("metadata", {})
+    # 输入可能是资源缓存中的只读视图：模型会就地修改的容器统一解冻为可变副本
+    graph.metadata = thaw_payload(data.get("metadata", {}))
     
     # 事件流顺序（用于稳定事件布局顺序）
     if "event_flow_order" in data:
@@ -186,7 +189,7 @@ def deserialize_graph(data: dict) -> "GraphModel":
         node.inputs = _parse_port_list(node_data.get("inputs", []), is_input=True)
         node.outputs = _parse_port_list(node_data.get("outputs", []), is_input=False)
         
-        node.input_constants = dict(node_data.get("input_constants", {}))
+        node.input_constants = thaw_payload(node_data.get("input_constants", {}))
 
         # 恢复可选的源码行范围（若存在则用于UI错误定位）
         node.source_lineno = int(node_data.get("source_lineno", 0) or 0)
@@ -221,7 +224,7 @@ def deserialize_graph(data: dict) -> "GraphModel":
                     node.copy_block_id = inferred_block
         
         # 双向无痛编辑：加载用户自定义信息
-        node.custom_var_names = node_data.get("custom_var_names", {})
+        node.custom_var_names = thaw_payload(node_data.get("custom_var_names", {}))
         node.custom_comment = node_data.get("custom_comment", "")
         node.inline_comment = node_data.get("inline_comment", "")
         
@@ -247,7 +250,7 @@ def deserialize_graph(data: dict) -> "GraphModel":
         graph.edges[edge.id] = edge
     
     # 加载节点图变量
-    graph.graph_variables = data.get("graph_variables", [])
+    graph.graph_variables = thaw_payload(data.get("graph_variables", []))
 
     # 可选：加载基本块（避免场景初始化时重复识别）
     basic_blocks_data = data.get("basic_blocks", [])
@@ -0,0 +1,245 @@
+"""进程内共享的图解析结果缓存。
+
+同一份 `.py` 节点图在一次会话中往往被多处解析：资源加载（GraphLoader）、代码质量规则、
+复合节点结构校验……每次都要重新读盘并跑完整的 CodeToGraphParser（含一次布局）。
+本模块按 (解析类型, 文件路径, 内容哈希, node_defs_fp, 布局设置摘要) 缓存解析结果：
+
+- 图文件：返回 `ParsedGraphResult`，其中 GraphModel 为**共享只读**对象，元数据冻结为只读视图；
+  只读调用方（校验规则等）直接使用，需要修改的调用方（加载 + 增强布局）先 `clone_model()`；
+- 仅需图结构的调用方（`apply_layout=False`）使用独立的缓存键，解析时跳过自动布局；
+- 复合节点文件：返回 CompositeNodeConfig（同样按只读约定共享）；
+- 内存有界：按条目数与“节点 + 连线”总量双重预算做 LRU 淘汰，`get_stats()` 暴露命中/淘汰统计。
+
+只有使用节点注册表默认节点库的解析才走缓存（自定义 node_library 的解析器无法由 node_defs_fp 描述）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, TYPE_CHECKING
+
+from engine.configs.settings import settings
+from engine.graph.models import GraphModel
+from engine.utils.cache.frozen_payload import freeze_payload, thaw_payload
+from engine.utils.graph.node_defs_fingerprint_service import get_node_defs_fingerprint
+
+if TYPE_CHECKING:
+    from engine.graph.composite_code_parser import CompositeCodeParser
+    from engine.graph.graph_code_parser import GraphCodeParser
+    from engine.nodes.advanced_node_features import CompositeNodeConfig
+
+
+_PARSE_KIND_GRAPH = "graph"
+_PARSE_KIND_GRAPH_STRUCTURE = "graph-structure"
+_PARSE_KIND_COMPOSITE = "composite"
+
+# 默认预算：最多 128 个文件，且缓存中的节点 + 连线总数不超过 200k
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_ELEMENTS = 200_000
+
+ParseCacheKey = Tuple[str, str, str, str, str]
+
+
+@dataclass(frozen=True)
+class ParsedGraphResult:
+    """一次图文件解析的共享结果（只读约定：不要修改 model / metadata）。"""
+
+    model: GraphModel
+    metadata: Mapping[str, Any]
+    source_path: Path
+    content_hash: str
+    node_defs_fp: str
+
+    def clone_model(self) -> GraphModel:
+        """返回可自由修改的模型副本。"""
+        return self.model.clone()
+
+    def mutable_metadata(self) -> Dict[str, Any]:
+        """返回可自由修改的元数据副本。"""
+        return thaw_payload(self.metadata)
+
+
+class _ParseCacheEntry:
+    __slots__ = ("value", "element_count")
+
+    def __init__(self, value: Any, element_count: int) -> None:
+        self.value = value
+        self.element_count = element_count
+
+
+class GraphParseResultCache:
+    """解析结果 LRU：条目数与元素（节点 + 连线）总量双重预算。"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_elements: int = DEFAULT_MAX_ELEMENTS) -> None:
+        self._entries: "OrderedDict[ParseCacheKey, _ParseCacheEntry]" = OrderedDict()
+        self._lock = Lock()
+        self._max_entries = max(1, int(max_entries))
+        self._max_elements = max(1, int(max_elements))
+        self._element_count = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_parse(self, key: ParseCacheKey, parse: Callable[[], Tuple[Any, int]]) -> Any:
+        """命中直接返回共享结果；未命中时调用 parse() -> (结果, 元素数) 并写入缓存。
+
+        解析异常原样抛出且不写入缓存。
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry.value
+            self._misses += 1
+
+        value, element_count = parse()
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._element_count -= previous.element_count
+            self._entries[key] = _ParseCacheEntry(value, element_count)
+            self._element_count += element_count
+            self._evict_if_needed()
+        return value
+
+    def _evict_if_needed(self) -> None:
+        # 至少保留最近写入的一条，避免超大图“写入即淘汰”
+        while len(self._entries) > 1 and (
+            len(self._entries) > self._max_entries or self._element_count > self._max_elements
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._element_count -= evicted.element_count
+            self._evictions += 1
+
+    def invalidate_path(self, file_path: Path) -> None:
+        """显式失效某个文件的所有解析结果（内容哈希变化时会自然未命中，此处用于及早释放内存）。"""
+        path_text = str(Path(file_path).resolve())
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == path_text]:
+                self._element_count -= self._entries.pop(key).element_count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._element_count = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            total_requests = self._hits + self._misses
+            hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0.0
+            return {
+                "cache_size": len(self._entries),
+                "max_cache_size": self._max_entries,
+                "cache_elements": self._element_count,
+                "max_cache_elements": self._max_elements,
+                "cache_hits": self._hits,
+                "cache_misses": self._misses,
+                "cache_evictions": self._evictions,
+                "hit_rate": round(hit_rate, 2),
+            }
+
+
+_SHARED_CACHE = GraphParseResultCache()
+
+
+def get_graph_parse_result_cache() -> GraphParseResultCache:
+    return _SHARED_CACHE
+
+
+def _layout_settings_digest() -> str:
+    """解析流程会执行一次布局，布局相关设置变化时必须视为不同的解析结果。"""
+    layout_settings = sorted(
+        (key, repr(value))
+        for key, value in settings._get_all_settings().items()
+        if key.startswith("LAYOUT_") or key.startswith("DATA_NODE_")
+    )
+    return hashlib.sha1(repr(layout_settings).encode("utf-8")).hexdigest()
+
+
+def _build_key(kind: str, workspace_path: Path, code_file: Path) -> ParseCacheKey:
+    content_hash = hashlib.sha1(Path(code_file).read_bytes()).hexdigest()
+    return (
+        kind,
+        str(Path(code_file).resolve()),
+        content_hash,
+        get_node_defs_fingerprint(Path(workspace_path)),
+        _layout_settings_digest(),
+    )
+
+
+def parse_graph_file_shared(
+    workspace_path: Path,
+    code_file: Path,
+    *,
+    parser: Optional["GraphCodeParser"] = None,
+    apply_layout: bool = True,
+) -> ParsedGraphResult:
+    """解析节点图文件（同一文件修订在进程内只解析一次）。
+
+    Args:
+        parser: 可选的解析器实例（必须使用注册表当前的节点库，刷新后需重建）；未提供时按需创建。
+        apply_layout: False 时返回未布局的结构图（坐标为默认值、无基本块与数据副本），与布局结果分开缓存。
+
+    Raises:
+        GraphParseError: 解析失败时抛出（失败结果不缓存）。
+    """
+    kind = _PARSE_KIND_GRAPH if apply_layout else _PARSE_KIND_GRAPH_STRUCTURE
+    key = _build_key(kind, workspace_path, code_file)
+
+    def _parse() -> Tuple[ParsedGraphResult, int]:
+        from engine.graph.graph_code_parser import GraphCodeParser
+
+        active_parser = parser or GraphCodeParser(Path(workspace_path))
+        model, metadata = active_parser.parse_file(Path(code_file), apply_layout=apply_layout)
+        result = ParsedGraphResult(
+            model=model,
+            metadata=freeze_payload(metadata),
+            source_path=Path(code_file),
+            content_hash=key[2],
+            node_defs_fp=key[3],
+        )
+        return result, len(model.nodes) + len(model.edges)
+
+    return _SHARED_CACHE.get_or_parse(key, _parse)
+
+
+def parse_composite_file_shared(
+    workspace_path: Path,
+    file_path: Path,
+    *,
+    parser: Optional["CompositeCodeParser"] = None,
+) -> "CompositeNodeConfig":
+    """解析复合节点文件（共享只读结果，同一文件修订在进程内只解析一次）。"""
+    key = _build_key(_PARSE_KIND_COMPOSITE, workspace_path, file_path)
+
+    def _parse() -> Tuple["CompositeNodeConfig", int]:
+        from engine.graph.composite_code_parser import CompositeCodeParser
+        from engine.nodes.node_registry import get_node_registry
+
+        active_parser = parser
+        if active_parser is None:
+            node_library = get_node_registry(Path(workspace_path), include_composite=True).get_library()
+            active_parser = CompositeCodeParser(node_library, verbose=False, workspace_path=Path(workspace_path))
+        composite = active_parser.parse_file(Path(file_path))
+        sub_graph = getattr(composite, "sub_graph", None) or {}
+        element_count = len(sub_graph.get("nodes", []) or []) + len(sub_graph.get("edges", []) or [])
+        return composite, element_count
+
+    return _SHARED_CACHE.get_or_parse(key, _parse)
+
+
+__all__ = [
+    "GraphParseResultCache",
+    "ParsedGraphResult",
+    "get_graph_parse_result_cache",
+    "parse_composite_file_shared",
+    "parse_graph_file_shared",
+]
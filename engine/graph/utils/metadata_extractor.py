@@ -5,7 +5,10 @@
 from __future__ import annotations
 
 import ast
+import inspect
+import io
 import re
+import tokenize
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -333,3 +336,94 @@ def load_graph_metadata_from_file(file_path: Path, *, encoding: str = "utf-8") -
     code = Path(file_path).read_text(encoding=encoding)
     return extract_metadata_from_code(code)
 
+
+
+_HEADER_SCAN_INITIAL_CHARS = 4096
+
+_DOCSTRING_FOUND = "found"
+_DOCSTRING_ABSENT = "absent"
+_DOCSTRING_NEED_MORE = "need_more"
+_DOCSTRING_FALLBACK = "fallback"
+
+
+def _scan_module_docstring(source_prefix: str, at_eof: bool) -> tuple[str, Optional[str]]:
+    """基于词法扫描判定模块 docstring（与 `ast.get_docstring` 口径一致）。
+
+    `source_prefix` 需以完整行结尾（或为整个文件）。返回（状态, docstring）：
+    - found：首条语句为字符串字面量语句；
+    - absent：首条语句不是 docstring；
+    - need_more：前缀不足以判定，需要读取更多内容；
+    - fallback：词法层面无法可靠判定（如括号包裹的字符串），调用方应回退为完整解析。
+    """
+    literal_tokens: List[str] = []
+    token_stream = tokenize.generate_tokens(io.StringIO(source_prefix).readline)
+    try:
+        for token in token_stream:
+            token_type = token.type
+            if not literal_tokens:
+                if token_type in (tokenize.NL, tokenize.NEWLINE, tokenize.COMMENT):
+                    continue
+                if token_type == tokenize.ENDMARKER:
+                    return (_DOCSTRING_ABSENT if at_eof else _DOCSTRING_NEED_MORE), None
+                if token_type == tokenize.STRING:
+                    literal_tokens.append(token.string)
+                    continue
+                if token_type == tokenize.OP and token.string == "(":
+                    return _DOCSTRING_FALLBACK, None
+                return _DOCSTRING_ABSENT, None
+
+            if token_type == tokenize.STRING:
+                literal_tokens.append(token.string)
+                continue
+            if token_type == tokenize.COMMENT:
+                continue
+            if token_type == tokenize.ENDMARKER and not at_eof:
+                return _DOCSTRING_NEED_MORE, None
+            if token_type in (tokenize.NEWLINE, tokenize.ENDMARKER) or (
+                token_type == tokenize.OP and token.string == ";"
+            ):
+                break
+            # 字符串只是更大表达式的一部分（如 "...".strip()），不构成 docstring
+            return _DOCSTRING_ABSENT, None
+    except tokenize.TokenError:
+        return (_DOCSTRING_FALLBACK if at_eof else _DOCSTRING_NEED_MORE), None
+
+    pieces: List[str] = []
+    for literal in literal_tokens:
+        quote_index = min(index for index in (literal.find("'"), literal.find('"')) if index >= 0)
+        literal_prefix = literal[:quote_index].lower()
+        # f-string 与 bytes 字面量都不是 docstring
+        if "f" in literal_prefix or "b" in literal_prefix:
+            return _DOCSTRING_ABSENT, None
+        pieces.append(ast.literal_eval(literal))
+    return _DOCSTRING_FOUND, inspect.cleandoc("".join(pieces))
+
+
+def load_graph_header_metadata_from_file(file_path: Path, *, encoding: str = "utf-8") -> GraphMetadata:
+    """只读取文件开头的模块 docstring 并解析基础元数据（graph_id/graph_name 等）。
+
+    用于资源索引等只需要基础字段的场景：不对整份代码做 AST 解析，也不提取 GRAPH_VARIABLES。
+    docstring 字段与 `load_graph_metadata_from_file` 的解析结果一致。
+    """
+    chunk_size = _HEADER_SCAN_INITIAL_CHARS
+    with open(file_path, "r", encoding=encoding) as file_obj:
+        source_text = file_obj.read(chunk_size)
+        at_eof = len(source_text) < chunk_size
+        while True:
+            # 未读到文件末尾时只扫描完整行，避免把被截断的行误判为语句结束
+            source_prefix = source_text if at_eof else source_text[: source_text.rfind("\n") + 1]
+            status, docstring = _scan_module_docstring(source_prefix, at_eof)
+            if status == _DOCSTRING_NEED_MORE:
+                chunk_size *= 2
+                chunk = file_obj.read(chunk_size)
+                at_eof = len(chunk) < chunk_size
+                source_text += chunk
+                continue
+            if status == _DOCSTRING_FALLBACK:
+                source_text += file_obj.read()
+                docstring = ast.get_docstring(ast.parse(source_text))
+            break
+
+    if not docstring:
+        return GraphMetadata()
+    return extract_metadata_from_docstring(docstring)
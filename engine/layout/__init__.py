@@ -5,6 +5,14 @@
 """
 
 from .internal.layout_service import LayoutResult, LayoutService
+from .internal.layout_job import (
+    LayoutDelta,
+    LayoutJobEvent,
+    LayoutJobRunner,
+    apply_layout_delta,
+    compute_layout_delta,
+    get_shared_layout_job_runner,
+)
 from .flow.flow_tree_generator import generate_flow_tree
 from .internal import constants as _constants
 from .internal.layout_context import LayoutContext
@@ -44,6 +52,12 @@ __all__ = [
     "generate_flow_tree",
     "LayoutService",
     "LayoutResult",
+    "LayoutDelta",
+    "LayoutJobEvent",
+    "LayoutJobRunner",
+    "apply_layout_delta",
+    "compute_layout_delta",
+    "get_shared_layout_job_runner",
     "LayoutContext",
     "find_event_roots",
     "invalidate_layout_caches",
@@ -17,6 +17,7 @@ from engine.graph.models import GraphModel
 from engine.configs.settings import settings
 from ..internal.layout_context import LayoutContext
 from ..internal.layout_models import LayoutBlock
+from ..internal.parallel_region_layout import RegionBlockGeometry, RegionBlockSpec
 from ..utils.edge_index_proxies import CopyOnWriteEdgeIndex
 from ..utils.graph_query_utils import (
     count_outgoing_data_edges,
@@ -192,12 +193,28 @@ class BlockLayoutExecutor:
             block: 阶段1创建的LayoutBlock
             block_data_nodes: 该块应放置的数据节点ID集合（由全局复制管理器提供）
         """
+        debug_y_info = self.compute_data_phase(block, block_data_nodes)
+        
+        # 更新调试信息
+        current_map = getattr(self.model, "_layout_y_debug_info", None)
+        if current_map is None:
+            current_map = {}
+            setattr(self.model, "_layout_y_debug_info", current_map)
+        for node_id, info in debug_y_info.items():
+            current_map[node_id] = info
+
+    def compute_data_phase(
+        self,
+        block: LayoutBlock,
+        block_data_nodes: Set[str],
+    ) -> Dict[str, Any]:
+        """阶段2的纯计算部分：写入块几何并返回该块的Y调试信息（不写入模型级调试映射）。"""
         block_order_index = block.order_index
         cached = self._block_context_cache.get(block_order_index)
         
         if cached is None:
             # 回退：如果没有缓存，直接返回（不应该发生）
-            return
+            return {}
         
         context = cached.context
         flow_node_ids = cached.flow_node_ids
@@ -208,14 +225,7 @@ class BlockLayoutExecutor:
         
         # 执行数据节点放置和坐标计算管线
         self._run_data_placement_pipeline(context, block, flow_node_ids, scalars)
-        
-        # 更新调试信息
-        current_map = getattr(self.model, "_layout_y_debug_info", None)
-        if current_map is None:
-            current_map = {}
-            setattr(self.model, "_layout_y_debug_info", current_map)
-        for node_id, info in context.debug_y_info.items():
-            current_map[node_id] = info
+        return context.debug_y_info
 
     def _prepare_block_context_minimal(
         self,
@@ -450,6 +460,46 @@ class BlockIdentificationCoordinator:
         """
         self._layout_executor.layout_data_phase(block, block_data_nodes)
 
+    def export_region_block_spec(self, block: LayoutBlock, block_data_nodes: Set[str]) -> Optional[RegionBlockSpec]:
+        """导出阶段2在其他进程中重建块上下文所需的输入（并行事件区域布局使用）。"""
+        cached = self._layout_executor._block_context_cache.get(block.order_index)  # noqa: SLF001
+        if cached is None:
+            return None
+        return RegionBlockSpec(
+            order_index=block.order_index,
+            flow_node_ids=tuple(cached.flow_node_ids),
+            event_metadata=cached.event_metadata,
+            data_node_ids=tuple(sorted(block_data_nodes)),
+        )
+
+    def compute_block_data_phase_geometry(
+        self,
+        block: LayoutBlock,
+        block_data_nodes: Set[str],
+    ) -> RegionBlockGeometry:
+        """执行阶段2并以块几何的形式返回结果（调试信息由 apply_region_block_geometry 统一回填）。"""
+        debug_y_info = self._layout_executor.compute_data_phase(block, block_data_nodes)
+        return RegionBlockGeometry(
+            order_index=block.order_index,
+            data_nodes=list(block.data_nodes),
+            node_local_pos=dict(block.node_local_pos),
+            width=block.width,
+            height=block.height,
+            debug_y_info=dict(debug_y_info),
+        )
+
+    def apply_region_block_geometry(self, block: LayoutBlock, geometry: RegionBlockGeometry) -> None:
+        """回填块内布局结果（并行计算或区域缓存命中），与 layout_block_data_phase 的写入保持一致。"""
+        block.data_nodes = list(geometry.data_nodes)
+        block.node_local_pos = dict(geometry.node_local_pos)
+        block.width = geometry.width
+        block.height = geometry.height
+        current_map = getattr(self.model, "_layout_y_debug_info", None)
+        if current_map is None:
+            current_map = {}
+            setattr(self.model, "_layout_y_debug_info", current_map)
+        current_map.update(geometry.debug_y_info)
+
     def refresh_global_layout_context(self, global_layout_ctx: LayoutContext) -> None:
         """在全局复制阶段修改图之后，刷新后续阶段所使用的全局 LayoutContext。"""
         self.global_layout_ctx = global_layout_ctx
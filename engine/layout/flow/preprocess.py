@@ -56,7 +56,7 @@ def promote_flow_outputs_for_layout(model_copy: GraphModel, node_library: Dict[s
         # 同步修改所有引用该端口的边
         for edge in edges_by_src.get(node.id, ()):
             if edge.src_port in rename_map:
-                edge.src_port = rename_map[edge.src_port]
+                model_copy.update_edge_endpoints(edge, src_port=rename_map[edge.src_port])
 
         if node_rename_record:
             rename_records[node.id] = node_rename_record
@@ -14,7 +14,7 @@
 """
 
 from __future__ import annotations
-from typing import Dict, Set, List, Tuple, Optional
+from typing import Callable, Dict, Set, List, Tuple, Optional
 from collections import deque
 
 from engine.graph.models import GraphModel, NodeModel
@@ -47,6 +47,40 @@ from ..blocks.block_positioning_engine import BlockPositioningEngine
 from ..utils.position_applicator import PositionApplicator
 from ..blocks.block_identification_coordinator import BlockIdentificationCoordinator
 from .layout_models import LayoutBlock
+from .parallel_region_layout import (
+    RegionBlockGeometry,
+    RegionBlockSpec,
+    compute_region_block_geometries,
+    group_blocks_by_event_region,
+    resolve_region_worker_count,
+)
+from .region_layout_cache import (
+    RegionLayoutKey,
+    build_layout_environment_digest,
+    build_region_layout_key,
+    get_region_layout_cache,
+)
+
+
+# 布局阶段（进度回调在每个阶段开始前以阶段名调用；纯数据图不经过这些阶段）
+LAYOUT_STAGE_BLOCK_IDENTIFICATION = "block_identification"
+LAYOUT_STAGE_GLOBAL_COPY = "global_copy"
+LAYOUT_STAGE_DATA_PLACEMENT = "data_placement"
+LAYOUT_STAGE_BLOCK_TREE = "block_tree"
+LAYOUT_STAGES: Tuple[str, ...] = (
+    LAYOUT_STAGE_BLOCK_IDENTIFICATION,
+    LAYOUT_STAGE_GLOBAL_COPY,
+    LAYOUT_STAGE_DATA_PLACEMENT,
+    LAYOUT_STAGE_BLOCK_TREE,
+)
+LAYOUT_STAGE_LABELS: Dict[str, str] = {
+    LAYOUT_STAGE_BLOCK_IDENTIFICATION: "识别基本块",
+    LAYOUT_STAGE_GLOBAL_COPY: "跨块复制",
+    LAYOUT_STAGE_DATA_PLACEMENT: "放置数据节点",
+    LAYOUT_STAGE_BLOCK_TREE: "块间排版",
+}
+
+LayoutProgressCallback = Callable[[str], None]
 
 
 class LayoutOrchestrator:
@@ -94,8 +128,15 @@ class LayoutOrchestrator:
         self._coordinator: Optional[BlockIdentificationCoordinator] = None
         self._global_visited: Set[str] = set()
 
-    def execute_layout(self) -> None:
-        """执行完整的布局流程（新流程）"""
+    def execute_layout(self, progress_callback: Optional[LayoutProgressCallback] = None) -> None:
+        """执行完整的布局流程（新流程）
+
+        Args:
+            progress_callback: 可选；每个阶段开始前以阶段名（LAYOUT_STAGE_*）调用。
+                回调抛出的异常会中止布局（用于后台任务取消）。
+        """
+        report_stage = progress_callback or (lambda stage: None)
+
         # 步骤1：发现事件节点
         if not self._discover_event_nodes():
             # 纯数据图，使用专门布局
@@ -103,15 +144,19 @@ class LayoutOrchestrator:
             return
 
         # 步骤2：识别所有块的流程节点（不放置数据节点）
+        report_stage(LAYOUT_STAGE_BLOCK_IDENTIFICATION)
         self._identify_all_blocks_flow_only()
 
         # 步骤3：全局复制阶段
+        report_stage(LAYOUT_STAGE_GLOBAL_COPY)
         self._execute_global_copy()
 
         # 步骤4：为每个块放置数据节点并计算坐标
+        report_stage(LAYOUT_STAGE_DATA_PLACEMENT)
         self._place_all_blocks_data_nodes()
 
         # 步骤5：块间排版
+        report_stage(LAYOUT_STAGE_BLOCK_TREE)
         self._layout_block_tree_stage()
 
         # 步骤6：应用最终位置到节点
@@ -219,21 +264,86 @@ class LayoutOrchestrator:
             self._coordinator.refresh_global_layout_context(refreshed)
 
     def _place_all_blocks_data_nodes(self) -> None:
-        """为每个块放置数据节点并计算坐标（阶段2）"""
+        """为每个块放置数据节点并计算坐标（阶段2）
+
+        按事件区域处理：结构未变化的区域直接复用区域缓存中的块几何；
+        其余区域在启用并行且区域足够多时交给进程池，否则串行计算。
+        结果统一按块序号回填，与逐块串行执行的写入顺序一致。
+        """
         if self._coordinator is None:
             return
 
-        # 为每个块执行数据节点放置和坐标计算
+        region_cache = get_region_layout_cache()
+        environment_digest = ""
+        node_rank: Dict[str, int] = {}
+        if region_cache is not None:
+            node_rank = {node_id: rank for rank, node_id in enumerate(self.model.nodes)}
+            environment_digest = build_layout_environment_digest(
+                getattr(self.global_layout_context, "registry_context", None),
+                self.node_width,
+                self.node_height,
+                self.block_padding,
+            )
+
+        geometries: Dict[int, RegionBlockGeometry] = {}
+        pending: List[Tuple[List[RegionBlockSpec], Optional[RegionLayoutKey]]] = []
+        for region_blocks in group_blocks_by_event_region(self.layout_blocks):
+            specs: List[RegionBlockSpec] = []
+            for block in region_blocks:
+                block_data_nodes: Set[str] = set()
+                if self._global_copy_manager:
+                    block_data_nodes = self._global_copy_manager.get_block_data_nodes(f"block_{block.order_index}")
+                spec = self._coordinator.export_region_block_spec(block, block_data_nodes)
+                if spec is not None:
+                    specs.append(spec)
+            if not specs:
+                continue
+            region_key = (
+                build_region_layout_key(self.model, specs, environment_digest, node_rank) if region_cache else None
+            )
+            cached = region_cache.lookup(region_key, specs) if region_key is not None else None
+            if cached is not None:
+                geometries.update((geometry.order_index, geometry) for geometry in cached)
+                continue
+            pending.append((specs, region_key))
+
+        computed = self._compute_pending_region_geometries([specs for specs, _ in pending])
+        geometries.update(computed)
+        for specs, region_key in pending:
+            if region_key is not None:
+                region_cache.store(region_key, [computed[spec.order_index] for spec in specs])
+
         for block in self.layout_blocks:
-            block_id = f"block_{block.order_index}"
-            
-            # 获取该块应放置的数据节点
-            block_data_nodes: Set[str] = set()
-            if self._global_copy_manager:
-                block_data_nodes = self._global_copy_manager.get_block_data_nodes(block_id)
-            
-            # 执行阶段2：放置数据节点并计算坐标
-            self._coordinator.layout_block_data_phase(block, block_data_nodes)
+            geometry = geometries.get(block.order_index)
+            if geometry is not None:
+                self._coordinator.apply_region_block_geometry(block, geometry)
+
+    def _compute_pending_region_geometries(
+        self,
+        region_specs: List[List[RegionBlockSpec]],
+    ) -> Dict[int, RegionBlockGeometry]:
+        """计算未命中缓存的区域：区域足够多且启用并行时走进程池，否则在当前进程逐块计算。"""
+        worker_count = resolve_region_worker_count(len(region_specs))
+        if worker_count:
+            return compute_region_block_geometries(
+                self.model,
+                region_specs,
+                registry_context=getattr(self.global_layout_context, "registry_context", None),
+                node_width=self.node_width,
+                node_height=self.node_height,
+                block_padding=self.block_padding,
+                worker_count=worker_count,
+            )
+
+        block_by_index = {block.order_index: block for block in self.layout_blocks}
+        computed: Dict[int, RegionBlockGeometry] = {}
+        for specs in region_specs:
+            for spec in specs:
+                computed[spec.order_index] = self._coordinator.compute_block_data_phase_geometry(
+                    block_by_index[spec.order_index],
+                    set(spec.data_node_ids),
+                )
+        return computed
 
     def _build_event_metadata_lookup(self) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
         """预计算事件ID与标题映射，供块识别阶段复用。"""
@@ -382,7 +492,10 @@ class LayoutOrchestrator:
         return lookup
 
 
-def layout_by_event_regions(model: GraphModel) -> None:
+def layout_by_event_regions(
+    model: GraphModel,
+    progress_callback: Optional[LayoutProgressCallback] = None,
+) -> None:
     """
     基于基本块的多阶段布局（使用Orchestrator编排器）
     
@@ -396,6 +509,7 @@ def layout_by_event_regions(model: GraphModel) -> None:
     
     Args:
         model: 图模型，会被就地修改（节点位置和基本块）
+        progress_callback: 可选的阶段进度回调（见 LayoutOrchestrator.execute_layout）
     """
     if not model.nodes:
         return
@@ -403,6 +517,6 @@ def layout_by_event_regions(model: GraphModel) -> None:
     ensure_layout_registry_context_for_model(model)
 
     orchestrator = LayoutOrchestrator(model)
-    orchestrator.execute_layout()
+    orchestrator.execute_layout(progress_callback)
 
 
@@ -0,0 +1,377 @@
+"""
+自动排版后台任务（纯逻辑，无 UI）。
+
+在常驻 worker 进程中运行 `LayoutService.compute_layout`，避免大图排版阻塞 UI 主线程：
+- 宿主进程提交模型克隆（pickle 传输，保持节点/连线插入顺序）与当前 settings 快照；
+- worker 以 spawn 方式启动（不继承宿主的 Qt 状态），按工作区加载节点库后复用；
+  每个任务携带宿主侧的节点定义指纹，指纹变化（节点/复合节点定义被编辑）时 worker 重载节点库；
+- 每个布局阶段开始前回报进度，并检查任务是否已被取消或被更新的任务取代；
+- 结果以差异（LayoutDelta）返回：坐标、基本块、新增副本节点/连线、被移除的连线与副本节点，
+  由调用方通过 `apply_layout_delta` 增量合并，无需重建场景。
+
+取消语义：任务号单调递增，共享计数 `latest_job_id` 之前的任务一律视为已取消；
+提交新任务会取代所有旧任务（同一时刻只保留一个有效的排版任务）。
+"""
+
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import queue
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from engine.graph.models import BasicBlock, EdgeModel, GraphModel, NodeModel
+from .layout_algorithm import LayoutProgressCallback
+from .layout_service import LayoutService
+
+LAYOUT_JOB_PROGRESS = "progress"
+LAYOUT_JOB_FINISHED = "finished"
+LAYOUT_JOB_FAILED = "failed"
+LAYOUT_JOB_CANCELLED = "cancelled"
+
+
+class LayoutJobCancelled(Exception):
+    """后台排版任务已被取消或被更新的任务取代。"""
+
+
+@dataclass
+class LayoutDelta:
+    """一次排版相对输入模型的差异。
+
+    - positions: 排版后全部节点（含新增副本）的坐标
+    - added_nodes / added_edges: 排版新增的节点与连线（按排版结果中的插入顺序）
+    - removed_edge_ids: 排版中被移除的原有连线
+    - removed_copy_node_ids: 排版中被清理的原有数据节点副本（用户节点不会被删除）
+    """
+
+    positions: Dict[str, Tuple[float, float]]
+    basic_blocks: List[BasicBlock]
+    added_nodes: List[NodeModel] = field(default_factory=list)
+    added_edges: List[EdgeModel] = field(default_factory=list)
+    removed_edge_ids: List[str] = field(default_factory=list)
+    removed_copy_node_ids: List[str] = field(default_factory=list)
+    y_debug_info: Dict[str, dict] = field(default_factory=dict)
+
+
+@dataclass
+class LayoutDeltaChanges:
+    """`apply_layout_delta` 对模型做出的改动，供 UI 增量同步图形项。"""
+
+    added_node_ids: List[str] = field(default_factory=list)
+    removed_node_ids: List[str] = field(default_factory=list)
+    added_edge_ids: List[str] = field(default_factory=list)
+    removed_edge_ids: List[str] = field(default_factory=list)
+    moved_node_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class LayoutJobEvent:
+    """worker 回传的任务事件（kind 为 LAYOUT_JOB_* 之一）。"""
+
+    job_id: int
+    kind: str
+    stage: str = ""
+    delta: Optional[LayoutDelta] = None
+    error: str = ""
+
+
+@dataclass
+class _LayoutJobRequest:
+    job_id: int
+    model: GraphModel
+    workspace_path: str
+    settings_snapshot: Dict[str, Any]
+    use_node_library: bool
+    node_defs_fp: str = ""
+
+
+def compute_layout_delta(
+    model: GraphModel,
+    *,
+    node_library: Optional[Dict[str, Any]] = None,
+    workspace_path: Optional[Path] = None,
+    progress_callback: Optional[LayoutProgressCallback] = None,
+) -> LayoutDelta:
+    """在当前进程中排版 `model` 的克隆，并返回相对 `model` 的差异（不修改 `model`）。"""
+    result = LayoutService.compute_layout(
+        model,
+        node_library=node_library,
+        include_augmented_model=True,
+        workspace_path=workspace_path,
+        progress_callback=progress_callback,
+    )
+    augmented = result.augmented_model
+    positions = {node_id: (float(node.pos[0]), float(node.pos[1])) for node_id, node in augmented.nodes.items()}
+    delta = LayoutDelta(
+        positions=positions,
+        basic_blocks=list(result.basic_blocks or augmented.basic_blocks or []),
+        added_nodes=[node for node_id, node in augmented.nodes.items() if node_id not in model.nodes],
+        added_edges=[edge for edge_id, edge in augmented.edges.items() if edge_id not in model.edges],
+        removed_edge_ids=[edge_id for edge_id in model.edges if edge_id not in augmented.edges],
+        removed_copy_node_ids=[
+            node_id
+            for node_id, node in model.nodes.items()
+            if node_id not in augmented.nodes and getattr(node, "is_data_node_copy", False)
+        ],
+        y_debug_info=dict(getattr(augmented, "_layout_y_debug_info", None) or {}),
+    )
+    return delta
+
+
+def apply_layout_delta(model: GraphModel, delta: LayoutDelta) -> LayoutDeltaChanges:
+    """将排版差异合并到 `model`（新增副本 → 移除旧连线/副本 → 回填坐标与基本块）。"""
+    changes = LayoutDeltaChanges()
+    for node in delta.added_nodes:
+        if node.id not in model.nodes:
+            model.nodes[node.id] = node
+            changes.added_node_ids.append(node.id)
+    for edge in delta.added_edges:
+        if edge.id not in model.edges:
+            model.edges[edge.id] = edge
+            changes.added_edge_ids.append(edge.id)
+    for edge_id in delta.removed_edge_ids:
+        if model.remove_edge(edge_id) is not None:
+            changes.removed_edge_ids.append(edge_id)
+    for node_id in delta.removed_copy_node_ids:
+        node = model.nodes.get(node_id)
+        if node is None or not getattr(node, "is_data_node_copy", False):
+            continue
+        for edge in model.get_outgoing_edges(node_id) + model.get_incoming_edges(node_id):
+            if model.remove_edge(edge.id) is not None:
+                changes.removed_edge_ids.append(edge.id)
+        model.nodes.pop(node_id, None)
+        changes.removed_node_ids.append(node_id)
+
+    for node_id, position in delta.positions.items():
+        node = model.nodes.get(node_id)
+        if node is None:
+            continue
+        new_pos = (float(position[0]), float(position[1]))
+        if tuple(node.pos) != new_pos:
+            node.pos = new_pos
+            changes.moved_node_ids.append(node_id)
+    model.basic_blocks = list(delta.basic_blocks)
+    if delta.y_debug_info:
+        setattr(model, "_layout_y_debug_info", dict(delta.y_debug_info))
+    return changes
+
+
+# ============================================================================
+# worker 进程
+# ============================================================================
+
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _prepare_worker_workspace(
+    workspace_text: str,
+    use_node_library: bool,
+    node_defs_fp: str = "",
+) -> Optional[Dict[str, Any]]:
+    """对齐 worker 的 settings 工作区，并按需加载节点库（同一工作区、同一节点定义指纹内复用）。"""
+    from engine.configs.settings import settings
+    from engine.nodes.node_registry import get_node_registry
+
+    workspace = Path(workspace_text)
+    if _WORKER_STATE.get("workspace") != workspace:
+        settings.set_config_path(workspace)
+        settings.load()
+        _WORKER_STATE["workspace"] = workspace
+        _WORKER_STATE["node_library"] = None
+        _WORKER_STATE["node_defs_fp"] = node_defs_fp
+    if not use_node_library:
+        return None
+    registry = get_node_registry(workspace, include_composite=True)
+    if _WORKER_STATE.get("node_defs_fp") != node_defs_fp:
+        # 宿主侧节点定义已变化：丢弃 worker 中的旧节点库，避免按旧端口/变参信息排版
+        registry.refresh()
+        _WORKER_STATE["node_library"] = None
+        _WORKER_STATE["node_defs_fp"] = node_defs_fp
+    if _WORKER_STATE.get("node_library") is None:
+        _WORKER_STATE["node_library"] = registry.get_library()
+    return _WORKER_STATE["node_library"]
+
+
+def _run_layout_request(request: _LayoutJobRequest, event_queue: Any, latest_job_id: Any) -> LayoutJobEvent:
+    from engine.configs.settings import settings
+
+    def _check_and_report(stage: str) -> None:
+        if request.job_id < latest_job_id.value:
+            raise LayoutJobCancelled(stage)
+        event_queue.put(LayoutJobEvent(job_id=request.job_id, kind=LAYOUT_JOB_PROGRESS, stage=stage))
+
+    node_library = _prepare_worker_workspace(
+        request.workspace_path,
+        request.use_node_library,
+        request.node_defs_fp,
+    )
+    # 使用宿主进程提交时的 settings 快照，保证与同步排版的参数一致
+    for key, value in request.settings_snapshot.items():
+        setattr(settings, key, value)
+    delta = compute_layout_delta(
+        request.model,
+        node_library=node_library,
+        workspace_path=Path(request.workspace_path),
+        progress_callback=_check_and_report,
+    )
+    if request.job_id < latest_job_id.value:
+        raise LayoutJobCancelled("finished")
+    return LayoutJobEvent(job_id=request.job_id, kind=LAYOUT_JOB_FINISHED, delta=delta)
+
+
+def _layout_worker_main(request_queue: Any, event_queue: Any, latest_job_id: Any) -> None:
+    """worker 主循环：逐个处理请求，收到 None 时退出。"""
+    while True:
+        request = request_queue.get()
+        if request is None:
+            return
+        if request.job_id < latest_job_id.value:
+            event_queue.put(LayoutJobEvent(job_id=request.job_id, kind=LAYOUT_JOB_CANCELLED))
+            continue
+        try:
+            event = _run_layout_request(request, event_queue, latest_job_id)
+        except LayoutJobCancelled as cancelled:
+            event = LayoutJobEvent(job_id=request.job_id, kind=LAYOUT_JOB_CANCELLED, stage=str(cancelled))
+        except Exception:
+            # worker 常驻：单个任务失败需回传给宿主（否则宿主会一直等待），并继续处理后续任务
+            event = LayoutJobEvent(job_id=request.job_id, kind=LAYOUT_JOB_FAILED, error=traceback.format_exc())
+        event_queue.put(event)
+
+
+# ============================================================================
+# 宿主侧调度
+# ============================================================================
+
+
+class LayoutJobRunner:
+    """排版任务调度器：管理常驻 worker 进程、任务提交/取消与事件轮询（非阻塞）。"""
+
+    def __init__(self) -> None:
+        self._context = multiprocessing.get_context("spawn")
+        self._latest_job_id = self._context.Value("q", 0)
+        self._request_queue: Any = None
+        self._event_queue: Any = None
+        self._process: Any = None
+        self._next_job_id = 1
+        self._pending_job_ids: set[int] = set()
+        self._lock = Lock()
+
+    def _ensure_worker(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+        self._request_queue = self._context.Queue()
+        self._event_queue = self._context.Queue()
+        self._process = self._context.Process(
+            target=_layout_worker_main,
+            args=(self._request_queue, self._event_queue, self._latest_job_id),
+            name="layout-worker",
+            daemon=True,
+        )
+        self._process.start()
+
+    def submit(
+        self,
+        model: GraphModel,
+        *,
+        workspace_path: Path,
+        use_node_library: bool = True,
+    ) -> int:
+        """提交排版任务并返回任务号；之前提交的未完成任务会被取代。"""
+        from engine.configs.settings import settings
+        from engine.utils.graph.node_defs_fingerprint_service import get_node_defs_fingerprint
+
+        node_defs_fp = get_node_defs_fingerprint(Path(workspace_path)) if use_node_library else ""
+        with self._lock:
+            self._ensure_worker()
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self._latest_job_id.value = job_id
+            self._pending_job_ids.add(job_id)
+            self._request_queue.put(
+                _LayoutJobRequest(
+                    job_id=job_id,
+                    model=model.clone(),
+                    workspace_path=str(workspace_path),
+                    settings_snapshot=settings._get_all_settings(),
+                    use_node_library=bool(use_node_library),
+                    node_defs_fp=node_defs_fp,
+                )
+            )
+        return job_id
+
+    def cancel(self) -> None:
+        """取消所有已提交的任务（worker 在下一个阶段边界处停止）。"""
+        with self._lock:
+            self._latest_job_id.value = self._next_job_id
+
+    def is_current(self, job_id: int) -> bool:
+        """任务是否仍为最新且未被取消。"""
+        return job_id >= self._latest_job_id.value
+
+    def poll_events(self) -> List[LayoutJobEvent]:
+        """取出 worker 已回传的全部事件；worker 意外退出时为未完成任务补发失败事件。"""
+        events: List[LayoutJobEvent] = []
+        if self._event_queue is None:
+            return events
+        while True:
+            try:
+                event = self._event_queue.get_nowait()
+            except queue.Empty:
+                break
+            events.append(event)
+            if event.kind != LAYOUT_JOB_PROGRESS:
+                self._pending_job_ids.discard(event.job_id)
+        if self._pending_job_ids and not self._process.is_alive():
+            exit_code = self._process.exitcode
+            for job_id in sorted(self._pending_job_ids):
+                events.append(
+                    LayoutJobEvent(job_id=job_id, kind=LAYOUT_JOB_FAILED, error=f"排版进程意外退出（exitcode={exit_code}）")
+                )
+            self._pending_job_ids.clear()
+        return events
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._process is None:
+                return
+            self._latest_job_id.value = self._next_job_id
+            if self._process.is_alive():
+                self._request_queue.put(None)
+                self._process.join(timeout=2.0)
+                if self._process.is_alive():
+                    self._process.terminate()
+            self._process = None
+
+
+_SHARED_RUNNER: Optional[LayoutJobRunner] = None
+_SHARED_RUNNER_LOCK = Lock()
+
+
+def get_shared_layout_job_runner() -> LayoutJobRunner:
+    """进程内共享的排版任务调度器（首次提交任务时才启动 worker 进程）。"""
+    global _SHARED_RUNNER
+    with _SHARED_RUNNER_LOCK:
+        if _SHARED_RUNNER is None:
+            _SHARED_RUNNER = LayoutJobRunner()
+            atexit.register(_SHARED_RUNNER.shutdown)
+        return _SHARED_RUNNER
+
+
+__all__ = [
+    "LAYOUT_JOB_PROGRESS",
+    "LAYOUT_JOB_FINISHED",
+    "LAYOUT_JOB_FAILED",
+    "LAYOUT_JOB_CANCELLED",
+    "LayoutDelta",
+    "LayoutDeltaChanges",
+    "LayoutJobCancelled",
+    "LayoutJobEvent",
+    "LayoutJobRunner",
+    "apply_layout_delta",
+    "compute_layout_delta",
+    "get_shared_layout_job_runner",
+]
@@ -6,7 +6,7 @@ from typing import Dict, List, Tuple, Optional, Any, Set
 
 from engine.graph.models import GraphModel, BasicBlock
 from engine.configs.settings import settings
-from .layout_algorithm import layout_by_event_regions
+from .layout_algorithm import LayoutProgressCallback, layout_by_event_regions
 from .layout_context import LayoutContext
 from .layout_registry_context import LayoutRegistryContext, ensure_layout_registry_context_for_model
 from ..flow.preprocess import promote_flow_outputs_for_layout
@@ -46,6 +46,7 @@ class LayoutService:
         write_back_to_input_model: bool = False,
         workspace_path: Optional[Path] = None,
         registry_context: Optional[LayoutRegistryContext] = None,
+        progress_callback: Optional[LayoutProgressCallback] = None,
     ) -> LayoutResult:
         """
         Args:
@@ -56,6 +57,7 @@ class LayoutService:
             write_back_to_input_model: 当 clone_model=True 时，是否把结果回写到原始模型
             workspace_path: 工作区根目录（用于构建 LayoutRegistryContext）；未提供时要求 settings.set_config_path 已初始化
             registry_context: 显式注入的 LayoutRegistryContext（优先级最高）
+            progress_callback: 可选的阶段进度回调（阶段名见 layout_algorithm.LAYOUT_STAGES）
         """
         effective_registry_context = ensure_layout_registry_context_for_model(
             model,
@@ -71,7 +73,7 @@ class LayoutService:
         )
         collapse_duplicate_data_copies(working_model)
 
-        layout_by_event_regions(working_model)
+        layout_by_event_regions(working_model, progress_callback)
 
         # 可选的布局断言检查（仅在调试模式下启用）
         if getattr(settings, "DEBUG_LAYOUT_ASSERTIONS", False):
@@ -308,7 +310,7 @@ class LayoutService:
                 node._rebuild_port_maps()
                 for edge in edges_by_src.get(node_id, ()):
                     if edge.src_port in reverted:
-                        edge.src_port = reverted[edge.src_port]
+                        model.update_edge_endpoints(edge, src_port=reverted[edge.src_port])
 
     @staticmethod
     def _register_copy_override(
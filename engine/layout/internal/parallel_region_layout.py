@@ -0,0 +1,216 @@
+"""
+按事件区域并行的块内布局（纯逻辑，无 UI）。
+
+块识别与全局复制决定了块的编号、数据节点归属与副本，属于整图决策，仍在宿主进程串行完成；
+其后的“块内数据节点放置 + 块内坐标/尺寸计算”只依赖复制后的图结构与块自身的输入，
+各块之间互不影响，因此可以按事件区域分批交给进程池并发计算：
+- 宿主进程把复制后的模型克隆（pickle 传输）、布局所需的注册表派生索引与 settings 快照发给 worker；
+- 每个 worker 为分到的块重建块上下文并执行与串行完全相同的块内管线，回传块几何；
+- 宿主按块序号（order_index）回填几何与调试信息，随后照常串行执行块间排版（最终堆叠）。
+
+结果与串行模式逐字节一致（可用 `tools/verify_layout_equivalence.py --parallel-regions` 校验）。
+默认关闭，通过 settings.LAYOUT_PARALLEL_EVENT_REGIONS 启用。
+"""
+
+from __future__ import annotations
+
+import atexit
+import dataclasses
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from engine.configs.settings import settings
+from engine.graph.models import GraphModel
+
+from .layout_models import LayoutBlock
+from .layout_registry_context import LayoutRegistryContext
+
+
+EventMetadata = Optional[Tuple[Optional[str], Optional[str]]]
+
+
+@dataclass(frozen=True)
+class RegionBlockSpec:
+    """单个块在 worker 中重建块上下文所需的输入（与阶段1缓存的上下文参数一致）。"""
+
+    order_index: int
+    flow_node_ids: Tuple[str, ...]
+    event_metadata: EventMetadata
+    data_node_ids: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class RegionBlockGeometry:
+    """worker 回传的块内布局结果。"""
+
+    order_index: int
+    data_nodes: List[str]
+    node_local_pos: Dict[str, Tuple[float, float]]
+    width: float
+    height: float
+    debug_y_info: Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class _RegionLayoutPayload:
+    model: GraphModel
+    registry_context: Optional[LayoutRegistryContext]
+    settings_snapshot: Dict[str, Any]
+    node_width: float
+    node_height: float
+    block_padding: float
+
+
+def resolve_region_worker_count(region_count: int) -> int:
+    """根据设置与事件区域数量决定并行 worker 数；返回 0 表示走串行路径。"""
+    if not bool(getattr(settings, "LAYOUT_PARALLEL_EVENT_REGIONS", False)):
+        return 0
+    min_regions = max(2, int(getattr(settings, "LAYOUT_PARALLEL_MIN_EVENT_REGIONS", 8)))
+    if region_count < min_regions:
+        return 0
+    # 守护进程（例如后台排版 worker）不允许再创建子进程
+    if multiprocessing.current_process().daemon:
+        return 0
+    worker_count = int(getattr(settings, "LAYOUT_PARALLEL_WORKERS", 0)) or (os.cpu_count() or 1)
+    worker_count = min(worker_count, region_count)
+    return worker_count if worker_count >= 2 else 0
+
+
+def group_blocks_by_event_region(layout_blocks: Sequence[LayoutBlock]) -> List[List[LayoutBlock]]:
+    """按事件根节点把块分组（孤立块归为一组），组顺序与组内顺序均按块序号。"""
+    regions: Dict[Optional[str], List[LayoutBlock]] = {}
+    for block in sorted(layout_blocks, key=lambda item: item.order_index):
+        regions.setdefault(block.event_root_id, []).append(block)
+    return list(regions.values())
+
+
+def _split_into_batches(region_specs: List[List[RegionBlockSpec]], worker_count: int) -> List[List[RegionBlockSpec]]:
+    """按区域规模（流程+数据节点数）贪心装箱，使各 worker 的负载接近；结果与输入顺序一一确定。"""
+    def _region_cost(specs: List[RegionBlockSpec]) -> int:
+        return sum(len(spec.flow_node_ids) + len(spec.data_node_ids) for spec in specs)
+
+    batches: List[List[RegionBlockSpec]] = [[] for _ in range(worker_count)]
+    loads = [0] * worker_count
+    ordered = sorted(range(len(region_specs)), key=lambda index: (-_region_cost(region_specs[index]), index))
+    for region_index in ordered:
+        target = min(range(worker_count), key=lambda index: (loads[index], index))
+        batches[target].extend(region_specs[region_index])
+        loads[target] += _region_cost(region_specs[region_index])
+    return [batch for batch in batches if batch]
+
+
+def _layout_region_batch(payload_bytes: bytes, specs: Tuple[RegionBlockSpec, ...]) -> List[RegionBlockGeometry]:
+    """worker 入口：为一批块执行与串行一致的块内布局管线。"""
+    from ..blocks.block_identification_coordinator import BlockLayoutExecutor
+    from .layout_context import get_or_build_layout_context_for_model
+
+    payload: _RegionLayoutPayload = pickle.loads(payload_bytes)
+    # 使用宿主进程的 settings 快照，保证块内布局参数一致
+    for key, value in payload.settings_snapshot.items():
+        setattr(settings, key, value)
+
+    model = payload.model
+    layout_context = get_or_build_layout_context_for_model(model, registry_context=payload.registry_context)
+    executor = BlockLayoutExecutor(
+        model=model,
+        global_layout_ctx=layout_context,
+        node_width=payload.node_width,
+        node_height=payload.node_height,
+        block_padding=payload.block_padding,
+    )
+
+    results: List[RegionBlockGeometry] = []
+    for spec in specs:
+        block = executor.identify_flow_only(
+            list(spec.flow_node_ids),
+            spec.order_index,
+            event_metadata=spec.event_metadata,
+        )
+        block.order_index = spec.order_index
+        debug_y_info = executor.compute_data_phase(block, set(spec.data_node_ids))
+        results.append(
+            RegionBlockGeometry(
+                order_index=spec.order_index,
+                data_nodes=list(block.data_nodes),
+                node_local_pos=dict(block.node_local_pos),
+                width=block.width,
+                height=block.height,
+                debug_y_info=dict(debug_y_info),
+            )
+        )
+    return results
+
+
+_SHARED_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_SHARED_POOLS_LOCK = Lock()
+
+
+def _get_shared_pool(worker_count: int) -> ProcessPoolExecutor:
+    """按 worker 数复用进程池（spawn 启动，避免继承宿主的 Qt 状态），进程退出时统一关闭。"""
+    with _SHARED_POOLS_LOCK:
+        pool = _SHARED_POOLS.get(worker_count)
+        if pool is None:
+            if not _SHARED_POOLS:
+                atexit.register(shutdown_region_layout_pools)
+            pool = ProcessPoolExecutor(max_workers=worker_count, mp_context=multiprocessing.get_context("spawn"))
+            _SHARED_POOLS[worker_count] = pool
+        return pool
+
+
+def shutdown_region_layout_pools() -> None:
+    with _SHARED_POOLS_LOCK:
+        pools = list(_SHARED_POOLS.values())
+        _SHARED_POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def compute_region_block_geometries(
+    model: GraphModel,
+    region_specs: List[List[RegionBlockSpec]],
+    *,
+    registry_context: Optional[LayoutRegistryContext],
+    node_width: float,
+    node_height: float,
+    block_padding: float,
+    worker_count: int,
+) -> Dict[int, RegionBlockGeometry]:
+    """在进程池中并发计算各事件区域的块内布局，返回 order_index → 块几何。"""
+    transport_registry = (
+        dataclasses.replace(registry_context, node_registry=None) if registry_context is not None else None
+    )
+    payload_bytes = pickle.dumps(
+        _RegionLayoutPayload(
+            model=model.clone(),
+            registry_context=transport_registry,
+            settings_snapshot=settings._get_all_settings(),
+            node_width=node_width,
+            node_height=node_height,
+            block_padding=block_padding,
+        ),
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    batches = _split_into_batches(region_specs, worker_count)
+    pool = _get_shared_pool(worker_count)
+    futures = [pool.submit(_layout_region_batch, payload_bytes, tuple(batch)) for batch in batches]
+
+    geometries: Dict[int, RegionBlockGeometry] = {}
+    for future in futures:
+        for geometry in future.result():
+            geometries[geometry.order_index] = geometry
+    return geometries
+
+
+__all__ = [
+    "RegionBlockGeometry",
+    "RegionBlockSpec",
+    "compute_region_block_geometries",
+    "group_blocks_by_event_region",
+    "resolve_region_worker_count",
+    "shutdown_region_layout_pools",
+]
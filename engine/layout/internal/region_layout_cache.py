@@ -0,0 +1,272 @@
+"""
+按事件区域缓存块内布局结果（纯逻辑，无 UI）。
+
+背景：编辑-保存-重载时，通常只有一个事件处理器发生变化，但每次都会从头执行整图布局。
+块识别、跨块复制与块间排版（最终堆叠）都是整图决策，仍每次重新计算；
+块内数据节点放置与块内坐标/尺寸计算只依赖区域自身的子图，可按区域复用：
+- 以“区域结构哈希”作为键：区域内节点（标题/类别/端口/常量等）、关联连线、块划分与数据节点归属，
+  再叠加布局相关 settings 与注册表派生索引；
+- 节点 ID 在每次解析时都会重新生成，因此哈希与缓存内容均使用“规范标签”而非节点 ID：
+  普通节点按其在 model.nodes 中的相对顺序编号，副本节点由“原始节点标签 + 区域内块序”派生；
+- 命中时把缓存的块几何与调试信息从标签翻译回当前节点 ID，并改写为当前块序号。
+
+含有“原始节点位于其他区域的副本”的区域无法得到稳定标签，不参与缓存（每次重新计算）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from engine.configs.settings import settings
+from engine.graph.models import GraphModel
+
+from ..utils.copy_identity_utils import is_data_node_copy, resolve_canonical_original_id, resolve_copy_block_id
+from .layout_registry_context import LayoutRegistryContext
+from .parallel_region_layout import RegionBlockGeometry, RegionBlockSpec
+
+
+# 不影响布局结果的设置（并行开关与缓存自身的参数），不计入环境摘要
+_NON_LAYOUT_SETTING_PREFIXES = ("LAYOUT_PARALLEL_", "LAYOUT_REGION_CACHE_", "LAYOUT_DEBUG_PRINT")
+
+
+@dataclass(frozen=True)
+class RegionLayoutKey:
+    """区域缓存键：结构摘要 + 当前节点 ID 与规范标签之间的双向映射。"""
+
+    digest: str
+    label_by_node_id: Dict[str, str]
+    node_id_by_label: Dict[str, str]
+
+
+@dataclass(frozen=True)
+class _CachedBlockGeometry:
+    data_nodes: Tuple[str, ...]
+    node_local_pos: Tuple[Tuple[str, Tuple[float, float]], ...]
+    width: float
+    height: float
+    debug_y_info: Tuple[Tuple[str, Any], ...]
+
+
+def build_layout_environment_digest(
+    registry_context: Optional[LayoutRegistryContext],
+    node_width: float,
+    node_height: float,
+    block_padding: float,
+) -> str:
+    """布局环境摘要：布局相关 settings、注册表派生索引与块内布局尺寸参数。"""
+    layout_settings = sorted(
+        (key, repr(value))
+        for key, value in settings._get_all_settings().items()
+        if (key.startswith("LAYOUT_") or key.startswith("DATA_NODE_"))
+        and not key.startswith(_NON_LAYOUT_SETTING_PREFIXES)
+    )
+    registry_payload: Tuple[Any, ...] = ()
+    if registry_context is not None:
+        registry_payload = (
+            sorted((name, sorted(ports)) for name, ports in registry_context.entity_inputs_by_name.items()),
+            sorted(registry_context.variadic_min_args.items()),
+        )
+    payload = repr((layout_settings, registry_payload, float(node_width), float(node_height), float(block_padding)))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def build_region_layout_key(
+    model: GraphModel,
+    specs: List[RegionBlockSpec],
+    environment_digest: str,
+    node_rank: Dict[str, int],
+) -> Optional[RegionLayoutKey]:
+    """为一个事件区域构建缓存键；区域无法得到稳定标签时返回 None。
+
+    Args:
+        node_rank: 节点 ID → 在 model.nodes 中的序号（整图只需计算一次）
+    """
+    block_position_by_id = {f"block_{spec.order_index}": position for position, spec in enumerate(specs)}
+    region_node_ids = set()
+    for spec in specs:
+        region_node_ids.update(spec.flow_node_ids)
+        region_node_ids.update(spec.data_node_ids)
+    if any(node_id not in node_rank for node_id in region_node_ids):
+        return None
+
+    label_by_node_id: Dict[str, str] = {}
+    copy_node_ids: List[str] = []
+    for node_id in sorted(region_node_ids, key=node_rank.__getitem__):
+        node = model.nodes[node_id]
+        if is_data_node_copy(node):
+            copy_node_ids.append(node_id)
+            continue
+        label_by_node_id[node_id] = f"#n{len(label_by_node_id)}"
+    for node_id in copy_node_ids:
+        original_label = label_by_node_id.get(resolve_canonical_original_id(node_id, model=model))
+        block_position = block_position_by_id.get(resolve_copy_block_id(model.nodes[node_id]))
+        if original_label is None or block_position is None:
+            return None
+        label_by_node_id[node_id] = f"{original_label}@{block_position}"
+    if len(label_by_node_id) != len(region_node_ids):
+        return None
+
+    def _label(node_id: str) -> str:
+        label = label_by_node_id.get(node_id)
+        if label is not None:
+            return label
+        external = model.nodes.get(node_id)
+        return f"#x:{getattr(external, 'title', '')}"
+
+    blocks_payload = []
+    for position, spec in enumerate(specs):
+        event_id, event_title = spec.event_metadata or (None, None)
+        blocks_payload.append(
+            (
+                position,
+                [_label(node_id) for node_id in spec.flow_node_ids],
+                (_label(event_id) if event_id else None, event_title),
+                sorted(_label(node_id) for node_id in spec.data_node_ids),
+            )
+        )
+
+    source_lines = sorted({model.nodes[node_id].source_lineno for node_id in label_by_node_id})
+    source_rank = {lineno: rank for rank, lineno in enumerate(source_lines)}
+    nodes_payload = []
+    edge_keys = set()
+    for node_id, label in label_by_node_id.items():
+        node = model.nodes[node_id]
+        nodes_payload.append(
+            (
+                label,
+                node.title,
+                node.category,
+                [port.name for port in node.inputs],
+                [port.name for port in node.outputs],
+                sorted((str(name), repr(value)) for name, value in (node.input_constants or {}).items()),
+                node.composite_id,
+                (node.is_virtual_pin, node.virtual_pin_index, node.virtual_pin_type, node.is_virtual_pin_input),
+                sorted((node.custom_var_names or {}).items()),
+                source_rank[node.source_lineno],
+            )
+        )
+        for edge in model.get_outgoing_edges(node_id) + model.get_incoming_edges(node_id):
+            edge_keys.add((_label(edge.src_node), edge.src_port, _label(edge.dst_node), edge.dst_port))
+
+    payload = repr((environment_digest, blocks_payload, sorted(nodes_payload), sorted(edge_keys)))
+    node_id_by_label = {label: node_id for node_id, label in label_by_node_id.items()}
+    return RegionLayoutKey(
+        digest=hashlib.sha1(payload.encode("utf-8")).hexdigest(),
+        label_by_node_id=label_by_node_id,
+        node_id_by_label=node_id_by_label,
+    )
+
+
+def _translate(value: Any, mapping: Dict[str, str]) -> Any:
+    """把调试信息中的节点 ID 字符串按映射替换（递归处理 dict/list/tuple）。"""
+    if isinstance(value, str):
+        return mapping.get(value, value)
+    if isinstance(value, dict):
+        return {mapping.get(key, key) if isinstance(key, str) else key: _translate(item, mapping) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_translate(item, mapping) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_translate(item, mapping) for item in value)
+    return value
+
+
+class RegionLayoutCache:
+    """进程内 LRU：区域结构摘要 → 区域内各块的几何（规范标签空间）。"""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, Tuple[_CachedBlockGeometry, ...]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: RegionLayoutKey, specs: List[RegionBlockSpec]) -> Optional[List[RegionBlockGeometry]]:
+        """命中时返回已翻译为当前节点 ID 与块序号的块几何。"""
+        with self._lock:
+            cached = self._entries.get(key.digest)
+            if cached is None or len(cached) != len(specs):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key.digest)
+            self.hits += 1
+
+        mapping = key.node_id_by_label
+        geometries: List[RegionBlockGeometry] = []
+        for spec, entry in zip(specs, cached):
+            debug_y_info: Dict[str, Any] = {}
+            for label, info in entry.debug_y_info:
+                translated = _translate(info, mapping)
+                if isinstance(translated, dict) and "block_index" in translated:
+                    translated["block_index"] = spec.order_index
+                    translated["block_id"] = f"block_{spec.order_index}"
+                debug_y_info[mapping[label]] = translated
+            geometries.append(
+                RegionBlockGeometry(
+                    order_index=spec.order_index,
+                    data_nodes=[mapping[label] for label in entry.data_nodes],
+                    node_local_pos={mapping[label]: pos for label, pos in entry.node_local_pos},
+                    width=entry.width,
+                    height=entry.height,
+                    debug_y_info=debug_y_info,
+                )
+            )
+        return geometries
+
+    def store(self, key: RegionLayoutKey, geometries: List[RegionBlockGeometry]) -> None:
+        mapping = key.label_by_node_id
+        for geometry in geometries:
+            touched = set(geometry.data_nodes) | set(geometry.node_local_pos) | set(geometry.debug_y_info)
+            if not touched.issubset(mapping):
+                # 块几何引用了区域外节点，无法在标签空间中复用
+                return
+        entry = tuple(
+            _CachedBlockGeometry(
+                data_nodes=tuple(mapping[node_id] for node_id in geometry.data_nodes),
+                node_local_pos=tuple((mapping[node_id], pos) for node_id, pos in geometry.node_local_pos.items()),
+                width=geometry.width,
+                height=geometry.height,
+                debug_y_info=tuple(
+                    (mapping[node_id], _translate(info, mapping)) for node_id, info in geometry.debug_y_info.items()
+                ),
+            )
+            for geometry in geometries
+        )
+        with self._lock:
+            self._entries[key.digest] = entry
+            self._entries.move_to_end(key.digest)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_SHARED_CACHE: Optional[RegionLayoutCache] = None
+_SHARED_CACHE_LOCK = Lock()
+
+
+def get_region_layout_cache() -> Optional[RegionLayoutCache]:
+    """进程内共享的区域布局缓存；settings.LAYOUT_REGION_CACHE_ENABLED 关闭时返回 None。"""
+    global _SHARED_CACHE
+    if not bool(getattr(settings, "LAYOUT_REGION_CACHE_ENABLED", True)):
+        return None
+    with _SHARED_CACHE_LOCK:
+        if _SHARED_CACHE is None:
+            _SHARED_CACHE = RegionLayoutCache(int(getattr(settings, "LAYOUT_REGION_CACHE_MAX_ENTRIES", 512)))
+        return _SHARED_CACHE
+
+
+__all__ = [
+    "RegionLayoutCache",
+    "RegionLayoutKey",
+    "build_layout_environment_digest",
+    "build_region_layout_key",
+    "get_region_layout_cache",
+]
@@ -731,8 +731,11 @@ class GlobalCopyManager:
             edge = self.model.edges.get(mutation.edge_id)
             if edge is None:
                 continue
-            edge.src_node = mutation.new_src_node
-            edge.dst_node = mutation.new_dst_node
+            self.model.update_edge_endpoints(
+                edge,
+                src_node=mutation.new_src_node,
+                dst_node=mutation.new_dst_node,
+            )
 
     def _ensure_new_edges(self, new_edges: Iterable[NewEdgeSpec]) -> None:
         """新增副本输入边（若同构边已存在则跳过）。"""
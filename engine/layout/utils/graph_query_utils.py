@@ -88,9 +88,7 @@ def _resolve_data_in_edges_fetcher(
         if not dst_node:
             return []
         edges: List = []
-        for edge in model.edges.values():
-            if edge.dst_node != node_id:
-                continue
+        for edge in model.get_incoming_edges(node_id):
             dst_port = dst_node.get_input_port(edge.dst_port)
             if dst_port and not is_flow_port_name(dst_port.name):
                 edges.append(edge)
@@ -597,8 +595,8 @@ def estimate_node_height_ui_exact_for_model(
         return NODE_HEIGHT_DEFAULT
 
     connected_input_ports: Set[str] = set()
-    for edge in model.edges.values():
-        if edge.dst_node == node_obj.id and edge.dst_port:
+    for edge in model.get_incoming_edges(node_obj.id):
+        if edge.dst_port:
             connected_input_ports.add(str(edge.dst_port))
 
     return _estimate_node_height_from_structure(node_obj, connected_input_ports, registry_context=registry_context)
@@ -768,8 +766,8 @@ def is_jump_out_edge(model: GraphModel, src_node_id: str, dst_node_id: str) -> b
     dst_node_obj = model.nodes.get(dst_node_id)
     if not dst_node_obj:
         return False
-    for edge in model.edges.values():
-        if edge.src_node == src_node_id and edge.dst_node == dst_node_id:
+    for edge in model.get_outgoing_edges(src_node_id):
+        if edge.dst_node == dst_node_id:
             dst_port_obj = dst_node_obj.get_input_port(edge.dst_port)
             if dst_port_obj and dst_port_obj.name == PORT_EXIT_LOOP:
                 return True
@@ -800,8 +798,8 @@ def count_outgoing_data_edges(
     if data_out_index is not None:
         edges_to_check = data_out_index.get(data_node_id, [])
     else:
-        # 回退到全图扫描
-        edges_to_check = [edge for edge in model.edges.values() if edge.src_node == data_node_id]
+        # 回退到模型自带的邻接索引
+        edges_to_check = model.get_outgoing_edges(data_node_id)
 
     count = 0
     for edge in edges_to_check:
@@ -101,9 +101,8 @@ def remove_data_nodes(
             for edge in data_out_index.get(node_id, []):
                 edges_to_purge.append(edge.id)
         if data_in_index is None or data_out_index is None:
-            for edge in model.edges.values():
-                if edge.src_node == node_id or edge.dst_node == node_id:
-                    edges_to_purge.append(edge.id)
+            for edge in model.get_outgoing_edges(node_id) + model.get_incoming_edges(node_id):
+                edges_to_purge.append(edge.id)
 
     for edge_id in set(edges_to_purge):
         edge = model.edges.pop(edge_id, None)
@@ -177,10 +176,12 @@ def collapse_duplicate_data_copies(model: GraphModel) -> int:
 def _redirect_edges_to_canonical(model: GraphModel, source_id: str, canonical_id: str) -> None:
     """将指向 source_id 的边重定向到 canonical_id"""
     for edge in model.edges.values():
-        if edge.src_node == source_id:
-            edge.src_node = canonical_id
-        if edge.dst_node == source_id:
-            edge.dst_node = canonical_id
+        if edge.src_node == source_id or edge.dst_node == source_id:
+            model.update_edge_endpoints(
+                edge,
+                src_node=canonical_id if edge.src_node == source_id else None,
+                dst_node=canonical_id if edge.dst_node == source_id else None,
+            )
 
 
 def _dedupe_edges(model: GraphModel, edge_indices: Optional[dict] = None) -> None:
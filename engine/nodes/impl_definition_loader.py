@@ -6,7 +6,8 @@ from typing import Dict, List, Any
 from .node_definition_loader import NodeDef
 from engine.utils.logging.logger import log_info
 from engine.configs.settings import settings
-from .pipeline.runner import run_pipeline
+from .pipeline.runner import run_cached_pipeline
+from engine.utils.cache.cache_paths import get_node_cache_dir
 
 
 def load_all_nodes_from_impl(workspace_path: Path, include_composite: bool = True, verbose: bool = False) -> Dict[str, NodeDef]:
@@ -21,8 +22,8 @@ def load_all_nodes_from_impl(workspace_path: Path, include_composite: bool = Tru
     # 规范工作区路径为绝对路径，避免 Windows 下相对路径导致 relative_to 失败
     workspace_root = workspace_path.resolve()
 
-    # V2 管线（唯一实现）：只解析不导入
-    index = run_pipeline(workspace_root)
+    # V2 管线（唯一实现）：只解析不导入；逐文件 AST 提取结果按内容哈希复用
+    index = run_cached_pipeline(workspace_root, get_node_cache_dir(workspace_root))
     by_key: Dict[str, Any] = index.get("by_key", {}) if isinstance(index, dict) else {}
     alias_to_key: Dict[str, str] = index.get("alias_to_key", {}) if isinstance(index, dict) else {}
 
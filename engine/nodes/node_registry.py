@@ -8,10 +8,15 @@ import threading
 
 from .node_definition_loader import load_all_nodes, NodeDef
 from .port_type_system import BOOLEAN_TYPE_KEYWORDS
-from .pipeline.runner import run_pipeline
+from .pipeline.runner import run_cached_pipeline
 from .pipeline.node_library import NodeLibrary
+from .pipeline.spec_cache import (
+    NODE_INDEX_CACHE_FILENAME,
+    load_persistent_node_index,
+    save_persistent_node_index,
+)
 from engine.utils.logging.logger import log_info
-from engine.utils.graph.node_defs_fingerprint import compute_node_defs_fingerprint
+from engine.utils.graph.node_defs_fingerprint_service import get_node_defs_fingerprint
 from engine.utils.cache.cache_paths import get_node_cache_dir
 
 
@@ -102,14 +107,25 @@ class NodeRegistry:
         """
         if self._index_cache is not None and self._node_library_view is not None:
             return
-        # 以工作区为根运行管线（只解析不导入）
+        # 先尝试与 node_library.json 同指纹的索引快照：命中时无需解析任何实现文件
+        cache_file = self._get_node_cache_dir() / NODE_INDEX_CACHE_FILENAME
+        node_defs_fp = self._compute_node_defs_fingerprint()
+        persisted = load_persistent_node_index(cache_file, node_defs_fp)
+        if persisted is not None:
+            index, derived = persisted
+            self._index_cache = index
+            self._node_library_view = NodeLibrary(index=index, derived=derived)
+            return
+        # 以工作区为根运行管线（只解析不导入；逐文件 AST 提取结果按内容哈希复用）
         workspace_root = self.workspace_path.resolve()
-        index = run_pipeline(workspace_root)
+        index = run_cached_pipeline(workspace_root, self._get_node_cache_dir())
         # 最小保障：index 结构必须是 dict
         if not isinstance(index, dict):
             raise TypeError("节点索引构建失败：pipe 产物不是字典")
         self._index_cache = index
         self._node_library_view = NodeLibrary(index=index)
+        log_info("[缓存][节点索引] 写入索引快照：{}（{} 项）", cache_file, len(index.get("by_key", {})))
+        save_persistent_node_index(cache_file, node_defs_fp, index, self._node_library_view.export_derived())
 
     # ------------------------ 持久化缓存 ------------------------
     def _get_node_cache_dir(self) -> Path:
@@ -125,7 +141,7 @@ class NodeRegistry:
         - 图解析/生成核心：`engine/graph/`
         - 复合节点库：`assets/资源库/复合节点库/`
         """
-        return compute_node_defs_fingerprint(self.workspace_path)
+        return get_node_defs_fingerprint(self.workspace_path)
 
     def _load_persistent_node_library(self) -> Optional[Dict[str, NodeDef]]:
         """从磁盘持久化缓存加载节点库（命中且指纹一致时返回）。"""
@@ -1,80 +1,153 @@
 from __future__ import annotations
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Any
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 import ast
 
 from .types import ExtractedSpec
 
+if TYPE_CHECKING:
+    from .spec_cache import ExtractedSpecCache
 
-def extract_specs(file_paths: List[Path]) -> List[ExtractedSpec]:
+
+# 未命中缓存的文件数达到该值时才值得启动进程池（spawn 启动本身约数百毫秒）
+PARALLEL_EXTRACT_MIN_FILES = 64
+
+
+def _to_literal(node: ast.AST) -> Any:
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.List):
+        return [_to_literal(e) for e in node.elts]
+    if isinstance(node, ast.Tuple):
+        return tuple(_to_literal(e) for e in node.elts)
+    if isinstance(node, ast.Dict):
+        return { _to_literal(k): _to_literal(v) for k, v in zip(node.keys, node.values) }
+    return None
+
+
+def extract_file_specs(file_path: Path, source: str) -> List[ExtractedSpec]:
+    """从单个实现文件的源码中提取 @node_spec 规范（不导入模块）。"""
+    tree = ast.parse(source, filename=str(file_path))
+    extracted: List[ExtractedSpec] = []
+
+    for fn in [n for n in tree.body if isinstance(n, ast.FunctionDef)]:
+        has_node_spec = False
+        spec_kwargs: Dict[str, Any] = {}
+        for dec in fn.decorator_list:
+            # 仅提取 @node_spec(...) 装饰的函数参数
+            if isinstance(dec, ast.Call):
+                callee = dec.func
+                if isinstance(callee, ast.Name) and callee.id == "node_spec":
+                    has_node_spec = True
+                    for kw in dec.keywords:
+                        spec_kwargs[kw.arg] = _to_literal(kw.value)
+                    break
+        # 没有 @node_spec(...) 则跳过；有装饰器但缺字段由后续 normalizer/validator 阻断式报错
+        if not has_node_spec:
+            continue
+
+        spec = ExtractedSpec(
+            file_path=file_path,
+            function_name=str(fn.name or ""),
+            name=spec_kwargs.get("name"),
+            category=spec_kwargs.get("category"),
+            inputs=spec_kwargs.get("inputs") or [],
+            outputs=spec_kwargs.get("outputs") or [],
+            description=spec_kwargs.get("description") or "",
+            mount_restrictions=list(spec_kwargs.get("mount_restrictions") or []),
+            doc_reference=spec_kwargs.get("doc_reference") or "",
+            dynamic_port_type=spec_kwargs.get("dynamic_port_type") or "",
+            scopes=list(spec_kwargs.get("scopes") or []),
+            aliases=list(spec_kwargs.get("aliases") or []),
+            input_generic_constraints=dict(spec_kwargs.get("input_generic_constraints") or {}),
+            output_generic_constraints=dict(spec_kwargs.get("output_generic_constraints") or {}),
+            input_enum_options=dict(spec_kwargs.get("input_enum_options") or {}),
+            output_enum_options=dict(spec_kwargs.get("output_enum_options") or {}),
+        )
+        extracted.append(spec)
+
+    return extracted
+
+
+def _extract_file_in_worker(file_path_text: str, source: str) -> List[ExtractedSpec]:
+    return extract_file_specs(Path(file_path_text), source)
+
+
+def _resolve_extract_workers(workers: Optional[int], pending_count: int) -> int:
+    """返回进程池 worker 数；0 表示串行。"""
+    if pending_count < PARALLEL_EXTRACT_MIN_FILES:
+        return 0
+    # 已处于子进程中（例如校验/回环/区域排版进程池的 worker）时不再嵌套进程池，
+    # 否则 N 个 worker 冷启动时会各自再拉起 cpu_count 个进程。
+    # ProcessPoolExecutor 的 worker 并非 daemon 进程，因此按 parent_process() 判断。
+    if multiprocessing.parent_process() is not None:
+        return 0
+    worker_count = min(int(workers or 0), pending_count)
+    return worker_count if worker_count > 1 else 0
+
+
+def extract_specs(
+    file_paths: List[Path],
+    *,
+    spec_cache: Optional["ExtractedSpecCache"] = None,
+    workers: Optional[int] = None,
+) -> List[ExtractedSpec]:
     """
     基于 AST 的节点规范提取。
-    
+
     约定：
     - 输入为待分析的实现文件路径
     - 输出为规范化前的“原始提取项”列表（后续由 normalizer/validator 处理）
     - 不导入模块本身，避免导入副作用
+    - 提供 spec_cache 时按“文件路径 + 内容哈希”复用上次的提取结果，只解析变更过的文件；
+    - workers > 1 且待解析文件较多时分片到进程池并行解析（默认串行）
+    - 输出顺序始终为“文件顺序 + 文件内函数顺序”，与是否命中缓存/是否并行无关
     """
     for p in file_paths:
         if not isinstance(p, Path):
             raise TypeError("file_paths 列表元素必须是 pathlib.Path 实例")
 
-    def _to_literal(node: ast.AST) -> Any:
-        if isinstance(node, ast.Constant):
-            return node.value
-        if isinstance(node, ast.List):
-            return [_to_literal(e) for e in node.elts]
-        if isinstance(node, ast.Tuple):
-            return tuple(_to_literal(e) for e in node.elts)
-        if isinstance(node, ast.Dict):
-            return { _to_literal(k): _to_literal(v) for k, v in zip(node.keys, node.values) }
-        return None
-
-    extracted: List[ExtractedSpec] = []
-
-    for file_path in file_paths:
+    per_file: List[Optional[List[ExtractedSpec]]] = []
+    sources: Dict[int, str] = {}
+    pending: List[int] = []
+    for position, file_path in enumerate(file_paths):
         if not file_path.exists():
+            per_file.append([])
             continue
         source = file_path.read_text(encoding="utf-8")
-        tree = ast.parse(source, filename=str(file_path))
-
-        for fn in [n for n in tree.body if isinstance(n, ast.FunctionDef)]:
-            has_node_spec = False
-            spec_kwargs: Dict[str, Any] = {}
-            for dec in fn.decorator_list:
-                # 仅提取 @node_spec(...) 装饰的函数参数
-                if isinstance(dec, ast.Call):
-                    callee = dec.func
-                    if isinstance(callee, ast.Name) and callee.id == "node_spec":
-                        has_node_spec = True
-                        for kw in dec.keywords:
-                            spec_kwargs[kw.arg] = _to_literal(kw.value)
-                        break
-            # 没有 @node_spec(...) 则跳过；有装饰器但缺字段由后续 normalizer/validator 阻断式报错
-            if not has_node_spec:
-                continue
-
-            spec = ExtractedSpec(
-                file_path=file_path,
-                function_name=str(fn.name or ""),
-                name=spec_kwargs.get("name"),
-                category=spec_kwargs.get("category"),
-                inputs=spec_kwargs.get("inputs") or [],
-                outputs=spec_kwargs.get("outputs") or [],
-                description=spec_kwargs.get("description") or "",
-                mount_restrictions=list(spec_kwargs.get("mount_restrictions") or []),
-                doc_reference=spec_kwargs.get("doc_reference") or "",
-                dynamic_port_type=spec_kwargs.get("dynamic_port_type") or "",
-                scopes=list(spec_kwargs.get("scopes") or []),
-                aliases=list(spec_kwargs.get("aliases") or []),
-                input_generic_constraints=dict(spec_kwargs.get("input_generic_constraints") or {}),
-                output_generic_constraints=dict(spec_kwargs.get("output_generic_constraints") or {}),
-                input_enum_options=dict(spec_kwargs.get("input_enum_options") or {}),
-                output_enum_options=dict(spec_kwargs.get("output_enum_options") or {}),
-            )
-            extracted.append(spec)
+        cached = spec_cache.get(file_path, source) if spec_cache is not None else None
+        per_file.append(cached)
+        if cached is None:
+            sources[position] = source
+            pending.append(position)
 
-    return extracted
+    worker_count = _resolve_extract_workers(workers, len(pending))
+    if worker_count > 0:
+        chunk_size = max(1, len(pending) // (worker_count * 4))
+        with ProcessPoolExecutor(
+            max_workers=worker_count,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            parsed = list(
+                executor.map(
+                    _extract_file_in_worker,
+                    [str(file_paths[position]) for position in pending],
+                    [sources[position] for position in pending],
+                    chunksize=chunk_size,
+                )
+            )
+    else:
+        parsed = [extract_file_specs(file_paths[position], sources[position]) for position in pending]
 
+    for position, specs in zip(pending, parsed):
+        per_file[position] = specs
+        if spec_cache is not None:
+            spec_cache.put(file_paths[position], sources[position], specs)
 
+    extracted: List[ExtractedSpec] = []
+    for specs in per_file:
+        extracted.extend(specs or [])
+    return extracted
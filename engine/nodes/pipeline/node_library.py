@@ -25,13 +25,18 @@ class NodeLibrary:
     - 本类不做异常包装，遵循阻断式错误策略
     """
 
-    def __init__(self, index: Dict[str, Any]) -> None:
+    def __init__(self, index: Dict[str, Any], derived: Optional[Dict[str, Any]] = None) -> None:
         if not isinstance(index, dict):
             raise TypeError("index 必须是字典")
         self._index: Dict[str, Any] = index
         self._derived_flow_names: Optional[Set[str]] = None
         self._derived_boolean_names: Optional[Set[str]] = None
         self._derived_variadic_min_args: Optional[Dict[str, int]] = None
+        # 可选：从持久化快照恢复的派生集合（结构同 export_derived 的返回值）
+        if derived:
+            self._derived_flow_names = set(derived.get("flow_node_names") or [])
+            self._derived_boolean_names = set(derived.get("boolean_node_names") or [])
+            self._derived_variadic_min_args = dict(derived.get("variadic_min_args") or {})
 
     def get_by_key(self, key: str) -> Optional[Dict[str, Any]]:
         """按标准键 `类别/名称` 获取节点定义。"""
@@ -131,4 +136,10 @@ class NodeLibrary:
         self._derived_variadic_min_args = rules
         return rules
 
-
+    def export_derived(self) -> Dict[str, Any]:
+        """导出派生集合（可序列化的纯 list/dict），用于与索引一并持久化。"""
+        return {
+            "flow_node_names": sorted(self.get_flow_node_names()),
+            "boolean_node_names": sorted(self.get_boolean_node_names()),
+            "variadic_min_args": dict(self.get_variadic_min_args()),
+        }
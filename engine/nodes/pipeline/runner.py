@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from .discovery import discover_implementation_files
 from .extractor_ast import extract_specs
@@ -9,9 +10,15 @@ from .normalizer import normalize_specs
 from .validator import validate_specs
 from .merger import merge_specs
 from .indexer import build_index
+from .spec_cache import ExtractedSpecCache, SPEC_CACHE_FILENAME
 
 
-def run_pipeline(workspace_path: Path) -> Dict[str, Any]:
+def run_pipeline(
+    workspace_path: Path,
+    *,
+    spec_cache: Optional[ExtractedSpecCache] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     运行 V2 节点解析管线，返回索引结构：
     {
@@ -25,7 +32,7 @@ def run_pipeline(workspace_path: Path) -> Dict[str, Any]:
     # 1) 发现实现文件
     files = discover_implementation_files(workspace_path)
     # 2) AST 提取（不导入模块）
-    extracted = extract_specs(files)
+    extracted = extract_specs(files, spec_cache=spec_cache, workers=workers)
     # 3) 标准化
     normalized = normalize_specs(extracted)
     # 4) 校验（阻断式）
@@ -37,4 +44,12 @@ def run_pipeline(workspace_path: Path) -> Dict[str, Any]:
     return index
 
 
-
+def run_cached_pipeline(workspace_path: Path, cache_dir: Path) -> Dict[str, Any]:
+    """
+    运行管线并复用 `cache_dir` 下的逐文件 AST 提取缓存：
+    只有内容变化的实现文件会重新解析，冷重建（大量未命中）时按 CPU 核数并行提取。
+    """
+    spec_cache = ExtractedSpecCache.load(cache_dir / SPEC_CACHE_FILENAME)
+    index = run_pipeline(workspace_path, spec_cache=spec_cache, workers=os.cpu_count())
+    spec_cache.save()
+    return index
@@ -0,0 +1,201 @@
+"""V2 管线的持久化缓存：按文件缓存 AST 提取结果 + 整体索引快照。
+
+两级缓存都写在节点库缓存目录（app/runtime/cache/node_cache）下，正文用 marshal 编码：
+- `extracted_specs.mcache`：实现文件路径 -> (源码哈希, ExtractedSpec 列表)。
+  冷重建时只对内容变化的文件重新 `ast.parse`；提取器代码（本目录的 extractor_ast/types）变化时整体失效。
+- `node_index.mcache`：run_pipeline 产物（by_key/alias_to_key）及 NodeLibrary 派生集合，
+  与 node_library.json 使用同一个 node_defs_fp，指纹一致时进程启动后无需运行管线。
+
+marshal 原样保留 tuple/list/dict 等字面量结构（JSON 会把 tuple 变成 list），
+其字节格式随 Python 版本变化，因此文件内记录编码器版本，不一致时按未命中处理。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .types import ExtractedSpec
+
+
+SPEC_CACHE_FILENAME = "extracted_specs.mcache"
+NODE_INDEX_CACHE_FILENAME = "node_index.mcache"
+
+_CACHE_FORMAT_VERSION = 1
+_CODEC = f"marshal-{marshal.version}-py{sys.version_info[0]}.{sys.version_info[1]}"
+# 正文前的明文前缀：先比对前缀再反序列化，编码器不一致的旧文件不会进入 marshal.loads
+_FILE_PREFIX = f"nodecache-v{_CACHE_FORMAT_VERSION}:{_CODEC}\n".encode("ascii")
+
+_extractor_digest: Optional[str] = None
+
+
+def _get_extractor_digest() -> str:
+    """提取器实现的摘要：提取逻辑或 ExtractedSpec 结构变化时，旧的逐文件缓存整体失效。"""
+    global _extractor_digest
+    if _extractor_digest is None:
+        package_dir = Path(__file__).resolve().parent
+        hasher = hashlib.sha1()
+        for module_name in ("extractor_ast.py", "types.py"):
+            hasher.update((package_dir / module_name).read_bytes())
+        _extractor_digest = hasher.hexdigest()
+    return _extractor_digest
+
+
+def _read_marshal_payload(cache_file: Path) -> Optional[Dict[str, Any]]:
+    """文件不存在、前缀（格式版本 + 编码器）不匹配或正文截断/损坏时返回 None（等价于无缓存）。"""
+    if not cache_file.exists():
+        return None
+    raw = cache_file.read_bytes()
+    if not raw.startswith(_FILE_PREFIX):
+        return None
+    try:
+        payload = marshal.loads(raw[len(_FILE_PREFIX):])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _write_marshal_payload(cache_file: Path, payload: Dict[str, Any]) -> None:
+    """写入同目录下的唯一临时文件再原子替换，避免并发读取到半写入的文件。
+
+    多个进程可能同时写同一缓存（例如进程池 worker 冷启动），各自使用独立临时文件；
+    替换失败只意味着本次缓存未落盘，不影响调用方。
+    """
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        prefix=cache_file.name + ".",
+        suffix=".tmp",
+        dir=str(cache_file.parent),
+    )
+    with os.fdopen(fd, "wb") as temp_stream:
+        temp_stream.write(_FILE_PREFIX + marshal.dumps(payload))
+    try:
+        os.replace(temp_path, cache_file)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _source_digest(source: str) -> str:
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+class ExtractedSpecCache:
+    """按“文件路径 + 源码哈希”缓存 ExtractedSpec 列表。
+
+    一次管线运行中未被访问的条目（文件已删除/已移出实现目录）在 save() 时剔除。
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None) -> None:
+        self.cache_file = cache_file
+        self._items: Dict[str, Tuple[str, List[Dict[str, Any]]]] = {}
+        self._touched: set[str] = set()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, cache_file: Path) -> "ExtractedSpecCache":
+        cache = cls(cache_file)
+        payload = _read_marshal_payload(cache_file)
+        if payload is not None and payload.get("extractor") == _get_extractor_digest():
+            items = payload.get("items")
+            if isinstance(items, dict):
+                cache._items = items
+        return cache
+
+    def get(self, file_path: Path, source: str) -> Optional[List[ExtractedSpec]]:
+        key = str(file_path)
+        self._touched.add(key)
+        entry = self._items.get(key)
+        if entry is None or entry[0] != _source_digest(source):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [ExtractedSpec(file_path=file_path, **record) for record in entry[1]]
+
+    def put(self, file_path: Path, source: str, specs: List[ExtractedSpec]) -> None:
+        key = str(file_path)
+        self._touched.add(key)
+        records: List[Dict[str, Any]] = []
+        for spec in specs:
+            record = asdict(spec)
+            record.pop("file_path", None)
+            records.append(record)
+        self._items[key] = (_source_digest(source), records)
+        self._dirty = True
+
+    def save(self) -> None:
+        stale_keys = [key for key in self._items if key not in self._touched]
+        for key in stale_keys:
+            del self._items[key]
+        if self.cache_file is None or not (self._dirty or stale_keys):
+            return
+        _write_marshal_payload(
+            self.cache_file,
+            {"extractor": _get_extractor_digest(), "items": self._items},
+        )
+        self._dirty = False
+
+
+# ------------------------ 整体索引快照 ------------------------
+
+def _index_to_payload(index: Dict[str, Any]) -> Dict[str, Any]:
+    """by_key 条目中的 file_path 为 Path，marshal 无法编码，持久化时转为字符串。"""
+    by_key: Dict[str, Any] = {}
+    for key, item in (index.get("by_key") or {}).items():
+        if isinstance(item, dict) and isinstance(item.get("file_path"), Path):
+            item = dict(item, file_path=str(item["file_path"]))
+        by_key[key] = item
+    return dict(index, by_key=by_key)
+
+
+def _index_from_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    by_key: Dict[str, Any] = {}
+    for key, item in (payload.get("by_key") or {}).items():
+        if isinstance(item, dict) and isinstance(item.get("file_path"), str):
+            item = dict(item, file_path=Path(item["file_path"]))
+        by_key[key] = item
+    return dict(payload, by_key=by_key)
+
+
+def load_persistent_node_index(
+    cache_file: Path,
+    node_defs_fp: str,
+) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """读取索引快照；指纹一致时返回 (index, derived)，否则返回 None。"""
+    payload = _read_marshal_payload(cache_file)
+    if payload is None or payload.get("node_defs_fp") != node_defs_fp:
+        return None
+    index = payload.get("index")
+    derived = payload.get("derived")
+    if not isinstance(index, dict) or not isinstance(derived, dict):
+        return None
+    return _index_from_payload(index), derived
+
+
+def save_persistent_node_index(
+    cache_file: Path,
+    node_defs_fp: str,
+    index: Dict[str, Any],
+    derived: Dict[str, Any],
+) -> None:
+    _write_marshal_payload(
+        cache_file,
+        {"node_defs_fp": node_defs_fp, "index": _index_to_payload(index), "derived": derived},
+    )
+
+
+__all__ = [
+    "ExtractedSpecCache",
+    "NODE_INDEX_CACHE_FILENAME",
+    "SPEC_CACHE_FILENAME",
+    "load_persistent_node_index",
+    "save_persistent_node_index",
+]
@@ -1,7 +1,8 @@
 """节点图缓存门面（内存 + 持久化）。
 
 职责：
-- 进程内缓存（ResourceCacheService）读写与失效策略（含 node_defs_fp）。
+- 进程内缓存（ResourceCacheService）读写与失效策略（含 node_defs_fp）；图载荷以只读视图共享，命中为 O(1)。
+  结构图载荷（`load_graph(..., need_layout=False)`，未布局）使用独立的内存缓存，与布局结果互不覆盖。
 - 节点定义/解析器指纹（node_defs_fp）短 TTL 缓存，避免 UI 高频刷新卡顿。
 - 布局设置快照与持久化缓存兼容性判断（避免“切换设置后仍命中旧布局缓存”）。
 - UI 侧增量更新持久化缓存（delta 合并、指纹重算、写盘与同步内存）。
@@ -15,7 +16,8 @@ from typing import Any, Dict, Optional
 from engine.configs.resource_types import ResourceType
 from engine.configs.settings import settings
 from engine.resources.persistent_graph_cache_manager import PersistentGraphCacheManager
-from engine.utils.graph.node_defs_fingerprint import compute_node_defs_fingerprint
+from engine.utils.cache.graph_cache_format import GraphCacheEntry
+from engine.utils.graph.node_defs_fingerprint_service import get_node_defs_fingerprint
 from engine.utils.logging.logger import log_info
 
 from .graph_fingerprints_service import GraphFingerprintsService
@@ -38,6 +40,8 @@ class GraphCacheFacade:
         self._cache_service = cache_service
         self._persistent_graph_cache_manager = persistent_graph_cache_manager
         self._fingerprints_service = fingerprints_service
+        # 结构图载荷（未布局）单独缓存：不与布局结果共享 key，也不写入磁盘
+        self._structure_cache_service = ResourceCacheService(max_cache_bytes=128 * 1024 * 1024)
 
         # ===== 节点定义/解析器指纹缓存（避免频繁全目录扫描导致 UI 卡顿） =====
         self._cached_node_defs_fp: str = ""
@@ -58,10 +62,11 @@ class GraphCacheFacade:
         if self._cached_node_defs_fp and (now - self._cached_node_defs_fp_at) < self._node_defs_fp_cache_ttl_seconds:
             return self._cached_node_defs_fp
 
-        new_fingerprint = compute_node_defs_fingerprint(self._workspace_path)
+        new_fingerprint = get_node_defs_fingerprint(self._workspace_path)
         # 若指纹发生变化，清理图相关的内存缓存，确保后续读取会触发重新解析
         if self._cached_node_defs_fp and new_fingerprint != self._cached_node_defs_fp:
             self._cache_service.clear(ResourceType.GRAPH)
+            self._structure_cache_service.clear(ResourceType.GRAPH)
 
         self._cached_node_defs_fp = new_fingerprint
         self._cached_node_defs_fp_at = now
@@ -70,8 +75,21 @@ class GraphCacheFacade:
     # ===== 内存缓存（ResourceCacheService） =====
 
     def get_graph_from_memory_cache(self, graph_id: str, current_mtime: float) -> Optional[dict]:
+        """读取内存缓存中的图载荷（只读视图，需修改时请先 `thaw_payload()`）。"""
+        return self._get_checked_graph_payload(self._cache_service, graph_id, current_mtime)
+
+    def get_graph_structure_from_memory_cache(self, graph_id: str, current_mtime: float) -> Optional[dict]:
+        """读取内存缓存中的结构图载荷（未布局，只读视图）。"""
+        return self._get_checked_graph_payload(self._structure_cache_service, graph_id, current_mtime)
+
+    def _get_checked_graph_payload(
+        self,
+        cache_service: ResourceCacheService,
+        graph_id: str,
+        current_mtime: float,
+    ) -> Optional[dict]:
         cache_key = (ResourceType.GRAPH, graph_id)
-        cached_value = self._cache_service.get(cache_key, current_mtime)
+        cached_value = cache_service.get(cache_key, current_mtime)
         if cached_value is None:
             return None
 
@@ -87,12 +105,22 @@ class GraphCacheFacade:
             return cached_value
 
         # 缓存缺少 fp 或 fp 不一致：清理并回退到持久化缓存/重解析路径
-        self._cache_service.clear(ResourceType.GRAPH, graph_id)
+        cache_service.clear(ResourceType.GRAPH, graph_id)
         return None
 
-    def store_graph_in_memory_cache(self, graph_id: str, result_data: dict, current_mtime: float) -> None:
+    def store_graph_in_memory_cache(self, graph_id: str, result_data: dict, current_mtime: float) -> dict:
+        """写入内存缓存并返回冻结后的只读视图（后续命中将共享同一对象，不再深拷贝）。"""
         cache_key = (ResourceType.GRAPH, graph_id)
-        self._cache_service.add(cache_key, result_data, current_mtime)
+        return self._cache_service.add(cache_key, result_data, current_mtime, frozen=True)
+
+    def store_graph_structure_in_memory_cache(self, graph_id: str, result_data: dict, current_mtime: float) -> dict:
+        """写入结构图载荷缓存并返回冻结后的只读视图。"""
+        cache_key = (ResourceType.GRAPH, graph_id)
+        return self._structure_cache_service.add(cache_key, result_data, current_mtime, frozen=True)
+
+    def clear_graph_structure_cache(self, graph_id: Optional[str] = None) -> None:
+        """失效结构图载荷缓存；graph_id 为空时清空全部。"""
+        self._structure_cache_service.clear(ResourceType.GRAPH, graph_id)
 
     # ===== 布局设置快照/兼容性 =====
 
@@ -118,7 +146,10 @@ class GraphCacheFacade:
         metadata = persisted_result_data.get("metadata")
         if not isinstance(metadata, dict):
             return False
-        cached_settings = metadata.get("layout_settings")
+        return self.is_layout_settings_snapshot_compatible(metadata.get("layout_settings"))
+
+    def is_layout_settings_snapshot_compatible(self, cached_settings: Optional[dict]) -> bool:
+        """检查布局设置快照（如持久化缓存头部记录的快照）是否与当前全局设置兼容。"""
         if not isinstance(cached_settings, dict):
             return False
 
@@ -146,6 +177,10 @@ class GraphCacheFacade:
             return None
         return persisted
 
+    def read_persistent_graph_cache_entry(self, graph_id: str) -> Optional[GraphCacheEntry]:
+        """只读取持久化缓存头部（file_hash/node_defs_fp/节点与连线数量/布局设置快照）。"""
+        return self._persistent_graph_cache_manager.read_persistent_graph_cache_entry(graph_id)
+
     def save_persistent_graph_cache(self, graph_id: str, file_path: Path, result_data: Dict[str, Any]) -> None:
         self._persistent_graph_cache_manager.save_persistent_graph_cache(graph_id, file_path, result_data)
 
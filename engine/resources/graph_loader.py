@@ -4,6 +4,7 @@
 - 解析 `.py` 节点图为 GraphModel + metadata
 - 执行与编辑器一致的增强布局流程（克隆就地布局 + 差分合并）
 - 组装 `load_graph()` 对外返回结构，并与 GraphCacheFacade 协作做缓存命中/回退
+- `load_graph(..., need_layout=False)`：只解析结构、不做任何布局，供校验/引用查询等不展示坐标的调用方使用
 """
 
 from __future__ import annotations
@@ -13,6 +14,7 @@ from typing import Any, Dict, Optional, TYPE_CHECKING
 
 from engine.configs.resource_types import ResourceType
 from engine.graph.models.graph_model import GraphModel
+from engine.graph.parse_result_cache import parse_graph_file_shared
 from engine.layout import LayoutService
 from engine.nodes.node_registry import get_node_registry
 from engine.utils.logging.logger import log_error, log_info
@@ -45,9 +47,19 @@ class GraphLoader:
         self._fingerprints_service = fingerprints_service
 
         self._graph_parser: Optional["GraphCodeParser"] = None
+        # 构建解析器时使用的节点库对象：NodeRegistry.refresh() 后会换成新对象，此时需重建解析器
+        self._graph_parser_library: Optional[Dict[str, Any]] = None
 
-    def load_graph(self, graph_id: str) -> Optional[dict]:
-        """加载节点图，带持久化与内存缓存。"""
+    def load_graph(self, graph_id: str, *, need_layout: bool = True) -> Optional[dict]:
+        """加载节点图，带持久化与内存缓存。
+
+        返回值为内存缓存中的只读视图（FrozenDict）；需要修改的调用方请先 `thaw_payload()`。
+
+        Args:
+            need_layout: False 时返回未布局的结构图（节点/连线/常量/图变量与解析元数据，
+                不含坐标、基本块与跨块数据副本），单独缓存在内存中，不读写布局持久化缓存。
+                只读取图结构的调用方（包校验、引用查询、搜索）应使用该模式。
+        """
         resource_file = self._resolve_graph_file_path(graph_id)
         if not resource_file or not resource_file.exists():
             return None
@@ -60,6 +72,8 @@ class GraphLoader:
             return None
 
         current_mtime = resource_file.stat().st_mtime
+        if not need_layout:
+            return self._load_graph_structure(graph_id, resource_file, current_mtime)
 
         cached = self._cache_facade.get_graph_from_memory_cache(graph_id, current_mtime)
         if cached is not None:
@@ -72,12 +86,13 @@ class GraphLoader:
             meta = persisted.get("metadata")
             if isinstance(meta, dict):
                 meta.setdefault("node_defs_fp", self._cache_facade.get_current_node_defs_fingerprint())
-            self._cache_facade.store_graph_in_memory_cache(graph_id, persisted, current_mtime)
-            return persisted
+            return self._cache_facade.store_graph_in_memory_cache(graph_id, persisted, current_mtime)
 
         log_info("[缓存][图] 未命中持久化缓存，开始解析与自动布局：{}", graph_id)
-        parser = self._get_graph_parser()
-        graph_model, metadata = parser.parse_file(resource_file)
+        # 解析结果在进程内共享（校验阶段可直接复用）；后续要修改模型，因此取可写副本
+        parsed = parse_graph_file_shared(self._workspace_path, resource_file, parser=self._get_graph_parser())
+        graph_model = parsed.clone_model()
+        metadata = parsed.mutable_metadata()
 
         if (not getattr(graph_model, "graph_variables", None)) and metadata.get("graph_variables"):
             graph_model.graph_variables = metadata["graph_variables"]
@@ -87,7 +102,43 @@ class GraphLoader:
         # 首次加载或缓存失效时：执行与编辑器“自动排版”完全等价的增强布局流程
         self._apply_enhanced_layout_to_model(graph_model)
 
-        graph_data = graph_model.serialize()
+        result_data = self._build_result_data(graph_id, graph_model.serialize(), metadata)
+
+        fingerprints = self._fingerprints_service.build_fingerprints_from_graph_model(graph_model)
+        if fingerprints:
+            result_data["metadata"]["fingerprints"] = fingerprints
+
+        # 记录当前布局相关设置快照（用于判断持久化缓存是否与当前布局语义兼容）
+        result_data["metadata"]["layout_settings"] = self._cache_facade.current_layout_settings_snapshot()
+
+        self._cache_facade.save_persistent_graph_cache(graph_id, resource_file, result_data)
+        return self._cache_facade.store_graph_in_memory_cache(graph_id, result_data, current_mtime)
+
+    def _load_graph_structure(self, graph_id: str, resource_file: Path, current_mtime: float) -> dict:
+        """结构图层级：解析时跳过自动布局，也不执行增强布局与指纹计算。"""
+        cached = self._cache_facade.get_graph_structure_from_memory_cache(graph_id, current_mtime)
+        if cached is not None:
+            return cached
+
+        parsed = parse_graph_file_shared(
+            self._workspace_path,
+            resource_file,
+            parser=self._get_graph_parser(),
+            apply_layout=False,
+        )
+        metadata = parsed.mutable_metadata()
+        # 共享模型只读：serialize 不修改模型，无需克隆
+        graph_data = parsed.model.serialize()
+        if (not graph_data.get("graph_variables")) and metadata.get("graph_variables"):
+            graph_data["graph_variables"] = metadata["graph_variables"]
+
+        self._index_state.set_file_path(ResourceType.GRAPH, graph_id, resource_file)
+
+        result_data = self._build_result_data(graph_id, graph_data, metadata)
+        result_data["metadata"]["structure_only"] = True
+        return self._cache_facade.store_graph_structure_in_memory_cache(graph_id, result_data, current_mtime)
+
+    def _build_result_data(self, graph_id: str, graph_data: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
         result_data: Dict[str, Any] = {
             "graph_id": metadata.get("graph_id", graph_id),
             "name": metadata.get("graph_name", graph_data.get("graph_name", "")),
@@ -100,16 +151,6 @@ class GraphLoader:
 
         # 写入节点定义/解析器指纹，用于内存缓存的失效判定
         result_data["metadata"]["node_defs_fp"] = self._cache_facade.get_current_node_defs_fingerprint()
-
-        fingerprints = self._fingerprints_service.build_fingerprints_from_graph_model(graph_model)
-        if fingerprints:
-            result_data["metadata"]["fingerprints"] = fingerprints
-
-        # 记录当前布局相关设置快照（用于判断持久化缓存是否与当前布局语义兼容）
-        result_data["metadata"]["layout_settings"] = self._cache_facade.current_layout_settings_snapshot()
-
-        self._cache_facade.save_persistent_graph_cache(graph_id, resource_file, result_data)
-        self._cache_facade.store_graph_in_memory_cache(graph_id, result_data, current_mtime)
         return result_data
 
     # ===== 内部：文件路径解析 =====
@@ -125,12 +166,18 @@ class GraphLoader:
     # ===== 内部：解析器惰性初始化 =====
 
     def _get_graph_parser(self) -> "GraphCodeParser":
-        if self._graph_parser is None:
+        """返回使用注册表当前节点库的解析器。
+
+        共享解析缓存以当前 node_defs_fp 为键，解析器若仍持有刷新前的节点库，
+        旧定义下的解析结果会被写到新指纹下并被校验阶段复用，因此节点库对象变化时重建解析器。
+        """
+        registry = get_node_registry(self._workspace_path, include_composite=True)
+        node_library = registry.get_library()
+        if self._graph_parser is None or self._graph_parser_library is not node_library:
             from engine.graph import GraphCodeParser
 
-            registry = get_node_registry(self._workspace_path, include_composite=True)
-            node_library = registry.get_library()
             self._graph_parser = GraphCodeParser(self._workspace_path, node_library=node_library)
+            self._graph_parser_library = node_library
         return self._graph_parser
 
     # ===== 内部：增强布局差分合并 =====
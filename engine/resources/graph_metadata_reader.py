@@ -10,13 +10,11 @@
 from __future__ import annotations
 
 import hashlib
-import json
 from pathlib import Path
 from typing import Optional
 
 from engine.configs.resource_types import ResourceType
 from engine.graph.utils.metadata_extractor import extract_metadata_from_code
-from engine.utils.cache.cache_paths import get_graph_cache_dir
 
 from .graph_cache_facade import GraphCacheFacade
 from .resource_cache_service import ResourceCacheService
@@ -85,33 +83,18 @@ class GraphMetadataReader:
         # 优先：若存在与当前图文件内容、节点定义指纹、布局设置兼容的持久化缓存，
         # 则直接使用缓存内的 nodes/edges 进行计数，确保与右侧属性面板口径一致，
         # 同时仍不触发解析与自动布局。
-        cache_dir = get_graph_cache_dir(self._workspace_path)
-        cache_file = cache_dir / f"{graph_id}.json"
-        if cache_file.exists():
-            cache_text = cache_file.read_text(encoding="utf-8")
-            if cache_text.strip():
-                payload = json.loads(cache_text)
-                if isinstance(payload, dict):
-                    cached_hash = payload.get("file_hash")
-                    cached_fp = payload.get("node_defs_fp")
-                    cached_result_data = payload.get("result_data")
-                    if (
-                        isinstance(cached_hash, str)
-                        and isinstance(cached_fp, str)
-                        and isinstance(cached_result_data, dict)
-                        and cached_hash == file_md5
-                        and cached_fp == current_node_defs_fp
-                        and self._cache_facade.is_persistent_layout_settings_compatible(cached_result_data)
-                    ):
-                        cached_graph_data = cached_result_data.get("data")
-                        if isinstance(cached_graph_data, dict):
-                            cached_nodes = cached_graph_data.get("nodes")
-                            cached_edges = cached_graph_data.get("edges")
-                            if isinstance(cached_nodes, list) and isinstance(cached_edges, list):
-                                metadata["node_count"] = len(cached_nodes)
-                                metadata["edge_count"] = len(cached_edges)
-                                self._cache_service.add(cache_key, metadata, current_mtime)
-                                return metadata
+        # 只读取缓存头部：校验字段与节点/连线数量均记录在头部，无需反序列化正文。
+        cache_entry = self._cache_facade.read_persistent_graph_cache_entry(graph_id)
+        if (
+            cache_entry is not None
+            and cache_entry.file_hash == file_md5
+            and cache_entry.node_defs_fp == current_node_defs_fp
+            and self._cache_facade.is_layout_settings_snapshot_compatible(cache_entry.layout_settings)
+        ):
+            metadata["node_count"] = cache_entry.node_count
+            metadata["edge_count"] = cache_entry.edge_count
+            self._cache_service.add(cache_key, metadata, current_mtime)
+            return metadata
 
         import re
 
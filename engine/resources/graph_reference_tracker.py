@@ -220,7 +220,10 @@ class GraphReferenceTracker:
         return modified
 
     def find_graphs_using_composite(self, composite_node_name: str) -> List[Dict[str, Any]]:
-        """列出使用指定复合节点的所有节点图（包含节点/连线信息）。"""
+        """列出使用指定复合节点的所有节点图（包含节点/连线信息）。
+
+        候选图由节点图摘要索引给出，只加载确实引用了该复合节点的图。
+        """
         key = composite_node_name.strip()
         if not key:
             return []
@@ -228,11 +231,11 @@ class GraphReferenceTracker:
             return self._composite_usage_cache[key]
 
         usages: List[Dict[str, Any]] = []
-        target_category = f"复合节点/{key}"
-        graph_ids = self.resource_manager.list_resources(ResourceType.GRAPH)
+        legacy_category = f"复合节点/{key}"
+        graph_ids = self.resource_manager.get_graph_summary_index().find_graphs_using_composite(key)
 
         for graph_id in graph_ids:
-            graph_data = self.resource_manager.load_resource(ResourceType.GRAPH, graph_id)
+            graph_data = self.resource_manager.load_resource(ResourceType.GRAPH, graph_id, need_layout=False)
             if not graph_data:
                 continue
             payload = graph_data.get("data", graph_data)
@@ -240,7 +243,11 @@ class GraphReferenceTracker:
             node_ids = [
                 node.get("id")
                 for node in nodes
-                if node.get("category") == target_category and node.get("id")
+                if node.get("id")
+                and (
+                    (node.get("category") == "复合节点" and node.get("title") == key)
+                    or node.get("category") == legacy_category
+                )
             ]
             if not node_ids:
                 continue
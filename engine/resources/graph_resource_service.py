@@ -73,9 +73,17 @@ class GraphResourceService:
         """保存节点图资源，返回 (是否成功, 最终文件路径)。"""
         return self._saver.save_graph(graph_id, data)
 
-    def load_graph(self, graph_id: str) -> Optional[dict]:
-        """加载节点图，带持久化与内存缓存。"""
-        return self._loader.load_graph(graph_id)
+    def load_graph(self, graph_id: str, *, need_layout: bool = True) -> Optional[dict]:
+        """加载节点图，带持久化与内存缓存；need_layout=False 时返回未布局的结构图。"""
+        return self._loader.load_graph(graph_id, need_layout=need_layout)
+
+    def clear_graph_structure_cache(self, graph_id: Optional[str] = None) -> None:
+        """失效结构图（need_layout=False）的内存缓存。"""
+        self._cache_facade.clear_graph_structure_cache(graph_id)
+
+    def get_current_node_defs_fingerprint(self) -> str:
+        """节点定义/解析器指纹（带短 TTL 缓存）。"""
+        return self._cache_facade.get_current_node_defs_fingerprint()
 
     def load_graph_metadata(self, graph_id: str) -> Optional[dict]:
         """加载节点图的轻量级元数据（不执行节点图代码）。"""
@@ -128,7 +128,7 @@ class GraphSaver:
             "metadata": {},
         }
 
-        self._cache_service.add(cache_key, result_data, current_mtime)
+        self._cache_service.add(cache_key, result_data, current_mtime, frozen=True)
         return True, resource_file
 
     def _get_roundtrip_validator(self) -> "RoundtripValidator":
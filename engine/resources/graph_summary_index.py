@@ -0,0 +1,488 @@
+"""节点图摘要索引：逐文件持久化的图摘要 + 内存倒排索引，用于反向查询而无需加载节点图。
+
+每个节点图文件对应一条摘要（节点标题/类别直方图、复合节点、信号、结构体与图变量），
+以文件内容哈希为键：
+- (mtime_ns, size) 与磁盘一致时直接复用；
+- 只有 mtime 变化而内容哈希不变时仅更新文件状态；
+- 内容变化或节点定义指纹变化时才以结构图层级（need_layout=False）重新解析该文件；
+- 加载失败（返回空或解析抛错）的文件记为“无摘要”记录，内容哈希不变时不再重试。
+
+倒排索引在内存中由摘要重建，支持“使用复合节点 X 的图”“发送信号 Y 的图”等查询。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from engine.configs.resource_types import ResourceType
+from engine.graph.common import (
+    SIGNAL_ID_HINT_CONSTANT_KEY,
+    SIGNAL_LISTEN_NODE_TITLE,
+    SIGNAL_SEND_NODE_TITLE,
+    STRUCT_ID_HINT_CONSTANT_KEY,
+    STRUCT_NODE_TITLES,
+)
+from engine.utils.cache.cache_paths import get_graph_summary_index_file
+from engine.utils.logging.logger import log_warn
+
+from .atomic_json import atomic_write_json
+
+if TYPE_CHECKING:
+    from engine.resources.resource_manager import ResourceManager
+
+
+GRAPH_SUMMARY_INDEX_SCHEMA = "graph_summary_index/v2"
+GRAPH_SUMMARY_INDEX_SCHEMA_VERSION = 2
+
+COMPOSITE_NODE_CATEGORY = "复合节点"
+
+
+@dataclass
+class GraphSummary:
+    """单个节点图的摘要（只包含反向查询所需的信息）。"""
+
+    graph_id: str
+    graph_name: str = ""
+    graph_type: str = ""
+    node_title_counts: Dict[str, int] = field(default_factory=dict)
+    node_category_counts: Dict[str, int] = field(default_factory=dict)
+    composite_ids: List[str] = field(default_factory=list)
+    composite_names: List[str] = field(default_factory=list)
+    sent_signal_ids: List[str] = field(default_factory=list)
+    listened_signal_ids: List[str] = field(default_factory=list)
+    struct_ids: List[str] = field(default_factory=list)
+    graph_variables: List[Dict[str, str]] = field(default_factory=list)
+
+    def count_nodes(self, *titles: str) -> int:
+        return sum(self.node_title_counts.get(title, 0) for title in titles)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "graph_id": self.graph_id,
+            "graph_name": self.graph_name,
+            "graph_type": self.graph_type,
+            "node_title_counts": self.node_title_counts,
+            "node_category_counts": self.node_category_counts,
+            "composite_ids": self.composite_ids,
+            "composite_names": self.composite_names,
+            "sent_signal_ids": self.sent_signal_ids,
+            "listened_signal_ids": self.listened_signal_ids,
+            "struct_ids": self.struct_ids,
+            "graph_variables": self.graph_variables,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GraphSummary":
+        return cls(
+            graph_id=str(data["graph_id"]),
+            graph_name=str(data.get("graph_name", "")),
+            graph_type=str(data.get("graph_type", "")),
+            node_title_counts={str(key): int(value) for key, value in data.get("node_title_counts", {}).items()},
+            node_category_counts={str(key): int(value) for key, value in data.get("node_category_counts", {}).items()},
+            composite_ids=[str(value) for value in data.get("composite_ids", [])],
+            composite_names=[str(value) for value in data.get("composite_names", [])],
+            sent_signal_ids=[str(value) for value in data.get("sent_signal_ids", [])],
+            listened_signal_ids=[str(value) for value in data.get("listened_signal_ids", [])],
+            struct_ids=[str(value) for value in data.get("struct_ids", [])],
+            graph_variables=[dict(item) for item in data.get("graph_variables", [])],
+        )
+
+
+def _non_empty_text(raw_value: object) -> str:
+    return str(raw_value).strip() if raw_value is not None else ""
+
+
+def summarize_graph_payload(graph_id: str, graph_payload: Dict[str, Any]) -> GraphSummary:
+    """从 `load_resource(GRAPH, ...)` 的返回结构提取摘要。
+
+    信号/结构体 ID 优先取 metadata 中的 signal_bindings / struct_bindings，
+    并补充节点上的隐藏常量 `__signal_id` / `__struct_id`。
+    """
+    graph_data = graph_payload.get("data", graph_payload) or {}
+    metadata = graph_data.get("metadata") or {}
+
+    title_counts: Dict[str, int] = {}
+    category_counts: Dict[str, int] = {}
+    composite_ids: Set[str] = set()
+    composite_names: Set[str] = set()
+    sent_signal_ids: Set[str] = set()
+    listened_signal_ids: Set[str] = set()
+    struct_ids: Set[str] = set()
+    title_by_node_id: Dict[str, str] = {}
+
+    for node in graph_data.get("nodes", []) or []:
+        title = _non_empty_text(node.get("title"))
+        category = _non_empty_text(node.get("category"))
+        title_counts[title] = title_counts.get(title, 0) + 1
+        category_counts[category] = category_counts.get(category, 0) + 1
+        title_by_node_id[str(node.get("id", ""))] = title
+
+        if category == COMPOSITE_NODE_CATEGORY:
+            composite_names.add(title)
+            composite_id = _non_empty_text(node.get("composite_id"))
+            if composite_id:
+                composite_ids.add(composite_id)
+        elif category.startswith(f"{COMPOSITE_NODE_CATEGORY}/"):
+            # 旧格式：类别中携带复合节点名
+            composite_names.add(category.split("/", 1)[1])
+
+        input_constants = node.get("input_constants") or {}
+        if not isinstance(input_constants, dict):
+            continue
+        if title in (SIGNAL_SEND_NODE_TITLE, SIGNAL_LISTEN_NODE_TITLE):
+            signal_id = _non_empty_text(input_constants.get(SIGNAL_ID_HINT_CONSTANT_KEY))
+            if signal_id:
+                (sent_signal_ids if title == SIGNAL_SEND_NODE_TITLE else listened_signal_ids).add(signal_id)
+        elif title in STRUCT_NODE_TITLES:
+            struct_id = _non_empty_text(input_constants.get(STRUCT_ID_HINT_CONSTANT_KEY))
+            if struct_id:
+                struct_ids.add(struct_id)
+
+    signal_bindings = metadata.get("signal_bindings") or {}
+    if isinstance(signal_bindings, dict):
+        for node_id, binding in signal_bindings.items():
+            signal_id = _non_empty_text(binding.get("signal_id")) if isinstance(binding, dict) else ""
+            if not signal_id:
+                continue
+            if title_by_node_id.get(str(node_id)) == SIGNAL_SEND_NODE_TITLE:
+                sent_signal_ids.add(signal_id)
+            else:
+                listened_signal_ids.add(signal_id)
+
+    struct_bindings = metadata.get("struct_bindings") or {}
+    if isinstance(struct_bindings, dict):
+        for binding in struct_bindings.values():
+            struct_id = _non_empty_text(binding.get("struct_id")) if isinstance(binding, dict) else ""
+            if struct_id:
+                struct_ids.add(struct_id)
+
+    graph_variables: List[Dict[str, str]] = []
+    for variable in graph_data.get("graph_variables", []) or []:
+        if not isinstance(variable, dict):
+            continue
+        name = _non_empty_text(variable.get("name"))
+        if name:
+            graph_variables.append(
+                {"name": name, "variable_type": _non_empty_text(variable.get("variable_type"))}
+            )
+
+    return GraphSummary(
+        graph_id=graph_id,
+        graph_name=_non_empty_text(graph_payload.get("name", graph_data.get("graph_name", ""))),
+        graph_type=_non_empty_text(graph_payload.get("graph_type", "")),
+        node_title_counts=title_counts,
+        node_category_counts=category_counts,
+        composite_ids=sorted(composite_ids),
+        composite_names=sorted(composite_names),
+        sent_signal_ids=sorted(sent_signal_ids),
+        listened_signal_ids=sorted(listened_signal_ids),
+        struct_ids=sorted(struct_ids),
+        graph_variables=graph_variables,
+    )
+
+
+@dataclass
+class _SummaryRecord:
+    """持久化索引中单个节点图文件的记录（summary 为 None 表示该内容加载失败）。"""
+
+    graph_id: str
+    mtime_ns: int
+    size: int
+    content_hash: str
+    summary: Optional[GraphSummary]
+
+    def matches_stat(self, stat_result: os.stat_result) -> bool:
+        return self.mtime_ns == stat_result.st_mtime_ns and self.size == stat_result.st_size
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "graph_id": self.graph_id,
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "content_hash": self.content_hash,
+            "summary": self.summary.to_dict() if self.summary is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "_SummaryRecord":
+        summary_raw = data.get("summary")
+        return cls(
+            graph_id=str(data["graph_id"]),
+            mtime_ns=int(data["mtime_ns"]),
+            size=int(data["size"]),
+            content_hash=str(data["content_hash"]),
+            summary=GraphSummary.from_dict(summary_raw) if summary_raw is not None else None,
+        )
+
+
+class GraphSummaryIndex:
+    """节点图摘要索引（持久化到 app/runtime/cache/resource_cache/graph_summary_index.json）。
+
+    每次查询前先按文件状态做一次增量刷新（未变化的文件只 stat 一次），
+    因此查询结果始终与磁盘上的节点图一致。同一操作内的多次查询可放进
+    `with index.batch():`，只在进入时刷新一次。
+    """
+
+    def __init__(
+        self,
+        workspace_path: Path,
+        resource_manager: "ResourceManager",
+        *,
+        node_defs_fingerprint: Callable[[], str],
+    ) -> None:
+        self.workspace_path = workspace_path
+        self.resource_manager = resource_manager
+        self._node_defs_fingerprint = node_defs_fingerprint
+        self._index_file = get_graph_summary_index_file(workspace_path)
+
+        self._loaded = False
+        self._records_node_defs_fp = ""
+        self._records: Dict[str, _SummaryRecord] = {}
+        self._summaries_by_graph_id: Dict[str, GraphSummary] = {}
+        self._inverted: Dict[str, Dict[str, Set[str]]] = {}
+        self._batch_depth = 0
+        self.rebuilt_count = 0
+
+    # ===== 刷新 =====
+
+    def refresh(self) -> int:
+        """按文件状态增量刷新摘要，返回本次重新解析的节点图数量。"""
+        if not self._loaded:
+            self._load_index_file()
+            self._loaded = True
+
+        changed = False
+        current_fp = self._node_defs_fingerprint()
+        if current_fp != self._records_node_defs_fp:
+            self._records = {}
+            self._records_node_defs_fp = current_fp
+            changed = True
+
+        reparsed = 0
+        records: Dict[str, _SummaryRecord] = {}
+        for graph_id in self.resource_manager.list_resources(ResourceType.GRAPH):
+            file_path = self.resource_manager.get_graph_file_path(graph_id)
+            if file_path is None or not file_path.exists():
+                continue
+            path_key = self._path_key(file_path)
+            stat_result = file_path.stat()
+            record = self._records.get(path_key)
+            if record is not None and record.graph_id == graph_id and record.matches_stat(stat_result):
+                records[path_key] = record
+                continue
+
+            content_hash = hashlib.sha1(file_path.read_bytes()).hexdigest()
+            if record is not None and record.graph_id == graph_id and record.content_hash == content_hash:
+                record.mtime_ns = stat_result.st_mtime_ns
+                record.size = stat_result.st_size
+                records[path_key] = record
+                changed = True
+                continue
+
+            # 加载失败也落一条无摘要记录：内容不变时不再重复加载；
+            # 单个图的语法/解析错误不能拖垮整个库的反向查询
+            try:
+                graph_payload = self.resource_manager.load_resource(ResourceType.GRAPH, graph_id, need_layout=False)
+            except Exception as error:
+                log_warn("[索引][图摘要] 节点图加载失败，记为无摘要：{} ({})", graph_id, error)
+                graph_payload = None
+            records[path_key] = _SummaryRecord(
+                graph_id=graph_id,
+                mtime_ns=stat_result.st_mtime_ns,
+                size=stat_result.st_size,
+                content_hash=content_hash,
+                summary=summarize_graph_payload(graph_id, graph_payload) if graph_payload else None,
+            )
+            reparsed += 1
+            changed = True
+
+        if records.keys() != self._records.keys():
+            changed = True
+        if changed or not self._inverted:
+            self._records = records
+            self._rebuild_inverted_index()
+        if changed:
+            self._write_index_file()
+        self.rebuilt_count += reparsed
+        return reparsed
+
+    @contextmanager
+    def batch(self) -> Iterator["GraphSummaryIndex"]:
+        """同一操作内共享一次刷新：进入（最外层）时刷新，块内的查询不再逐次扫描文件。"""
+        if self._batch_depth == 0:
+            self.refresh()
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+
+    def _ensure_fresh(self) -> None:
+        if self._batch_depth == 0:
+            self.refresh()
+
+    def clear_persistent_cache(self) -> int:
+        """删除持久化索引文件并清空内存状态，返回删除的文件数量（0或1）。"""
+        self._loaded = False
+        self._records = {}
+        self._records_node_defs_fp = ""
+        self._summaries_by_graph_id = {}
+        self._inverted = {}
+        if not self._index_file.exists():
+            return 0
+        self._index_file.unlink()
+        return 1
+
+    # ===== 查询 =====
+
+    def get_summary(self, graph_id: str) -> Optional[GraphSummary]:
+        self._ensure_fresh()
+        return self._summaries_by_graph_id.get(graph_id)
+
+    def iter_summaries(self) -> List[GraphSummary]:
+        self._ensure_fresh()
+        return list(self._summaries_by_graph_id.values())
+
+    def find_graphs_using_composite(self, composite_ref: str) -> List[str]:
+        """按复合节点 ID 或名称查询使用它的节点图 ID。"""
+        return self._query("composite", key=composite_ref)
+
+    def find_graphs_sending_signal(self, signal_id: str) -> List[str]:
+        return self._query("signal_send", key=signal_id)
+
+    def find_graphs_listening_signal(self, signal_id: str) -> List[str]:
+        return self._query("signal_listen", key=signal_id)
+
+    def find_graphs_using_signal(self, signal_id: str) -> List[str]:
+        return self._query("signal_send", "signal_listen", key=signal_id)
+
+    def find_graphs_using_struct(self, struct_id: str) -> List[str]:
+        return self._query("struct", key=struct_id)
+
+    def find_graphs_with_node_title(self, node_title: str) -> List[str]:
+        return self._query("node_title", key=node_title)
+
+    def find_graphs_with_graph_variable(self, variable_name: str) -> List[str]:
+        return self._query("graph_variable", key=variable_name)
+
+    def build_node_title_filter(self, titles: Iterable[str]) -> Callable[[str], bool]:
+        """返回 graph_id -> 图中是否可能包含任一标题节点 的判定函数（只刷新一次）。
+
+        没有摘要的图（未收录或加载失败）按“可能包含”处理，交由调用方照常加载。
+        """
+        self._ensure_fresh()
+        title_tuple = tuple(titles)
+        summaries = self._summaries_by_graph_id
+
+        def _may_contain(graph_id: str) -> bool:
+            summary = summaries.get(graph_id)
+            return summary is None or summary.count_nodes(*title_tuple) > 0
+
+        return _may_contain
+
+    def _query(self, *kinds: str, key: str = "") -> List[str]:
+        self._ensure_fresh()
+        lookup_key = str(key).strip()
+        graph_ids: Set[str] = set()
+        for kind in kinds:
+            graph_ids.update(self._inverted.get(kind, {}).get(lookup_key, ()))
+        return sorted(graph_ids)
+
+    # ===== 内部 =====
+
+    def _rebuild_inverted_index(self) -> None:
+        inverted: Dict[str, Dict[str, Set[str]]] = {
+            "composite": {},
+            "signal_send": {},
+            "signal_listen": {},
+            "struct": {},
+            "node_title": {},
+            "graph_variable": {},
+        }
+
+        def _add(kind: str, keys, graph_id: str) -> None:
+            bucket = inverted[kind]
+            for key in keys:
+                bucket.setdefault(key, set()).add(graph_id)
+
+        summaries: Dict[str, GraphSummary] = {}
+        for record in self._records.values():
+            summary = record.summary
+            if summary is None:
+                continue
+            graph_id = summary.graph_id
+            summaries[graph_id] = summary
+            _add("composite", summary.composite_ids, graph_id)
+            _add("composite", summary.composite_names, graph_id)
+            _add("signal_send", summary.sent_signal_ids, graph_id)
+            _add("signal_listen", summary.listened_signal_ids, graph_id)
+            _add("struct", summary.struct_ids, graph_id)
+            _add("node_title", summary.node_title_counts.keys(), graph_id)
+            _add("graph_variable", (variable["name"] for variable in summary.graph_variables), graph_id)
+
+        self._summaries_by_graph_id = summaries
+        self._inverted = inverted
+
+    def _path_key(self, file_path: Path) -> str:
+        resolved = file_path.resolve()
+        workspace = self.workspace_path.resolve()
+        if resolved.is_relative_to(workspace):
+            return resolved.relative_to(workspace).as_posix()
+        return resolved.as_posix()
+
+    def _load_index_file(self) -> None:
+        """读取持久化索引；文件不存在、无法读取/解析或 schema 不匹配时从空索引开始。"""
+        if not self._index_file.exists():
+            return
+        try:
+            with open(self._index_file, "r", encoding="utf-8") as file_obj:
+                data = json.load(file_obj)
+        except (OSError, ValueError) as error:
+            log_warn("[索引][图摘要] 索引文件损坏，按空索引重建：{} ({})", self._index_file, error)
+            return
+        if not isinstance(data, dict):
+            return
+        manifest = data.get("__manifest__")
+        if not isinstance(manifest, dict):
+            return
+        if manifest.get("schema") != GRAPH_SUMMARY_INDEX_SCHEMA:
+            return
+        if manifest.get("schema_version") != GRAPH_SUMMARY_INDEX_SCHEMA_VERSION:
+            return
+        files_raw = data.get("files")
+        if not isinstance(files_raw, dict):
+            return
+        try:
+            records = {path_key: _SummaryRecord.from_dict(row) for path_key, row in files_raw.items()}
+        except (KeyError, TypeError, ValueError, AttributeError) as error:
+            log_warn("[索引][图摘要] 索引记录损坏，按空索引重建：{} ({})", self._index_file, error)
+            return
+        self._records_node_defs_fp = str(manifest.get("node_defs_fp", ""))
+        self._records = records
+
+    def _write_index_file(self) -> None:
+        payload = {
+            "__manifest__": {
+                "schema": GRAPH_SUMMARY_INDEX_SCHEMA,
+                "schema_version": GRAPH_SUMMARY_INDEX_SCHEMA_VERSION,
+                "node_defs_fp": self._records_node_defs_fp,
+                "generated_at": datetime.now().isoformat(),
+                "source": "engine.resources.GraphSummaryIndex",
+            },
+            "files": {path_key: record.to_dict() for path_key, record in sorted(self._records.items())},
+        }
+        atomic_write_json(self._index_file, payload, ensure_ascii=False, indent=1)
+
+
+__all__ = [
+    "GraphSummary",
+    "GraphSummaryIndex",
+    "summarize_graph_payload",
+]
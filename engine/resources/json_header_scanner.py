@@ -0,0 +1,106 @@
+"""JSON 资源顶层字段的部分扫描（用于资源索引构建）。
+
+资源索引只关心少数顶层字段（ID / name / 显示名），无需把整份 JSON 反序列化：
+- 逐个读取顶层键；只对关心的键解码值，其余值按括号/字符串边界跳过；
+- 调用方提供“是否已足够”的判定，满足后立即停止扫描；
+- 文档不是 JSON 对象或结构异常时返回 None，由调用方回退到 `json.load`（保持原有报错行为）。
+
+注意：跳过的值不会被校验；重复的顶层键以扫描到的最后一次出现为准（与 `json.load` 一致），
+但若在重复键出现之前已满足停止条件，则以先出现的值为准。
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+__all__ = ["scan_json_object_fields"]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_CONTAINER_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+_SCALAR_END = re.compile(r"[,}\]\s]")
+_DECODER = json.JSONDecoder()
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    return _WHITESPACE.match(text, position).end()
+
+
+def _char_at(text: str, position: int) -> str:
+    return text[position] if position < len(text) else ""
+
+
+def _skip_value(text: str, position: int) -> Optional[int]:
+    """返回值结束后的位置；无法识别时返回 None。"""
+    first_char = _char_at(text, position)
+    if first_char == '"':
+        return scanstring(text, position + 1)[1]
+    if first_char in ("[", "{"):
+        depth = 0
+        for match in _CONTAINER_TOKEN.finditer(text, position):
+            token_char = match.group()[0]
+            if token_char == '"':
+                continue
+            if token_char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        return None
+    if not first_char:
+        return None
+    scalar_end = _SCALAR_END.search(text, position)
+    return scalar_end.start() if scalar_end else len(text)
+
+
+def scan_json_object_fields(
+    text: str,
+    wanted_keys: Iterable[str],
+    is_satisfied: Callable[[Dict[str, Any]], bool],
+) -> Optional[Tuple[Dict[str, Any], bool]]:
+    """扫描 JSON 文本的顶层对象，提取 `wanted_keys` 中出现的字段。
+
+    Returns:
+        (found, complete)：found 为已解码的关心字段；complete 表示是否扫描了整个顶层对象
+        （为 False 时说明因 `is_satisfied(found)` 提前停止）。文档不是对象或结构异常时返回 None。
+    """
+    wanted = frozenset(wanted_keys)
+    found: Dict[str, Any] = {}
+    position = _skip_whitespace(text, 0)
+    if _char_at(text, position) != "{":
+        return None
+    position = _skip_whitespace(text, position + 1)
+    if _char_at(text, position) == "}":
+        return found, True
+
+    while True:
+        if _char_at(text, position) != '"':
+            return None
+        key, position = scanstring(text, position + 1)
+        position = _skip_whitespace(text, position)
+        if _char_at(text, position) != ":":
+            return None
+        position = _skip_whitespace(text, position + 1)
+
+        if key in wanted:
+            value, position = _DECODER.raw_decode(text, position)
+            found[key] = value
+            if is_satisfied(found):
+                return found, False
+        else:
+            value_end = _skip_value(text, position)
+            if value_end is None:
+                return None
+            position = value_end
+
+        position = _skip_whitespace(text, position)
+        separator = _char_at(text, position)
+        if separator == ",":
+            position = _skip_whitespace(text, position + 1)
+            continue
+        if separator == "}":
+            return found, True
+        return None
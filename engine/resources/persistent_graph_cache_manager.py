@@ -3,7 +3,7 @@
 职责：
 - 计算节点定义指纹（plugins/nodes / engine/nodes / engine/graph）
 - 基于文件内容哈希与指纹校验持久化缓存有效性
-- 读写 `app/runtime/cache/graph_cache/<graph_id>.json`
+- 读写 `app/runtime/cache/graph_cache/<graph_id>.gcache`（紧凑二进制格式，见 `engine.utils.cache.graph_cache_format`）
 
 注意：
 - 本模块是“磁盘持久化缓存”，与 UI/任务清单使用的“进程内临时 graph_data 缓存”不同。
@@ -12,13 +12,20 @@
 from __future__ import annotations
 
 import hashlib
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional
 
 from engine.utils.cache.cache_paths import get_graph_cache_dir
-from engine.utils.graph.node_defs_fingerprint import compute_node_defs_fingerprint
+from engine.utils.cache.graph_cache_format import (
+    GRAPH_CACHE_FILE_SUFFIX,
+    GraphCacheEntry,
+    encode_graph_cache,
+    get_graph_cache_file,
+    read_graph_cache_entry,
+    write_graph_cache_file,
+)
+from engine.utils.graph.node_defs_fingerprint_service import get_node_defs_fingerprint
 from engine.utils.logging.logger import log_info, log_warn
 from engine.graph.common import (
     FLOW_BRANCH_PORT_ALIASES,
@@ -43,60 +50,51 @@ class PersistentGraphCacheManager:
     def load_persistent_graph_cache(self, graph_id: str, file_path: Path) -> Optional[Dict]:
         """按图 ID 和文件路径尝试加载持久化缓存。
 
-        使用文件内容 MD5 与节点定义指纹进行严格校验。
+        使用文件内容 MD5 与节点定义指纹进行严格校验；校验只读取缓存头部，
+        全部通过后才反序列化正文。
         """
-        cache_dir = self._get_graph_cache_dir()
-        cache_file = cache_dir / f"{graph_id}.json"
-        if not cache_file.exists():
+        entry = self.read_persistent_graph_cache_entry(graph_id)
+        if entry is None:
             return None
-
-        # 兼容：磁盘缓存文件可能在异常中断/并发写入时变为空文件。
-        # 空文件等价于“无缓存”，应直接回退到重新解析/重建流程，避免 JSONDecodeError 阻断启动。
-        cache_text = cache_file.read_text(encoding="utf-8")
-        if not cache_text.strip():
+        if not self.is_persistent_graph_cache_entry_current(entry, file_path):
             return None
-        data = json.loads(cache_text)
 
-        required_keys = {"file_hash", "node_defs_fp", "result_data"}
-        if not all(key in data for key in required_keys):
-            return None
-
-        current_hash = self._compute_file_md5(file_path)
-        current_fp = self._compute_node_defs_fingerprint()
-        if data.get("file_hash") != current_hash:
-            return None
-        if data.get("node_defs_fp") != current_fp:
-            return None
-
-        result_data = data.get("result_data")
-        if not isinstance(result_data, dict):
+        result_data = entry.load_result_data()
+        if result_data is None:
             return None
         if not self._is_result_data_structurally_consistent(result_data):
             log_warn("[缓存][图] 持久化缓存结构不自洽，视为失效：{}", graph_id)
-            cache_file.unlink()
+            entry.path.unlink()
             return None
         return result_data
 
+    def read_persistent_graph_cache_entry(self, graph_id: str) -> Optional[GraphCacheEntry]:
+        """读取持久化缓存文件头部（不反序列化正文，不做哈希与指纹校验）。
+
+        缓存文件不存在、为空或格式版本不匹配时返回 None。
+        """
+        return read_graph_cache_entry(self._get_graph_cache_file(graph_id))
+
+    def is_persistent_graph_cache_entry_current(self, entry: GraphCacheEntry, file_path: Path) -> bool:
+        """基于缓存头部判断缓存是否与当前源文件内容、节点定义指纹一致。
+
+        源文件大小与头部记录不同时直接判定失效，无需再计算 MD5。
+        """
+        if entry.node_defs_fp != self._compute_node_defs_fingerprint():
+            return False
+        if entry.file_size != file_path.stat().st_size:
+            return False
+        return entry.file_hash == self._compute_file_md5(file_path)
+
     def read_persistent_graph_cache_result_data(self, graph_id: str) -> Optional[Dict]:
         """读取现有持久化缓存中的 result_data（不做哈希与指纹校验）。
 
         用于 UI 在已知缓存有效的前提下做增量更新。
         """
-        cache_dir = self._get_graph_cache_dir()
-        cache_file = cache_dir / f"{graph_id}.json"
-        if not cache_file.exists():
-            return None
-
-        cache_text = cache_file.read_text(encoding="utf-8")
-        if not cache_text.strip():
+        entry = self.read_persistent_graph_cache_entry(graph_id)
+        if entry is None:
             return None
-        payload = json.loads(cache_text)
-        if not isinstance(payload, dict):
-            return None
-        result = payload.get("result_data")
-        if not isinstance(result, dict):
-            return None
-        return result
+        return entry.load_result_data()
 
     def save_persistent_graph_cache(
         self,
@@ -107,25 +105,25 @@ class PersistentGraphCacheManager:
         """写入或覆盖节点图的持久化缓存文件。"""
         cache_dir = self._get_graph_cache_dir()
         cache_dir.mkdir(parents=True, exist_ok=True)
-        cache_file = cache_dir / f"{graph_id}.json"
-        tmp_file = cache_dir / f"{graph_id}.json.tmp"
+        cache_file = self._get_graph_cache_file(graph_id)
         log_info("[缓存][图] 写入持久化缓存：{} -> {}", graph_id, cache_file)
-        payload = {
-            "file_hash": self._compute_file_md5(file_path),
-            "node_defs_fp": self._compute_node_defs_fingerprint(),
-            "result_data": result_data,
-            "cached_at": datetime.now().isoformat(),
-        }
-        # 原子写入：先写临时文件，再替换目标文件，避免中断导致空文件/半写入 JSON。
-        # 额外兜底：在外部工具/并发清缓存的情况下，目录可能在 mkdir 后被删除；写入前再次确保父目录存在。
-        tmp_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(tmp_file, "w", encoding="utf-8") as file_obj:
-            json.dump(payload, file_obj, ensure_ascii=False, indent=2)
-        tmp_file.replace(cache_file)
+        encoded = encode_graph_cache(
+            file_hash=self._compute_file_md5(file_path),
+            file_size=file_path.stat().st_size,
+            node_defs_fp=self._compute_node_defs_fingerprint(),
+            cached_at=datetime.now().isoformat(),
+            result_data=result_data,
+        )
+        # 原子写入：先写临时文件，再替换目标文件，避免中断导致空文件/半写入。
+        write_graph_cache_file(cache_file, encoded)
+        # 旧版 JSON 缓存不再读取，顺带清理同名文件，避免残留占用磁盘。
+        legacy_cache_file = cache_dir / f"{graph_id}.json"
+        if legacy_cache_file.exists():
+            legacy_cache_file.unlink()
         log_info("[缓存][图] 持久化缓存写入完成：{}", graph_id)
 
     def clear_all_persistent_graph_cache(self) -> int:
-        """清空磁盘上的全部节点图持久化缓存。
+        """清空磁盘上的全部节点图持久化缓存（含旧版 JSON 缓存文件）。
 
         Returns:
             被删除的缓存文件数量。
@@ -134,29 +132,34 @@ class PersistentGraphCacheManager:
         if not cache_dir.exists():
             return 0
         removed_files = 0
-        for json_file in cache_dir.glob("*.json"):
-            json_file.unlink()
-            removed_files += 1
+        for pattern in (f"*{GRAPH_CACHE_FILE_SUFFIX}", "*.json"):
+            for cache_file in cache_dir.glob(pattern):
+                cache_file.unlink()
+                removed_files += 1
         if not any(cache_dir.iterdir()):
             cache_dir.rmdir()
         return removed_files
 
     def clear_persistent_graph_cache_for(self, graph_id: str) -> int:
-        """按图 ID 清除单个节点图的持久化缓存文件。"""
+        """按图 ID 清除单个节点图的持久化缓存文件（含旧版 JSON 缓存文件）。"""
         cache_dir = self._get_graph_cache_dir()
-        cache_file = cache_dir / f"{graph_id}.json"
-        if cache_file.exists():
-            cache_file.unlink()
-            if not any(cache_dir.iterdir()):
-                cache_dir.rmdir()
-            return 1
-        return 0
+        removed_files = 0
+        for cache_file in (self._get_graph_cache_file(graph_id), cache_dir / f"{graph_id}.json"):
+            if cache_file.exists():
+                cache_file.unlink()
+                removed_files += 1
+        if removed_files and not any(cache_dir.iterdir()):
+            cache_dir.rmdir()
+        return removed_files
 
     # ===== 内部实现 =====
 
     def _get_graph_cache_dir(self) -> Path:
         return get_graph_cache_dir(self.workspace_path)
 
+    def _get_graph_cache_file(self, graph_id: str) -> Path:
+        return get_graph_cache_file(self._get_graph_cache_dir(), graph_id)
+
     @staticmethod
     def _compute_file_md5(file_path: Path) -> str:
         md5 = hashlib.md5()
@@ -174,7 +177,7 @@ class PersistentGraphCacheManager:
         - 图解析与生成核心：`engine/graph/`
         - 复合节点库：`assets/资源库/复合节点库/`
         """
-        return compute_node_defs_fingerprint(self.workspace_path)
+        return get_node_defs_fingerprint(self.workspace_path)
 
     @staticmethod
     def _is_result_data_structurally_consistent(result_data: Dict) -> bool:
@@ -1,51 +1,96 @@
-"""资源缓存服务 - 提供统一的内存缓存（LRU 风格）实现。"""
+"""资源缓存服务 - 提供统一的内存缓存（LRU + 字节预算）实现。"""
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+import copy
+from collections import OrderedDict
+from typing import Any, Optional
 
 from engine.configs.resource_types import ResourceType
+from engine.utils.cache.frozen_payload import estimate_payload_bytes, freeze_payload
 
 
-class ResourceCacheService:
-    """资源数据的内存缓存服务（LRU 样式，负责命中统计与失效策略）。"""
+class _CacheEntry:
+    __slots__ = ("data", "mtime", "frozen", "size_bytes")
+
+    def __init__(self, data: Any, mtime: float, frozen: bool, size_bytes: int) -> None:
+        self.data = data
+        self.mtime = mtime
+        self.frozen = frozen
+        self.size_bytes = size_bytes
+
 
-    def __init__(self, max_cache_size: int = 500) -> None:
-        # 缓存已加载的资源数据：{(resource_type, resource_id): (data, mtime)}
-        # mtime 用于检测文件是否被外部修改
-        self._resource_cache: Dict[tuple[ResourceType, str], tuple[dict, float]] = {}
+class ResourceCacheService:
+    """资源数据的内存缓存服务（LRU 淘汰，负责命中统计与失效策略）。
+
+    两种载荷模式：
+    - 复制模式（默认）：写入与命中时均深拷贝，调用方可随意修改返回值；
+    - 只读模式（`add(..., frozen=True)`）：写入时一次性冻结为只读视图，命中时直接共享返回（O(1)），
+      需要修改的调用方应先 `thaw_payload()`。
+    """
+
+    def __init__(self, max_cache_size: int = 500, max_cache_bytes: int = 512 * 1024 * 1024) -> None:
+        # 缓存已加载的资源数据：{(resource_type, resource_id): _CacheEntry}
+        # mtime 用于检测文件是否被外部修改；OrderedDict 顺序即 LRU 顺序（末尾为最近使用）
+        self._resource_cache: "OrderedDict[tuple[ResourceType, str], _CacheEntry]" = OrderedDict()
         self._cache_hits = 0
         self._cache_misses = 0
+        self._cache_evictions = 0
+        self._cache_bytes = 0
         self._max_cache_size = max_cache_size
+        self._max_cache_bytes = max_cache_bytes
 
     def get(self, key: tuple[ResourceType, str], current_mtime: float) -> Optional[dict]:
-        """按 key 读取缓存，如果 mtime 匹配则返回深拷贝后的数据。"""
-        if key not in self._resource_cache:
+        """按 key 读取缓存；mtime 匹配时返回数据（复制模式为深拷贝，只读模式为共享视图）。"""
+        entry = self._resource_cache.get(key)
+        if entry is None:
             self._cache_misses += 1
             return None
 
-        cached_data, cached_mtime = self._resource_cache[key]
-        if abs(current_mtime - cached_mtime) >= 0.001:
+        if abs(current_mtime - entry.mtime) >= 0.001:
             # 文件已变化，视为未命中
             self._cache_misses += 1
             return None
 
         self._cache_hits += 1
+        self._resource_cache.move_to_end(key)
+
+        if entry.frozen:
+            return entry.data
+        return copy.deepcopy(entry.data)
 
-        import copy
+    def add(self, key: tuple[ResourceType, str], data: dict, mtime: float, *, frozen: bool = False) -> Any:
+        """向缓存写入一条记录，必要时按 LRU 淘汰。
 
-        return copy.deepcopy(cached_data)
+        Returns:
+            调用方应对外交付的载荷：只读模式下为冻结后的共享视图，复制模式下为原始 `data`。
+        """
+        stored = freeze_payload(data) if frozen else copy.deepcopy(data)
+        size_bytes = estimate_payload_bytes(stored)
+
+        previous = self._resource_cache.pop(key, None)
+        if previous is not None:
+            self._cache_bytes -= previous.size_bytes
+
+        self._resource_cache[key] = _CacheEntry(stored, mtime, frozen, size_bytes)
+        self._cache_bytes += size_bytes
+        self._evict_if_needed()
 
-    def add(self, key: tuple[ResourceType, str], data: dict, mtime: float) -> None:
-        """向缓存写入一条记录，必要时进行淘汰。"""
-        # 简单的 FIFO 淘汰：Python 3.7+ 字典保持插入顺序
-        if len(self._resource_cache) >= self._max_cache_size:
-            first_key = next(iter(self._resource_cache))
-            del self._resource_cache[first_key]
+        return stored if frozen else data
 
-        import copy
+    def _evict_if_needed(self) -> None:
+        # 至少保留最近写入的一条，避免单条超大载荷导致“写入即淘汰”
+        while len(self._resource_cache) > 1 and (
+            len(self._resource_cache) > self._max_cache_size or self._cache_bytes > self._max_cache_bytes
+        ):
+            _, evicted = self._resource_cache.popitem(last=False)
+            self._cache_bytes -= evicted.size_bytes
+            self._cache_evictions += 1
 
-        self._resource_cache[key] = (copy.deepcopy(data), mtime)
+    def _remove(self, key: tuple[ResourceType, str]) -> None:
+        entry = self._resource_cache.pop(key, None)
+        if entry is not None:
+            self._cache_bytes -= entry.size_bytes
 
     def clear(self, resource_type: Optional[ResourceType] = None, resource_id: Optional[str] = None) -> None:
         """根据条件清理缓存。
@@ -55,20 +100,20 @@ class ResourceCacheService:
         - 同时提供 resource_type 与 resource_id：清理单个资源。
         """
         if resource_type is not None and resource_id is not None:
-            cache_key = (resource_type, resource_id)
-            if cache_key in self._resource_cache:
-                del self._resource_cache[cache_key]
+            self._remove((resource_type, resource_id))
             return
 
         if resource_type is not None:
             keys_to_remove = [key for key in self._resource_cache.keys() if key[0] == resource_type]
             for key in keys_to_remove:
-                del self._resource_cache[key]
+                self._remove(key)
             return
 
         self._resource_cache.clear()
+        self._cache_bytes = 0
         self._cache_hits = 0
         self._cache_misses = 0
+        self._cache_evictions = 0
 
     def invalidate_by_file_change(self, resource_type: ResourceType, resource_id: str) -> None:
         """文件被修改时显式失效单条缓存。"""
@@ -78,12 +123,15 @@ class ResourceCacheService:
         """获取缓存统计数据。"""
         total_requests = self._cache_hits + self._cache_misses
         hit_rate = (self._cache_hits / total_requests * 100) if total_requests > 0 else 0.0
+        frozen_entries = sum(1 for entry in self._resource_cache.values() if entry.frozen)
         return {
             "cache_size": len(self._resource_cache),
             "max_cache_size": self._max_cache_size,
+            "cache_bytes": self._cache_bytes,
+            "max_cache_bytes": self._max_cache_bytes,
+            "frozen_entries": frozen_entries,
             "cache_hits": self._cache_hits,
             "cache_misses": self._cache_misses,
+            "cache_evictions": self._cache_evictions,
             "hit_rate": round(hit_rate, 2),
         }
-
-
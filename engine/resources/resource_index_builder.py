@@ -5,7 +5,7 @@
 
 - 按 `ResourceType` 扫描资源库目录，构建索引与 name/id 映射
 - 计算资源库指纹（文件数 + 最新修改时间）
-- 读写磁盘上的持久化索引缓存
+- 读写磁盘上的持久化索引缓存（按文件记录 mtime_ns/size，启动时只重新读取新增或修改过的文件）
 
 设计约束：
 - 不依赖 UI，仅依赖文件系统与 `ResourceType`
@@ -16,13 +16,15 @@
 from __future__ import annotations
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from engine.configs.resource_types import ResourceType
-from engine.graph.utils.metadata_extractor import load_graph_metadata_from_file
+from engine.graph.utils.metadata_extractor import load_graph_header_metadata_from_file
 from engine.resources.management_naming_rules import (
     get_id_and_display_name_fields,
 )
@@ -30,12 +32,16 @@ from engine.utils.logging.logger import log_info
 from engine.utils.cache.cache_paths import get_resource_cache_dir, get_resource_index_cache_file
 from engine.utils.name_utils import sanitize_resource_filename
 from .atomic_json import atomic_write_json
+from .json_header_scanner import scan_json_object_fields
 
 
-CheckAndSyncNameFn = Callable[[Path, ResourceType, str, str, Optional[dict]], bool]
+CheckAndSyncNameFn = Callable[..., bool]
+"""名称同步回调：(file_path, resource_type, resource_id, filename_without_ext, preloaded_data, *, scanned_fields)。"""
 
-RESOURCE_INDEX_CACHE_SCHEMA = "resource_index_cache/v1"
-RESOURCE_INDEX_CACHE_SCHEMA_VERSION = 1
+_JSON_FALLBACK_ID_FIELDS: Tuple[str, ...] = ("id", "resource_id", "preset_id", "config_id")
+
+RESOURCE_INDEX_CACHE_SCHEMA = "resource_index_cache/v2"
+RESOURCE_INDEX_CACHE_SCHEMA_VERSION = 2
 
 
 @dataclass
@@ -46,6 +52,52 @@ class ResourceIndexData:
     name_to_id_index: Dict[ResourceType, Dict[str, str]]
     id_to_filename_cache: Dict[ResourceType, Dict[str, str]]
     synced_file_count: int
+    rescanned_file_count: int = 0
+
+
+@dataclass
+class _ScannedResourceFile:
+    """单个资源文件的扫描结果（ID / 名称 / 扫描到的字段）。"""
+
+    file_path: Path
+    filename_without_ext: str
+    resource_id: str
+    resource_name: Optional[str]
+    scanned_fields: Dict[str, Any]
+
+
+@dataclass
+class _IndexedFileRecord:
+    """持久化索引中单个资源文件的记录；(mtime_ns, size) 与磁盘一致时视为未变化，无需重新读取。"""
+
+    mtime_ns: int
+    size: int
+    resource_id: str
+    filename_without_ext: str
+    name_keys: List[str]
+
+    def matches_stat(self, stat_result: os.stat_result) -> bool:
+        return self.mtime_ns == stat_result.st_mtime_ns and self.size == stat_result.st_size
+
+    def to_row(self) -> list:
+        return [self.mtime_ns, self.size, self.resource_id, self.filename_without_ext, self.name_keys]
+
+    @classmethod
+    def from_row(cls, row: list) -> "_IndexedFileRecord":
+        mtime_ns, size, resource_id, filename_without_ext, name_keys = row
+        return cls(
+            mtime_ns=int(mtime_ns),
+            size=int(size),
+            resource_id=str(resource_id),
+            filename_without_ext=str(filename_without_ext),
+            name_keys=[str(name_key) for name_key in name_keys],
+        )
+
+
+def _non_empty_id(raw_value: object) -> Optional[str]:
+    if isinstance(raw_value, str) and raw_value.strip():
+        return raw_value.strip()
+    return None
 
 
 class ResourceIndexBuilder:
@@ -53,7 +105,7 @@ class ResourceIndexBuilder:
 
     负责：
     - 扫描资源库目录，构建索引
-    - 维护资源指纹并读写持久化索引缓存
+    - 维护资源指纹并读写逐文件的持久化索引缓存
     """
 
     def __init__(self, workspace_path: Path, resource_library_dir: Path) -> None:
@@ -64,6 +116,8 @@ class ResourceIndexBuilder:
         """
         self.workspace_path = workspace_path
         self.resource_library_dir = resource_library_dir
+        # 最近一次扫描/恢复得到的逐文件记录（{类型: {路径: 记录}}），保存索引时据此判断哪些文件无需重新 stat
+        self._file_records: Dict[ResourceType, Dict[str, _IndexedFileRecord]] = {}
 
     def compute_resources_fingerprint(self) -> str:
         """计算当前资源库的指纹（文件数 + 最新修改时间）。"""
@@ -71,224 +125,70 @@ class ResourceIndexBuilder:
 
     # ===== 对外 API =====
 
-    def try_load_from_cache(self) -> Optional[ResourceIndexData]:
-        """尝试从持久化缓存恢复资源索引。
-
-        Returns:
-            命中缓存时返回 ResourceIndexData，否则返回 None。
-        """
-        cache_file = self._get_resource_index_cache_file()
-        if not cache_file.exists():
-            return None
+    def try_load_from_cache(
+        self,
+        check_and_sync_name: Optional[CheckAndSyncNameFn] = None,
+        *,
+        max_workers: Optional[int] = None,
+    ) -> Optional[ResourceIndexData]:
+        """从持久化缓存恢复资源索引，并按文件增量修补。
 
-        with open(cache_file, "r", encoding="utf-8") as file_obj:
-            data = json.load(file_obj)
+        缓存按文件记录 (路径, mtime_ns, size)：每个资源目录只遍历一次，未变化的文件直接沿用缓存记录，
+        新增/修改的文件重新扫描（并对这些文件执行名称同步），已删除的文件从索引中移除。
+        结果与全量扫描一致；发生变化时同时回写缓存。
 
-        manifest = data.get("__manifest__")
-        if manifest is not None:
-            if not isinstance(manifest, dict):
-                return None
-            schema_value = manifest.get("schema")
-            version_value = manifest.get("schema_version")
-            if schema_value != RESOURCE_INDEX_CACHE_SCHEMA:
-                return None
-            if version_value != RESOURCE_INDEX_CACHE_SCHEMA_VERSION:
-                return None
-
-        if (
-            "resources_fp" not in data
-            or "resource_index" not in data
-            or "name_to_id_index" not in data
-            or "id_to_filename_cache" not in data
-        ):
-            return None
+        Args:
+            check_and_sync_name: 名称同步回调，仅对重新扫描的文件调用；为 None 时不做同步。
+            max_workers: 目录遍历线程数，含义同 `build_index`。
 
-        saved_fingerprint = data.get("resources_fp", "")
-        current_fingerprint = self.compute_resources_fingerprint()
-        if saved_fingerprint != current_fingerprint:
+        Returns:
+            缓存存在且 schema 匹配时返回 ResourceIndexData，否则返回 None（由调用方走全量扫描）。
+        """
+        cached_records = self._load_cached_file_records()
+        if cached_records is None:
             return None
 
-        # 反序列化索引结构
-        resource_index_raw: Dict[str, Dict[str, str]] = data["resource_index"]
-        resource_index: Dict[ResourceType, Dict[str, Path]] = {}
-        for type_name, id_map in resource_index_raw.items():
-            resource_type = self._find_resource_type_by_name(type_name)
-            if resource_type is None:
-                continue
-            resource_index[resource_type] = {
-                resource_id: Path(path_str) for resource_id, path_str in id_map.items()
-            }
-
-        name_to_id_raw: Dict[str, Dict[str, str]] = data["name_to_id_index"]
-        name_to_id_index: Dict[ResourceType, Dict[str, str]] = {}
-        for type_name, name_map in name_to_id_raw.items():
-            resource_type = self._find_resource_type_by_name(type_name)
-            if resource_type is None:
-                continue
-            name_to_id_index[resource_type] = dict(name_map)
-
-        id_to_filename_raw: Dict[str, Dict[str, str]] = data["id_to_filename_cache"]
-        id_to_filename_cache: Dict[ResourceType, Dict[str, str]] = {}
-        for type_name, id_map in id_to_filename_raw.items():
-            resource_type = self._find_resource_type_by_name(type_name)
-            if resource_type is None:
-                continue
-            id_to_filename_cache[resource_type] = dict(id_map)
-
-        # 额外健壮性校验：对于 **JSON 资源类型**，如果当前磁盘上的文件数量
-        # 大于缓存中记录的条目数量，则认为缓存已过期，回退到全量扫描。
-        # 这样可以覆盖“外部脚本直接在资源库目录新增 JSON，但未通过 ResourceManager
-        # 触发索引重建”的情况。
-        parsed_counts = self._parse_resources_fingerprint(current_fingerprint)
-        for resource_type, (file_count, _latest_mtime) in parsed_counts.items():
-            # 节点图 / 结构体定义 / 信号等类型使用 `.py` 并有各自的过滤与解析规则，
-            # 文件数与索引条目数天然可能不同，这里仅对“顶层 JSON 资源类型”做数量一致性校验。
-            if resource_type in {
-                ResourceType.GRAPH,
-                ResourceType.STRUCT_DEFINITION,
-                ResourceType.SIGNAL,
-            }:
-                continue
-            if file_count <= 0:
-                continue
-            bucket = resource_index.get(resource_type, {})
-            if len(bucket) < file_count:
-                return None
-
-        # 额外健壮性校验：如果缓存中的任何资源路径已不存在，则视为缓存失效，回退到全量扫描。
-        for resource_type, id_map in resource_index.items():
-            for resource_id, resource_path in id_map.items():
-                if not resource_path.exists():
-                    return None
-
-        # 兼容过滤：移除任何指向以下划线开头 .py 文件的“节点图”条目（如 _prelude.py）
-        if ResourceType.GRAPH in resource_index:
-            to_remove: List[str] = []
-            for resource_id, path in resource_index[ResourceType.GRAPH].items():
-                try:
-                    if path.name.startswith("_"):
-                        to_remove.append(resource_id)
-                except Exception:
-                    # 无法判断路径名称时不移除
-                    pass
-            if to_remove:
-                for resource_id in to_remove:
-                    resource_index[ResourceType.GRAPH].pop(resource_id, None)
-                    if ResourceType.GRAPH in id_to_filename_cache:
-                        id_to_filename_cache[ResourceType.GRAPH].pop(resource_id, None)
-                    if ResourceType.GRAPH in name_to_id_index:
-                        name_map = name_to_id_index[ResourceType.GRAPH]
-                        keys_to_delete: List[str] = [
-                            key for key, value in name_map.items() if value == resource_id
-                        ]
-                        for key in keys_to_delete:
-                            name_map.pop(key, None)
-
-        total = sum(len(value) for value in resource_index.values())
-        log_info("[OK] 资源索引缓存命中，共 {} 个资源（跳过全量扫描）", total)
-
-        return ResourceIndexData(
-            resource_index=resource_index,
-            name_to_id_index=name_to_id_index,
-            id_to_filename_cache=id_to_filename_cache,
-            synced_file_count=0,
+        index_data, records_by_type = self._collect_index(check_and_sync_name, cached_records, max_workers)
+        removed_file_count = sum(
+            len(cached_records.get(resource_type, {}).keys() - records.keys())
+            for resource_type, records in records_by_type.items()
+        )
+        self._file_records = records_by_type
+        if index_data.rescanned_file_count or removed_file_count:
+            self._write_cache_file(records_by_type)
+
+        total = sum(len(value) for value in index_data.resource_index.values())
+        log_info(
+            "[OK] 资源索引缓存命中，共 {} 个资源（重新读取 {} 个文件，移除 {} 个文件）",
+            total,
+            index_data.rescanned_file_count,
+            removed_file_count,
         )
+        return index_data
 
-    def build_index(self, check_and_sync_name: CheckAndSyncNameFn) -> ResourceIndexData:
+    def build_index(
+        self,
+        check_and_sync_name: CheckAndSyncNameFn,
+        *,
+        max_workers: Optional[int] = None,
+    ) -> ResourceIndexData:
         """扫描资源库目录，构建资源索引和名称映射。
 
+        各资源类型目录在线程池中并行扫描（只读取 ID/名称所需的文件前缀或顶层字段），
+        随后在调用线程内按 `ResourceType` 顺序合并结果并执行名称同步，索引内容与顺序与串行扫描一致。
+
         Args:
             check_and_sync_name: 回调，用于在扫描过程中进行 name 与文件名的同步。
+            max_workers: 扫描线程数；默认取 min(资源类型数, CPU 核数 + 4)。
 
         Returns:
             ResourceIndexData，包含索引与同步数量。
         """
-        resource_index: Dict[ResourceType, Dict[str, Path]] = {}
-        name_to_id_index: Dict[ResourceType, Dict[str, str]] = {}
-        id_to_filename_cache: Dict[ResourceType, Dict[str, str]] = {}
-        synced_file_count = 0
-
-        for resource_type in ResourceType:
-            resource_index[resource_type] = {}
-            name_to_id_index[resource_type] = {}
-            id_to_filename_cache[resource_type] = {}
-            resource_dir = self._get_resource_directory(resource_type)
-
-            if not resource_dir.exists():
-                continue
-
-            # 节点图需要递归扫描子文件夹（支持 server/client 子目录）
-            if resource_type == ResourceType.GRAPH:
-                # 节点图只使用 .py 文件（类结构 Python 文件）
-                for py_file in resource_dir.rglob("*.py"):
-                    # 跳过以 "_" 开头的保留/辅助文件（例如 _prelude.py）
-                    if py_file.name.startswith("_"):
-                        continue
-                    # 跳过校验脚本（如 校验节点图.py），这些不是真正的节点图文件
-                    if "校验" in py_file.stem:
-                        continue
-                    filename_without_ext = py_file.stem
-
-                    # 读取文件获取 graph_id（从 docstring 元数据中）
-                    resource_id = self._extract_graph_id_from_file(py_file)
-                    if not resource_id:
-                        # 如果无法从文件中提取 ID，使用文件名作为 ID
-                        resource_id = filename_without_ext
-
-                    resource_index[resource_type][resource_id] = py_file
-                    id_to_filename_cache[resource_type][resource_id] = filename_without_ext
-                    name_to_id_index[resource_type][filename_without_ext] = resource_id
-
-                    if check_and_sync_name(
-                        py_file,
-                        resource_type,
-                        resource_id,
-                        filename_without_ext,
-                        None,
-                    ):
-                        synced_file_count += 1
-            else:
-                # 其他资源类型只扫描直接子文件
-                for json_file in resource_dir.glob("*.json"):
-                    filename_without_ext = json_file.stem
-
-                    # 读取 JSON 文件获取 ID 和 name
-                    resource_id, resource_name, resource_payload = self._extract_id_and_name_from_json(
-                        json_file, resource_type
-                    )
-                    if not resource_id:
-                        # 如果无法从文件中提取 ID，使用文件名作为 ID
-                        resource_id = filename_without_ext
-
-                    resource_index[resource_type][resource_id] = json_file
-                    id_to_filename_cache[resource_type][resource_id] = filename_without_ext
-                    if resource_name:
-                        sanitized_name = sanitize_resource_filename(resource_name)
-                        name_to_id_index[resource_type][sanitized_name] = resource_id
-
-                    # 检查文件名与内部 name 是否一致，如果不一致则同步
-                    if check_and_sync_name(
-                        json_file,
-                        resource_type,
-                        resource_id,
-                        filename_without_ext,
-                        resource_payload,
-                    ):
-                        synced_file_count += 1
-
-        # 将索引写入持久化缓存
-        self._save_persistent_resource_index(
-            resource_index=resource_index,
-            name_to_id_index=name_to_id_index,
-            id_to_filename_cache=id_to_filename_cache,
-        )
-
-        return ResourceIndexData(
-            resource_index=resource_index,
-            name_to_id_index=name_to_id_index,
-            id_to_filename_cache=id_to_filename_cache,
-            synced_file_count=synced_file_count,
-        )
+        index_data, records_by_type = self._collect_index(check_and_sync_name, {}, max_workers)
+        # 将逐文件记录写入持久化缓存
+        self._file_records = records_by_type
+        self._write_cache_file(records_by_type)
+        return index_data
 
     def clear_persistent_cache(self) -> int:
         """清空磁盘上的资源索引缓存。
@@ -309,6 +209,185 @@ class ResourceIndexBuilder:
 
     # ===== 内部工具方法 =====
 
+    def _collect_index(
+        self,
+        check_and_sync_name: Optional[CheckAndSyncNameFn],
+        cached_records: Dict[ResourceType, Dict[str, _IndexedFileRecord]],
+        max_workers: Optional[int],
+    ) -> Tuple[ResourceIndexData, Dict[ResourceType, Dict[str, _IndexedFileRecord]]]:
+        """并行遍历各资源类型目录并按 `ResourceType` 顺序合并为索引（缓存为空时即全量扫描）。"""
+        resource_types = list(ResourceType)
+        worker_count = max_workers or min(len(resource_types), (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=max(1, worker_count)) as executor:
+            refreshed_by_type = list(
+                executor.map(
+                    lambda resource_type: self._refresh_resource_type(
+                        resource_type, cached_records.get(resource_type, {})
+                    ),
+                    resource_types,
+                )
+            )
+
+        records_by_type: Dict[ResourceType, Dict[str, _IndexedFileRecord]] = {}
+        rescanned_file_count = 0
+        synced_file_count = 0
+        for resource_type, (records, rescanned_files) in zip(resource_types, refreshed_by_type):
+            records_by_type[resource_type] = records
+            rescanned_file_count += len(rescanned_files)
+            if check_and_sync_name is None:
+                continue
+            for scanned in rescanned_files:
+                # 检查文件名与内部 name 是否一致，如果不一致则同步
+                # （回写会改变文件 mtime，下次启动时该文件会被重新读取一次，索引随之更新）
+                if check_and_sync_name(
+                    scanned.file_path,
+                    resource_type,
+                    scanned.resource_id,
+                    scanned.filename_without_ext,
+                    None,
+                    scanned_fields=scanned.scanned_fields,
+                ):
+                    synced_file_count += 1
+
+        resource_index, name_to_id_index, id_to_filename_cache = self._maps_from_records(records_by_type)
+        index_data = ResourceIndexData(
+            resource_index=resource_index,
+            name_to_id_index=name_to_id_index,
+            id_to_filename_cache=id_to_filename_cache,
+            synced_file_count=synced_file_count,
+            rescanned_file_count=rescanned_file_count,
+        )
+        return index_data, records_by_type
+
+    def _refresh_resource_type(
+        self,
+        resource_type: ResourceType,
+        cached_records: Dict[str, _IndexedFileRecord],
+    ) -> Tuple[Dict[str, _IndexedFileRecord], List[_ScannedResourceFile]]:
+        """遍历单个资源类型目录：未变化的文件沿用缓存记录，其余文件重新扫描（可在工作线程中执行）。
+
+        Returns:
+            (按遍历顺序排列的 {路径: 记录}, 本次重新扫描的文件列表)
+        """
+        records: Dict[str, _IndexedFileRecord] = {}
+        rescanned_files: List[_ScannedResourceFile] = []
+        for file_path, stat_result in self._iter_resource_files(resource_type):
+            path_key = str(file_path)
+            record = cached_records.get(path_key)
+            if record is None or not record.matches_stat(stat_result):
+                scanned = self._scan_resource_file(resource_type, file_path)
+                record = _IndexedFileRecord(
+                    mtime_ns=stat_result.st_mtime_ns,
+                    size=stat_result.st_size,
+                    resource_id=scanned.resource_id,
+                    filename_without_ext=scanned.filename_without_ext,
+                    name_keys=self._name_keys_for_scanned(resource_type, scanned),
+                )
+                rescanned_files.append(scanned)
+            records[path_key] = record
+        return records, rescanned_files
+
+    def _iter_resource_files(self, resource_type: ResourceType) -> List[Tuple[Path, os.stat_result]]:
+        """列出资源类型目录下参与索引的文件及其 stat（一次目录遍历）。
+
+        - 节点图：递归扫描 .py（支持 server/client 子目录），目录按先序遍历、不跟随符号链接；
+        - 其他资源类型：只扫描直接子目录下的 .json。
+        """
+        resource_dir = self._get_resource_directory(resource_type)
+        if not resource_dir.exists():
+            return []
+
+        found_files: List[Tuple[Path, os.stat_result]] = []
+        if resource_type != ResourceType.GRAPH:
+            with os.scandir(resource_dir) as entries:
+                for entry in entries:
+                    if os.path.normcase(entry.name).endswith(".json") and entry.is_file():
+                        found_files.append((Path(entry.path), entry.stat()))
+            return found_files
+
+        pending_dirs: List[str] = [str(resource_dir)]
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            sub_dirs: List[str] = []
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.path)
+                        continue
+                    name = entry.name
+                    if not os.path.normcase(name).endswith(".py") or not entry.is_file():
+                        continue
+                    # 跳过以 "_" 开头的保留/辅助文件（例如 _prelude.py）
+                    if name.startswith("_"):
+                        continue
+                    # 跳过校验脚本（如 校验节点图.py），这些不是真正的节点图文件
+                    if "校验" in name[: -len(".py")]:
+                        continue
+                    found_files.append((Path(entry.path), entry.stat()))
+            # 逆序压栈，使子目录按 scandir 顺序出栈（与 rglob 的先序遍历一致）
+            pending_dirs.extend(reversed(sub_dirs))
+        return found_files
+
+    def _scan_resource_file(self, resource_type: ResourceType, file_path: Path) -> _ScannedResourceFile:
+        """读取单个资源文件的 ID / 名称（节点图只读 docstring，JSON 只读顶层字段）。"""
+        filename_without_ext = file_path.stem
+        if resource_type == ResourceType.GRAPH:
+            metadata = load_graph_header_metadata_from_file(file_path)
+            return _ScannedResourceFile(
+                file_path=file_path,
+                filename_without_ext=filename_without_ext,
+                # 如果无法从文件中提取 ID，使用文件名作为 ID
+                resource_id=metadata.graph_id or filename_without_ext,
+                resource_name=metadata.graph_name or None,
+                scanned_fields={"graph_name": metadata.graph_name},
+            )
+
+        resource_id, resource_name, scanned_fields = self._extract_id_and_name_from_json(
+            file_path, resource_type
+        )
+        return _ScannedResourceFile(
+            file_path=file_path,
+            filename_without_ext=filename_without_ext,
+            resource_id=resource_id or filename_without_ext,
+            resource_name=resource_name,
+            scanned_fields=scanned_fields,
+        )
+
+    @staticmethod
+    def _name_keys_for_scanned(resource_type: ResourceType, scanned: _ScannedResourceFile) -> List[str]:
+        """该文件在 name_to_id_index 中登记的名称键：节点图用文件名，JSON 用规范化后的 name。"""
+        if resource_type == ResourceType.GRAPH:
+            return [scanned.filename_without_ext]
+        if scanned.resource_name:
+            return [sanitize_resource_filename(scanned.resource_name)]
+        return []
+
+    @staticmethod
+    def _maps_from_records(
+        records_by_type: Dict[ResourceType, Dict[str, _IndexedFileRecord]],
+    ) -> Tuple[
+        Dict[ResourceType, Dict[str, Path]],
+        Dict[ResourceType, Dict[str, str]],
+        Dict[ResourceType, Dict[str, str]],
+    ]:
+        """按遍历顺序由逐文件记录生成三张索引表（同 ID 的多个文件以后出现者为准，与全量扫描一致）。"""
+        resource_index: Dict[ResourceType, Dict[str, Path]] = {}
+        name_to_id_index: Dict[ResourceType, Dict[str, str]] = {}
+        id_to_filename_cache: Dict[ResourceType, Dict[str, str]] = {}
+        for resource_type in ResourceType:
+            id_map: Dict[str, Path] = {}
+            name_map: Dict[str, str] = {}
+            filename_map: Dict[str, str] = {}
+            for path_key, record in records_by_type.get(resource_type, {}).items():
+                id_map[record.resource_id] = Path(path_key)
+                filename_map[record.resource_id] = record.filename_without_ext
+                for name_key in record.name_keys:
+                    name_map[name_key] = record.resource_id
+            resource_index[resource_type] = id_map
+            name_to_id_index[resource_type] = name_map
+            id_to_filename_cache[resource_type] = filename_map
+        return resource_index, name_to_id_index, id_to_filename_cache
+
     def _get_resource_index_cache_dir(self) -> Path:
         return get_resource_cache_dir(self.workspace_path)
 
@@ -356,43 +435,54 @@ class ResourceIndexBuilder:
             parts.append(f"{resource_type.name}:{file_count}:{round(latest_mtime, 3)}")
         return "|".join(parts)
 
-    @staticmethod
-    def _parse_resources_fingerprint(fingerprint: str) -> Dict[ResourceType, Tuple[int, float]]:
-        """
-        将指纹字符串解析为 {ResourceType: (file_count, latest_mtime)} 形式。
-
-        指纹格式示例：
-        TEMPLATE:4:1764757166.98|INSTANCE:5:1764987035.256|...
-        """
-        result: Dict[ResourceType, Tuple[int, float]] = {}
-        if not fingerprint:
-            return result
-
-        for part in fingerprint.split("|"):
-            if not part:
-                continue
-            segments = part.split(":")
-            if len(segments) != 3:
-                continue
-            type_name, count_str, mtime_str = segments
-            resource_type = ResourceIndexBuilder._find_resource_type_by_name(type_name)
-            if resource_type is None:
-                continue
-            try:
-                file_count = int(float(count_str))
-                latest_mtime = float(mtime_str)
-            except ValueError:
-                continue
-            result[resource_type] = (file_count, latest_mtime)
-        return result
-
     def _save_persistent_resource_index(
         self,
         resource_index: Dict[ResourceType, Dict[str, Path]],
         name_to_id_index: Dict[ResourceType, Dict[str, str]],
         id_to_filename_cache: Dict[ResourceType, Dict[str, str]],
     ) -> None:
-        """将当前索引写入磁盘缓存。"""
+        """将当前内存中的索引写入磁盘缓存（保存/删除资源后调用）。
+
+        内存索引映射回逐文件记录：映射未变化的文件沿用扫描时的记录（不 stat，外部修改仍能在下次启动时被发现）；
+        映射有变化的文件按当前 stat 重新记录；索引中不存在的文件记录原样保留，由下次启动的目录遍历决定去留。
+        """
+        records_by_type: Dict[ResourceType, Dict[str, _IndexedFileRecord]] = {}
+        for resource_type in ResourceType:
+            previous_records = self._file_records.get(resource_type, {})
+            records = dict(previous_records)
+            name_keys_by_id: Dict[str, List[str]] = {}
+            for name_key, resource_id in name_to_id_index.get(resource_type, {}).items():
+                name_keys_by_id.setdefault(resource_id, []).append(name_key)
+            filename_map = id_to_filename_cache.get(resource_type, {})
+
+            for resource_id, resource_path in resource_index.get(resource_type, {}).items():
+                path_key = str(resource_path)
+                filename_without_ext = filename_map.get(resource_id, resource_path.stem)
+                name_keys = name_keys_by_id.get(resource_id, [])
+                previous = previous_records.get(path_key)
+                if previous is not None and (
+                    previous.resource_id == resource_id
+                    and previous.filename_without_ext == filename_without_ext
+                    and previous.name_keys == name_keys
+                ):
+                    continue
+                if not resource_path.exists():
+                    continue
+                stat_result = resource_path.stat()
+                records[path_key] = _IndexedFileRecord(
+                    mtime_ns=stat_result.st_mtime_ns,
+                    size=stat_result.st_size,
+                    resource_id=resource_id,
+                    filename_without_ext=filename_without_ext,
+                    name_keys=name_keys,
+                )
+            records_by_type[resource_type] = records
+
+        self._file_records = records_by_type
+        self._write_cache_file(records_by_type)
+
+    def _write_cache_file(self, records_by_type: Dict[ResourceType, Dict[str, _IndexedFileRecord]]) -> None:
+        """写入逐文件记录：{类型名: {路径: [mtime_ns, size, resource_id, 文件名, [名称键...]]}}。"""
         cache_dir = self._get_resource_index_cache_dir()
         cache_dir.mkdir(parents=True, exist_ok=True)
         cache_file = self._get_resource_index_cache_file()
@@ -403,78 +493,100 @@ class ResourceIndexBuilder:
                 "generated_at": datetime.now().isoformat(),
                 "source": "engine.resources.ResourceIndexBuilder",
             },
-            "resources_fp": self.compute_resources_fingerprint(),
-            "resource_index": {
-                resource_type.name: {
-                    resource_id: str(path) for resource_id, path in id_map.items()
-                }
-                for resource_type, id_map in resource_index.items()
-            },
-            "name_to_id_index": {
-                resource_type.name: mapping for resource_type, mapping in name_to_id_index.items()
-            },
-            "id_to_filename_cache": {
-                resource_type.name: mapping
-                for resource_type, mapping in id_to_filename_cache.items()
+            "files": {
+                resource_type.name: {path_key: record.to_row() for path_key, record in records.items()}
+                for resource_type, records in records_by_type.items()
             },
             "cached_at": datetime.now().isoformat(),
         }
         atomic_write_json(cache_file, payload, ensure_ascii=False, indent=2)
 
-    @staticmethod
-    def _extract_graph_id_from_file(py_file: Path) -> Optional[str]:
-        """从节点图文件的 docstring 中提取 graph_id。"""
-        metadata = load_graph_metadata_from_file(py_file)
-        return metadata.graph_id or None
+    def _load_cached_file_records(self) -> Optional[Dict[ResourceType, Dict[str, _IndexedFileRecord]]]:
+        """读取逐文件记录；缓存不存在或 schema 不匹配（含旧版整库指纹格式）时返回 None。"""
+        cache_file = self._get_resource_index_cache_file()
+        if not cache_file.exists():
+            return None
+
+        with open(cache_file, "r", encoding="utf-8") as file_obj:
+            data = json.load(file_obj)
+
+        manifest = data.get("__manifest__")
+        if not isinstance(manifest, dict):
+            return None
+        if manifest.get("schema") != RESOURCE_INDEX_CACHE_SCHEMA:
+            return None
+        if manifest.get("schema_version") != RESOURCE_INDEX_CACHE_SCHEMA_VERSION:
+            return None
+        files_raw = data.get("files")
+        if not isinstance(files_raw, dict):
+            return None
+
+        records_by_type: Dict[ResourceType, Dict[str, _IndexedFileRecord]] = {}
+        for type_name, rows in files_raw.items():
+            resource_type = self._find_resource_type_by_name(type_name)
+            if resource_type is None or not isinstance(rows, dict):
+                continue
+            records_by_type[resource_type] = {
+                path_key: _IndexedFileRecord.from_row(row) for path_key, row in rows.items()
+            }
+        return records_by_type
 
     @staticmethod
     def _extract_id_and_name_from_json(
         json_file: Path, resource_type: ResourceType
     ) -> Tuple[Optional[str], Optional[str], dict]:
-        """从 JSON 文件中提取资源 ID、名称及原始数据。
-        
+        """从 JSON 文件中提取资源 ID、名称及扫描到的顶层字段。
+
         约定：
         - 模板/实例使用各自的 *_id 字段；
         - 聊天频道等管理配置可使用各自领域内约定的 ID 字段；
         - 其余资源优先使用通用的 `id` / `resource_id` / `preset_id` / `config_id`；
         - 名称优先读取通用 `name` 字段，对部分管理配置（如聊天频道）回退到业务字段。
-        
+
         设计目标：
         - 索引扫描仅依赖 JSON 内容中的 ID 与名称字段，与物理文件名解耦；
         - 当类型专用 ID 字段缺失时，自动回退到通用 ID 字段，兼容“仅写 id 字段、
-          使用人类可读名称作为文件名”的资源文件。
+          使用人类可读名称作为文件名”的资源文件；
+        - 只扫描顶层字段，ID 与名称均已确定时立即停止，不反序列化整份文件。
         """
-        with open(json_file, "r", encoding="utf-8") as file_obj:
-            data = json.load(file_obj)
-
         id_field, explicit_name_field = get_id_and_display_name_fields(resource_type)
-
-        # 统一的 ID 提取规则：
-        # 1. 若为该资源类型声明了专用 ID 字段，则优先使用该字段；
-        # 2. 当专用 ID 字段缺失或为空时，回退到通用 ID 字段：
-        #    - `id` / `resource_id` / `preset_id` / `config_id`
-        #    这样可以兼容“仅写通用 id 字段、文件名使用名称”的场景。
+        # 统一的 ID 提取规则：若为该资源类型声明了专用 ID 字段，则优先使用该字段；
+        # 缺失或为空时回退到通用 ID 字段（见 `_JSON_FALLBACK_ID_FIELDS`）。
         candidate_id_field = id_field if id_field is not None else "id"
-
-        resource_id: Optional[str] = None
-        raw_candidate_value = data.get(candidate_id_field)
-        if isinstance(raw_candidate_value, str) and raw_candidate_value.strip():
-            resource_id = raw_candidate_value.strip()
-
+        wanted_fields = {candidate_id_field, "name", *_JSON_FALLBACK_ID_FIELDS}
+        if explicit_name_field:
+            wanted_fields.add(explicit_name_field)
+
+        def is_resolved(found: Dict[str, object]) -> bool:
+            if _non_empty_id(found.get(candidate_id_field)) is None:
+                return False
+            if "name" not in found:
+                return False
+            return bool(found["name"]) or not explicit_name_field or explicit_name_field in found
+
+        text = json_file.read_text(encoding="utf-8")
+        scan_result = scan_json_object_fields(text, wanted_fields, is_resolved)
+        if scan_result is None:
+            # 非对象或结构异常：回退为完整解析（保持 json 原有的报错行为）
+            data = json.loads(text)
+            fields = {key: data[key] for key in wanted_fields if key in data}
+        else:
+            fields = scan_result[0]
+
+        resource_id = _non_empty_id(fields.get(candidate_id_field))
         if resource_id is None:
-            for possible_id in ["id", "resource_id", "preset_id", "config_id"]:
-                raw_value = data.get(possible_id)
-                if isinstance(raw_value, str) and raw_value.strip():
-                    resource_id = raw_value.strip()
+            for possible_id in _JSON_FALLBACK_ID_FIELDS:
+                resource_id = _non_empty_id(fields.get(possible_id))
+                if resource_id is not None:
                     break
 
         # 名称：通用 `name` 字段优先，其次回退到各资源类型约定的显示名字段
         # （例如 timer_name / variable_name / resource_name 等）。
-        resource_name = data.get("name")
+        resource_name = fields.get("name")
         if not resource_name and explicit_name_field:
-            resource_name = data.get(explicit_name_field)
+            resource_name = fields.get(explicit_name_field)
 
-        return resource_id, resource_name, data
+        return resource_id, resource_name, fields
 
     @staticmethod
     def _find_resource_type_by_name(type_name: str) -> Optional[ResourceType]:
@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Dict, Optional
 
 from engine.configs.resource_types import ResourceType
-from engine.graph.utils.metadata_extractor import load_graph_metadata_from_file
+from engine.graph.utils.metadata_extractor import load_graph_header_metadata_from_file
 from engine.resources.resource_index_builder import ResourceIndexBuilder
 from engine.utils.logging.logger import log_info
 from engine.utils.cache.cache_paths import get_name_sync_state_file
@@ -62,18 +62,25 @@ class ResourceIndexService:
         resource_id: str,
         filename_without_ext: str,
         preloaded_data: Optional[dict] = None,
+        *,
+        scanned_fields: Optional[dict] = None,
     ) -> bool:
         """检查文件名与内部 name 字段是否一致，并按策略执行同步。
 
         重要：仅对“保存时以 name 驱动物理文件名”的 JSON 资源类型允许做
         “文件名 -> name”的写回同步。否则会与 `id_to_filename_cache` 的默认
         “沿用旧文件名”策略冲突，导致 UI 改名被扫描回滚。
+
+        `scanned_fields` 为索引扫描阶段已读取的字段（节点图为 graph_name，JSON 为顶层 name 等），
+        提供时直接用于比较，仅在确需回写时才完整读取 JSON。
         """
         data_payload: Optional[dict] = preloaded_data
 
         if resource_type == ResourceType.GRAPH:
-            metadata = load_graph_metadata_from_file(file_path)
-            internal_name = metadata.graph_name
+            if scanned_fields is not None:
+                internal_name = scanned_fields.get("graph_name", "")
+            else:
+                internal_name = load_graph_header_metadata_from_file(file_path).graph_name
             if internal_name:
                 sanitized = self._file_ops.sanitize_filename(internal_name)
                 if sanitized != filename_without_ext:
@@ -100,16 +107,20 @@ class ResourceIndexService:
         if not resource_type_should_sync_json_name_with_filename(resource_type):
             return False
 
-        if data_payload is None:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data_payload = json.load(f)
+        if data_payload is None and scanned_fields is None:
+            data_payload = self._load_json_payload(file_path)
 
-        internal_name = data_payload.get("name", "")
+        if data_payload is not None:
+            internal_name = data_payload.get("name", "")
+        else:
+            internal_name = scanned_fields.get("name", "")
         if not internal_name:
             return False
 
         sanitized_internal_name = self._file_ops.sanitize_filename(internal_name)
         if sanitized_internal_name != filename_without_ext:
+            if data_payload is None:
+                data_payload = self._load_json_payload(file_path)
             data_payload["name"] = filename_without_ext
             data_payload["updated_at"] = datetime.now().isoformat()
 
@@ -126,19 +137,22 @@ class ResourceIndexService:
 
         return False
 
+    @staticmethod
+    def _load_json_payload(file_path: Path) -> dict:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
     def build_index(self) -> None:
-        """扫描资源库目录，构建资源索引和名称映射。"""
-        cached = self._index_builder.try_load_from_cache()
-        if cached is not None:
-            self.resource_index.clear()
-            self.resource_index.update(cached.resource_index)
-            self.name_to_id_index.clear()
-            self.name_to_id_index.update(cached.name_to_id_index)
-            self.id_to_filename_cache.clear()
-            self.id_to_filename_cache.update(cached.id_to_filename_cache)
-            return
-
-        index_data = self._index_builder.build_index(self._check_and_sync_name)
+        """扫描资源库目录，构建资源索引和名称映射。
+
+        存在持久化索引缓存时只重新读取新增/修改过的文件（并仅对这些文件做名称同步），否则全量扫描。
+        """
+        index_data = self._index_builder.try_load_from_cache(self._check_and_sync_name)
+        if index_data is None:
+            index_data = self._index_builder.build_index(self._check_and_sync_name)
+            total_resources = sum(len(resources) for resources in index_data.resource_index.values())
+            log_info("[OK] 资源索引构建完成，共加载 {} 个资源", total_resources)
+
         self.resource_index.clear()
         self.resource_index.update(index_data.resource_index)
         self.name_to_id_index.clear()
@@ -146,8 +160,6 @@ class ResourceIndexService:
         self.id_to_filename_cache.clear()
         self.id_to_filename_cache.update(index_data.id_to_filename_cache)
 
-        total_resources = sum(len(resources) for resources in self.resource_index.values())
-        log_info("[OK] 资源索引构建完成，共加载 {} 个资源", total_resources)
         if index_data.synced_file_count > 0:
             log_info(
                 "[同步] 自动同步了 {} 个文件的name字段（文件名已被手动修改）",
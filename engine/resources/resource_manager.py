@@ -17,7 +17,9 @@ from engine.resources.management_naming_rules import (
 from engine.resources.resource_index_builder import ResourceIndexBuilder
 from engine.utils.logging.logger import log_error, log_info, log_warn
 from engine.utils.cache.cache_paths import get_node_cache_dir
+from engine.utils.cache.frozen_payload import thaw_payload
 from .graph_resource_service import GraphResourceService
+from .graph_summary_index import GraphSummaryIndex
 from .resource_cache_service import ResourceCacheService
 from .resource_file_ops import ResourceFileOps
 from .resource_index_service import ResourceIndexService
@@ -44,6 +46,7 @@ class ResourceManager:
         graph_service: Optional[GraphResourceService] = None,
         graph_code_generator: Optional[object] = None,
         max_cache_size: int = 500,
+        max_cache_bytes: int = 512 * 1024 * 1024,
     ):
         """初始化资源管理器。
 
@@ -60,6 +63,7 @@ class ResourceManager:
             graph_service: 自定义图资源服务
             graph_code_generator: 可注入的“节点图源码生成器”（应用层实现），仅 GraphResourceService.save_graph 使用
             max_cache_size: 资源缓存最大尺寸
+            max_cache_bytes: 资源缓存字节预算（估算值，超出后按 LRU 淘汰）
         """
         self.workspace_path = workspace_path
         self.resource_library_dir = workspace_path / "assets" / "资源库"
@@ -83,7 +87,8 @@ class ResourceManager:
         )
 
         self._cache_service = cache_service or ResourceCacheService(
-            max_cache_size=self._max_cache_size
+            max_cache_size=self._max_cache_size,
+            max_cache_bytes=max_cache_bytes,
         )
         self._file_ops = file_ops or ResourceFileOps(self.resource_library_dir)
         self._resource_store = resource_store or JsonResourceStore(
@@ -106,6 +111,7 @@ class ResourceManager:
             graph_code_generator=graph_code_generator,
         )
         self._metadata_service = ResourceMetadataService()
+        self._graph_summary_index: Optional[GraphSummaryIndex] = None
         self._resource_library_fingerprint: str = ""
         # 指纹脏标记：当资源被保存时设为 True，延迟到下次需要时再重新计算
         self._fingerprint_invalidated: bool = False
@@ -177,6 +183,16 @@ class ResourceManager:
             ]
         )
 
+    def get_graph_summary_index(self) -> GraphSummaryIndex:
+        """节点图摘要索引（惰性创建）：按复合节点/信号/结构体/节点标题反查节点图，无需加载节点图。"""
+        if self._graph_summary_index is None:
+            self._graph_summary_index = GraphSummaryIndex(
+                self.workspace_path,
+                self,
+                node_defs_fingerprint=self._graph_service.get_current_node_defs_fingerprint,
+            )
+        return self._graph_summary_index
+
     def get_resource_library_fingerprint(self) -> str:
         """获取最近一次记录的资源库指纹。"""
         return self._resource_library_fingerprint
@@ -262,6 +278,8 @@ class ResourceManager:
             resource_id: 如果指定，只清除该资源的缓存
         """
         self._cache_service.clear(resource_type, resource_id)
+        if resource_type is None or resource_type == ResourceType.GRAPH:
+            self._graph_service.clear_graph_structure_cache(resource_id)
     
     def get_cache_stats(self) -> dict:
         """获取缓存统计信息
@@ -270,8 +288,12 @@ class ResourceManager:
             缓存统计字典，包含：
             - cache_size: 当前缓存条目数
             - max_cache_size: 最大缓存条目数
+            - cache_bytes: 当前缓存估算字节数
+            - max_cache_bytes: 缓存字节预算
+            - frozen_entries: 以只读视图共享的条目数（节点图载荷）
             - cache_hits: 缓存命中次数
             - cache_misses: 缓存未命中次数
+            - cache_evictions: LRU 淘汰次数
             - hit_rate: 缓存命中率（百分比）
         """
         return self._cache_service.get_stats()
@@ -290,7 +312,7 @@ class ResourceManager:
         return self._index_service.clear_persistent_cache()
     
     def clear_persistent_graph_cache_for(self, graph_id: str) -> int:
-        """按图ID清除节点图的持久化缓存文件（app/runtime/cache/graph_cache/<graph_id>.json）。
+        """按图ID清除节点图的持久化缓存文件（app/runtime/cache/graph_cache/<graph_id>.gcache）。
         
         Returns:
             被删除的缓存文件数量（0或1）
@@ -331,7 +353,7 @@ class ResourceManager:
         """清除所有缓存（内存+磁盘节点图缓存）。
         
         - 内存缓存：资源数据LRU缓存、元数据缓存
-        - 磁盘缓存：app/runtime/cache/graph_cache 下的持久化缓存
+        - 磁盘缓存：app/runtime/cache/graph_cache 下的持久化缓存、资源索引、节点库缓存与节点图摘要索引
         
         Returns:
             {"removed_persistent_files": int, "memory_cache_cleared": bool}
@@ -340,6 +362,7 @@ class ResourceManager:
         removed_persistent_files += self.clear_persistent_graph_cache()
         removed_persistent_files += self.clear_persistent_resource_index_cache()
         removed_persistent_files += self.clear_persistent_node_cache()
+        removed_persistent_files += self.get_graph_summary_index().clear_persistent_cache()
         self.clear_cache()
         return {"removed_persistent_files": removed_persistent_files, "memory_cache_cleared": True}
     
@@ -517,18 +540,26 @@ class ResourceManager:
         
         return True
     
-    def load_resource(self, resource_type: ResourceType, resource_id: str) -> Optional[dict]:
+    def load_resource(
+        self,
+        resource_type: ResourceType,
+        resource_id: str,
+        *,
+        need_layout: bool = True,
+    ) -> Optional[dict]:
         """加载单个资源（带缓存）
         
         Args:
             resource_type: 资源类型
             resource_id: 资源ID
+            need_layout: 仅对节点图生效。False 时返回未布局的结构图（不含坐标/基本块/数据副本），
+                适合只读取节点与连线结构、不展示画布的调用方（校验、引用查询、搜索）。
         
         Returns:
             资源数据（字典格式），如果不存在返回None
         """
         if resource_type == ResourceType.GRAPH:
-            return self._graph_service.load_graph(resource_id)
+            return self._graph_service.load_graph(resource_id, need_layout=need_layout)
         return self._resource_store.load(resource_type, resource_id)
     
     def load_graph_metadata(self, graph_id: str) -> Optional[dict]:
@@ -757,10 +788,10 @@ class ResourceManager:
         """获取用于 UI 展示与搜索的资源元数据（统一格式）。
 
         说明：
-        - 对多数资源类型，该方法会读取资源 payload（节点图会触发解析与布局，因此不适合在“列表页”高频调用）。
+        - 对多数资源类型，该方法会读取资源 payload（节点图只解析结构、不做布局，但仍不适合在“列表页”高频调用）。
         - 节点图的列表展示应优先走 `load_graph_metadata()` 的轻量路径。
         """
-        payload = self.load_resource(resource_type, resource_id)
+        payload = self.load_resource(resource_type, resource_id, need_layout=False)
         if not payload:
             return None
         return self._metadata_service.build_resource_metadata(resource_type, resource_id, payload)
@@ -976,10 +1007,11 @@ class ResourceManager:
             graph_id: 节点图 ID
             new_folder_path: 目标文件夹路径（空字符串表示根目录）
         """
-        # 加载节点图数据
+        # 加载节点图数据（缓存返回只读视图，修改前先解冻）
         graph_data = self.load_resource(ResourceType.GRAPH, graph_id)
         if not graph_data:
             raise ValueError(f"节点图 {graph_id} 不存在")
+        graph_data = thaw_payload(graph_data)
         
         # 更新 folder_path
         new_folder_path = self.sanitize_folder_path(new_folder_path)
@@ -1018,7 +1050,7 @@ class ResourceManager:
                 
                 # 检查是否在目标文件夹或其子文件夹中
                 if folder_path == old_folder_path or folder_path.startswith(old_folder_path + "/"):
-                    affected_graphs.append((graph_id, graph_data, folder_path))
+                    affected_graphs.append((graph_id, thaw_payload(graph_data), folder_path))
         
         log_info("[重命名文件夹] 受影响的节点图数量: {}", len(affected_graphs))
         
@@ -1058,7 +1090,7 @@ class ResourceManager:
         if file_path:
             return file_path
         
-        graph_data = self.load_resource(ResourceType.GRAPH, graph_id)
+        graph_data = self.load_resource(ResourceType.GRAPH, graph_id, need_layout=False)
         if graph_data:
             return self._state.get_file_path(ResourceType.GRAPH, graph_id)
         
@@ -138,7 +138,10 @@ class SignalBindingService:
 
         该方法用于管理面板与存档库中展示“每个信号在哪些图中被使用”。
         """
-        from engine.validate.comprehensive_rules.helpers import iter_all_package_graphs
+        from engine.validate.comprehensive_rules.helpers import (
+            build_node_title_graph_filter,
+            iter_all_package_graphs,
+        )
 
         resource_manager = getattr(package, "resource_manager", None)
         templates = getattr(package, "templates", None)
@@ -153,6 +156,10 @@ class SignalBindingService:
             templates,
             instances,
             level_entity,
+            graph_filter=build_node_title_graph_filter(
+                resource_manager,
+                (SIGNAL_SEND_NODE_TITLE, SIGNAL_LISTEN_NODE_TITLE),
+            ),
         ):
             graph_config = attachment.graph_config
             if getattr(graph_config, "graph_type", "") != "server":
@@ -3,8 +3,9 @@
 负责缓存路径定义与通用指纹工具：
 - cache_paths：统一的运行时缓存路径提供
 - fingerprint：通用内容/结构指纹工具
+- graph_cache_format：节点图持久化缓存的紧凑二进制文件格式（头部校验 + 按需读取正文）
 """
 
-__all__ = ["cache_paths", "fingerprint"]
+__all__ = ["cache_paths", "fingerprint", "graph_cache_format"]
 
 
@@ -50,6 +50,11 @@ def get_resource_index_cache_file(workspace_path: Path) -> Path:
     return get_resource_cache_dir(workspace_path) / "resource_index.json"
 
 
+def get_graph_summary_index_file(workspace_path: Path) -> Path:
+    """返回节点图摘要索引文件路径：app/runtime/cache/resource_cache/graph_summary_index.json。"""
+    return get_resource_cache_dir(workspace_path) / "graph_summary_index.json"
+
+
 def get_name_sync_state_file(workspace_path: Path) -> Path:
     """返回资源名称同步状态文件路径：app/runtime/cache/name_sync_state.json。"""
     return get_runtime_cache_root(workspace_path) / "name_sync_state.json"
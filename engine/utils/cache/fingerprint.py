@@ -11,11 +11,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Sequence, Hashable, TypeVar
-import json
 import math
 
 from engine.utils.graph.graph_utils import compute_stable_md5_from_data
 from .cache_paths import get_graph_cache_dir
+from .graph_cache_format import get_graph_cache_file, read_graph_cache_entry
 
 
 @dataclass
@@ -47,6 +47,95 @@ def _median_distance(values: List[float]) -> float:
     return median if median > 1e-8 else 1.0
 
 
+# 点数不超过该值时直接暴力求近邻（网格索引的建桶开销不划算）
+_BRUTE_FORCE_MAX_POINTS = 32
+
+
+class _GridNeighborIndex:
+    """均匀网格近邻索引：按“每格约 k 个点”划分网格，查询时由内向外逐圈扩展。
+
+    查询结果与全量排序完全一致（距离相同按点序号升序），但只需访问目标点附近的若干格。
+    """
+
+    def __init__(self, xs: List[float], ys: List[float], k_neighbors: int) -> None:
+        self._xs = xs
+        self._ys = ys
+        self._min_x = min(xs)
+        self._min_y = min(ys)
+        width = max(xs) - self._min_x
+        height = max(ys) - self._min_y
+        point_count = len(xs)
+        area = width * height
+        if area > 1e-8:
+            cell_size = math.sqrt(area * max(1, k_neighbors) / point_count)
+        else:
+            # 所有点共线：按最长边均分
+            cell_size = max(width, height) * max(1, k_neighbors) / point_count
+        self.cell_size = cell_size if cell_size > 1e-8 else 0.0
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        if self.cell_size <= 0.0:
+            return
+        for point_index in range(point_count):
+            self._cells.setdefault(self._cell_of(xs[point_index], ys[point_index]), []).append(point_index)
+        self._max_ring = int(max(width, height) / self.cell_size) + 2
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return (
+            int(math.floor((x - self._min_x) / self.cell_size)),
+            int(math.floor((y - self._min_y) / self.cell_size)),
+        )
+
+    def nearest(self, point_index: int, k_neighbors: int) -> List[Tuple[float, int]]:
+        """返回最近的 k 个邻居 [(距离, 序号), ...]（不含自身）。"""
+        xs = self._xs
+        ys = self._ys
+        center_x = xs[point_index]
+        center_y = ys[point_index]
+        cell_x, cell_y = self._cell_of(center_x, center_y)
+        candidates: List[Tuple[float, int]] = []
+        ring = 0
+        while ring <= self._max_ring:
+            for cell_key in _iter_ring_cells(cell_x, cell_y, ring):
+                for neighbor_index in self._cells.get(cell_key, ()):
+                    if neighbor_index == point_index:
+                        continue
+                    candidates.append(
+                        (_pairwise_dist(center_x, center_y, xs[neighbor_index], ys[neighbor_index]), neighbor_index)
+                    )
+            # 第 ring+1 圈及以外的点与中心的距离至少为 ring * cell_size；
+            # 第 k 近距离严格小于该下界时，外圈不可能再出现更近（或同距离）的点。
+            if len(candidates) >= k_neighbors:
+                candidates.sort()
+                if candidates[k_neighbors - 1][0] < ring * self.cell_size:
+                    break
+            ring += 1
+        candidates.sort()
+        return candidates[:k_neighbors]
+
+
+def _iter_ring_cells(cell_x: int, cell_y: int, ring: int):
+    if ring == 0:
+        yield (cell_x, cell_y)
+        return
+    for offset in range(-ring, ring + 1):
+        yield (cell_x + offset, cell_y - ring)
+        yield (cell_x + offset, cell_y + ring)
+    for offset in range(-ring + 1, ring):
+        yield (cell_x - ring, cell_y + offset)
+        yield (cell_x + ring, cell_y + offset)
+
+
+def _brute_force_nearest(xs: List[float], ys: List[float], point_index: int, k_neighbors: int) -> List[Tuple[float, int]]:
+    distance_pairs: List[Tuple[float, int]] = []
+    for neighbor_index in range(len(xs)):
+        if neighbor_index == point_index:
+            continue
+        distance_value = _pairwise_dist(xs[point_index], ys[point_index], xs[neighbor_index], ys[neighbor_index])
+        distance_pairs.append((distance_value, neighbor_index))
+    distance_pairs.sort()
+    return distance_pairs[:k_neighbors]
+
+
 def _build_fingerprint_map(
     identifiers: Sequence[Identifier],
     coordinates: Sequence[Tuple[float, float]],
@@ -63,17 +152,22 @@ def _build_fingerprint_map(
 
     xs = [float(point[0]) for point in coordinates]
     ys = [float(point[1]) for point in coordinates]
+    neighbor_limit = max(1, k_neighbors)
+
+    # 近邻数接近总点数时网格无法剪枝，直接暴力求解
+    grid_index: Optional[_GridNeighborIndex] = None
+    if total_points > _BRUTE_FORCE_MAX_POINTS and neighbor_limit < total_points - 1:
+        grid_index = _GridNeighborIndex(xs, ys, neighbor_limit)
+        if grid_index.cell_size <= 0.0:
+            grid_index = None
 
     for point_index, identifier in enumerate(identifiers):
-        distance_pairs: List[Tuple[float, int]] = []
-        for neighbor_index in range(total_points):
-            if neighbor_index == point_index:
-                continue
-            distance_value = _pairwise_dist(xs[point_index], ys[point_index], xs[neighbor_index], ys[neighbor_index])
-            distance_pairs.append((distance_value, neighbor_index))
-        distance_pairs.sort(key=lambda item: item[0])
+        if grid_index is not None:
+            neighbor_slice = grid_index.nearest(point_index, neighbor_limit)
+        else:
+            neighbor_slice = _brute_force_nearest(xs, ys, point_index, neighbor_limit)
 
-        if not distance_pairs:
+        if not neighbor_slice:
             result[identifier] = Fingerprint(
                 ratios=[],
                 nearest_distance=0.0,
@@ -83,7 +177,6 @@ def _build_fingerprint_map(
             )
             continue
 
-        neighbor_slice = distance_pairs[: max(1, k_neighbors)]
         nearest_distance = float(neighbor_slice[0][0])
         reference_distance = nearest_distance
         if reference_distance <= 1e-8:
@@ -183,23 +276,54 @@ def compare_fingerprints_l1(
     return float(s) / float(overlap)
 
 
+def compare_fingerprints_l1_matrix(
+    model_fps: Sequence[Optional[Fingerprint]],
+    detect_fps: Sequence[Optional[Fingerprint]],
+    min_overlap_neighbors: int = 4,
+) -> List[List[float]]:
+    """
+    批量计算 L1 距离矩阵：matrix[i][j] == compare_fingerprints_l1(model_fps[i], detect_fps[j])。
+    每个指纹的比例向量只转换一次，逐对比较不再重复做类型转换与下标访问。
+    """
+    min_overlap = int(min_overlap_neighbors)
+    model_ratios = [None if fp is None else [float(v) for v in fp.ratios] for fp in model_fps]
+    detect_ratios = [None if fp is None else [float(v) for v in fp.ratios] for fp in detect_fps]
+    infinity = float("inf")
+
+    matrix: List[List[float]] = []
+    for ratios_a in model_ratios:
+        row: List[float] = []
+        for ratios_b in detect_ratios:
+            if ratios_a is None or ratios_b is None:
+                row.append(infinity)
+                continue
+            overlap = min(len(ratios_a), len(ratios_b))
+            if overlap < min_overlap:
+                row.append(infinity)
+                continue
+            total = 0.0
+            for value_a, value_b in zip(ratios_a, ratios_b):
+                total += abs(value_a - value_b)
+            row.append(total / float(overlap))
+        matrix.append(row)
+    return matrix
+
+
 def load_cached_fingerprints(
     workspace_path: Path,
     graph_id: str,
 ) -> Optional[dict]:
     """
-    读取 app/runtime/cache/graph_cache/<graph_id>.json 中 result_data.metadata.fingerprints
+    读取 app/runtime/cache/graph_cache/<graph_id>.gcache 中 result_data.metadata.fingerprints
     返回完整 fingerprints 字典（包含 version/layout_signature/params/items），不存在返回 None。
     """
     cache_dir = get_graph_cache_dir(Path(workspace_path))
-    cache_file = cache_dir / f"{graph_id}.json"
-    if not cache_file.exists():
+    entry = read_graph_cache_entry(get_graph_cache_file(cache_dir, graph_id))
+    if entry is None:
         return None
-    with open(cache_file, "r", encoding="utf-8") as f:
-        payload = json.load(f)
-    if "result_data" not in payload:
+    result_data = entry.load_result_data()
+    if result_data is None:
         return None
-    result_data = payload.get("result_data") or {}
     metadata = result_data.get("metadata") or {}
     fps = metadata.get("fingerprints")
     return fps
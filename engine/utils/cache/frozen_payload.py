@@ -0,0 +1,146 @@
+"""只读（冻结）载荷工具
+
+用于进程内缓存共享 JSON 风格的数据（dict/list/标量）而无需在每次读取时深拷贝：
+- freeze_payload：一次性将载荷转换为只读视图（FrozenDict/FrozenList），读取方可 O(1) 共享；
+- thaw_payload：需要修改数据的调用方显式“解冻”为普通 dict/list（深拷贝语义）；
+- estimate_payload_bytes：粗略估算载荷内存占用，供缓存按字节预算淘汰。
+
+注意：
+- FrozenDict/FrozenList 分别继承 dict/list，`isinstance(x, dict)`、`json.dumps` 等只读用法保持不变；
+- 任何写操作都会抛出 TypeError，提示调用方先调用 `thaw_payload()`；
+- `copy.deepcopy` 会得到普通可变副本（等价于 `thaw_payload`）。
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, NoReturn
+
+__all__ = [
+    "FrozenDict",
+    "FrozenList",
+    "freeze_payload",
+    "thaw_payload",
+    "is_frozen_payload",
+    "estimate_payload_bytes",
+]
+
+
+def _raise_frozen(*_args: Any, **_kwargs: Any) -> NoReturn:
+    raise TypeError("只读缓存载荷不可修改，请先调用 thaw_payload() 获取可变副本")
+
+
+class FrozenDict(dict):
+    """只读 dict 视图（dict 子类，写操作抛出 TypeError）。"""
+
+    __slots__ = ()
+
+    __setitem__ = _raise_frozen
+    __delitem__ = _raise_frozen
+    __ior__ = _raise_frozen
+    clear = _raise_frozen
+    pop = _raise_frozen
+    popitem = _raise_frozen
+    setdefault = _raise_frozen
+    update = _raise_frozen
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return thaw_payload(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """只读 list 视图（list 子类，写操作抛出 TypeError）。"""
+
+    __slots__ = ()
+
+    __setitem__ = _raise_frozen
+    __delitem__ = _raise_frozen
+    __iadd__ = _raise_frozen
+    __imul__ = _raise_frozen
+    append = _raise_frozen
+    extend = _raise_frozen
+    insert = _raise_frozen
+    pop = _raise_frozen
+    remove = _raise_frozen
+    clear = _raise_frozen
+    sort = _raise_frozen
+    reverse = _raise_frozen
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return thaw_payload(self)
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def _frozen_dict_from_items(items: Any) -> FrozenDict:
+    # 绕过被禁用的 __setitem__/update：直接调用 dict 的初始化
+    frozen = FrozenDict.__new__(FrozenDict)
+    dict.__init__(frozen, items)
+    return frozen
+
+
+def _frozen_list_from_items(items: Any) -> FrozenList:
+    frozen = FrozenList.__new__(FrozenList)
+    list.__init__(frozen, items)
+    return frozen
+
+
+def freeze_payload(value: Any) -> Any:
+    """将 JSON 风格载荷递归转换为只读视图；已冻结的对象原样返回（O(1)）。"""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return _frozen_dict_from_items((key, freeze_payload(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return _frozen_list_from_items(freeze_payload(item) for item in value)
+    if isinstance(value, tuple):
+        return tuple(freeze_payload(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def thaw_payload(value: Any) -> Any:
+    """将（可能冻结的）载荷递归转换为普通可变 dict/list（深拷贝语义）。"""
+    if isinstance(value, dict):
+        return {key: thaw_payload(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw_payload(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(thaw_payload(item) for item in value)
+    if isinstance(value, frozenset):
+        return set(value)
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+def is_frozen_payload(value: Any) -> bool:
+    return isinstance(value, (FrozenDict, FrozenList))
+
+
+def estimate_payload_bytes(value: Any) -> int:
+    """粗略估算载荷占用的字节数（容器 + 字符串/数值对象本身，不追踪共享引用）。"""
+    total = 0
+    stack = [value]
+    getsizeof = sys.getsizeof
+    while stack:
+        current = stack.pop()
+        total += getsizeof(current)
+        if isinstance(current, dict):
+            for key, item in current.items():
+                total += getsizeof(key)
+                stack.append(item)
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+    return total
@@ -0,0 +1,236 @@
+"""节点图持久化缓存的紧凑二进制文件格式
+
+文件布局（`<graph_id>.gcache`）：
+- 前导：8 字节魔数 + `<HI`（格式版本号、头部长度）；
+- 头部：紧凑 UTF-8 JSON，只包含校验与列表展示所需的少量字段
+  （file_hash/file_size/node_defs_fp/cached_at/body_codec/body_size/node_count/edge_count/layout_settings）；
+- 正文：`marshal` 编码的 result_data（先规范化为 JSON 等价的纯 dict/list/标量）。
+
+设计要点：
+- 有效性（源文件哈希、节点定义指纹、布局设置）只需读取头部即可判定，无需反序列化正文；
+- 正文按需读取（`GraphCacheEntry.load_result_data()`），列表统计等只读头部的场景不触碰正文；
+- marshal 的字节格式随 Python 版本变化，头部记录编码器版本，不一致时视为缓存未命中并重建；
+- 正文长度与头部声明不一致（截断/半写入）时同样视为未命中。
+"""
+
+from __future__ import annotations
+
+import json
+import marshal
+import struct
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+__all__ = [
+    "GRAPH_CACHE_FILE_SUFFIX",
+    "GRAPH_CACHE_FORMAT_VERSION",
+    "GraphCacheEntry",
+    "get_graph_cache_file",
+    "encode_graph_cache",
+    "write_graph_cache_file",
+    "read_graph_cache_entry",
+    "load_graph_cache_payload",
+    "normalize_json_compatible",
+]
+
+GRAPH_CACHE_FILE_SUFFIX = ".gcache"
+GRAPH_CACHE_FORMAT_VERSION = 1
+
+_MAGIC = b"GGCACHE\x00"
+_PREAMBLE = struct.Struct("<HI")
+_PREFIX_SIZE = len(_MAGIC) + _PREAMBLE.size
+_BODY_CODEC = f"marshal-{marshal.version}-py{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+def get_graph_cache_file(cache_dir: Path, graph_id: str) -> Path:
+    """返回指定图的持久化缓存文件路径：<cache_dir>/<graph_id>.gcache。"""
+    return cache_dir / f"{graph_id}{GRAPH_CACHE_FILE_SUFFIX}"
+
+
+@dataclass(frozen=True)
+class GraphCacheEntry:
+    """已读取头部的缓存文件句柄（正文按需加载）。"""
+
+    path: Path
+    header: Dict[str, Any]
+    body_offset: int
+
+    @property
+    def file_hash(self) -> str:
+        return str(self.header.get("file_hash") or "")
+
+    @property
+    def file_size(self) -> int:
+        return int(self.header.get("file_size") or -1)
+
+    @property
+    def node_defs_fp(self) -> str:
+        return str(self.header.get("node_defs_fp") or "")
+
+    @property
+    def cached_at(self) -> str:
+        return str(self.header.get("cached_at") or "")
+
+    @property
+    def node_count(self) -> int:
+        return int(self.header.get("node_count") or 0)
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.header.get("edge_count") or 0)
+
+    @property
+    def layout_settings(self) -> Optional[Dict[str, Any]]:
+        settings_snapshot = self.header.get("layout_settings")
+        return settings_snapshot if isinstance(settings_snapshot, dict) else None
+
+    def load_result_data(self) -> Optional[Dict[str, Any]]:
+        """读取并解码正文；文件被截断或正文不是 dict 时返回 None。"""
+        body_size = int(self.header.get("body_size") or 0)
+        with open(self.path, "rb") as file_obj:
+            file_obj.seek(self.body_offset)
+            body = file_obj.read(body_size + 1)
+        if len(body) != body_size:
+            return None
+        result_data = marshal.loads(body)
+        if not isinstance(result_data, dict):
+            return None
+        return result_data
+
+
+def normalize_json_compatible(value: Any) -> Any:
+    """将载荷规范化为 JSON 往返后的等价形态（纯 dict/list/str/int/float/bool/None）。
+
+    - tuple/list 及其子类 → list；dict 子类（如 FrozenDict）→ dict；
+    - dict 键按 `json.dumps` 规则转为字符串；
+    - str/int/float 子类（如 str 枚举）→ 对应基础类型。
+    其余类型与 `json.dump` 行为一致：直接抛出 TypeError。
+    """
+    if value is None or value is True or value is False:
+        return value
+    value_type = type(value)
+    if value_type is str or value_type is int or value_type is float:
+        return value
+    if isinstance(value, dict):
+        return {_normalize_key(key): normalize_json_compatible(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_json_compatible(item) for item in value]
+    if isinstance(value, str):
+        return str.__str__(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    raise TypeError(f"图缓存载荷包含无法序列化的类型：{value_type.__name__}")
+
+
+def _normalize_key(key: Any) -> str:
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, (int, float)):
+        return json.dumps(key)
+    raise TypeError(f"图缓存载荷的字典键类型不受支持：{type(key).__name__}")
+
+
+def _count_graph_elements(result_data: Dict[str, Any]) -> tuple[int, int]:
+    graph_data = result_data.get("data")
+    if not isinstance(graph_data, dict):
+        return 0, 0
+    nodes = graph_data.get("nodes")
+    edges = graph_data.get("edges")
+    node_count = len(nodes) if isinstance(nodes, list) else 0
+    edge_count = len(edges) if isinstance(edges, list) else 0
+    return node_count, edge_count
+
+
+def encode_graph_cache(
+    *,
+    file_hash: str,
+    file_size: int,
+    node_defs_fp: str,
+    cached_at: str,
+    result_data: Dict[str, Any],
+) -> bytes:
+    """将 result_data 与校验字段编码为完整的缓存文件字节串。"""
+    normalized = normalize_json_compatible(result_data)
+    body = marshal.dumps(normalized)
+    node_count, edge_count = _count_graph_elements(normalized)
+    metadata = normalized.get("metadata")
+    layout_settings = metadata.get("layout_settings") if isinstance(metadata, dict) else None
+    header = {
+        "file_hash": file_hash,
+        "file_size": int(file_size),
+        "node_defs_fp": node_defs_fp,
+        "cached_at": cached_at,
+        "body_codec": _BODY_CODEC,
+        "body_size": len(body),
+        "node_count": node_count,
+        "edge_count": edge_count,
+        "layout_settings": layout_settings if isinstance(layout_settings, dict) else None,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"".join(
+        (_MAGIC, _PREAMBLE.pack(GRAPH_CACHE_FORMAT_VERSION, len(header_bytes)), header_bytes, body)
+    )
+
+
+def write_graph_cache_file(cache_file: Path, encoded: bytes) -> None:
+    """原子写入：先写同目录临时文件，再替换目标文件，避免中断导致半写入。"""
+    tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+    # 在外部工具/并发清缓存的情况下，目录可能在 mkdir 后被删除；写入前再次确保父目录存在。
+    tmp_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(tmp_file, "wb") as file_obj:
+        file_obj.write(encoded)
+    tmp_file.replace(cache_file)
+
+
+def read_graph_cache_entry(cache_file: Path) -> Optional[GraphCacheEntry]:
+    """仅读取缓存文件头部。
+
+    文件不存在、为空、魔数/格式版本/正文编码器不匹配时返回 None（等价于无缓存）。
+    """
+    if not cache_file.exists():
+        return None
+    with open(cache_file, "rb") as file_obj:
+        prefix = file_obj.read(_PREFIX_SIZE)
+        if len(prefix) != _PREFIX_SIZE or not prefix.startswith(_MAGIC):
+            return None
+        format_version, header_length = _PREAMBLE.unpack_from(prefix, len(_MAGIC))
+        if format_version != GRAPH_CACHE_FORMAT_VERSION:
+            return None
+        header_bytes = file_obj.read(header_length)
+    if len(header_bytes) != header_length:
+        return None
+    header = json.loads(header_bytes.decode("utf-8"))
+    if not isinstance(header, dict) or header.get("body_codec") != _BODY_CODEC:
+        return None
+    if not isinstance(header.get("file_hash"), str) or not isinstance(header.get("node_defs_fp"), str):
+        return None
+    return GraphCacheEntry(path=cache_file, header=header, body_offset=_PREFIX_SIZE + header_length)
+
+
+def load_graph_cache_payload(cache_file: Path) -> Optional[Dict[str, Any]]:
+    """读取完整缓存并还原为旧版 JSON 缓存的字典形态，供调试/校验工具使用。
+
+    返回 `{file_hash, node_defs_fp, cached_at, result_data}`；无法读取时返回 None。
+    """
+    entry = read_graph_cache_entry(cache_file)
+    if entry is None:
+        return None
+    result_data = entry.load_result_data()
+    if result_data is None:
+        return None
+    return {
+        "file_hash": entry.file_hash,
+        "node_defs_fp": entry.node_defs_fp,
+        "cached_at": entry.cached_at,
+        "result_data": result_data,
+    }
@@ -4,8 +4,9 @@
 - graph_algorithms：通用图算法（拓扑排序、事件分组等）
 - graph_utils：节点图数据处理与端口/常量判断工具
 - node_defs_fingerprint：节点定义与实现库指纹计算
+- node_defs_fingerprint_service：基于文件变更通知的增量指纹服务（高频查询入口）
 """
 
-__all__ = ["graph_algorithms", "graph_utils", "node_defs_fingerprint"]
+__all__ = ["graph_algorithms", "graph_utils", "node_defs_fingerprint", "node_defs_fingerprint_service"]
 
 
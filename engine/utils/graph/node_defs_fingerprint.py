@@ -2,6 +2,51 @@ from __future__ import annotations
 
 import hashlib
 from pathlib import Path
+from typing import Iterable, List, Tuple
+
+# 参与指纹计算的目录（相对工作区），顺序即指纹字符串中的分段顺序：(分段前缀, 相对路径)
+NODE_DEFS_FINGERPRINT_ROOTS: Tuple[Tuple[str, Path], ...] = (
+    # 1) 实现库：plugins/nodes
+    ("plugins", Path("plugins") / "nodes"),
+    # 2) 节点定义/加载核心
+    ("nodes", Path("engine") / "nodes"),
+    # 3) 图解析/生成核心
+    ("gc", Path("engine") / "graph"),
+    # 4) 复合节点库
+    ("composites", Path("assets") / "资源库" / "复合节点库"),
+)
+
+# (文件路径, mtime, size)
+FileStatEntry = Tuple[Path, float, int]
+
+
+def build_dir_signature(workspace_path: Path, entries: Iterable[FileStatEntry]) -> tuple[int, float, str]:
+    """由文件清单构建目录签名，返回 (count, latest_mtime, signature_hex8)。
+
+    entries 不要求有序，内部按路径排序后再哈希，保证与扫描顺序无关。
+    """
+    hasher = hashlib.md5()
+    latest_mtime = 0.0
+    count = 0
+    for path, mtime, size in sorted(entries, key=lambda entry: entry[0]):
+        count += 1
+        if mtime > latest_mtime:
+            latest_mtime = mtime
+        rel = path.relative_to(workspace_path).as_posix()
+        hasher.update(rel.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(str(int(mtime * 1000)).encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(str(int(size)).encode("utf-8"))
+        hasher.update(b"\0")
+    return count, latest_mtime, hasher.hexdigest()[:8]
+
+
+def format_node_defs_fingerprint(signatures: List[tuple[str, tuple[int, float, str]]]) -> str:
+    """将各目录签名拼接为最终指纹字符串。"""
+    return "|".join(
+        f"{prefix}:{count}:{round(latest, 3)}:{signature}" for prefix, (count, latest, signature) in signatures
+    )
 
 
 def compute_node_defs_fingerprint(workspace_path: Path) -> str:
@@ -23,53 +68,19 @@ def compute_node_defs_fingerprint(workspace_path: Path) -> str:
     - 仅依赖文件元信息，不读取文件内容，保持轻量；
     - 相比“仅看最新修改时间”，加入清单签名可避免“修改了非最新文件但 max mtime 未变”
       导致缓存未失效的问题。
+    - 本函数每次都全量扫描；高频调用方应使用
+      `node_defs_fingerprint_service.get_node_defs_fingerprint`（增量、基于文件变更通知）。
     """
 
     def _dir_signature(root_dir: Path) -> tuple[int, float, str]:
-        """返回 (count, latest_mtime, signature_hex8)。"""
         if not root_dir.exists():
             return 0, 0.0, "0" * 8
-
-        paths = sorted(root_dir.rglob("*.py"))
-        hasher = hashlib.md5()
-        latest_mtime = 0.0
-        count = 0
-        for path in paths:
+        entries: List[FileStatEntry] = []
+        for path in root_dir.rglob("*.py"):
             stat = path.stat()
-            count += 1
-            if stat.st_mtime > latest_mtime:
-                latest_mtime = stat.st_mtime
-            rel = path.relative_to(workspace_path).as_posix()
-            hasher.update(rel.encode("utf-8"))
-            hasher.update(b"\0")
-            hasher.update(str(int(stat.st_mtime * 1000)).encode("utf-8"))
-            hasher.update(b"\0")
-            hasher.update(str(int(stat.st_size)).encode("utf-8"))
-            hasher.update(b"\0")
-        return count, latest_mtime, hasher.hexdigest()[:8]
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return build_dir_signature(workspace_path, entries)
 
-    # 1) 实现库：plugins/nodes
-    plugins_dir = workspace_path / "plugins" / "nodes"
-    plugins_count, plugins_latest, plugins_sig = _dir_signature(plugins_dir)
-
-    # 2) 节点定义/加载核心
-    nodes_core_dir = workspace_path / "engine" / "nodes"
-    nodes_count, nodes_latest, nodes_sig = _dir_signature(nodes_core_dir)
-
-    # 3) 图解析/生成核心
-    graph_code_dir = workspace_path / "engine" / "graph"
-    graph_code_count, graph_code_latest, graph_sig = _dir_signature(graph_code_dir)
-
-    # 4) 复合节点库
-    composites_dir = workspace_path / "assets" / "资源库" / "复合节点库"
-    composites_count, composites_latest, composites_sig = _dir_signature(composites_dir)
-
-    return (
-        f"plugins:{plugins_count}:{round(plugins_latest, 3)}:{plugins_sig}"
-        f"|nodes:{nodes_count}:{round(nodes_latest, 3)}:{nodes_sig}"
-        f"|gc:{graph_code_count}:{round(graph_code_latest, 3)}:{graph_sig}"
-        f"|composites:{composites_count}:{round(composites_latest, 3)}:{composites_sig}"
+    return format_node_defs_fingerprint(
+        [(prefix, _dir_signature(workspace_path / relative_dir)) for prefix, relative_dir in NODE_DEFS_FINGERPRINT_ROOTS]
     )
-
-
-
@@ -0,0 +1,442 @@
+"""节点定义指纹服务（增量 + 文件变更通知）
+
+`compute_node_defs_fingerprint` 每次都会对四个目录做 rglob + stat，而 NodeRegistry、
+PersistentGraphCacheManager、build_rules_hash、GraphCacheFacade 等会高频调用它。
+本模块提供进程内单例服务：
+- 按目录记忆每个子目录的 *.py 文件清单（文件 mtime/size），变更时只重扫受影响的目录；
+- 通过文件系统变更通知保持最新：
+  - Linux：inotify（按目录精确标记脏目录，只重扫变化的目录）；
+  - Windows：FindFirstChangeNotificationW（按根目录标记脏，变化后重扫该根目录）；
+  - 其它平台或通知初始化/挂载失败：关闭通知句柄并退化为短周期轮询（超过轮询间隔才全量重扫，退化时仅提示一次）；
+- 稳态查询只需非阻塞地读取一次通知队列，耗时为微秒级；
+- `get_stats()` 暴露查询/重算次数，便于确认增量生效。
+
+指纹字符串与 `compute_node_defs_fingerprint` 完全一致。
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from engine.utils.graph.node_defs_fingerprint import (
+    NODE_DEFS_FINGERPRINT_ROOTS,
+    FileStatEntry,
+    build_dir_signature,
+    format_node_defs_fingerprint,
+)
+from engine.utils.logging.logger import log_warn
+
+__all__ = [
+    "NodeDefsFingerprintService",
+    "get_node_defs_fingerprint_service",
+    "get_node_defs_fingerprint",
+]
+
+
+def _name_matches_py(name: str) -> bool:
+    # 与 Path.rglob("*.py") 的匹配语义保持一致：Windows 下大小写不敏感
+    if sys.platform == "win32":
+        return name.lower().endswith(".py")
+    return name.endswith(".py")
+
+
+class _DirListing:
+    """单个目录的扫描结果：直接包含的 *.py 条目 + 直接子目录。"""
+
+    __slots__ = ("entries", "subdirs")
+
+    def __init__(self, entries: List[FileStatEntry], subdirs: List[Path]) -> None:
+        self.entries = entries
+        self.subdirs = subdirs
+
+
+def _scan_single_dir(directory: Path) -> _DirListing:
+    entries: List[FileStatEntry] = []
+    subdirs: List[Path] = []
+    with os.scandir(directory) as iterator:
+        for entry in iterator:
+            entry_path = directory / entry.name
+            if entry.is_dir() and not entry.is_symlink():
+                subdirs.append(entry_path)
+            if _name_matches_py(entry.name):
+                stat = entry_path.stat()
+                entries.append((entry_path, stat.st_mtime, stat.st_size))
+    return _DirListing(entries, subdirs)
+
+
+# ===== 变更通知后端 =====
+
+
+class _InotifyWatcher:
+    """Linux inotify 后端：每个目录一个 watch，变更事件映射回“脏目录”。"""
+
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+    _WATCH_MASK = (
+        0x00000002  # IN_MODIFY
+        | 0x00000004  # IN_ATTRIB
+        | 0x00000008  # IN_CLOSE_WRITE
+        | 0x00000040  # IN_MOVED_FROM
+        | 0x00000080  # IN_MOVED_TO
+        | 0x00000100  # IN_CREATE
+        | 0x00000200  # IN_DELETE
+        | 0x00000400  # IN_DELETE_SELF
+        | 0x00000800  # IN_MOVE_SELF
+    )
+    _IN_Q_OVERFLOW = 0x00004000
+    _IN_IGNORED = 0x00008000
+    _EVENT_HEADER_SIZE = 16
+
+    def __init__(self) -> None:
+        import ctypes
+
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        fd = self._libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self._fd: Optional[int] = fd
+        self._wd_to_dir: Dict[int, Path] = {}
+        self._dir_to_wd: Dict[Path, int] = {}
+
+    def watch_dir(self, directory: Path) -> bool:
+        if directory in self._dir_to_wd:
+            return True
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), self._WATCH_MASK)
+        if wd < 0:
+            return False
+        self._wd_to_dir[wd] = directory
+        self._dir_to_wd[directory] = wd
+        return True
+
+    def close(self) -> None:
+        """关闭 inotify fd（内核随之移除该 fd 上的全部 watch）。"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._wd_to_dir.clear()
+        self._dir_to_wd.clear()
+
+    def read_dirty_dirs(self) -> Optional[Set[Path]]:
+        """非阻塞读取事件队列；返回脏目录集合，队列溢出时返回 None（表示需全量重扫）。"""
+        import struct
+
+        dirty: Set[Path] = set()
+        overflowed = False
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + self._EVENT_HEADER_SIZE <= len(buffer):
+                wd, mask, _cookie, name_len = struct.unpack_from("iIII", buffer, offset)
+                offset += self._EVENT_HEADER_SIZE + name_len
+                if mask & self._IN_Q_OVERFLOW:
+                    overflowed = True
+                    continue
+                directory = self._wd_to_dir.get(wd)
+                if directory is None:
+                    continue
+                dirty.add(directory)
+                if mask & self._IN_IGNORED:
+                    self._wd_to_dir.pop(wd, None)
+                    self._dir_to_wd.pop(directory, None)
+        return None if overflowed else dirty
+
+
+class _WindowsChangeWatcher:
+    """Windows 后端：每个根目录一个 FindFirstChangeNotificationW 句柄（含子树）。"""
+
+    _FILTER = 0x00000001 | 0x00000002 | 0x00000008 | 0x00000010  # FILE_NAME | DIR_NAME | SIZE | LAST_WRITE
+    _WAIT_OBJECT_0 = 0
+    _WAIT_FAILED = 0xFFFFFFFF
+
+    def __init__(self) -> None:
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        kernel32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        kernel32.FindNextChangeNotification.restype = wintypes.BOOL
+        kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        kernel32.WaitForSingleObject.restype = wintypes.DWORD
+        kernel32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        kernel32.FindCloseChangeNotification.restype = wintypes.BOOL
+        self._kernel32 = kernel32
+        # restype=HANDLE 时返回值是无符号指针值（或 None），INVALID_HANDLE_VALUE 需按同样方式换算
+        self._invalid_handle_value = ctypes.c_void_p(-1).value
+        self._root_handles: Dict[Path, int] = {}
+
+    def watch_root(self, root_dir: Path) -> bool:
+        if root_dir in self._root_handles:
+            return True
+        handle = self._kernel32.FindFirstChangeNotificationW(str(root_dir), True, self._FILTER)
+        if handle is None or handle == self._invalid_handle_value:
+            return False
+        self._root_handles[root_dir] = handle
+        return True
+
+    def read_dirty_roots(self) -> Optional[Set[Path]]:
+        """返回脏根目录集合；等待失败（WAIT_FAILED）时返回 None，表示通知不可用。"""
+        dirty: Set[Path] = set()
+        for root_dir, handle in self._root_handles.items():
+            result = self._kernel32.WaitForSingleObject(handle, 0)
+            if result == self._WAIT_FAILED:
+                return None
+            if result == self._WAIT_OBJECT_0:
+                dirty.add(root_dir)
+                self._kernel32.FindNextChangeNotification(handle)
+        return dirty
+
+    def close(self) -> None:
+        for handle in self._root_handles.values():
+            self._kernel32.FindCloseChangeNotification(handle)
+        self._root_handles.clear()
+
+
+# ===== 服务 =====
+
+
+class _RootState:
+    __slots__ = ("prefix", "root_dir", "listings", "signature", "exists")
+
+    def __init__(self, prefix: str, root_dir: Path) -> None:
+        self.prefix = prefix
+        self.root_dir = root_dir
+        self.listings: Dict[Path, _DirListing] = {}
+        self.signature: Optional[tuple[int, float, str]] = None
+        self.exists = False
+
+
+class NodeDefsFingerprintService:
+    """增量维护节点定义指纹（进程内单例，见 `get_node_defs_fingerprint_service`）。"""
+
+    def __init__(self, workspace_path: Path, *, poll_interval_seconds: float = 1.0, use_notifications: bool = True) -> None:
+        self.workspace_path = workspace_path
+        self._poll_interval_seconds = float(poll_interval_seconds)
+        self._lock = threading.RLock()
+        self._roots: List[_RootState] = [
+            _RootState(prefix, workspace_path / relative_dir) for prefix, relative_dir in NODE_DEFS_FINGERPRINT_ROOTS
+        ]
+        self._inotify: Optional[_InotifyWatcher] = None
+        self._windows_watcher: Optional[_WindowsChangeWatcher] = None
+        if use_notifications:
+            if sys.platform.startswith("linux"):
+                try:
+                    self._inotify = _InotifyWatcher()
+                except (OSError, AttributeError) as exc:
+                    log_warn("[节点定义指纹] inotify 初始化失败（{}），使用轮询", exc)
+                    self._inotify = None
+            elif sys.platform == "win32":
+                try:
+                    self._windows_watcher = _WindowsChangeWatcher()
+                except (OSError, AttributeError) as exc:
+                    log_warn("[节点定义指纹] 变更通知初始化失败（{}），使用轮询", exc)
+                    self._windows_watcher = None
+        self._fingerprint: str = ""
+        self._last_poll_at: float = 0.0
+        self._lookups = 0
+        self._root_rescans = 0
+        self._dir_rescans = 0
+
+    def close(self) -> None:
+        """释放通知句柄；之后的查询按轮询模式工作。"""
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+            if self._windows_watcher is not None:
+                self._windows_watcher.close()
+                self._windows_watcher = None
+
+    def _fall_back_to_polling(self, reason: str) -> None:
+        """通知后端不可用：关闭句柄并退化为轮询（只提示一次）。"""
+        mode = self.mode
+        self.close()
+        self._last_poll_at = time.monotonic()
+        log_warn("[节点定义指纹] {} 通知不可用（{}），退化为每 {}s 轮询", mode, reason, self._poll_interval_seconds)
+
+    @property
+    def mode(self) -> str:
+        if self._inotify is not None:
+            return "inotify"
+        if self._windows_watcher is not None:
+            return "win32_change_notification"
+        return "polling"
+
+    # ------------------------------------------------------------------ 查询
+
+    def get_fingerprint(self) -> str:
+        with self._lock:
+            self._lookups += 1
+            if not self._fingerprint:
+                for root_state in self._roots:
+                    self._rescan_root(root_state)
+                self._last_poll_at = time.monotonic()
+                return self._rebuild_fingerprint()
+
+            changed = False
+            if self._inotify is not None:
+                changed = self._apply_inotify_changes()
+            elif self._windows_watcher is not None:
+                changed = self._apply_windows_changes()
+            else:
+                now = time.monotonic()
+                if (now - self._last_poll_at) >= self._poll_interval_seconds:
+                    for root_state in self._roots:
+                        self._rescan_root(root_state)
+                    self._last_poll_at = now
+                    changed = True
+
+            # 根目录缺失时无法挂通知：每次仅做一次 exists 检查，出现后再全量扫描并挂 watch
+            for root_state in self._roots:
+                if not root_state.exists and root_state.root_dir.is_dir():
+                    self._rescan_root(root_state)
+                    changed = True
+
+            if changed:
+                return self._rebuild_fingerprint()
+            return self._fingerprint
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "lookups": self._lookups,
+                "root_rescans": self._root_rescans,
+                "dir_rescans": self._dir_rescans,
+            }
+
+    # ------------------------------------------------------------------ 内部：扫描
+
+    def _rebuild_fingerprint(self) -> str:
+        signatures = []
+        for root_state in self._roots:
+            if root_state.signature is None:
+                root_state.signature = self._compute_root_signature(root_state)
+            signatures.append((root_state.prefix, root_state.signature))
+        self._fingerprint = format_node_defs_fingerprint(signatures)
+        return self._fingerprint
+
+    def _compute_root_signature(self, root_state: _RootState) -> tuple[int, float, str]:
+        if not root_state.exists:
+            return 0, 0.0, "0" * 8
+        all_entries: List[FileStatEntry] = []
+        for listing in root_state.listings.values():
+            all_entries.extend(listing.entries)
+        return build_dir_signature(self.workspace_path, all_entries)
+
+    def _rescan_root(self, root_state: _RootState) -> None:
+        self._root_rescans += 1
+        root_state.listings = {}
+        root_state.signature = None
+        root_state.exists = root_state.root_dir.is_dir()
+        if not root_state.exists:
+            return
+        self._scan_subtree(root_state, root_state.root_dir)
+        if self._windows_watcher is not None and not self._windows_watcher.watch_root(root_state.root_dir):
+            self._fall_back_to_polling(f"无法监听 {root_state.root_dir}")
+
+    def _scan_subtree(self, root_state: _RootState, directory: Path) -> None:
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            self._dir_rescans += 1
+            if self._inotify is not None and not self._inotify.watch_dir(current):
+                # 先挂 watch 再列目录，避免两者之间的变更被遗漏；watch 数达到系统上限时整体退化为轮询
+                self._fall_back_to_polling(f"inotify_add_watch 失败：{current}")
+            listing = _scan_single_dir(current)
+            root_state.listings[current] = listing
+            pending.extend(listing.subdirs)
+
+    def _drop_subtree(self, root_state: _RootState, directory: Path) -> None:
+        stale = [path for path in root_state.listings if path == directory or directory in path.parents]
+        for path in stale:
+            root_state.listings.pop(path, None)
+
+    def _find_root_for(self, directory: Path) -> Optional[_RootState]:
+        for root_state in self._roots:
+            if directory == root_state.root_dir or root_state.root_dir in directory.parents:
+                return root_state
+        return None
+
+    # ------------------------------------------------------------------ 内部：通知
+
+    def _apply_inotify_changes(self) -> bool:
+        assert self._inotify is not None
+        dirty_dirs = self._inotify.read_dirty_dirs()
+        if dirty_dirs is None:
+            for root_state in self._roots:
+                self._rescan_root(root_state)
+            return True
+        if not dirty_dirs:
+            return False
+        for directory in sorted(dirty_dirs, key=lambda path: len(path.parts)):
+            root_state = self._find_root_for(directory)
+            if root_state is None:
+                continue
+            root_state.signature = None
+            if not directory.is_dir():
+                self._drop_subtree(root_state, directory)
+                if directory == root_state.root_dir:
+                    root_state.exists = False
+                continue
+            previous = root_state.listings.get(directory)
+            self._dir_rescans += 1
+            listing = _scan_single_dir(directory)
+            root_state.listings[directory] = listing
+            previous_subdirs = set(previous.subdirs) if previous is not None else set()
+            current_subdirs = set(listing.subdirs)
+            for removed in previous_subdirs - current_subdirs:
+                self._drop_subtree(root_state, removed)
+            for added in current_subdirs - previous_subdirs:
+                self._scan_subtree(root_state, added)
+        return True
+
+    def _apply_windows_changes(self) -> bool:
+        assert self._windows_watcher is not None
+        dirty_roots = self._windows_watcher.read_dirty_roots()
+        if dirty_roots is None:
+            self._fall_back_to_polling("WaitForSingleObject 返回 WAIT_FAILED")
+            for root_state in self._roots:
+                self._rescan_root(root_state)
+            return True
+        if not dirty_roots:
+            return False
+        for root_state in self._roots:
+            if root_state.root_dir in dirty_roots:
+                self._rescan_root(root_state)
+        return True
+
+
+_SERVICES: Dict[Tuple[str, int], NodeDefsFingerprintService] = {}
+_SERVICES_LOCK = threading.Lock()
+
+
+def get_node_defs_fingerprint_service(workspace_path: Path) -> NodeDefsFingerprintService:
+    """获取工作区对应的进程内单例服务（按 pid 区分，fork 出的子进程会重建自己的通知句柄）。"""
+    # 以调用方传入的路径文本为键（避免每次 resolve 的 syscalls）；同一真实目录的不同写法共享一个服务
+    key = (str(workspace_path), os.getpid())
+    service = _SERVICES.get(key)
+    if service is not None:
+        return service
+    with _SERVICES_LOCK:
+        resolved_key = (str(Path(workspace_path).resolve()), os.getpid())
+        service = _SERVICES.get(resolved_key)
+        if service is None:
+            service = NodeDefsFingerprintService(Path(resolved_key[0]))
+            _SERVICES[resolved_key] = service
+        _SERVICES[key] = service
+        return service
+
+
+def get_node_defs_fingerprint(workspace_path: Path) -> str:
+    """增量版 `compute_node_defs_fingerprint`：结果一致，稳态查询不做目录扫描。"""
+    return get_node_defs_fingerprint_service(workspace_path).get_fingerprint()
@@ -2,9 +2,10 @@
 
 提供统一日志与控制台输出清理等功能：
 - logger：log_info/log_warn/log_error 等统一日志接口
+- log_backend：可插拔日志后端（级别过滤、惰性格式化、后台批量写入与各类 sink）
 - console_sanitizer：控制台输出内容清洗与格式化
 """
 
-__all__ = ["logger", "console_sanitizer"]
+__all__ = ["logger", "log_backend", "console_sanitizer"]
 
 
@@ -0,0 +1,427 @@
+"""可插拔的结构化日志后端：记录前级别过滤 + 惰性格式化 + 可选的队列后台写入。
+
+- 级别判断发生在构造记录之前：被过滤的调用只有一次整数比较，模板与参数都不会被格式化；
+- `LogRecord` 只保存模板与参数，由 sink 在真正输出时才 `str.format`，时间戳同样在输出时才格式化；
+- 同步模式下记录直接交给 sink；后台模式下记录进入队列，由写线程攒批后一次性投递，I/O 不阻塞调用方
+  （提交时可变参数先转为字符串快照）；
+- 格式化失败退化为 repr 输出，单个 sink 抛错只报告到 stderr，写线程不会因此退出；
+- 内置 sink：控制台、滚动文件、内存环形缓冲（供 UI 日志面板读取）与空 sink。
+  只挂载空 sink（或没有 sink）时后端视为关闭，所有级别都在入口处被过滤。
+"""
+
+from __future__ import annotations
+
+import atexit
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+LOG_LEVEL_DEBUG = 10
+LOG_LEVEL_INFO = 20
+LOG_LEVEL_PRINT = 25
+LOG_LEVEL_WARNING = 30
+LOG_LEVEL_ERROR = 40
+LOG_LEVEL_OFF = 100
+
+# 控制台行前缀中的级别标签（与旧版 print 输出保持一致，ERR 后补空格对齐）
+_LEVEL_TAGS: Dict[int, str] = {
+    LOG_LEVEL_DEBUG: "DEBUG",
+    LOG_LEVEL_INFO: "INFO",
+    LOG_LEVEL_PRINT: "PRINT",
+    LOG_LEVEL_WARNING: "WARN",
+    LOG_LEVEL_ERROR: "ERR ",
+}
+
+
+@dataclass(slots=True)
+class LogRecord:
+    logger_name: str
+    level: int
+    template: str
+    args: Tuple[Any, ...]
+    created: float
+
+    def get_message(self) -> str:
+        """按需格式化：无参数时模板原样输出（不把其中的花括号当作占位符）。
+
+        模板与参数不匹配时退化为 `repr((template, args))`，不向 sink 抛出异常。
+        """
+        if not self.args:
+            return self.template
+        try:
+            return self.template.format(*self.args)
+        except (IndexError, KeyError, ValueError, TypeError, AttributeError):
+            return repr((self.template, self.args))
+
+
+# 后台提交时无需做字符串快照的参数类型
+_IMMUTABLE_ARG_TYPES = (str, int, float, bool, type(None))
+
+_clock_cache: List[Any] = [-1, ""]
+
+
+def _format_clock(created: float) -> str:
+    """HH:MM:SS；同一秒内的记录复用上次的格式化结果。"""
+    second = int(created)
+    if _clock_cache[0] != second:
+        _clock_cache[0] = second
+        _clock_cache[1] = time.strftime("%H:%M:%S", time.localtime(second))
+    return _clock_cache[1]
+
+
+def format_log_line(record: LogRecord) -> str:
+    tag = _LEVEL_TAGS.get(record.level, str(record.level))
+    return f"[{tag} {_format_clock(record.created)}] {record.get_message()}"
+
+
+# ------------------------ sinks ------------------------
+
+
+class LogSink(Protocol):
+    def emit(self, records: Sequence[LogRecord]) -> None: ...
+
+    def flush(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class NullLogSink:
+    """丢弃所有记录；仅挂载空 sink 时后端视为关闭。"""
+
+    discards_records = True
+
+    def emit(self, records: Sequence[LogRecord]) -> None:
+        return None
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class ConsoleLogSink:
+    """一批记录合并为一次 print 输出。
+
+    默认 stream=None，即每次输出时解析当前的 sys.stdout（兼容 pytest capsys 与 ASCII 安全 print 补丁）。
+    """
+
+    def __init__(self, stream: Any = None) -> None:
+        self.stream = stream
+
+    def emit(self, records: Sequence[LogRecord]) -> None:
+        if records:
+            print("\n".join(format_log_line(record) for record in records), file=self.stream)
+
+    def flush(self) -> None:
+        if self.stream is not None and hasattr(self.stream, "flush"):
+            self.stream.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+
+class RotatingFileLogSink:
+    """追加写入文本文件；超过 max_bytes 时滚动为 `<name>.1`…`<name>.<backup_count>`。"""
+
+    def __init__(self, path: Path, *, max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3) -> None:
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes 必须为正数：{max_bytes}")
+        self.path = Path(path)
+        self.max_bytes = int(max_bytes)
+        self.backup_count = max(0, int(backup_count))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self.path.stat().st_size
+
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self.path.with_name(f"{self.path.name}.{index}")
+                if source.exists():
+                    source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._size = 0
+
+    def emit(self, records: Sequence[LogRecord]) -> None:
+        chunk: List[str] = []
+        chunk_size = 0
+        for record in records:
+            line = format_log_line(record) + "\n"
+            line_size = len(line.encode("utf-8"))
+            if self._size + chunk_size + line_size > self.max_bytes and (self._size + chunk_size) > 0:
+                self._file.write("".join(chunk))
+                chunk.clear()
+                chunk_size = 0
+                self._rotate()
+            chunk.append(line)
+            chunk_size += line_size
+        if chunk:
+            self._file.write("".join(chunk))
+            self._size += chunk_size
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class MemoryRingLogSink:
+    """定长内存环形缓冲：保留最近 capacity 条记录，供 UI 日志面板按需读取。"""
+
+    def __init__(self, capacity: int = 2000) -> None:
+        if capacity <= 0:
+            raise ValueError(f"capacity 必须为正数：{capacity}")
+        self._records: deque = deque(maxlen=int(capacity))
+        self._lock = threading.Lock()
+        self.total_count = 0
+
+    def emit(self, records: Sequence[LogRecord]) -> None:
+        with self._lock:
+            self._records.extend(records)
+            self.total_count += len(records)
+
+    def records(self) -> List[LogRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def lines(self) -> List[str]:
+        return [format_log_line(record) for record in self.records()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+# ------------------------ 后台写线程 ------------------------
+
+
+def _emit_guarded(sink: LogSink, records: Sequence[LogRecord]) -> None:
+    """单个 sink 失败只报告到 stderr，不影响其它 sink 与写线程。"""
+    try:
+        sink.emit(records)
+    except Exception as exc:
+        print(f"[日志] sink {type(sink).__name__} 写入失败：{exc!r}", file=sys.__stderr__)
+
+_STOP = object()
+
+
+class QueueLogWriter:
+    """后台写线程：从队列攒批（最多 batch_size 条）后依次投递给各 sink。"""
+
+    def __init__(self, sinks: Sequence[LogSink], *, batch_size: int = 256) -> None:
+        self._sinks = list(sinks)
+        self.batch_size = max(1, int(batch_size))
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, record: LogRecord) -> None:
+        self._queue.put(record)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List[LogRecord] = []
+            taken = 1
+            stop = item is _STOP
+            try:
+                if not stop:
+                    batch.append(item)
+                while not stop and len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    taken += 1
+                    if item is _STOP:
+                        stop = True
+                    else:
+                        batch.append(item)
+                if batch:
+                    for sink in self._sinks:
+                        _emit_guarded(sink, batch)
+            finally:
+                # 无论投递是否成功都要确认出队，否则 flush() 会永久阻塞
+                for _ in range(taken):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """阻塞到队列中已提交的记录全部投递完毕。"""
+        self._queue.join()
+        for sink in self._sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        for sink in self._sinks:
+            sink.flush()
+
+
+# ------------------------ 后端与 Logger ------------------------
+
+
+class LogBackend:
+    """持有 sink 列表；background=True 时经由队列后台写入。"""
+
+    def __init__(
+        self,
+        sinks: Optional[Iterable[LogSink]] = None,
+        *,
+        background: bool = False,
+        batch_size: int = 256,
+    ) -> None:
+        self.sinks: List[LogSink] = list(sinks) if sinks is not None else [ConsoleLogSink()]
+        self.active = any(not getattr(sink, "discards_records", False) for sink in self.sinks)
+        self._writer = QueueLogWriter(self.sinks, batch_size=batch_size) if (background and self.active) else None
+
+    @property
+    def background(self) -> bool:
+        return self._writer is not None
+
+    def submit(self, record: LogRecord) -> None:
+        if self._writer is not None:
+            # 后台模式下参数在写线程中才格式化：提交时先把可变对象转为字符串快照，
+            # 避免调用方随后修改对象导致输出与调用时的值不一致（不可变标量保留原值以支持格式说明符）
+            if record.args:
+                record.args = tuple(
+                    arg if isinstance(arg, _IMMUTABLE_ARG_TYPES) else str(arg) for arg in record.args
+                )
+            self._writer.put(record)
+            return
+        for sink in self.sinks:
+            _emit_guarded(sink, (record,))
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+            return
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for sink in self.sinks:
+            sink.close()
+
+
+class Logger:
+    """按名称区分的日志入口；模板使用 `str.format` 风格的 `{}` 占位符。
+
+    未指定 backend 时跟随全局后端（`configure_logging` 替换后立即生效）。
+    """
+
+    def __init__(self, name: str, level: int = LOG_LEVEL_DEBUG, backend: Optional[LogBackend] = None) -> None:
+        self.name = name
+        self.level = int(level)
+        self._backend = backend
+
+    @property
+    def backend(self) -> LogBackend:
+        return self._backend if self._backend is not None else _global_backend
+
+    def set_level(self, level: int) -> None:
+        self.level = int(level)
+
+    def is_enabled_for(self, level: int) -> bool:
+        """调用方可在构造昂贵参数之前预先判断。"""
+        return level >= self.level and self.backend.active
+
+    def log(self, level: int, template: str, *args: Any) -> None:
+        if level < self.level:
+            return
+        backend = self.backend
+        if backend.active:
+            backend.submit(LogRecord(self.name, level, template, args, time.time()))
+
+    def debug(self, template: str, *args: Any) -> None:
+        self.log(LOG_LEVEL_DEBUG, template, *args)
+
+    def info(self, template: str, *args: Any) -> None:
+        self.log(LOG_LEVEL_INFO, template, *args)
+
+    def warn(self, template: str, *args: Any) -> None:
+        self.log(LOG_LEVEL_WARNING, template, *args)
+
+    def error(self, template: str, *args: Any) -> None:
+        self.log(LOG_LEVEL_ERROR, template, *args)
+
+
+_global_backend = LogBackend()
+_loggers: Dict[str, Logger] = {}
+_atexit_registered = False
+
+
+def get_logger(name: str) -> Logger:
+    """返回按名称共享的 Logger（首次获取时创建，级别默认 DEBUG）。"""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = Logger(name)
+        _loggers[name] = logger
+    return logger
+
+
+def get_log_backend() -> LogBackend:
+    return _global_backend
+
+
+def configure_logging(
+    sinks: Optional[Iterable[LogSink]] = None,
+    *,
+    background: bool = False,
+    batch_size: int = 256,
+) -> LogBackend:
+    """替换全局日志后端（旧后端先刷新并关闭），返回新后端。
+
+    默认与旧行为一致：同步输出到控制台。后台模式下进程退出前会自动刷新队列。
+    """
+    global _global_backend, _atexit_registered
+    previous = _global_backend
+    _global_backend = LogBackend(sinks, background=background, batch_size=batch_size)
+    previous.close()
+    if background and not _atexit_registered:
+        atexit.register(lambda: _global_backend.close())
+        _atexit_registered = True
+    return _global_backend
+
+
+__all__ = [
+    "ConsoleLogSink",
+    "LOG_LEVEL_DEBUG",
+    "LOG_LEVEL_ERROR",
+    "LOG_LEVEL_INFO",
+    "LOG_LEVEL_OFF",
+    "LOG_LEVEL_PRINT",
+    "LOG_LEVEL_WARNING",
+    "LogBackend",
+    "LogRecord",
+    "Logger",
+    "MemoryRingLogSink",
+    "NullLogSink",
+    "QueueLogWriter",
+    "RotatingFileLogSink",
+    "configure_logging",
+    "format_log_line",
+    "get_log_backend",
+    "get_logger",
+]
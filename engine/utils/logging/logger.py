@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Any
 
-_settings = None  # 延迟导入 settings，避免循环依赖
+from .log_backend import (
+    LOG_LEVEL_ERROR,
+    LOG_LEVEL_INFO,
+    LOG_LEVEL_PRINT,
+    LOG_LEVEL_WARNING,
+    get_logger,
+)
 
+_settings = None  # 延迟导入 settings，避免循环依赖
 
-def _now() -> str:
-    return datetime.now().strftime("%H:%M:%S")
+# 统一日志接口共用的 Logger；输出目标由 log_backend.configure_logging 决定（默认同步输出到控制台）
+_engine_logger = get_logger("engine")
 
 
 def _get_settings():
@@ -26,37 +32,22 @@ def _get_settings():
 
 
 def log_info(message: str, *args: Any) -> None:
-    """信息日志。由 settings.NODE_IMPL_LOG_VERBOSE 控制是否输出。"""
+    """信息日志。由 settings.NODE_IMPL_LOG_VERBOSE 控制是否输出（关闭时不格式化参数）。"""
     settings = _get_settings()
     if getattr(settings, "NODE_IMPL_LOG_VERBOSE", False):
-        if args:
-            print(f"[INFO { _now() }] " + message.format(*args))
-        else:
-            print(f"[INFO { _now() }] {message}")
+        _engine_logger.log(LOG_LEVEL_INFO, message, *args)
 
 
 def log_print(message: str, *args: Any) -> None:
     """打印日志。始终输出（用于节点图调试节点，如“打印字符串”）。"""
-    if args:
-        print(f"[PRINT { _now() }] " + message.format(*args))
-    else:
-        print(f"[PRINT { _now() }] {message}")
+    _engine_logger.log(LOG_LEVEL_PRINT, message, *args)
 
 
 def log_warn(message: str, *args: Any) -> None:
     """警告日志。始终输出。"""
-    if args:
-        print(f"[WARN { _now() }] " + message.format(*args))
-    else:
-        print(f"[WARN { _now() }] {message}")
+    _engine_logger.log(LOG_LEVEL_WARNING, message, *args)
 
 
 def log_error(message: str, *args: Any) -> None:
     """错误日志。始终输出。"""
-    if args:
-        print(f"[ERR  { _now() }] " + message.format(*args))
-    else:
-        print(f"[ERR  { _now() }] {message}")
-
-
-
+    _engine_logger.log(LOG_LEVEL_ERROR, message, *args)
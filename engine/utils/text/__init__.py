@@ -1,7 +1,7 @@
 """文本相关工具子包
 
 负责通用文本处理与相似度计算：
-- text_similarity：字符串/中文文本相似度与距离计算
+- text_similarity：字符串/中文文本相似度与距离计算（位并行编辑距离、编辑距离近邻索引）
 """
 
 __all__ = ["text_similarity"]
@@ -6,13 +6,31 @@ from __future__ import annotations
 提供通用的 Levenshtein 距离计算与基于中文提取的近似匹配判断，
 用于 OCR 标题与端口名近似匹配、运行时节点/端口容错选择等场景。
 
+- `levenshtein_distance`：位并行（Myers/Hyyrö）实现，以 Python 整数作为位向量，长度不受 64 位限制；
+- `bounded_levenshtein_distance`：给定最大距离时的带状 DP，超出阈值立即退出；
+- `EditDistanceIndex`：名称库的编辑距离近邻索引，用于“阈值内最近名称”查询。
+
 注意：不使用第三方库，保证在无额外依赖下可用。
 """
 
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import re
 
 
+def _strip_common_affixes(text_a: str, text_b: str) -> Tuple[str, str]:
+    """去掉公共前缀与后缀（不影响编辑距离，可显著缩短比较长度）。"""
+    limit = min(len(text_a), len(text_b))
+    start = 0
+    while start < limit and text_a[start] == text_b[start]:
+        start += 1
+    end_a = len(text_a)
+    end_b = len(text_b)
+    while end_a > start and end_b > start and text_a[end_a - 1] == text_b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    return text_a[start:end_a], text_b[start:end_b]
+
+
 def levenshtein_distance(text_a: str, text_b: str) -> int:
     """计算 Levenshtein 编辑距离。
 
@@ -23,30 +41,162 @@ def levenshtein_distance(text_a: str, text_b: str) -> int:
     Returns:
         最小编辑步数（插入/删除/替换均计 1）
     """
-    len_a = len(text_a)
-    len_b = len(text_b)
-    if len_a == 0:
-        return len_b
-    if len_b == 0:
-        return len_a
-    dp = [[0] * (len_b + 1) for _ in range(len_a + 1)]
-    for i in range(len_a + 1):
-        dp[i][0] = i
-    for j in range(len_b + 1):
-        dp[0][j] = j
-    for i in range(1, len_a + 1):
-        char_a = text_a[i - 1]
-        for j in range(1, len_b + 1):
-            char_b = text_b[j - 1]
-            replace_cost = 0 if char_a == char_b else 1
-            delete_cost = dp[i - 1][j] + 1
-            insert_cost = dp[i][j - 1] + 1
-            substitute_cost = dp[i - 1][j - 1] + replace_cost
-            best_cost = delete_cost if delete_cost < insert_cost else insert_cost
-            if substitute_cost < best_cost:
-                best_cost = substitute_cost
-            dp[i][j] = best_cost
-    return dp[len_a][len_b]
+    if text_a == text_b:
+        return 0
+    text_a, text_b = _strip_common_affixes(text_a, text_b)
+    # 较长者作为“模式串”编码进位向量，外层循环只遍历较短者
+    if len(text_a) < len(text_b):
+        text_a, text_b = text_b, text_a
+    pattern_length = len(text_a)
+    if len(text_b) == 0:
+        return pattern_length
+
+    match_masks: Dict[str, int] = {}
+    bit = 1
+    for char in text_a:
+        match_masks[char] = match_masks.get(char, 0) | bit
+        bit <<= 1
+    full_mask = (1 << pattern_length) - 1
+    last_bit = 1 << (pattern_length - 1)
+
+    positive_vertical = full_mask
+    negative_vertical = 0
+    score = pattern_length
+    for char in text_b:
+        equal_mask = match_masks.get(char, 0)
+        vertical_mix = equal_mask | negative_vertical
+        horizontal_mix = (((equal_mask & positive_vertical) + positive_vertical) ^ positive_vertical) | equal_mask
+        positive_horizontal = negative_vertical | ~(horizontal_mix | positive_vertical)
+        negative_horizontal = positive_vertical & horizontal_mix
+        if positive_horizontal & last_bit:
+            score += 1
+        elif negative_horizontal & last_bit:
+            score -= 1
+        positive_horizontal = (positive_horizontal << 1) | 1
+        negative_horizontal <<= 1
+        positive_vertical = (negative_horizontal | ~(vertical_mix | positive_horizontal)) & full_mask
+        negative_vertical = positive_horizontal & vertical_mix & full_mask
+    return score
+
+
+def bounded_levenshtein_distance(text_a: str, text_b: str, max_distance: int) -> int:
+    """带上限的 Levenshtein 编辑距离（带状 DP + 提前退出）。
+
+    只计算主对角线两侧 `max_distance` 宽度内的单元格；任一行的最小值超过上限时立即返回。
+
+    Returns:
+        距离不超过 `max_distance` 时返回精确距离，否则返回 `max_distance + 1`。
+    """
+    limit = max(0, int(max_distance))
+    exceeded = limit + 1
+    if abs(len(text_a) - len(text_b)) > limit:
+        return exceeded
+    if text_a == text_b:
+        return 0
+    text_a, text_b = _strip_common_affixes(text_a, text_b)
+    if len(text_a) > len(text_b):
+        text_a, text_b = text_b, text_a
+    row_count = len(text_a)
+    column_count = len(text_b)
+    if row_count == 0:
+        return column_count if column_count <= limit else exceeded
+
+    previous_row = [column if column <= limit else exceeded for column in range(column_count + 1)]
+    for row in range(1, row_count + 1):
+        char_a = text_a[row - 1]
+        first_column = max(1, row - limit)
+        last_column = min(column_count, row + limit)
+        current_row = [exceeded] * (column_count + 1)
+        current_row[0] = row if row <= limit else exceeded
+        row_minimum = current_row[0] if first_column == 1 else exceeded
+        for column in range(first_column, last_column + 1):
+            best_cost = previous_row[column - 1] + (char_a != text_b[column - 1])
+            insert_cost = current_row[column - 1] + 1
+            if insert_cost < best_cost:
+                best_cost = insert_cost
+            delete_cost = previous_row[column] + 1
+            if delete_cost < best_cost:
+                best_cost = delete_cost
+            if best_cost > exceeded:
+                best_cost = exceeded
+            current_row[column] = best_cost
+            if best_cost < row_minimum:
+                row_minimum = best_cost
+        if row_minimum > limit:
+            return exceeded
+        previous_row = current_row
+    return previous_row[column_count]
+
+
+class EditDistanceIndex:
+    """名称库的编辑距离近邻索引：字符计数过滤 + 带状验证，结果与逐个比较全库完全一致。
+
+    依据：若 `ed(a, b) ≤ k`，则两串按字符多重集计算的公共字符数不少于 `max(|a|, |b|) - k`。
+    通过“字符 → (词条序号, 出现次数)”倒排表一次性统计公共字符数，只对满足下界的候选
+    调用 `bounded_levenshtein_distance`。中文名称字符集大、相互共享的字符少，过滤后候选通常只剩个位数。
+    重复插入的词条会被忽略。
+    """
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        self._words: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._positions_by_length: Dict[int, List[int]] = {}
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._positions
+
+    def add(self, word: str) -> bool:
+        """插入词条；已存在时返回 False。"""
+        if word in self._positions:
+            return False
+        position = len(self._words)
+        self._words.append(word)
+        self._positions[word] = position
+        self._positions_by_length.setdefault(len(word), []).append(position)
+        char_counts: Dict[str, int] = {}
+        for char in word:
+            char_counts[char] = char_counts.get(char, 0) + 1
+        for char, count in char_counts.items():
+            self._postings.setdefault(char, []).append((position, count))
+        return True
+
+    def search(self, query: str, max_distance: int) -> List[Tuple[int, str]]:
+        """返回与 `query` 距离不超过 `max_distance` 的全部词条，按（距离, 插入顺序）排序。"""
+        limit = int(max_distance)
+        if limit < 0:
+            return []
+        query_counts: Dict[str, int] = {}
+        for char in query:
+            query_counts[char] = query_counts.get(char, 0) + 1
+        common_counts: Dict[int, int] = {}
+        for char, query_count in query_counts.items():
+            for position, word_count in self._postings.get(char, ()):
+                shared = query_count if query_count < word_count else word_count
+                common_counts[position] = common_counts.get(position, 0) + shared
+        # 没有公共字符的词条只有在两者都不长于 limit 时才可能命中
+        if len(query) <= limit:
+            for length in range(limit + 1):
+                for position in self._positions_by_length.get(length, ()):
+                    common_counts.setdefault(position, 0)
+
+        query_length = len(query)
+        found: List[Tuple[int, int]] = []
+        for position, shared in common_counts.items():
+            word = self._words[position]
+            longer_length = query_length if query_length > len(word) else len(word)
+            if shared < longer_length - limit:
+                continue
+            distance = bounded_levenshtein_distance(query, word, limit)
+            if distance <= limit:
+                found.append((distance, position))
+        found.sort()
+        return [(distance, self._words[position]) for distance, position in found]
 
 
 def chinese_similar(text_a: str, text_b: str, max_distance: int = 2) -> bool:
@@ -62,13 +212,12 @@ def chinese_similar(text_a: str, text_b: str, max_distance: int = 2) -> bool:
         return False
     if chinese_a == chinese_b or chinese_a in chinese_b or chinese_b in chinese_a:
         return True
-    return int(levenshtein_distance(chinese_a, chinese_b)) <= int(max_distance)
+    return bounded_levenshtein_distance(chinese_a, chinese_b, int(max_distance)) <= int(max_distance)
 
 
 __all__ = [
     "levenshtein_distance",
+    "bounded_levenshtein_distance",
+    "EditDistanceIndex",
     "chinese_similar",
 ]
-
-
-
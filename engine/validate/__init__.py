@@ -15,7 +15,7 @@ from .component_validator import ComponentValidator
 from .node_mount_validator import NodeMountValidator
 from .entity_config_validator import EntityConfigValidator
 from .comprehensive_validator import ComprehensiveValidator
-from .roundtrip_validator import RoundtripValidator
+from .roundtrip_validator import RoundtripFileResult, RoundtripValidator, validate_roundtrip_batch
 from .node_graph_validator import (
     NodeGraphValidationError,
     NodeGraphValidator,
@@ -40,6 +40,8 @@ __all__ = [
     "EntityConfigValidator",
     "ComprehensiveValidator",
     "RoundtripValidator",
+    "RoundtripFileResult",
+    "validate_roundtrip_batch",
     "NodeGraphValidationError",
     "NodeGraphValidator",
     "validate_node_graph",
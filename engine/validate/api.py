@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .context import ValidationContext
 from .issue import EngineIssue, ValidationReport
@@ -149,17 +150,93 @@ def _build_rules(config: Dict[str, Any], *, is_composite: bool) -> List[Validati
     return rules
 
 
+# ===== 多进程校验（每个 worker 进程仅初始化一次节点库与规则列表） =====
+
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _validate_single_file(
+    file_path: Path,
+    workspace: Path,
+    config: Dict[str, Any],
+    composite_pipeline: ValidationPipeline,
+    standard_pipeline: ValidationPipeline,
+) -> List[EngineIssue]:
+    ctx = ValidationContext(
+        workspace_path=workspace,
+        file_path=file_path,
+        is_composite=_is_composite_file(file_path),
+        config=config,
+    )
+    pipeline = composite_pipeline if ctx.is_composite else standard_pipeline
+    produced = pipeline.run(ctx)
+    return apply_exemptions(produced, ctx, config)
+
+
+def _init_validation_worker(workspace_text: str, config: Dict[str, Any]) -> None:
+    """worker 进程初始化：对齐 settings、预热 NodeRegistry，并构建一次规则流水线。"""
+    from engine.configs.settings import settings
+    from engine.nodes.node_registry import get_node_registry
+
+    workspace = Path(workspace_text)
+    settings.set_config_path(workspace)
+    settings.load()
+    get_node_registry(workspace, include_composite=True).get_library()
+    clear_node_index_caches()
+
+    _WORKER_STATE["workspace"] = workspace
+    _WORKER_STATE["config"] = config
+    _WORKER_STATE["composite_pipeline"] = ValidationPipeline(rules=_build_rules(config, is_composite=True))
+    _WORKER_STATE["standard_pipeline"] = ValidationPipeline(rules=_build_rules(config, is_composite=False))
+
+
+def _validate_file_in_worker(file_path_text: str) -> List[EngineIssue]:
+    return _validate_single_file(
+        Path(file_path_text),
+        _WORKER_STATE["workspace"],
+        _WORKER_STATE["config"],
+        _WORKER_STATE["composite_pipeline"],
+        _WORKER_STATE["standard_pipeline"],
+    )
+
+
+def _run_pending_files_in_pool(
+    pending_paths: List[Path],
+    workspace: Path,
+    config: Dict[str, Any],
+    workers: int,
+) -> List[List[EngineIssue]]:
+    """在进程池中校验文件；`map` 保证结果顺序与输入一致（确定性合并）。"""
+    worker_count = min(int(workers), len(pending_paths))
+    chunk_size = max(1, len(pending_paths) // (worker_count * 4))
+    with ProcessPoolExecutor(
+        max_workers=worker_count,
+        initializer=_init_validation_worker,
+        initargs=(str(workspace), config),
+    ) as executor:
+        return list(
+            executor.map(
+                _validate_file_in_worker,
+                [str(path) for path in pending_paths],
+                chunksize=chunk_size,
+            )
+        )
+
+
 def validate_files(
     paths: Iterable[Path],
     workspace: Path,
     strict_entity_wire_only: bool = False,
     use_cache: bool = True,
+    workers: Optional[int] = None,
 ) -> ValidationReport:
     """验证一组节点图文件（类结构 + 复合节点）
 
     说明：
         - 这是节点图验证的统一底层入口，所有 CLI / UI / runtime 都应通过此函数间接调用验证引擎。
         - 接受任意可迭代的路径序列，内部会先收敛为列表，以便统计与二次遍历时行为一致。
+        - workers > 1 时，未命中缓存的文件会分片到进程池并行校验（每个 worker 仅加载一次节点库与规则）；
+          Issue 按输入顺序合并，验证缓存只由父进程读写。
     """
     paths_list = list(paths)
     clear_node_index_caches()
@@ -167,7 +244,6 @@ def validate_files(
         "STRICT_ENTITY_INPUTS_WIRE_ONLY": bool(strict_entity_wire_only),
     }
     config = merge_config(DEFAULT_CONFIG, override)
-    issues: List[EngineIssue] = []
     composite_rules = _build_rules(config, is_composite=True)
     standard_rules = _build_rules(config, is_composite=False)
     composite_pipeline = ValidationPipeline(rules=composite_rules)
@@ -183,7 +259,11 @@ def validate_files(
             composite_rules,
             workspace=workspace,
         )
-    for file_path in paths_list:
+
+    # 按输入顺序收集每个文件的结果：缓存命中直接填充，其余交给串行/并行执行
+    issues_per_file: List[Optional[List[EngineIssue]]] = [None] * len(paths_list)
+    pending_indices: List[int] = []
+    for index, file_path in enumerate(paths_list):
         if use_cache and rules_hash:
             cached = try_load_cached_issues_for_file(
                 workspace=workspace,
@@ -192,22 +272,25 @@ def validate_files(
                 current_rules_hash=rules_hash,
             )
             if cached is not None:
-                issues.extend(cached)
+                issues_per_file[index] = cached
                 continue
-        ctx = ValidationContext(
-            workspace_path=workspace,
-            file_path=file_path,
-            is_composite=_is_composite_file(file_path),
-            config=config,
-        )
-        pipeline = composite_pipeline if ctx.is_composite else standard_pipeline
-        produced = pipeline.run(ctx)
-        produced = apply_exemptions(produced, ctx, config)
-        issues.extend(produced)
+        pending_indices.append(index)
+
+    pending_paths = [paths_list[index] for index in pending_indices]
+    if workers is not None and int(workers) > 1 and len(pending_paths) > 1:
+        pending_results = _run_pending_files_in_pool(pending_paths, workspace, config, int(workers))
+    else:
+        pending_results = [
+            _validate_single_file(file_path, workspace, config, composite_pipeline, standard_pipeline)
+            for file_path in pending_paths
+        ]
+
+    for index, produced in zip(pending_indices, pending_results):
+        issues_per_file[index] = produced
         if use_cache and rules_hash:
             update_validation_cache_for_file(
                 workspace=workspace,
-                file_path=file_path,
+                file_path=paths_list[index],
                 cache=cache_data,
                 current_rules_hash=rules_hash,
                 issues=produced,
@@ -215,11 +298,13 @@ def validate_files(
     if use_cache and rules_hash:
         save_validation_cache(workspace, cache_data)
 
+    issues: List[EngineIssue] = []
+    for file_issues in issues_per_file:
+        issues.extend(file_issues or [])
+
     stats = {
         "files": len(paths_list),
         "errors": len([i for i in issues if i.level == "error"]),
         "warnings": len([i for i in issues if i.level == "warning"]),
     }
     return ValidationReport(issues=issues, stats=stats, config=config)
-
- 
\ No newline at end of file
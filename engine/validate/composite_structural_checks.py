@@ -6,6 +6,7 @@ from typing import Dict, List, Sequence, Tuple
 from engine.graph import deserialize_graph
 from engine.graph.graph_code_parser import validate_graph as validate_graph_model
 from engine.graph.composite_code_parser import CompositeCodeParser
+from engine.graph.parse_result_cache import parse_composite_file_shared
 from engine.nodes.composite_file_policy import is_composite_definition_file
 from engine.nodes.node_registry import get_node_registry
 
@@ -51,7 +52,7 @@ def collect_composite_structural_issues(
         if not file_path.is_file():
             continue
 
-        composite = parser.parse_file(file_path)
+        composite = parse_composite_file_shared(workspace_path, file_path, parser=parser)
         model = deserialize_graph(composite.sub_graph)
 
         virtual_pin_mappings: Dict[Tuple[str, str], bool] = {}
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 from weakref import WeakKeyDictionary
 
 from engine.graph.models.graph_config import GraphConfig
@@ -33,6 +33,8 @@ class GraphDataSnapshot:
     connections: List[Dict[str, Any]]
 
 
+GraphFilter = Callable[[str], bool]
+
 _GRAPH_CONFIG_CACHE: "WeakKeyDictionary[ResourceManager, Dict[str, GraphConfig]]" = (
     WeakKeyDictionary()
 )
@@ -44,7 +46,7 @@ def _load_graph_config(resource_manager: ResourceManager, graph_id: str) -> Opti
     cached = manager_cache.get(graph_id)
     if cached is not None:
         return cached
-    graph_data = resource_manager.load_resource(ResourceType.GRAPH, graph_id)
+    graph_data = resource_manager.load_resource(ResourceType.GRAPH, graph_id, need_layout=False)
     if not graph_data:
         return None
     graph_config = GraphConfig.deserialize(graph_data)
@@ -123,6 +125,7 @@ def validate_components_for_entity(
 def iter_template_graphs(
     resource_manager: Optional[ResourceManager],
     templates: Dict[str, TemplateConfig],
+    graph_filter: Optional[GraphFilter] = None,
 ) -> Iterator[GraphAttachment]:
     if not resource_manager:
         return
@@ -130,6 +133,8 @@ def iter_template_graphs(
         if not template.default_graphs:
             continue
         for graph_id in template.default_graphs:
+            if graph_filter is not None and not graph_filter(graph_id):
+                continue
             graph_config = _load_graph_config(resource_manager, graph_id)
             if not graph_config:
                 continue
@@ -157,6 +162,7 @@ def iter_instance_graphs(
     resource_manager: Optional[ResourceManager],
     instances: Dict[str, InstanceConfig],
     templates: Optional[Dict[str, TemplateConfig]] = None,
+    graph_filter: Optional[GraphFilter] = None,
 ) -> Iterator[GraphAttachment]:
     if not resource_manager:
         return
@@ -170,6 +176,8 @@ def iter_instance_graphs(
             else instance.metadata.get("entity_type") or ""
         )
         for graph_id in instance.additional_graphs:
+            if graph_filter is not None and not graph_filter(graph_id):
+                continue
             graph_config = _load_graph_config(resource_manager, graph_id)
             if not graph_config:
                 continue
@@ -196,11 +204,14 @@ def iter_instance_graphs(
 def iter_level_entity_graphs(
     resource_manager: Optional[ResourceManager],
     level_entity,
+    graph_filter: Optional[GraphFilter] = None,
 ) -> Iterator[GraphAttachment]:
     if not resource_manager or not level_entity or not level_entity.additional_graphs:
         return
     entity_type = level_entity.metadata.get("entity_type", "关卡")
     for graph_id in level_entity.additional_graphs:
+        if graph_filter is not None and not graph_filter(graph_id):
+            continue
         graph_config = _load_graph_config(resource_manager, graph_id)
         if not graph_config:
             continue
@@ -230,15 +241,28 @@ def iter_all_package_graphs(
     templates: Dict[str, TemplateConfig],
     instances: Dict[str, InstanceConfig],
     level_entity,
+    graph_filter: Optional[GraphFilter] = None,
 ) -> Iterator[GraphAttachment]:
-    yield from iter_template_graphs(resource_manager, templates)
-    yield from iter_instance_graphs(resource_manager, instances, templates)
-    yield from iter_level_entity_graphs(resource_manager, level_entity)
+    """遍历存档挂载的全部节点图；graph_filter 返回 False 的图在加载前即被跳过。"""
+    yield from iter_template_graphs(resource_manager, templates, graph_filter)
+    yield from iter_instance_graphs(resource_manager, instances, templates, graph_filter)
+    yield from iter_level_entity_graphs(resource_manager, level_entity, graph_filter)
+
+
+def build_node_title_graph_filter(
+    resource_manager: Optional[ResourceManager],
+    node_titles: Iterable[str],
+) -> Optional[GraphFilter]:
+    """基于节点图摘要索引构造过滤器：只保留可能包含指定标题节点的图，其余图无需加载。"""
+    if not resource_manager:
+        return None
+    return resource_manager.get_graph_summary_index().build_node_title_filter(node_titles)
 
 
 __all__ = [
     "GraphAttachment",
     "GraphDataSnapshot",
+    "build_node_title_graph_filter",
     "iter_all_package_graphs",
     "iter_template_graphs",
     "iter_instance_graphs",
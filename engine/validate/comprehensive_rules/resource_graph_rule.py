@@ -27,7 +27,7 @@ def validate_resource_library_graphs(validator) -> List[ValidationIssue]:
         return []
     issues: List[ValidationIssue] = []
     for graph_id in graph_ids:
-        graph_data = resource_manager.load_resource(ResourceType.GRAPH, graph_id)
+        graph_data = resource_manager.load_resource(ResourceType.GRAPH, graph_id, need_layout=False)
         if not graph_data:
             continue
         graph_config = GraphConfig.deserialize(graph_data)
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from typing import Dict, List
 
+from engine.graph.common import SIGNAL_LISTEN_NODE_TITLE, SIGNAL_SEND_NODE_TITLE
 from engine.nodes.advanced_node_features import SignalDefinition, build_signal_definitions_from_package
 from engine.nodes.node_definition_loader import NodeDef
 
 from ...comprehensive_types import ValidationIssue
 from ..base import BaseComprehensiveRule
-from ..helpers import iter_all_package_graphs
+from ..helpers import build_node_title_graph_filter, iter_all_package_graphs
 from .definition_bounds import validate_signal_definition_bounds
 from .graph_validation import validate_signals_in_single_graph
 
@@ -49,6 +50,10 @@ def validate_package_signal_usage(validator) -> List[ValidationIssue]:
         package.templates,
         package.instances,
         package.level_entity,
+        graph_filter=build_node_title_graph_filter(
+            resource_manager,
+            (SIGNAL_SEND_NODE_TITLE, SIGNAL_LISTEN_NODE_TITLE),
+        ),
     )
 
     node_library: Dict[str, NodeDef] = getattr(validator, "node_library", {}) or {}
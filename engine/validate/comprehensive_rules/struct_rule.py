@@ -16,7 +16,12 @@ from engine.graph.common import (
 
 from ..comprehensive_types import ValidationIssue
 from .base import BaseComprehensiveRule
-from .helpers import GraphAttachment, get_graph_snapshot, iter_all_package_graphs
+from .helpers import (
+    GraphAttachment,
+    build_node_title_graph_filter,
+    get_graph_snapshot,
+    iter_all_package_graphs,
+)
 
 
 def _extract_struct_fields_from_payload(struct_payload: Mapping[str, Any]) -> Set[str]:
@@ -86,6 +91,7 @@ def validate_package_struct_usage(validator) -> List[ValidationIssue]:
         package.templates,
         package.instances,
         package.level_entity,
+        graph_filter=build_node_title_graph_filter(resource_manager, STRUCT_NODE_TITLES),
     )
 
     for attachment in attachments:
@@ -33,3 +33,5 @@ class ValidationContext:
     node_library: Dict[str, "NodeDef"] = field(default_factory=dict)
     verbose: bool = False
     ast_cache: Dict[Path, ast.AST] = field(default_factory=dict)
+    # 单次遍历的 AST 节点分桶索引（见 rules/ast_node_index.py），按文件缓存
+    ast_index_cache: Dict[Path, Any] = field(default_factory=dict)
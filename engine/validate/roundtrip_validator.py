@@ -1,10 +1,8 @@
 from __future__ import annotations
-import shutil
-import tempfile
-from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Protocol, Any
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Any
 
 from engine.graph.models.graph_model import GraphModel
 from engine.nodes.node_definition_loader import NodeDef
@@ -14,11 +12,19 @@ class GraphCodeGenerator(Protocol):
     def generate_code(self, graph_model: GraphModel, metadata: Optional[Dict[str, Any]] = None) -> str: ...
 
 
+# 批量模式下由 worker 进程自行构造生成器：(workspace_path, node_library) -> 生成器。
+# 多进程时必须是可 pickle 的模块级可调用对象（例如生成器类本身）。
+GraphCodeGeneratorFactory = Callable[[Path, Dict[str, NodeDef]], GraphCodeGenerator]
+
+# 往返解析使用的虚拟文件名（仅出现在错误信息与 metadata["source_file"] 中）
+_ROUNDTRIP_VIRTUAL_PATH = "<roundtrip>/graph_roundtrip.py"
+
+
 @dataclass
 class RoundtripValidationResult:
     """往返验证结果"""
     success: bool
-    error_type: str = ""  # "generation" | "syntax" | "execution" | "empty"
+    error_type: str = ""  # "source" | "generation" | "syntax" | "execution" | "empty"
     error_message: str = ""
     error_details: str = ""  # 技术细节（如堆栈跟踪）
     line_number: Optional[int] = None
@@ -97,7 +103,7 @@ class RoundtripValidator:
     def _check_syntax(self, generated_code: str) -> RoundtripValidationResult:
         """检查代码的 Python 语法"""
         try:
-            compile(generated_code, "<roundtrip>", "exec")
+            compile(generated_code, _ROUNDTRIP_VIRTUAL_PATH, "exec")
         except SyntaxError as exc:
             line_info = f"第 {exc.lineno} 行" if exc.lineno else "未知行"
             return RoundtripValidationResult(
@@ -110,28 +116,27 @@ class RoundtripValidator:
         return RoundtripValidationResult(success=True)
     
     def _parse(self, generated_code: str) -> 'ParseResult':
-        """尝试解析生成的代码"""
+        """尝试解析生成的代码（内存解析，不落盘）"""
         from engine.graph.graph_code_parser import GraphParseError
 
         parser = self._get_parser()
-        with _temporary_graph_file("roundtrip_parse_", generated_code) as temp_file:
-            try:
-                graph_model, _ = parser.parse_file(temp_file)
-            except GraphParseError as exc:
-                return ParseResult(
-                    success=False,
-                    error_type="execution",
-                    error_message=str(exc),
-                    error_details=getattr(exc, "message", str(exc)),
-                    line_number=getattr(exc, "line_number", None),
-                )
-            except Exception as exc:
-                return ParseResult(
-                    success=False,
-                    error_type="execution",
-                    error_message=str(exc),
-                    error_details=repr(exc),
-                )
+        try:
+            graph_model, _ = parser.parse_code(generated_code, _ROUNDTRIP_VIRTUAL_PATH)
+        except GraphParseError as exc:
+            return ParseResult(
+                success=False,
+                error_type="execution",
+                error_message=str(exc),
+                error_details=getattr(exc, "message", str(exc)),
+                line_number=getattr(exc, "line_number", None),
+            )
+        except Exception as exc:
+            return ParseResult(
+                success=False,
+                error_type="execution",
+                error_message=str(exc),
+                error_details=repr(exc),
+            )
         return ParseResult(success=True, parsed_model=graph_model)
 
     def _get_parser(self):
@@ -146,17 +151,6 @@ class RoundtripValidator:
         return self._parser
 
 
-@contextmanager
-def _temporary_graph_file(prefix: str, generated_code: str):
-    temp_dir = Path(tempfile.mkdtemp(prefix=prefix))
-    try:
-        temp_file = temp_dir / "graph_roundtrip.py"
-        temp_file.write_text(generated_code, encoding="utf-8")
-        yield temp_file
-    finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
-
-
 @dataclass
 class ParseResult:
     success: bool
@@ -167,3 +161,99 @@ class ParseResult:
     parsed_model: Optional[GraphModel] = None
 
 
+# ===== 批量往返校验（可选进程池；每个 worker 仅初始化一次节点库、生成器与解析器） =====
+
+@dataclass
+class RoundtripFileResult:
+    """单个源文件的批量往返校验结果"""
+    file_path: Path
+    result: RoundtripValidationResult
+
+
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _build_roundtrip_validator(
+    workspace_path: Path,
+    code_generator_factory: GraphCodeGeneratorFactory,
+) -> RoundtripValidator:
+    from engine.nodes.node_registry import get_node_registry
+
+    node_library = get_node_registry(workspace_path, include_composite=True).get_library()
+    return RoundtripValidator(
+        workspace_path,
+        node_library,
+        code_generator=code_generator_factory(workspace_path, node_library),
+    )
+
+
+def _roundtrip_single_file(validator: RoundtripValidator, file_path: Path) -> RoundtripValidationResult:
+    """源文件 -> GraphModel -> 代码 -> 语法检查 -> 内存解析；单个文件失败不影响整批。"""
+    try:
+        graph_model, metadata = validator._get_parser().parse_file(file_path)
+    except Exception as exc:
+        return RoundtripValidationResult(
+            success=False,
+            error_type="source",
+            error_message=f"源文件解析失败: {exc}",
+            error_details=repr(exc),
+            line_number=getattr(exc, "line_number", None),
+        )
+    try:
+        return validator.validate(graph_model, metadata)
+    except Exception as exc:
+        return RoundtripValidationResult(
+            success=False,
+            error_type="generation",
+            error_message=f"代码生成失败: {exc}",
+            error_details=repr(exc),
+        )
+
+
+def _init_roundtrip_worker(workspace_text: str, code_generator_factory: GraphCodeGeneratorFactory) -> None:
+    """worker 进程初始化：对齐 settings 并构建一次往返校验器。"""
+    from engine.configs.settings import settings
+
+    workspace = Path(workspace_text)
+    settings.set_config_path(workspace)
+    settings.load()
+    _WORKER_STATE["validator"] = _build_roundtrip_validator(workspace, code_generator_factory)
+
+
+def _roundtrip_file_in_worker(file_path_text: str) -> RoundtripValidationResult:
+    return _roundtrip_single_file(_WORKER_STATE["validator"], Path(file_path_text))
+
+
+def validate_roundtrip_batch(
+    graph_files: Iterable[Path],
+    workspace_path: Path,
+    *,
+    code_generator_factory: GraphCodeGeneratorFactory,
+    workers: Optional[int] = None,
+) -> List[RoundtripFileResult]:
+    """批量往返校验一组节点图源文件（生成 -> 编译 -> 内存重解析，全程不写临时文件）。
+
+    说明：
+        - workers > 1 时分片到进程池执行，每个 worker 只加载一次节点库并构造一次生成器/解析器；
+        - 结果按输入顺序返回（确定性输出，便于 CI 对比）。
+    """
+    files = [Path(path) for path in graph_files]
+    if workers is not None and int(workers) > 1 and len(files) > 1:
+        worker_count = min(int(workers), len(files))
+        chunk_size = max(1, len(files) // (worker_count * 4))
+        with ProcessPoolExecutor(
+            max_workers=worker_count,
+            initializer=_init_roundtrip_worker,
+            initargs=(str(workspace_path), code_generator_factory),
+        ) as executor:
+            results = list(
+                executor.map(
+                    _roundtrip_file_in_worker,
+                    [str(path) for path in files],
+                    chunksize=chunk_size,
+                )
+            )
+    else:
+        validator = _build_roundtrip_validator(Path(workspace_path), code_generator_factory)
+        results = [_roundtrip_single_file(validator, path) for path in files]
+    return [RoundtripFileResult(file_path=path, result=result) for path, result in zip(files, results)]
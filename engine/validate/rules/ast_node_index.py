@@ -0,0 +1,104 @@
+"""
+单次遍历的 AST 节点分桶索引（供代码规范规则共享）。
+
+背景：代码结构规则各自对同一模块执行 `ast.walk(method)` 再按节点类型过滤，
+每个文件要重复遍历十几次整棵语法树。这里在一次遍历中：
+- 为每个类方法（与 `iter_class_methods` 同一范围）按节点类型分桶，桶内顺序与 `ast.walk(method)` 完全一致；
+- 同时汇总全模块的类型分桶与父节点映射（替代 `ast.walk(tree)` / `build_parent_map`）。
+
+规则只需声明关心的节点类型并从索引取桶（`method_nodes(method, ast.Call)`），
+输出顺序与逐规则遍历保持一致；规则级耗时统计仍由 ValidationPipeline 按 rule_id 记录。
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Type
+
+import ast
+
+from .ast_utils import get_cached_module, iter_class_methods
+
+if TYPE_CHECKING:
+    from ..context import ValidationContext
+
+
+_NodeBuckets = Dict[Type[ast.AST], List[ast.AST]]
+
+
+def _walk_into(
+    root: ast.AST,
+    buckets: _NodeBuckets,
+    parents: Dict[ast.AST, ast.AST],
+    positions: Dict[int, int],
+    skip_children: Iterable[ast.AST] = (),
+) -> None:
+    """广度优先遍历（与 ast.walk 相同顺序），按节点类型分桶并记录父节点。"""
+    skipped_ids = {id(node) for node in skip_children}
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        positions[id(node)] = len(positions)
+        bucket = buckets.get(type(node))
+        if bucket is None:
+            bucket = buckets[type(node)] = []
+        bucket.append(node)
+        for child in ast.iter_child_nodes(node):
+            parents[child] = node
+            if id(child) not in skipped_ids:
+                queue.append(child)
+
+
+class ModuleNodeIndex:
+    """模块级 AST 节点索引：类方法分桶 + 全模块分桶 + 父节点映射。"""
+
+    def __init__(self, tree: ast.Module) -> None:
+        self.tree = tree
+        self.parent_map: Dict[ast.AST, ast.AST] = {}
+        self._module_buckets: _NodeBuckets = {}
+        self._method_buckets: Dict[int, _NodeBuckets] = {}
+        self._positions: Dict[int, int] = {}
+
+        methods = [method for _, method in iter_class_methods(tree)]
+        # 模块其余部分与各方法分别遍历：每个节点只访问一次，方法内部顺序与 ast.walk(method) 一致
+        _walk_into(tree, self._module_buckets, self.parent_map, self._positions, skip_children=methods)
+        for method in methods:
+            method_buckets: _NodeBuckets = {}
+            _walk_into(method, method_buckets, self.parent_map, self._positions)
+            self._method_buckets[id(method)] = method_buckets
+            for node_type, nodes in method_buckets.items():
+                self._module_buckets.setdefault(node_type, []).extend(nodes)
+
+    def _select(self, buckets: _NodeBuckets, node_types: Tuple[Type[ast.AST], ...]) -> List[ast.AST]:
+        if len(node_types) == 1:
+            return buckets.get(node_types[0], [])
+        selected: List[ast.AST] = []
+        for node_type in node_types:
+            selected.extend(buckets.get(node_type, []))
+        # 多类型查询按遍历顺序合并，保持与 ast.walk 过滤结果一致
+        selected.sort(key=lambda node: self._positions[id(node)])
+        return selected
+
+    def method_nodes(self, method: ast.FunctionDef, *node_types: Type[ast.AST]) -> List[ast.AST]:
+        """返回类方法内指定类型的节点（顺序与 `ast.walk(method)` 过滤后一致）。"""
+        buckets = self._method_buckets.get(id(method))
+        if buckets is None:
+            raise KeyError(f"方法 {getattr(method, 'name', '?')} 不属于当前模块的类方法")
+        return self._select(buckets, node_types)
+
+    def module_nodes(self, *node_types: Type[ast.AST]) -> List[ast.AST]:
+        """返回全模块指定类型的节点（集合语义：顺序不保证与 `ast.walk(tree)` 一致）。"""
+        return self._select(self._module_buckets, node_types)
+
+
+def get_module_node_index(ctx: "ValidationContext") -> ModuleNodeIndex:
+    """返回当前文件的节点索引（同一 ValidationContext 内只构建一次）。"""
+    tree = get_cached_module(ctx)
+    cached = ctx.ast_index_cache.get(ctx.file_path)
+    if cached is None or cached.tree is not tree:
+        cached = ModuleNodeIndex(tree)
+        ctx.ast_index_cache[ctx.file_path] = cached
+    return cached
+
+
+__all__ = ["ModuleNodeIndex", "get_module_node_index"]
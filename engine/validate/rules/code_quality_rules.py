@@ -17,7 +17,7 @@ from .ast_utils import (
     iter_class_methods,
 )
 from .node_index import data_query_node_names
-from engine.graph.graph_code_parser import GraphCodeParser
+from engine.graph.parse_result_cache import parse_graph_file_shared
 from engine.utils.graph.graph_utils import is_flow_port_name
 
 
@@ -117,8 +117,7 @@ class EventMultipleFlowOutputsRule(ValidationRule):
             return []
 
         file_path: Path = ctx.file_path
-        parser = GraphCodeParser(ctx.workspace_path)
-        graph_model, _ = parser.parse_file(file_path)
+        graph_model = _get_or_parse_graph_model(ctx)
 
         issues: List[EngineIssue] = []
         event_nodes = [n for n in graph_model.nodes.values() if n.category == "事件节点"]
@@ -424,8 +423,8 @@ def _get_or_parse_graph_model(ctx: ValidationContext):
         return cached
     if ctx.file_path is None:
         return None
-    parser = GraphCodeParser(ctx.workspace_path)
-    model, _ = parser.parse_file(ctx.file_path)
+    # 共享只读模型：与资源加载、其它规则复用同一份解析结果，规则内不得修改
+    model = parse_graph_file_shared(ctx.workspace_path, ctx.file_path).model
     ctx.graph_model = model
     return model
 
@@ -7,6 +7,7 @@ from typing import List, Set
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import (
     create_rule_issue,
     get_cached_module,
@@ -68,6 +69,7 @@ class IfBooleanRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         scope = infer_graph_scope(ctx)
         boolean_funcs = boolean_node_names(ctx.workspace_path, scope)
         issues: List[EngineIssue] = []
@@ -75,7 +77,7 @@ class IfBooleanRule(ValidationRule):
         for _, method in iter_class_methods(tree):
             bool_vars_assigned: Set[str] = set()
             # 收集布尔变量赋值
-            for node in ast.walk(method):
+            for node in node_index.method_nodes(method, ast.Assign, ast.AnnAssign):
                 targets = []
                 value = None
                 annotation_is_bool: bool = False
@@ -128,9 +130,7 @@ class IfBooleanRule(ValidationRule):
                                 bool_vars_assigned.add(tgt.id)
 
             # 检查 if 条件
-            for node in ast.walk(method):
-                if not isinstance(node, ast.If):
-                    continue
+            for node in node_index.method_nodes(method, ast.If):
                 # 必须是布尔表达式
                 is_boolean_expr = _is_boolean_expr(
                     node.test, boolean_funcs, bool_vars_assigned
@@ -185,12 +185,11 @@ class NoDirectLogicNotCallInIfRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         issues: List[EngineIssue] = []
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not isinstance(node, ast.If):
-                    continue
+            for node in node_index.method_nodes(method, ast.If):
                 test = getattr(node, "test", None)
                 if not isinstance(test, ast.Call):
                     continue
@@ -231,12 +230,11 @@ class IfBoolEqualityToConstRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         issues: List[EngineIssue] = []
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not isinstance(node, ast.If):
-                    continue
+            for node in node_index.method_nodes(method, ast.If):
                 test = getattr(node, "test", None)
                 if not (
                     isinstance(test, ast.Call)
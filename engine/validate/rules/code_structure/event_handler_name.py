@@ -9,6 +9,7 @@ from engine.signal import get_default_signal_repository
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import (
     create_rule_issue,
     get_cached_module,
@@ -46,6 +47,7 @@ class EventHandlerNameRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         module_constant_strings = _collect_module_constant_strings(tree)
         scope = infer_graph_scope(ctx)
         builtin_event_names = event_node_names(ctx.workspace_path, scope)
@@ -53,10 +55,7 @@ class EventHandlerNameRule(ValidationRule):
         issues: List[EngineIssue] = []
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not isinstance(node, ast.Call):
-                    continue
-
+            for node in node_index.method_nodes(method, ast.Call):
                 func = getattr(node, "func", None)
                 is_attr_call = (
                     isinstance(func, ast.Attribute)
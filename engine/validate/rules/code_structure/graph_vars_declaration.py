@@ -7,6 +7,7 @@ from typing import List, Set
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import (
     create_rule_issue,
     extract_declared_graph_vars,
@@ -30,15 +31,13 @@ class GraphVarsDeclarationRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         declared: Set[str] = extract_declared_graph_vars(tree, read_source(file_path))
         issues: List[EngineIssue] = []
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not (
-                    isinstance(node, ast.Call)
-                    and isinstance(getattr(node, "func", None), ast.Name)
-                ):
+            for node in node_index.method_nodes(method, ast.Call):
+                if not isinstance(getattr(node, "func", None), ast.Name):
                     continue
                 fname = node.func.id
                 if fname not in ("设置节点图变量", "获取节点图变量"):
@@ -7,6 +7,7 @@ from typing import List, Set
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import (
     create_rule_issue,
     get_cached_module,
@@ -73,18 +74,19 @@ class NoLiteralAssignmentRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         issues: List[EngineIssue] = []
 
         # 收集当前模块中所有“命名常量”声明的变量名，供后续禁止别名赋值使用。
         constant_var_names: Set[str] = set()
-        for node in ast.walk(tree):
+        for node in node_index.module_nodes(ast.AnnAssign):
             if _is_constant_var_declaration(node):
                 target = getattr(node, "target", None)
                 if isinstance(target, ast.Name):
                     constant_var_names.add(target.id)
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
+            for node in node_index.method_nodes(method, ast.Assign, ast.AnnAssign):
                 if isinstance(node, ast.Assign):
                     value = getattr(node, "value", None)
                     # 1) 直接字面量赋值（原有规则）
@@ -9,6 +9,7 @@ from engine.graph.ir.arg_normalizer import is_reserved_argument
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import create_rule_issue, get_cached_module, iter_class_methods, line_span_text
 
 
@@ -37,12 +38,11 @@ class LocalVarInitialValueRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         issues: List[EngineIssue] = []
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not isinstance(node, ast.Call):
-                    continue
+            for node in node_index.method_nodes(method, ast.Call):
                 func = getattr(node, "func", None)
                 if not isinstance(func, ast.Name) or func.id != "获取局部变量":
                     continue
@@ -7,8 +7,8 @@ from typing import List
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import (
-    build_parent_map,
     create_rule_issue,
     get_cached_module,
     iter_class_methods,
@@ -34,14 +34,13 @@ class LocalVarUsageRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
-        parent_map = build_parent_map(tree)
+        node_index = get_module_node_index(ctx)
+        parent_map = node_index.parent_map
 
         issues: List[EngineIssue] = []
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not isinstance(node, ast.Call):
-                    continue
+            for node in node_index.method_nodes(method, ast.Call):
                 func = getattr(node, "func", None)
                 if not isinstance(func, ast.Name) or func.id != "获取局部变量":
                     continue
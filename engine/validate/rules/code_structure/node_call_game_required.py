@@ -8,6 +8,7 @@ from typing import Dict, List, Optional, Set, Tuple
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import (
     create_rule_issue,
     get_cached_module,
@@ -17,7 +18,7 @@ from ..ast_utils import (
     line_span_text,
 )
 from ..node_index import node_function_names
-from engine.nodes.pipeline.runner import run_pipeline
+from engine.nodes.node_registry import get_node_registry
 
 
 def _is_game_expr(expr: ast.AST) -> bool:
@@ -81,7 +82,8 @@ def _build_nodes_requiring_game(workspace: Path, scope_text: str) -> Set[str]:
     - 仅当实现函数签名包含 `game` 参数时才视为必须传 game；
       例如客户端 `获取当前角色()` 这类无 `game` 的节点不应被强制传 game。
     """
-    index = run_pipeline(workspace)
+    # 复用注册表的管线索引（进程内懒构建一次，且有持久化快照），避免每个文件都重跑管线
+    index = get_node_registry(workspace, include_composite=True).get_node_library_index()
     by_key: Dict[str, Dict[str, object]] = index.get("by_key", {}) if isinstance(index, dict) else {}
 
     chosen: Dict[str, Tuple[int, Path]] = {}
@@ -141,6 +143,7 @@ class NodeCallGameRequiredRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         scope = infer_graph_scope(ctx)
         scope_text = str(scope or "").strip().lower() or "server"
         known_node_names = node_function_names(ctx.workspace_path, scope_text)
@@ -153,9 +156,7 @@ class NodeCallGameRequiredRule(ValidationRule):
         issues: List[EngineIssue] = []
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not isinstance(node, ast.Call):
-                    continue
+            for node in node_index.method_nodes(method, ast.Call):
                 func = getattr(node, "func", None)
                 if not isinstance(func, ast.Name):
                     continue
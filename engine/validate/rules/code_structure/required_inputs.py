@@ -11,6 +11,7 @@ from engine.utils.graph.graph_utils import is_flow_port_name
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import (
     create_rule_issue,
     get_cached_module,
@@ -81,6 +82,7 @@ class RequiredInputsRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         scope = infer_graph_scope(ctx)
         required_ports_by_func = _required_input_ports_by_func(ctx.workspace_path, scope)
         if not required_ports_by_func:
@@ -91,9 +93,7 @@ class RequiredInputsRule(ValidationRule):
         from engine.graph.ir.arg_normalizer import is_reserved_argument
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not isinstance(node, ast.Call):
-                    continue
+            for node in node_index.method_nodes(method, ast.Call):
                 func = getattr(node, "func", None)
                 if not isinstance(func, ast.Name):
                     continue
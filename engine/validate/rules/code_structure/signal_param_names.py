@@ -14,6 +14,7 @@ from engine.signal import get_default_signal_repository
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import (
     create_rule_issue,
     get_cached_module,
@@ -40,6 +41,7 @@ class SignalParamNamesRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         module_constant_strings = _collect_module_constant_strings(tree)
 
         # 加载全局信号定义视图（来自代码级 Schema 视图或内置常量）。
@@ -54,9 +56,7 @@ class SignalParamNamesRule(ValidationRule):
         static_inputs = set(SIGNAL_SEND_STATIC_INPUTS)
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not isinstance(node, ast.Call):
-                    continue
+            for node in node_index.method_nodes(method, ast.Call):
                 func = getattr(node, "func", None)
                 if not isinstance(func, ast.Name):
                     continue
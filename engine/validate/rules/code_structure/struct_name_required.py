@@ -11,6 +11,7 @@ from engine.resources.definition_schema_view import get_default_definition_schem
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import create_rule_issue, get_cached_module, iter_class_methods, line_span_text
 
 
@@ -90,15 +91,14 @@ class StructNameRequiredRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         module_constant_strings = _collect_module_constant_strings(tree)
         known_struct_ids = _known_struct_ids()
 
         issues: List[EngineIssue] = []
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not isinstance(node, ast.Call):
-                    continue
+            for node in node_index.method_nodes(method, ast.Call):
                 func = getattr(node, "func", None)
                 if not isinstance(func, ast.Name):
                     continue
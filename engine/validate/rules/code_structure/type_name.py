@@ -17,6 +17,7 @@ from engine.type_registry import (
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import create_rule_issue, get_cached_module, iter_class_methods, line_span_text
 
 
@@ -80,6 +81,7 @@ class TypeNameRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         allowed_types = _get_allowed_type_names(ctx.workspace_path)
         issues: List[EngineIssue] = []
 
@@ -94,9 +96,7 @@ class TypeNameRule(ValidationRule):
 
         # 2) 函数体内 AnnAssign 的中文字符串类型注解检查
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not isinstance(node, ast.AnnAssign):
-                    continue
+            for node in node_index.method_nodes(method, ast.AnnAssign):
                 annotation = getattr(node, "annotation", None)
                 if not (
                     isinstance(annotation, ast.Constant)
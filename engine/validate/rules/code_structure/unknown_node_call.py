@@ -7,6 +7,7 @@ from typing import List
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import create_rule_issue, get_cached_module, infer_graph_scope, iter_class_methods, line_span_text
 from ..node_index import node_function_names
 
@@ -52,6 +53,7 @@ class UnknownNodeCallRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         scope = infer_graph_scope(ctx)
         known_node_names = node_function_names(ctx.workspace_path, scope)
         issues: List[EngineIssue] = []
@@ -62,9 +64,7 @@ class UnknownNodeCallRule(ValidationRule):
             if method_name in {"__init__", "register_handlers"}:
                 continue
 
-            for node in ast.walk(method):
-                if not isinstance(node, ast.Call):
-                    continue
+            for node in node_index.method_nodes(method, ast.Call):
                 func = getattr(node, "func", None)
                 if not isinstance(func, ast.Name):
                     continue
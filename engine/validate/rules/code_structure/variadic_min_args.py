@@ -7,6 +7,7 @@ from typing import List
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
+from ..ast_node_index import get_module_node_index
 from ..ast_utils import (
     create_rule_issue,
     get_cached_module,
@@ -30,6 +31,7 @@ class VariadicMinArgsRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
+        node_index = get_module_node_index(ctx)
         scope = infer_graph_scope(ctx)
         rules = variadic_min_args(ctx.workspace_path, scope)
         issues: List[EngineIssue] = []
@@ -37,9 +39,7 @@ class VariadicMinArgsRule(ValidationRule):
         from engine.graph.ir.arg_normalizer import is_reserved_argument
 
         for _, method in iter_class_methods(tree):
-            for node in ast.walk(method):
-                if not isinstance(node, ast.Call):
-                    continue
+            for node in node_index.method_nodes(method, ast.Call):
                 func = getattr(node, "func", None)
                 if not isinstance(func, ast.Name):
                     continue
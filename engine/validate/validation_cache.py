@@ -7,7 +7,7 @@ import inspect
 
 from engine.utils.cache.cache_paths import get_validation_cache_file
 from engine.utils.graph.graph_utils import compute_stable_md5_from_data
-from engine.utils.graph.node_defs_fingerprint import compute_node_defs_fingerprint
+from engine.utils.graph.node_defs_fingerprint_service import get_node_defs_fingerprint
 
 from .issue import EngineIssue
 
@@ -57,7 +57,7 @@ def build_rules_hash(
             module_mtimes[key] = mtime_value
     node_defs_fp = ""
     if workspace is not None:
-        node_defs_fp = compute_node_defs_fingerprint(workspace)
+        node_defs_fp = get_node_defs_fingerprint(workspace)
     signature_data = {
         "config": config,
         "rule_modules": sorted(module_mtimes.items()),
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+# color_block_detector_internal 与 app.automation.vision 互相引用，需先加载 vision 包
+import app.automation.vision  # noqa: F401
+from tools.color_block_detector_internal import (
+    _keep_contours_fitting_solid_window,
+    _remove_short_horizontal_runs,
+    _remove_short_vertical_segments,
+)
+
+
+def _reference_vertical(mask: np.ndarray, scan_width: int, min_height: int) -> np.ndarray:
+    result = mask.copy()
+    for position_x in range(0, mask.shape[1], scan_width):
+        strip = result[:, position_x:position_x + scan_width].copy()
+        contours, _ = cv2.findContours(strip, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for contour in contours:
+            if cv2.boundingRect(contour)[3] < min_height:
+                cv2.drawContours(strip, [contour], -1, 0, thickness=-1)
+        result[:, position_x:position_x + scan_width] = strip
+    return result
+
+
+def _reference_horizontal(mask: np.ndarray, min_width: int) -> np.ndarray:
+    result = mask.copy()
+    for position_y in range(mask.shape[0]):
+        row = result[position_y:position_y + 1, :].copy()
+        contours, _ = cv2.findContours(row, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for contour in contours:
+            if cv2.boundingRect(contour)[2] < min_width:
+                cv2.drawContours(row, [contour], -1, 0, thickness=-1)
+        result[position_y:position_y + 1, :] = row
+    return result
+
+
+def _random_mask(seed: int, height: int = 97, width: int = 203) -> np.ndarray:
+    generator = np.random.default_rng(seed)
+    mask = np.zeros((height, width), dtype=np.uint8)
+    for _ in range(12):
+        x, y = int(generator.integers(0, width - 10)), int(generator.integers(0, height - 10))
+        w, h = int(generator.integers(3, 80)), int(generator.integers(3, 60))
+        mask[y:y + h, x:x + w] = 255
+    for _ in range(10):
+        start = (int(generator.integers(0, width)), int(generator.integers(0, height)))
+        end = (int(generator.integers(0, width)), int(generator.integers(0, height)))
+        cv2.line(mask, start, end, 255, int(generator.integers(1, 3)))
+    mask[generator.random((height, width)) < 0.03] = 255
+    return mask
+
+
+def test_strip_line_removal_matches_per_strip_find_contours() -> None:
+    for seed in range(8):
+        mask = _random_mask(seed)
+        vertical = _remove_short_vertical_segments(mask, 5, 15)
+        assert np.array_equal(vertical, _reference_vertical(mask, 5, 15))
+        assert np.array_equal(_remove_short_horizontal_runs(vertical, 50), _reference_horizontal(vertical, 50))
+
+
+def test_solid_window_filter_requires_full_window_inside_contour_bbox() -> None:
+    mask = np.zeros((60, 120), dtype=np.uint8)
+    mask[5:25, 5:25] = 255  # 恰好 20x20：保留
+    mask[5:24, 40:90] = 255  # 高 19：剔除
+    mask[30:55, 60:100] = 255
+    mask[42, 60:100] = 0  # 被横线切开后两半都放不下 20x20：剔除
+
+    filtered = _keep_contours_fitting_solid_window(mask, 20)
+
+    assert filtered[5:25, 5:25].all()
+    assert not filtered[:, 40:].any()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from tools.one_shot_scene_recognizer import (
+    _collect_template_hits_batched,
+    _collect_template_hits_in_rectangle,
+    _load_template_images,
+)
+
+
+def _template_dir() -> Path:
+    return Path(__file__).resolve().parents[2] / "assets" / "ocr_templates" / "4K-100-CN" / "Node"
+
+
+def _build_canvas(templates: dict, rectangles: list[dict], seed: int) -> Image.Image:
+    generator = np.random.default_rng(seed)
+    canvas_bgr = np.full((900, 1400, 3), 32, dtype=np.uint8)
+    template_images = list(templates.values())
+    for rect in rectangles:
+        x, y, width, height = rect["x"], rect["y"], rect["width"], rect["height"]
+        canvas_bgr[y:y + height, x:x + width] = generator.integers(60, 200, 3)
+        for row_top in range(y + 34, y + height - 20, 28):
+            for port_left in (x + 6, x + width - 24):
+                template_image = template_images[int(generator.integers(len(template_images)))]
+                template_height, template_width = template_image.shape[:2]
+                canvas_bgr[row_top:row_top + template_height, port_left:port_left + template_width] = template_image
+    return Image.fromarray(canvas_bgr[:, :, ::-1].copy())
+
+
+def test_batched_template_hits_match_per_rectangle_hits() -> None:
+    templates = _load_template_images(str(_template_dir()))
+    assert templates
+    rectangles = [
+        {"x": 40, "y": 30, "width": 260, "height": 200},
+        {"x": 500, "y": 60, "width": 220, "height": 260},
+        # 与上一个矩形重叠：重叠区域的命中应同时归属两个矩形
+        {"x": 650, "y": 200, "width": 240, "height": 180},
+        {"x": 1100, "y": 600, "width": 280, "height": 290},
+        # 搜索区域为空（高度不足标题栏）
+        {"x": 100, "y": 700, "width": 200, "height": 20},
+    ]
+    canvas = _build_canvas(templates, rectangles, seed=7)
+
+    per_rectangle = [
+        _collect_template_hits_in_rectangle(canvas, rect, templates, 28, 0.8) for rect in rectangles
+    ]
+    batched = _collect_template_hits_batched(canvas, rectangles, templates, 28, 0.8)
+    batched_threaded = _collect_template_hits_batched(canvas, rectangles, templates, 28, 0.8, max_workers=4)
+
+    assert sum(len(hits) for hits in per_rectangle) > 0
+    assert batched == per_rectangle
+    assert batched_threaded == per_rectangle
+    assert batched[-1] == []
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import app.automation.vision  # noqa: F401  先加载门面，避免 tools 与 vision 之间的循环导入
+from app.automation.vision import vision_backend
+
+
+def _use_library(monkeypatch, names: list[str]) -> None:
+    library = {f"类别/{name}": SimpleNamespace(name=name) for name in names}
+    monkeypatch.setattr(vision_backend, "_ensure_node_library", lambda: library)
+
+
+def test_title_mapping_uses_global_unique_nearest_name(monkeypatch) -> None:
+    # 大量共享首字/二元组的干扰项：旧的候选截断策略可能遗漏真正的最近名称
+    distractors = [f"获取{chr(0x4E00 + index)}{chr(0x4E80 + index)}属性" for index in range(300)]
+    _use_library(monkeypatch, distractors + ["获取自定义变量", "设置自定义变量", "发送信号(Signal)"])
+
+    assert vision_backend._map_title_to_library("获取自定义变") == ("获取自定义变量", 1, True)
+    assert vision_backend._map_title_to_library("发送信号") == ("发送信号(Signal)", None, True)
+    # 与两个名称距离相同 → 并列，放弃纠错
+    assert vision_backend._map_title_to_library("某某自定义变量") == ("某某自定义变量", None, False)
+    # 距离 2 且相似度不足 0.83 → 拒绝
+    assert vision_backend._map_title_to_library("获取自定义") == ("获取自定义", None, False)
+
+
+def test_search_radius_covers_every_acceptable_distance() -> None:
+    for title_length in range(1, 40):
+        radius = vision_backend._max_acceptable_title_distance(title_length)
+        for distance in range(1, title_length + 10):
+            best_length = title_length + distance
+            accepted = (1.0 - distance / best_length >= vision_backend._TITLE_ACCEPT_RATIO) or distance <= 1
+            assert not accepted or distance <= radius
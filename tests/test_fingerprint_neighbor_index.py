@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import math
+import random
+from typing import List, Tuple
+
+from engine.utils.cache.fingerprint import (
+    build_fingerprints_for_detections,
+    compare_fingerprints_l1,
+    compare_fingerprints_l1_matrix,
+)
+
+
+def _reference_neighbors(points: List[Tuple[float, float]], k_neighbors: int) -> List[List[Tuple[float, int]]]:
+    result = []
+    for index, (x, y) in enumerate(points):
+        pairs = [
+            (math.hypot(x - other_x, y - other_y), other_index)
+            for other_index, (other_x, other_y) in enumerate(points)
+            if other_index != index
+        ]
+        pairs.sort(key=lambda item: item[0])
+        result.append(pairs[: max(1, k_neighbors)])
+    return result
+
+
+def _random_points(rng: random.Random, count: int, layout: str) -> List[Tuple[float, float]]:
+    if layout == "lattice":
+        # 整数网格坐标：大量等距邻居，用于验证并列时的顺序
+        return [(float(rng.randint(0, 12) * 40), float(rng.randint(0, 8) * 40)) for _ in range(count)]
+    if layout == "line":
+        return [(float(rng.uniform(0, 2000)), 100.0) for _ in range(count)]
+    if layout == "cluster":
+        return [(float(rng.gauss(500, 30)), float(rng.gauss(300, 30))) for _ in range(count)]
+    return [(float(rng.uniform(0, 3000)), float(rng.uniform(0, 1500))) for _ in range(count)]
+
+
+def test_grid_neighbors_match_full_sort() -> None:
+    rng = random.Random(20240521)
+    for layout in ("uniform", "lattice", "line", "cluster"):
+        for count in (1, 2, 7, 33, 120, 400):
+            points = _random_points(rng, count, layout)
+            for k_neighbors in (1, 6, 10):
+                fingerprints = build_fingerprints_for_detections(points, k_neighbors=k_neighbors)
+                expected = _reference_neighbors(points, k_neighbors)
+                for index in range(count):
+                    fingerprint = fingerprints[index]
+                    assert fingerprint.neighbors_indices == [neighbor for _, neighbor in expected[index]], (
+                        layout,
+                        count,
+                        k_neighbors,
+                        index,
+                    )
+                    if expected[index]:
+                        assert fingerprint.nearest_distance == expected[index][0][0]
+
+
+def test_l1_matrix_matches_pairwise_comparison() -> None:
+    rng = random.Random(7)
+    model_fps = list(build_fingerprints_for_detections(_random_points(rng, 60, "uniform"), k_neighbors=6).values())
+    detect_fps = list(build_fingerprints_for_detections(_random_points(rng, 45, "uniform"), k_neighbors=4).values())
+    model_fps.append(None)
+
+    for min_overlap in (2, 4):
+        matrix = compare_fingerprints_l1_matrix(model_fps, detect_fps, min_overlap_neighbors=min_overlap)
+        assert len(matrix) == len(model_fps)
+        for row_index, model_fp in enumerate(model_fps):
+            assert matrix[row_index] == [
+                compare_fingerprints_l1(model_fp, detect_fp, min_overlap_neighbors=min_overlap)
+                for detect_fp in detect_fps
+            ]
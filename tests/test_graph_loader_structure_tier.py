@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from engine.configs.resource_types import ResourceType
+from engine.configs.settings import settings
+from engine.graph import code_to_graph_orchestrator
+from engine.graph.parse_result_cache import get_graph_parse_result_cache
+from engine.resources import graph_loader
+from engine.resources.resource_manager import ResourceManager
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_GRAPH_ID = "server_template_complex_flow_example_01"
+
+
+@pytest.fixture()
+def resource_manager() -> ResourceManager:
+    settings.set_config_path(PROJECT_ROOT)
+    get_graph_parse_result_cache().clear()
+    manager = ResourceManager(PROJECT_ROOT)
+    manager.clear_cache(ResourceType.GRAPH, _GRAPH_ID)
+    yield manager
+    get_graph_parse_result_cache().clear()
+
+
+def test_structure_load_skips_layout_and_is_cached_separately(
+    resource_manager: ResourceManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def _no_layout(*args, **kwargs):
+        raise AssertionError("need_layout=False 不应触发布局")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(code_to_graph_orchestrator, "apply_layout_quietly", _no_layout)
+        patch.setattr(graph_loader.LayoutService, "compute_layout", _no_layout)
+        structure = resource_manager.load_resource(ResourceType.GRAPH, _GRAPH_ID, need_layout=False)
+        assert resource_manager.load_resource(ResourceType.GRAPH, _GRAPH_ID, need_layout=False) is structure
+
+    assert structure["metadata"]["structure_only"] is True
+    assert structure["graph_id"] == _GRAPH_ID
+    assert structure["data"]["nodes"] and structure["data"]["edges"]
+    assert not structure["data"].get("basic_blocks")
+
+    full = resource_manager.load_resource(ResourceType.GRAPH, _GRAPH_ID)
+    assert full is not structure
+    assert "structure_only" not in full["metadata"]
+    assert full["data"]["basic_blocks"]
+    structure_titles = sorted(node["title"] for node in structure["data"]["nodes"])
+    full_titles = sorted(node["title"] for node in full["data"]["nodes"] if not node.get("is_data_node_copy"))
+    assert structure_titles == full_titles
+
+    resource_manager.clear_cache(ResourceType.GRAPH, _GRAPH_ID)
+    assert resource_manager.load_resource(ResourceType.GRAPH, _GRAPH_ID, need_layout=False) is not structure
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import copy
+import pickle
+import random
+
+from engine.graph.models.graph_model import EdgeModel, GraphModel, NodeModel
+
+
+def _brute_force(model: GraphModel, node_id: str):
+    outgoing = [edge.id for edge in model.edges.values() if edge.src_node == node_id]
+    incoming = [edge.id for edge in model.edges.values() if edge.dst_node == node_id]
+    return outgoing, incoming
+
+
+def _assert_index_matches(model: GraphModel, node_ids) -> None:
+    for node_id in node_ids:
+        outgoing, incoming = _brute_force(model, node_id)
+        assert [edge.id for edge in model.get_outgoing_edges(node_id)] == outgoing
+        assert [edge.id for edge in model.get_incoming_edges(node_id)] == incoming
+        for port_name in ("a", "b"):
+            for is_input in (True, False):
+                expected = [
+                    edge.id
+                    for edge in model.edges.values()
+                    if ((edge.dst_node, edge.dst_port) if is_input else (edge.src_node, edge.src_port))
+                    == (node_id, port_name)
+                ]
+                assert [edge.id for edge in model.get_port_edges(node_id, port_name, is_input)] == expected
+                assert model.has_port_connections(node_id, port_name, is_input) == bool(expected)
+
+
+def test_adjacency_tracks_api_and_direct_mutations() -> None:
+    rng = random.Random(7)
+    node_ids = [f"n{index}" for index in range(12)]
+    model = GraphModel()
+
+    for step in range(400):
+        action = rng.random()
+        src, dst = rng.choice(node_ids), rng.choice(node_ids)
+        src_port, dst_port = rng.choice("ab"), rng.choice("ab")
+        if action < 0.4:
+            model.add_edge(src, src_port, dst, dst_port)
+        elif action < 0.5:
+            model.add_edge_if_absent(src, src_port, dst, dst_port)
+        elif action < 0.6 and model.edges:
+            model.remove_edge(rng.choice(list(model.edges)))
+        elif action < 0.7:
+            # 绕过 API 直接写入字典
+            edge_id = f"direct_{step}"
+            model.edges[edge_id] = EdgeModel(edge_id, src, src_port, dst, dst_port)
+        elif action < 0.8 and model.edges:
+            model.edges.pop(rng.choice(list(model.edges)))
+        elif action < 0.85 and model.edges:
+            # 经 API 原地改写端点
+            edge = model.edges[rng.choice(list(model.edges))]
+            model.update_edge_endpoints(edge, dst_node=dst, src_port=src_port)
+        elif action < 0.9 and model.edges:
+            # 绕过 API 改写端点字段后显式通知
+            edge = model.edges[rng.choice(list(model.edges))]
+            edge.dst_node = dst
+            edge.src_port = src_port
+            model.touch_edges_revision()
+        else:
+            model.remove_port_connections(src, src_port, is_input=rng.random() < 0.5)
+        if step % 25 == 0:
+            _assert_index_matches(model, node_ids)
+
+    _assert_index_matches(model, node_ids)
+    model.edges = {edge_id: edge for edge_id, edge in list(model.edges.items())[::2]}
+    _assert_index_matches(model, node_ids)
+
+
+def test_add_edge_if_absent_and_remove_node() -> None:
+    model = GraphModel()
+    model.nodes["b"] = NodeModel(id="b", title="节点", category="测试")
+    first = model.add_edge("a", "out", "b", "in")
+    assert model.add_edge_if_absent("a", "out", "b", "in") is None
+    loop = model.add_edge("b", "out", "b", "in")
+    model.add_edge("c", "out", "d", "in")
+
+    assert model.remove_port_connections("b", "in", is_input=True) == [first.id, loop.id]
+    model.add_edge("a", "out", "b", "in")
+    model.add_edge("b", "out", "b", "in")
+    model.remove_node("b")
+    assert [(edge.src_node, edge.dst_node) for edge in model.edges.values()] == [("c", "d")]
+    assert model.get_incoming_edges("b") == []
+
+
+def test_edges_revision_is_monotonic_and_survives_copies() -> None:
+    model = GraphModel()
+    revisions = [model.get_edges_revision()]
+    edge = model.add_edge("a", "out", "b", "in")
+    revisions.append(model.get_edges_revision())
+    model.edges[edge.id] = edge
+    revisions.append(model.get_edges_revision())
+    model.edges = {}
+    revisions.append(model.get_edges_revision())
+    model.touch_edges_revision()
+    revisions.append(model.get_edges_revision())
+    assert revisions == sorted(set(revisions))
+
+    model.add_edge("x", "out", "y", "in")
+    for duplicate in (copy.deepcopy(model), pickle.loads(pickle.dumps(model)), model.clone()):
+        assert [edge.dst_node for edge in duplicate.get_outgoing_edges("x")] == ["y"]
+        duplicate.add_edge("x", "out", "z", "in")
+        assert [edge.dst_node for edge in duplicate.get_outgoing_edges("x")] == ["y", "z"]
+    assert len(model.get_outgoing_edges("x")) == 1
+
+
+def test_endpoint_rewrite_only_invalidates_owning_graph() -> None:
+    first, second = GraphModel(), GraphModel()
+    moved = first.add_edge("a", "out", "b", "in")
+    second.add_edge("x", "out", "y", "in")
+    second.get_outgoing_edges("x")
+    second_adjacency = second._adjacency
+    second_revision = second.get_edges_revision()
+
+    first.update_edge_endpoints(moved, src_node="c", dst_port="in2")
+
+    assert first.get_outgoing_edges("a") == []
+    assert first.get_port_edges("b", "in2", is_input=True) == [moved]
+    assert second.get_edges_revision() == second_revision
+    second.get_outgoing_edges("x")
+    assert second._adjacency is second_adjacency
+
+
+def test_endpoint_rewrite_keeps_edges_order_in_live_index() -> None:
+    model = GraphModel()
+    for node_id in ("a", "b", "c", "d"):
+        model.nodes[node_id] = NodeModel(id=node_id, title="节点", category="测试")
+    model.add_edge("c", "out", "d", "x")
+    first = model.add_edge("a", "out", "d", "x")
+    second = model.add_edge("b", "out", "d", "y")
+    later = model.add_edge("a", "out", "d", "y")
+    model.get_incoming_edges("d")
+    live_adjacency = model._adjacency
+
+    # 仅改端口：节点分组中的位置不变，新端口分组按 edges 顺序插入
+    model.update_edge_endpoints(first, dst_port="y")
+    # 改节点：移入新节点分组时同样按 edges 顺序插入
+    model.update_edge_endpoints(later, src_node="b")
+    assert model._adjacency is live_adjacency
+
+    rebuilt = GraphModel.deserialize(model.serialize())
+    for node_id in ("a", "b", "c", "d"):
+        assert [edge.id for edge in model.get_incoming_edges(node_id)] == [
+            edge.id for edge in rebuilt.get_incoming_edges(node_id)
+        ]
+        assert [edge.id for edge in model.get_outgoing_edges(node_id)] == [
+            edge.id for edge in rebuilt.get_outgoing_edges(node_id)
+        ]
+        for port_name in ("out", "x", "y"):
+            for is_input in (True, False):
+                assert [edge.id for edge in model.get_port_edges(node_id, port_name, is_input)] == [
+                    edge.id for edge in rebuilt.get_port_edges(node_id, port_name, is_input)
+                ]
+    assert [edge.id for edge in model.get_port_edges("d", "y", True)] == [first.id, second.id, later.id]
+    assert [edge.id for edge in model.get_outgoing_edges("b")] == [second.id, later.id]
+    _assert_index_matches(model, ("a", "b", "c", "d"))
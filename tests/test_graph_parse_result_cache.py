@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import engine.graph as graph_package
+from engine.configs.settings import settings
+from engine.resources import graph_loader
+from engine.graph.parse_result_cache import (
+    GraphParseResultCache,
+    get_graph_parse_result_cache,
+    parse_graph_file_shared,
+)
+from engine.validate import validate_files
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_GRAPH_FILE = PROJECT_ROOT / "assets" / "资源库" / "节点图" / "server" / "模板示例" / "模板示例_复杂控制流综合测试.py"
+
+
+@pytest.fixture()
+def shared_cache() -> GraphParseResultCache:
+    settings.set_config_path(PROJECT_ROOT)
+    cache = get_graph_parse_result_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+def test_load_then_validate_parses_graph_once(shared_cache: GraphParseResultCache) -> None:
+    parsed = parse_graph_file_shared(PROJECT_ROOT, _GRAPH_FILE)
+    assert parse_graph_file_shared(PROJECT_ROOT, _GRAPH_FILE) is parsed
+
+    validate_files([_GRAPH_FILE], PROJECT_ROOT, use_cache=False)
+
+    stats = shared_cache.get_stats()
+    assert stats["cache_misses"] == 1
+    assert stats["cache_hits"] >= 2
+    assert stats["cache_elements"] == len(parsed.model.nodes) + len(parsed.model.edges)
+
+
+def test_shared_result_is_read_only_and_clone_is_independent(shared_cache: GraphParseResultCache) -> None:
+    parsed = parse_graph_file_shared(PROJECT_ROOT, _GRAPH_FILE)
+
+    with pytest.raises(TypeError):
+        parsed.metadata["graph_name"] = "changed"
+    metadata = parsed.mutable_metadata()
+    metadata["graph_name"] = "changed"
+    assert parsed.metadata.get("graph_name") != "changed"
+
+    clone = parsed.clone_model()
+    clone.nodes.clear()
+    assert parsed.model.nodes
+
+
+def test_validators_leave_shared_model_untouched(shared_cache: GraphParseResultCache) -> None:
+    parsed = parse_graph_file_shared(PROJECT_ROOT, _GRAPH_FILE)
+    serialized_before = parsed.model.serialize()
+    revision_before = parsed.model.get_edges_revision()
+
+    validate_files([_GRAPH_FILE], PROJECT_ROOT, use_cache=False)
+
+    assert parse_graph_file_shared(PROJECT_ROOT, _GRAPH_FILE) is parsed
+    assert parsed.model.get_edges_revision() == revision_before
+    assert parsed.model.serialize() == serialized_before
+
+
+def test_loader_rebuilds_parser_after_registry_refresh(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _FakeRegistry:
+        def __init__(self) -> None:
+            self.library: dict = {}
+
+        def get_library(self) -> dict:
+            return self.library
+
+    class _FakeParser:
+        def __init__(self, workspace_path: Path, node_library: dict) -> None:
+            self.node_library = node_library
+
+    registry = _FakeRegistry()
+    monkeypatch.setattr(graph_loader, "get_node_registry", lambda workspace, include_composite=True: registry)
+    monkeypatch.setattr(graph_package, "GraphCodeParser", _FakeParser)
+    loader = graph_loader.GraphLoader(
+        PROJECT_ROOT,
+        file_ops=None,
+        index_state=None,
+        cache_facade=None,
+        fingerprints_service=None,
+    )
+
+    first = loader._get_graph_parser()
+    assert loader._get_graph_parser() is first
+    # NodeRegistry.refresh() 后 get_library() 返回新的节点库对象
+    registry.library = {}
+    rebuilt = loader._get_graph_parser()
+    assert rebuilt is not first
+    assert rebuilt.node_library is registry.library
+
+
+def test_lru_evicts_by_entry_and_element_budget() -> None:
+    cache = GraphParseResultCache(max_entries=3, max_elements=10)
+    for index in range(3):
+        cache.get_or_parse(("graph", f"f{index}", "h", "fp", "layout"), lambda index=index: (index, 4))
+
+    stats = cache.get_stats()
+    assert stats["cache_size"] == 2
+    assert stats["cache_elements"] == 8
+    assert stats["cache_evictions"] == 1
+
+    # 被淘汰的最旧条目需要重新解析
+    assert cache.get_or_parse(("graph", "f0", "h", "fp", "layout"), lambda: ("reparsed", 1)) == "reparsed"
+    assert cache.get_stats()["cache_misses"] == 4
+
+    def _fail() -> tuple:
+        raise ValueError("parse failed")
+
+    with pytest.raises(ValueError):
+        cache.get_or_parse(("graph", "bad", "h", "fp", "layout"), _fail)
+    assert cache.get_stats()["cache_size"] == 3
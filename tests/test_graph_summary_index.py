@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from engine.configs.resource_types import ResourceType
+from engine.configs.settings import settings
+from engine.resources.graph_summary_index import GraphSummaryIndex
+
+
+def _node(node_id: str, title: str, category: str, **extra) -> dict:
+    return {"id": node_id, "title": title, "category": category, **extra}
+
+
+_PAYLOADS: Dict[str, dict] = {
+    "graph_sender": {
+        "name": "发送图",
+        "graph_type": "server",
+        "data": {
+            "nodes": [
+                _node("n1", "实体创建时", "事件节点"),
+                _node("n2", "发送信号", "执行节点", input_constants={"信号名": "开门", "__signal_id": "signal_open"}),
+                _node("n3", "开门流程", "复合节点", composite_id="composite_open_door"),
+                _node("n4", "拼装结构体", "运算节点"),
+            ],
+            "edges": [],
+            "graph_variables": [{"name": "计数", "variable_type": "整数"}],
+            "metadata": {"struct_bindings": {"n4": {"struct_id": "struct_door"}}},
+        },
+    },
+    "graph_listener": {
+        "name": "监听图",
+        "graph_type": "server",
+        "data": {
+            "nodes": [_node("m1", "监听信号", "事件节点")],
+            "edges": [],
+            "metadata": {"signal_bindings": {"m1": {"signal_id": "signal_open"}}},
+        },
+    },
+}
+
+
+class _FakeResourceManager:
+    def __init__(self, graph_dir: Path) -> None:
+        self.graph_dir = graph_dir
+        self.payloads = {graph_id: payload for graph_id, payload in _PAYLOADS.items()}
+        self.loaded: List[str] = []
+        for graph_id in self.payloads:
+            self.write(graph_id, f"# {graph_id}\n")
+
+    def write(self, graph_id: str, text: str) -> Path:
+        file_path = self.graph_dir / f"{graph_id}.py"
+        file_path.write_text(text, encoding="utf-8")
+        return file_path
+
+    def list_resources(self, resource_type: ResourceType) -> List[str]:
+        assert resource_type == ResourceType.GRAPH
+        return list(self.payloads)
+
+    def get_graph_file_path(self, graph_id: str) -> Path:
+        return self.graph_dir / f"{graph_id}.py"
+
+    def load_resource(self, resource_type: ResourceType, graph_id: str, *, need_layout: bool = True) -> dict:
+        assert not need_layout
+        self.loaded.append(graph_id)
+        payload = self.payloads[graph_id]
+        if isinstance(payload, Exception):
+            raise payload
+        return payload
+
+
+@pytest.fixture()
+def workspace(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(settings, "RUNTIME_CACHE_ROOT", str(tmp_path / "cache"))
+    (tmp_path / "graphs").mkdir()
+    return tmp_path
+
+
+def _make_index(workspace: Path, manager: _FakeResourceManager, fingerprint: List[str]) -> GraphSummaryIndex:
+    return GraphSummaryIndex(workspace, manager, node_defs_fingerprint=lambda: fingerprint[0])
+
+
+def test_inverted_queries_and_warm_restart_without_loading(workspace: Path) -> None:
+    manager = _FakeResourceManager(workspace / "graphs")
+    fingerprint = ["fp-1"]
+    index = _make_index(workspace, manager, fingerprint)
+
+    assert index.find_graphs_using_composite("开门流程") == ["graph_sender"]
+    assert index.find_graphs_using_composite("composite_open_door") == ["graph_sender"]
+    assert index.find_graphs_sending_signal("signal_open") == ["graph_sender"]
+    assert index.find_graphs_listening_signal("signal_open") == ["graph_listener"]
+    assert index.find_graphs_using_signal("signal_open") == ["graph_listener", "graph_sender"]
+    assert index.find_graphs_using_struct("struct_door") == ["graph_sender"]
+    assert index.find_graphs_with_graph_variable("计数") == ["graph_sender"]
+    assert index.get_summary("graph_sender").node_category_counts["复合节点"] == 1
+    assert sorted(manager.loaded) == ["graph_listener", "graph_sender"]
+
+    manager.loaded.clear()
+    restarted = _make_index(workspace, manager, fingerprint)
+    assert restarted.find_graphs_with_node_title("监听信号") == ["graph_listener"]
+    may_contain_struct = restarted.build_node_title_filter(("拼装结构体", "拆分结构体"))
+    assert may_contain_struct("graph_sender") and not may_contain_struct("graph_listener")
+    assert may_contain_struct("graph_unknown")
+    assert manager.loaded == []
+
+
+def test_refresh_reparses_only_changed_content(workspace: Path) -> None:
+    manager = _FakeResourceManager(workspace / "graphs")
+    fingerprint = ["fp-1"]
+    index = _make_index(workspace, manager, fingerprint)
+    assert index.refresh() == 2
+
+    # 仅 mtime 变化、内容不变：不重新解析
+    sender_file = manager.get_graph_file_path("graph_sender")
+    stat_result = sender_file.stat()
+    os.utime(sender_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+    assert index.refresh() == 0
+
+    manager.payloads["graph_listener"] = {
+        "name": "监听图",
+        "graph_type": "server",
+        "data": {"nodes": [_node("m1", "实体创建时", "事件节点")], "edges": []},
+    }
+    manager.write("graph_listener", "# graph_listener v2\n")
+    manager.loaded.clear()
+    assert index.refresh() == 1
+    assert manager.loaded == ["graph_listener"]
+    assert index.find_graphs_listening_signal("signal_open") == []
+
+    fingerprint[0] = "fp-2"
+    assert index.refresh() == 2
+
+    del manager.payloads["graph_sender"]
+    assert index.find_graphs_using_composite("开门流程") == []
+    assert index.clear_persistent_cache() == 1
+
+
+def test_failed_load_is_remembered_until_content_changes(workspace: Path) -> None:
+    manager = _FakeResourceManager(workspace / "graphs")
+    fingerprint = ["fp-1"]
+    manager.payloads["graph_broken"] = {}
+    manager.write("graph_broken", "# graph_broken\n")
+    index = _make_index(workspace, manager, fingerprint)
+    index.refresh()
+    assert index.get_summary("graph_broken") is None
+
+    manager.loaded.clear()
+    assert index.refresh() == 0
+    assert _make_index(workspace, manager, fingerprint).refresh() == 0
+    assert manager.loaded == []
+
+    manager.payloads["graph_broken"] = _PAYLOADS["graph_listener"]
+    manager.write("graph_broken", "# graph_broken fixed\n")
+    assert index.refresh() == 1
+    assert index.find_graphs_listening_signal("signal_open") == ["graph_broken", "graph_listener"]
+
+
+def test_load_error_is_recorded_without_breaking_queries(workspace: Path) -> None:
+    manager = _FakeResourceManager(workspace / "graphs")
+    fingerprint = ["fp-1"]
+    manager.payloads["graph_syntax_error"] = SyntaxError("'(' was never closed")
+    manager.write("graph_syntax_error", "节点 = 调用(\n")
+    index = _make_index(workspace, manager, fingerprint)
+
+    assert index.find_graphs_using_composite("开门流程") == ["graph_sender"]
+    assert index.get_summary("graph_syntax_error") is None
+    assert index.build_node_title_filter(("监听信号",))("graph_syntax_error")
+
+    manager.loaded.clear()
+    assert _make_index(workspace, manager, fingerprint).refresh() == 0
+    assert manager.loaded == []
+
+
+def test_corrupt_index_file_is_treated_as_empty(workspace: Path) -> None:
+    manager = _FakeResourceManager(workspace / "graphs")
+    fingerprint = ["fp-1"]
+    index = _make_index(workspace, manager, fingerprint)
+    index.refresh()
+    index._index_file.write_text('{"__manifest__": {', encoding="utf-8")
+
+    restarted = _make_index(workspace, manager, fingerprint)
+    assert restarted.refresh() == 2
+    assert restarted.find_graphs_listening_signal("signal_open") == ["graph_listener"]
+    assert _make_index(workspace, manager, fingerprint).refresh() == 0
+
+
+def test_batch_shares_one_refresh_across_queries(workspace: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    manager = _FakeResourceManager(workspace / "graphs")
+    index = _make_index(workspace, manager, ["fp-1"])
+    listed: List[int] = []
+    original_list_resources = manager.list_resources
+    monkeypatch.setattr(
+        manager, "list_resources", lambda resource_type: listed.append(1) or original_list_resources(resource_type)
+    )
+
+    with index.batch():
+        with index.batch():
+            assert index.find_graphs_using_struct("struct_door") == ["graph_sender"]
+        assert index.find_graphs_using_signal("signal_open") == ["graph_listener", "graph_sender"]
+        assert index.get_summary("graph_listener") is not None
+    assert len(listed) == 1
+
+    index.find_graphs_with_node_title("监听信号")
+    assert len(listed) == 2
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from engine.graph import GraphCodeParser
+from engine.layout import LayoutJobRunner, LayoutService, apply_layout_delta, compute_layout_delta
+from engine.layout.internal.layout_algorithm import LAYOUT_STAGES
+from engine.layout.internal import layout_job
+from engine.layout.internal.layout_job import (
+    LAYOUT_JOB_CANCELLED,
+    LAYOUT_JOB_FINISHED,
+    LAYOUT_JOB_PROGRESS,
+)
+from engine.nodes import node_registry
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_GRAPH_FILE = PROJECT_ROOT / "assets" / "资源库" / "节点图" / "server" / "模板示例" / "模板示例_多踏板联动.py"
+
+
+def _parse_model():
+    model, _ = GraphCodeParser(PROJECT_ROOT).parse_file(_GRAPH_FILE)
+    return model
+
+
+def test_layout_delta_matches_synchronous_write_back() -> None:
+    model = _parse_model()
+    expected_model = model.clone()
+    LayoutService.compute_layout(expected_model, workspace_path=PROJECT_ROOT, write_back_to_input_model=True)
+
+    stages = []
+    delta = compute_layout_delta(model, workspace_path=PROJECT_ROOT, progress_callback=stages.append)
+    assert tuple(stages) == LAYOUT_STAGES
+
+    changes = apply_layout_delta(model, delta)
+    assert changes.added_node_ids == [node.id for node in delta.added_nodes]
+    for node_id, node in expected_model.nodes.items():
+        assert model.nodes[node_id].pos == pytest.approx(node.pos, abs=1e-6), node_id
+    assert [block.nodes for block in model.basic_blocks] == [block.nodes for block in expected_model.basic_blocks]
+
+
+def test_runner_supersedes_older_job_and_reports_progress() -> None:
+    model = _parse_model()
+    expected = compute_layout_delta(model, workspace_path=PROJECT_ROOT)
+
+    runner = LayoutJobRunner()
+    try:
+        superseded_job = runner.submit(model, workspace_path=PROJECT_ROOT, use_node_library=False)
+        current_job = runner.submit(model, workspace_path=PROJECT_ROOT, use_node_library=False)
+        assert not runner.is_current(superseded_job)
+
+        events = []
+        deadline = time.monotonic() + 120
+        while time.monotonic() < deadline:
+            events.extend(runner.poll_events())
+            if any(event.kind == LAYOUT_JOB_FINISHED and event.job_id == current_job for event in events):
+                break
+            time.sleep(0.05)
+    finally:
+        runner.shutdown()
+
+    kinds_by_job = {}
+    for event in events:
+        kinds_by_job.setdefault(event.job_id, []).append(event.kind)
+    assert kinds_by_job[superseded_job][-1] == LAYOUT_JOB_CANCELLED
+    assert kinds_by_job[current_job] == [LAYOUT_JOB_PROGRESS] * len(LAYOUT_STAGES) + [LAYOUT_JOB_FINISHED]
+
+    finished = next(event for event in events if event.kind == LAYOUT_JOB_FINISHED)
+    assert finished.delta.positions == pytest.approx(expected.positions)
+    assert [edge.id for edge in finished.delta.added_edges] == [edge.id for edge in expected.added_edges]
+
+
+def test_worker_reloads_node_library_when_node_defs_change(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _FakeRegistry:
+        def __init__(self) -> None:
+            self.generation = 0
+
+        def refresh(self) -> None:
+            self.generation += 1
+
+        def get_library(self) -> dict:
+            return {"generation": self.generation}
+
+    registry = _FakeRegistry()
+    monkeypatch.setattr(node_registry, "get_node_registry", lambda workspace, include_composite=True: registry)
+    monkeypatch.setattr(layout_job, "_WORKER_STATE", {"workspace": PROJECT_ROOT, "node_defs_fp": "fp-1"})
+
+    first = layout_job._prepare_worker_workspace(str(PROJECT_ROOT), True, "fp-1")
+    assert layout_job._prepare_worker_workspace(str(PROJECT_ROOT), True, "fp-1") is first
+    reloaded = layout_job._prepare_worker_workspace(str(PROJECT_ROOT), True, "fp-2")
+    assert first == {"generation": 0}
+    assert reloaded == {"generation": 1}
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from engine.configs.settings import settings
+from engine.graph import GraphCodeParser
+from engine.graph.models import GraphModel
+from engine.layout import LayoutService
+from engine.layout.internal import layout_algorithm
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_TEMPLATE_DIR = PROJECT_ROOT / "assets" / "资源库" / "节点图" / "server" / "模板示例"
+_GRAPH_FILES = (
+    "模板示例_踏板开关_信号广播.py",
+    "模板示例_复杂控制流综合测试.py",
+    "模板示例_多踏板同时按下_开门_接收端.py",
+    "模板示例_结构体全类型_拆分与拼装.py",
+)
+
+
+def _build_merged_model() -> GraphModel:
+    parser = GraphCodeParser(PROJECT_ROOT)
+    merged = GraphModel(graph_name="并行布局")
+    for file_name in _GRAPH_FILES:
+        model, _ = parser.parse_file(_TEMPLATE_DIR / file_name)
+        merged.nodes.update(model.nodes)
+        merged.edges.update(model.edges)
+    return merged
+
+
+def _layout_snapshot(model: GraphModel) -> str:
+    result = LayoutService.compute_layout(model.clone(), workspace_path=PROJECT_ROOT)
+    augmented = result.augmented_model or model
+    return repr(
+        (
+            list(result.positions.items()),
+            [(list(block.nodes), block.color) for block in result.basic_blocks],
+            list(result.y_debug_info.items()),
+            list(augmented.nodes),
+            [(edge.id, edge.src_node, edge.dst_node) for edge in augmented.edges.values()],
+        )
+    )
+
+
+def test_parallel_event_regions_match_serial_layout(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "LAYOUT_REGION_CACHE_ENABLED", False)
+    model = _build_merged_model()
+    serial = _layout_snapshot(model)
+
+    parallel_calls = []
+    original = layout_algorithm.compute_region_block_geometries
+
+    def _tracking(*args, **kwargs):
+        geometries = original(*args, **kwargs)
+        parallel_calls.append(len(geometries))
+        return geometries
+
+    monkeypatch.setattr(layout_algorithm, "compute_region_block_geometries", _tracking)
+    monkeypatch.setattr(settings, "LAYOUT_PARALLEL_EVENT_REGIONS", True)
+    monkeypatch.setattr(settings, "LAYOUT_PARALLEL_WORKERS", 2)
+    monkeypatch.setattr(settings, "LAYOUT_PARALLEL_MIN_EVENT_REGIONS", 2)
+    parallel = _layout_snapshot(model)
+
+    assert len(parallel_calls) == 1 and parallel_calls[0] > 0
+    assert parallel == serial
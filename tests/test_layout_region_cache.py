@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from engine.configs.settings import settings
+from engine.graph import GraphCodeParser
+from engine.layout import LayoutService
+from engine.layout.internal.region_layout_cache import get_region_layout_cache
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_GRAPH_FILE = PROJECT_ROOT / "assets" / "资源库" / "节点图" / "server" / "模板示例" / "模板示例_踏板开关_信号广播.py"
+
+
+def _parse_model():
+    model, _ = GraphCodeParser(PROJECT_ROOT).parse_file(_GRAPH_FILE)
+    return model
+
+
+def _layout(model):
+    return LayoutService.compute_layout(model.clone(), workspace_path=PROJECT_ROOT)
+
+
+def _layout_with_counts(model):
+    cache = get_region_layout_cache()
+    hits, misses = cache.hits, cache.misses
+    result = _layout(model)
+    return result, cache.hits - hits, cache.misses - misses
+
+
+def _uncached_layout(model, monkeypatch):
+    monkeypatch.setattr(settings, "LAYOUT_REGION_CACHE_ENABLED", False)
+    result = _layout(model)
+    monkeypatch.setattr(settings, "LAYOUT_REGION_CACHE_ENABLED", True)
+    return result
+
+
+def test_reparsed_graph_reuses_every_region(monkeypatch) -> None:
+    model = _parse_model()
+    get_region_layout_cache().clear()
+    _, hits, regions = _layout_with_counts(model)
+    assert regions > 1 and hits == 0
+
+    # 重新解析会生成全新的节点 ID，结构不变时仍应全部命中
+    reparsed = _parse_model()
+    cached_result, hits, misses = _layout_with_counts(reparsed)
+    assert (hits, misses) == (regions, 0)
+
+    fresh_result = _uncached_layout(reparsed, monkeypatch)
+    assert cached_result.positions == fresh_result.positions
+    assert cached_result.y_debug_info == fresh_result.y_debug_info
+
+
+def test_editing_one_region_only_recomputes_that_region(monkeypatch) -> None:
+    model = _parse_model()
+    edited = _parse_model()
+    get_region_layout_cache().clear()
+    _, _, regions = _layout_with_counts(model)
+
+    node = next(node for node in edited.nodes.values() if node.input_constants)
+    port_name = next(iter(node.input_constants))
+    node.input_constants[port_name] = f"{node.input_constants[port_name]}_edited"
+
+    edited_result, hits, misses = _layout_with_counts(edited)
+    assert (hits, misses) == (regions - 1, 1)
+    assert edited_result.positions == _uncached_layout(edited, monkeypatch).positions
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from engine.utils.graph.node_defs_fingerprint import compute_node_defs_fingerprint
+from engine.utils.graph.node_defs_fingerprint_service import NodeDefsFingerprintService
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _bump_mtime(path: Path) -> None:
+    # 部分文件系统 mtime 精度较粗，显式推进以确保指纹可观测到变化
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5.0))
+
+
+@pytest.mark.parametrize("use_notifications", [True, False])
+def test_incremental_fingerprint_matches_full_scan(tmp_path: Path, use_notifications: bool) -> None:
+    workspace = tmp_path
+    _write(workspace / "plugins" / "nodes" / "server" / "a.py", "A = 1\n")
+    _write(workspace / "engine" / "nodes" / "registry.py", "R = 1\n")
+    _write(workspace / "engine" / "graph" / "sub" / "g.py", "G = 1\n")
+
+    service = NodeDefsFingerprintService(
+        workspace,
+        poll_interval_seconds=0.0,
+        use_notifications=use_notifications,
+    )
+
+    def _assert_in_sync() -> None:
+        if service.mode != "polling":
+            # 通知是异步投递的，给内核一个极短的窗口
+            time.sleep(0.05)
+        assert service.get_fingerprint() == compute_node_defs_fingerprint(workspace)
+
+    _assert_in_sync()
+
+    # 修改已有文件
+    target = workspace / "plugins" / "nodes" / "server" / "a.py"
+    target.write_text("A = 22\n", encoding="utf-8")
+    _bump_mtime(target)
+    _assert_in_sync()
+
+    # 新增子目录与文件
+    _write(workspace / "plugins" / "nodes" / "client" / "deep" / "b.py", "B = 1\n")
+    _assert_in_sync()
+
+    # 重命名与删除
+    (workspace / "engine" / "graph" / "sub" / "g.py").rename(workspace / "engine" / "graph" / "sub" / "h.py")
+    _assert_in_sync()
+    (workspace / "engine" / "nodes" / "registry.py").unlink()
+    _assert_in_sync()
+
+    # 原本不存在的根目录出现
+    _write(workspace / "assets" / "资源库" / "复合节点库" / "c.py", "C = 1\n")
+    _assert_in_sync()
+
+
+def test_steady_state_lookup_does_not_rescan(tmp_path: Path) -> None:
+    _write(tmp_path / "engine" / "nodes" / "x.py", "X = 1\n")
+    service = NodeDefsFingerprintService(tmp_path, poll_interval_seconds=3600.0)
+
+    first = service.get_fingerprint()
+    stats_after_first = service.get_stats()
+    for _ in range(100):
+        assert service.get_fingerprint() == first
+
+    stats = service.get_stats()
+    assert stats["lookups"] == stats_after_first["lookups"] + 100
+    assert stats["root_rescans"] == stats_after_first["root_rescans"]
+    assert stats["dir_rescans"] == stats_after_first["dir_rescans"]
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="需要 Linux inotify")
+def test_watch_failure_closes_inotify_fd_and_falls_back_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from engine.utils.graph import node_defs_fingerprint_service as service_module
+
+    _write(tmp_path / "engine" / "nodes" / "a" / "x.py", "X = 1\n")
+    _write(tmp_path / "engine" / "nodes" / "b" / "y.py", "Y = 1\n")
+    service = NodeDefsFingerprintService(tmp_path, poll_interval_seconds=0.0)
+    if service.mode != "inotify":
+        pytest.skip("inotify 不可用")
+    watcher = service._inotify
+    fd = watcher._fd
+    watched: list = []
+
+    def _fail_after_first(directory: Path) -> bool:
+        watched.append(directory)
+        return len(watched) == 1
+
+    warnings: list = []
+    monkeypatch.setattr(watcher, "watch_dir", _fail_after_first)
+    monkeypatch.setattr(service_module, "log_warn", lambda template, *args: warnings.append(template))
+
+    assert service.get_fingerprint() == compute_node_defs_fingerprint(tmp_path)
+    assert service.mode == "polling"
+    assert len(warnings) == 1
+    assert watcher._fd is None
+    with pytest.raises(OSError):
+        os.fstat(fd)
+
+    _write(tmp_path / "engine" / "nodes" / "b" / "z.py", "Z = 1\n")
+    assert service.get_fingerprint() == compute_node_defs_fingerprint(tmp_path)
+    assert len(warnings) == 1
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from engine.nodes.node_registry import NodeRegistry
+from engine.nodes.pipeline import extractor_ast
+from engine.nodes.pipeline.runner import run_cached_pipeline, run_pipeline
+from engine.nodes.pipeline.spec_cache import SPEC_CACHE_FILENAME
+from engine.utils.cache.cache_paths import get_node_cache_dir
+
+
+_SERVER_IMPL = '''
+from plugins.nodes.shared import node_spec
+
+
+@node_spec(
+    name="整数相加",
+    category="运算节点",
+    inputs=[("左值", "整数"), ("右值", "整数")],
+    outputs=[("结果", "整数")],
+    aliases=["加法"],
+)
+def 整数相加(game, 左值, 右值):
+    return 左值 + 右值
+
+
+@node_spec(
+    name="是否为零",
+    category="运算节点",
+    inputs=[("值", "整数")],
+    outputs=[("结果", "布尔值")],
+)
+def 是否为零(game, 值):
+    return 值 == 0
+'''
+
+_CLIENT_IMPL = '''
+from plugins.nodes.shared import node_spec
+
+
+@node_spec(
+    name="打印日志",
+    category="执行节点",
+    inputs=[("流程入", "流程"), ("内容", "字符串")],
+    outputs=[("流程出", "流程")],
+)
+def 打印日志(game, 内容):
+    print(内容)
+'''
+
+
+def _make_workspace(root: Path) -> Path:
+    server_dir = root / "plugins" / "nodes" / "server"
+    client_dir = root / "plugins" / "nodes" / "client"
+    server_dir.mkdir(parents=True)
+    client_dir.mkdir(parents=True)
+    (server_dir / "math_nodes.py").write_text(_SERVER_IMPL, encoding="utf-8")
+    (client_dir / "log_nodes.py").write_text(_CLIENT_IMPL, encoding="utf-8")
+    return root.resolve()
+
+
+def _count_extractions(monkeypatch: pytest.MonkeyPatch) -> list:
+    calls: list = []
+    original = extractor_ast.extract_file_specs
+
+    def _counting(file_path, source):
+        calls.append(file_path)
+        return original(file_path, source)
+
+    monkeypatch.setattr(extractor_ast, "extract_file_specs", _counting)
+    return calls
+
+
+def test_registry_index_snapshot_skips_pipeline_on_warm_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    workspace = _make_workspace(tmp_path)
+    expected_index = run_pipeline(workspace)
+    assert expected_index["by_key"]
+
+    cold_registry = NodeRegistry(workspace, include_composite=False)
+    assert cold_registry.get_node_library_index() == expected_index
+    expected_flow = cold_registry.get_node_library_view().get_flow_node_names()
+    expected_boolean = cold_registry.get_node_library_view().get_boolean_node_names()
+
+    calls = _count_extractions(monkeypatch)
+    warm_registry = NodeRegistry(workspace, include_composite=False)
+    assert warm_registry.get_node_library_index() == expected_index
+    view = warm_registry.get_node_library_view()
+    assert view.get_flow_node_names() == expected_flow
+    assert view.get_boolean_node_names() == expected_boolean
+    assert view.get_by_alias("运算节点", "加法")[0] == "运算节点/整数相加"
+    assert calls == []
+
+
+def test_spec_cache_reparses_only_changed_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    workspace = _make_workspace(tmp_path)
+    cache_dir = get_node_cache_dir(workspace)
+    calls = _count_extractions(monkeypatch)
+
+    first_index = run_cached_pipeline(workspace, cache_dir)
+    assert len(calls) == 2
+
+    calls.clear()
+    assert run_cached_pipeline(workspace, cache_dir) == first_index
+    assert calls == []
+
+    server_file = workspace / "plugins" / "nodes" / "server" / "math_nodes.py"
+    server_file.write_text(_SERVER_IMPL.replace('aliases=["加法"]', 'aliases=["加法", "求和"]'), encoding="utf-8")
+    calls.clear()
+    changed_index = run_cached_pipeline(workspace, cache_dir)
+    assert calls == [server_file]
+    assert changed_index == run_pipeline(workspace)
+    assert changed_index["alias_to_key"]["运算节点/求和"] == "运算节点/整数相加"
+
+
+def test_truncated_spec_cache_is_treated_as_missing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    workspace = _make_workspace(tmp_path)
+    cache_dir = get_node_cache_dir(workspace)
+    first_index = run_cached_pipeline(workspace, cache_dir)
+
+    cache_file = cache_dir / SPEC_CACHE_FILENAME
+    raw = cache_file.read_bytes()
+    cache_file.write_bytes(raw[: len(raw) - 16])
+
+    calls = _count_extractions(monkeypatch)
+    assert run_cached_pipeline(workspace, cache_dir) == first_index
+    assert len(calls) == 2
+    # 重写后的缓存可被下一次运行复用，且没有遗留临时文件
+    calls.clear()
+    assert run_cached_pipeline(workspace, cache_dir) == first_index
+    assert calls == []
+    assert list(cache_dir.glob("*.tmp")) == []
+
+
+def test_extract_workers_disabled_inside_child_process(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(extractor_ast.multiprocessing, "parent_process", lambda: object())
+    assert extractor_ast._resolve_extract_workers(8, 1000) == 0
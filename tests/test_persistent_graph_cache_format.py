@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from engine.resources.persistent_graph_cache_manager import PersistentGraphCacheManager
+from engine.utils.cache.frozen_payload import freeze_payload
+from engine.utils.cache.graph_cache_format import (
+    encode_graph_cache,
+    load_graph_cache_payload,
+    read_graph_cache_entry,
+)
+
+
+class _IsolatedCacheManager(PersistentGraphCacheManager):
+    """将缓存目录与节点定义指纹固定到测试临时目录，避免触碰工作区缓存。"""
+
+    def __init__(self, workspace_path: Path) -> None:
+        super().__init__(workspace_path)
+        self.node_defs_fp = "fp-1"
+
+    def _get_graph_cache_dir(self) -> Path:
+        return self.workspace_path / "graph_cache"
+
+    def _compute_node_defs_fingerprint(self) -> str:
+        return self.node_defs_fp
+
+
+def _build_result_data() -> dict:
+    return {
+        "graph_id": "g1",
+        "name": "测试图",
+        "data": {
+            "nodes": [
+                {"id": "n1", "inputs": ["流程入"], "outputs": ["流程出", "值"], "pos": (10.0, 20.5)},
+                {"id": "n2", "inputs": ["流程入", "输入"], "outputs": [], "pos": (200.0, 20.5)},
+            ],
+            "edges": [
+                {"id": "e1", "src_node": "n1", "src_port": "流程出", "dst_node": "n2", "dst_port": "流程入"},
+                {"id": "e2", "src_node": "n1", "src_port": "值", "dst_node": "n2", "dst_port": "输入"},
+            ],
+        },
+        "metadata": {"layout_settings": {"LAYOUT_ALGO_VERSION": 3}, "counts": {1: "a"}},
+    }
+
+
+def test_round_trip_matches_json_semantics_and_header_carries_summary(tmp_path: Path) -> None:
+    source_file = tmp_path / "graph.py"
+    source_file.write_text("# graph\n", encoding="utf-8")
+    manager = _IsolatedCacheManager(tmp_path)
+
+    manager.save_persistent_graph_cache("g1", source_file, freeze_payload(_build_result_data()))
+
+    entry = manager.read_persistent_graph_cache_entry("g1")
+    assert entry is not None
+    assert (entry.node_count, entry.edge_count) == (2, 2)
+    assert entry.layout_settings == {"LAYOUT_ALGO_VERSION": 3}
+    assert entry.file_size == source_file.stat().st_size
+
+    loaded = manager.load_persistent_graph_cache("g1", source_file)
+    assert loaded is not None
+    # 与 JSON 往返一致：tuple → list，非字符串键 → 字符串
+    assert loaded["data"]["nodes"][0]["pos"] == [10.0, 20.5]
+    assert loaded["metadata"]["counts"] == {"1": "a"}
+    assert type(loaded["data"]) is dict
+
+
+def test_stale_source_or_fingerprint_is_rejected_from_header(tmp_path: Path) -> None:
+    source_file = tmp_path / "graph.py"
+    source_file.write_text("# graph\n", encoding="utf-8")
+    manager = _IsolatedCacheManager(tmp_path)
+    manager.save_persistent_graph_cache("g1", source_file, _build_result_data())
+
+    manager.node_defs_fp = "fp-2"
+    assert manager.load_persistent_graph_cache("g1", source_file) is None
+
+    manager.node_defs_fp = "fp-1"
+    source_file.write_text("# graph v2\n", encoding="utf-8")
+    assert manager.load_persistent_graph_cache("g1", source_file) is None
+
+    source_file.write_text("# graph!\n", encoding="utf-8")  # 长度相同、内容不同
+    assert manager.load_persistent_graph_cache("g1", source_file) is None
+
+
+def test_truncated_or_foreign_files_are_cache_misses(tmp_path: Path) -> None:
+    encoded = encode_graph_cache(
+        file_hash="h",
+        file_size=1,
+        node_defs_fp="fp",
+        cached_at="now",
+        result_data=_build_result_data(),
+    )
+    truncated_file = tmp_path / "truncated.gcache"
+    truncated_file.write_bytes(encoded[:-5])
+    entry = read_graph_cache_entry(truncated_file)
+    assert entry is not None
+    assert entry.load_result_data() is None
+    assert load_graph_cache_payload(truncated_file) is None
+
+    legacy_file = tmp_path / "legacy.gcache"
+    legacy_file.write_text('{"file_hash": "h"}', encoding="utf-8")
+    assert read_graph_cache_entry(legacy_file) is None
+    assert read_graph_cache_entry(tmp_path / "missing.gcache") is None
+
+
+def test_clear_removes_binary_and_legacy_json_files(tmp_path: Path) -> None:
+    source_file = tmp_path / "graph.py"
+    source_file.write_text("# graph\n", encoding="utf-8")
+    manager = _IsolatedCacheManager(tmp_path)
+    manager.save_persistent_graph_cache("g1", source_file, _build_result_data())
+    (tmp_path / "graph_cache" / "g1.json").write_text("{}", encoding="utf-8")
+
+    assert manager.clear_persistent_graph_cache_for("g1") == 2
+    assert not (tmp_path / "graph_cache").exists()
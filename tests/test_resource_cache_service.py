@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import copy
+import json
+
+import pytest
+
+from engine.configs.resource_types import ResourceType
+from engine.graph.models.graph_config import GraphConfig
+from engine.graph.models.graph_model import GraphModel
+from engine.resources.resource_cache_service import ResourceCacheService
+from engine.utils.cache.frozen_payload import FrozenDict, thaw_payload
+
+
+def _graph_payload(node_count: int) -> dict:
+    return {
+        "graph_id": "g",
+        "name": "g",
+        "data": {
+            "graph_id": "g",
+            "nodes": [
+                {"id": f"node_{index}", "title": "加法", "pos": [0.0, 0.0], "input_constants": {"a": [1, 2]}}
+                for index in range(node_count)
+            ],
+            "edges": [],
+            "graph_variables": [{"name": "v", "default_value": [1]}],
+            "metadata": {"k": {"nested": 1}},
+        },
+        "metadata": {"node_defs_fp": "fp"},
+    }
+
+
+def test_frozen_entry_hit_returns_shared_read_only_view() -> None:
+    cache = ResourceCacheService()
+    key = (ResourceType.GRAPH, "g")
+    stored = cache.add(key, _graph_payload(3), 1.0, frozen=True)
+
+    first = cache.get(key, 1.0)
+    second = cache.get(key, 1.0)
+    assert first is stored and second is stored, "只读模式命中应直接共享同一对象，不做深拷贝"
+    assert isinstance(first, dict) and isinstance(first, FrozenDict)
+    assert json.loads(json.dumps(first)) == _graph_payload(3)
+
+    with pytest.raises(TypeError):
+        first["name"] = "x"
+    with pytest.raises(TypeError):
+        first["data"]["nodes"].append({})
+
+    thawed = thaw_payload(first)
+    thawed["data"]["nodes"].append({"id": "node_x"})
+    assert len(first["data"]["nodes"]) == 3
+    assert copy.deepcopy(first) == _graph_payload(3)
+
+
+def test_copy_mode_entry_keeps_deepcopy_semantics() -> None:
+    cache = ResourceCacheService()
+    key = (ResourceType.TEMPLATE, "t")
+    original = {"name": "t", "items": [1]}
+    cache.add(key, original, 1.0)
+    original["items"].append(2)
+
+    hit = cache.get(key, 1.0)
+    assert hit == {"name": "t", "items": [1]}
+    hit["items"].append(3)
+    assert cache.get(key, 1.0) == {"name": "t", "items": [1]}
+
+
+def test_lru_eviction_by_count_keeps_recently_used_entries() -> None:
+    cache = ResourceCacheService(max_cache_size=2)
+    key_a = (ResourceType.TEMPLATE, "a")
+    key_b = (ResourceType.TEMPLATE, "b")
+    key_c = (ResourceType.TEMPLATE, "c")
+    cache.add(key_a, {"v": 1}, 1.0)
+    cache.add(key_b, {"v": 2}, 1.0)
+    assert cache.get(key_a, 1.0) is not None  # a 变为最近使用
+    cache.add(key_c, {"v": 3}, 1.0)
+
+    assert cache.get(key_b, 1.0) is None, "最久未使用的 b 应被淘汰（LRU，而不是 FIFO 淘汰 a）"
+    assert cache.get(key_a, 1.0) == {"v": 1}
+    assert cache.get(key_c, 1.0) == {"v": 3}
+    assert cache.get_stats()["cache_evictions"] == 1
+
+
+def test_byte_budget_eviction_and_stats() -> None:
+    small_entry_bytes = ResourceCacheService()
+    small_entry_bytes.add((ResourceType.GRAPH, "probe"), _graph_payload(50), 1.0, frozen=True)
+    entry_bytes = small_entry_bytes.get_stats()["cache_bytes"]
+    assert entry_bytes > 0
+
+    cache = ResourceCacheService(max_cache_size=100, max_cache_bytes=int(entry_bytes * 2.5))
+    for index in range(4):
+        cache.add((ResourceType.GRAPH, f"g{index}"), _graph_payload(50), 1.0, frozen=True)
+
+    stats = cache.get_stats()
+    assert stats["cache_size"] == 2
+    assert stats["cache_evictions"] == 2
+    assert stats["frozen_entries"] == 2
+    assert stats["cache_bytes"] <= stats["max_cache_bytes"]
+
+    cache.clear(ResourceType.GRAPH, "g3")
+    assert cache.get_stats()["cache_bytes"] == entry_bytes
+
+
+def test_graph_model_deserialize_from_frozen_payload_is_mutable() -> None:
+    cache = ResourceCacheService()
+    key = (ResourceType.GRAPH, "g")
+    frozen = cache.add(key, _graph_payload(2), 1.0, frozen=True)
+
+    model = GraphModel.deserialize(frozen["data"])
+    model.metadata["extra"] = True
+    model.graph_variables.append({"name": "w"})
+    model.nodes["node_0"].input_constants["a"].append(3)
+    assert "extra" not in frozen["data"]["metadata"]
+    assert frozen["data"]["nodes"][0]["input_constants"]["a"] == [1, 2]
+
+
+def test_graph_config_deserialize_from_frozen_payload_is_mutable() -> None:
+    cache = ResourceCacheService()
+    key = (ResourceType.GRAPH, "g")
+    frozen = cache.add(key, _graph_payload(2), 1.0, frozen=True)
+
+    config = GraphConfig.deserialize(frozen)
+    config.data["nodes"].append({"id": "node_new"})
+    config.data["metadata"]["k"]["nested"] = 2
+    config.update_timestamp()
+    assert len(frozen["data"]["nodes"]) == 2
+    assert frozen["data"]["metadata"]["k"] == {"nested": 1}
+    assert "updated_at" not in frozen["metadata"]
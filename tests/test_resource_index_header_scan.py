@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import ast
+import json
+from pathlib import Path
+
+import engine.graph.utils.metadata_extractor as metadata_extractor
+from engine.configs.resource_types import ResourceType
+from engine.graph.utils.metadata_extractor import (
+    extract_metadata_from_docstring,
+    load_graph_header_metadata_from_file,
+)
+from engine.resources.json_header_scanner import scan_json_object_fields
+from engine.resources.resource_index_builder import ResourceIndexBuilder
+
+
+def test_json_scan_stops_once_satisfied_and_skips_nested_values() -> None:
+    text = json.dumps(
+        {
+            "nested": {"name": "内部字段不应命中", "list": [1, "]}", {"a": None}]},
+            "timer_id": "timer_001",
+            "name": "计时器",
+            "tail": [1, 2, 3],
+        },
+        ensure_ascii=False,
+    )
+    result = scan_json_object_fields(text, {"timer_id", "name"}, lambda found: len(found) == 2)
+    assert result == ({"timer_id": "timer_001", "name": "计时器"}, False)
+
+    full_scan = scan_json_object_fields(text, {"missing"}, lambda found: False)
+    assert full_scan == ({}, True)
+
+    assert scan_json_object_fields("[1, 2]", {"id"}, lambda found: False) is None
+    assert scan_json_object_fields('{"id": 1', {"name"}, lambda found: False) is None
+
+
+def test_graph_header_scan_matches_full_docstring_parse(tmp_path: Path, monkeypatch) -> None:
+    # 极小的初始读取量，覆盖“前缀不足需继续读取”的路径
+    monkeypatch.setattr(metadata_extractor, "_HEADER_SCAN_INITIAL_CHARS", 8)
+    sources = {
+        "plain.py": '# 注释\n"""\ngraph_id: g_001\ngraph_name: 示例图\n"""\nGRAPH_VARIABLES = []\n',
+        "concat.py": '"graph_id: a" "bc"  # 注释\nx = 1\n',
+        "expression.py": '"graph_id: nope".strip()\n',
+        "parenthesized.py": '(\n"graph_id: paren"\n)\n',
+        "no_docstring.py": 'import os\n"""graph_id: late"""\n',
+    }
+    for file_name, source in sources.items():
+        file_path = tmp_path / file_name
+        file_path.write_text(source, encoding="utf-8")
+        docstring = ast.get_docstring(ast.parse(source))
+        expected = extract_metadata_from_docstring(docstring or "")
+        assert load_graph_header_metadata_from_file(file_path) == expected, file_name
+
+    assert load_graph_header_metadata_from_file(tmp_path / "plain.py").graph_id == "g_001"
+    assert load_graph_header_metadata_from_file(tmp_path / "concat.py").graph_id == "abc"
+
+
+def test_build_index_passes_scanned_fields_to_name_sync(tmp_path: Path) -> None:
+    resource_library_dir = tmp_path / "assets" / "资源库"
+    graph_dir = resource_library_dir / ResourceType.GRAPH.value / "server"
+    graph_dir.mkdir(parents=True)
+    (graph_dir / "图文件.py").write_text('"""\ngraph_id: graph_a\ngraph_name: 图名\n"""\n', encoding="utf-8")
+    timer_dir = resource_library_dir / ResourceType.TIMER.value
+    timer_dir.mkdir(parents=True)
+    (timer_dir / "计时器文件.json").write_text(
+        json.dumps({"timer_id": "timer_a", "name": "计时器", "timer_name": "显示名"}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+
+    sync_calls = []
+
+    def record_sync(file_path, resource_type, resource_id, filename_without_ext, preloaded_data, **kwargs):
+        sync_calls.append((resource_type, resource_id, filename_without_ext, kwargs["scanned_fields"]))
+        return False
+
+    index_data = ResourceIndexBuilder(tmp_path, resource_library_dir).build_index(record_sync, max_workers=2)
+
+    assert index_data.resource_index[ResourceType.GRAPH] == {"graph_a": graph_dir / "图文件.py"}
+    assert index_data.name_to_id_index[ResourceType.TIMER] == {"计时器": "timer_a"}
+    assert (ResourceType.GRAPH, "graph_a", "图文件", {"graph_name": "图名"}) in sync_calls
+    timer_call = next(call for call in sync_calls if call[0] == ResourceType.TIMER)
+    assert timer_call[1] == "timer_a"
+    assert timer_call[3]["name"] == "计时器"
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from engine.configs.resource_types import ResourceType
+from engine.resources.resource_index_builder import ResourceIndexBuilder
+from engine.utils.cache.cache_paths import get_resource_index_cache_file
+
+
+def _write_timer(timer_dir: Path, file_stem: str, timer_id: str, name: str) -> Path:
+    timer_dir.mkdir(parents=True, exist_ok=True)
+    target_file = timer_dir / f"{file_stem}.json"
+    target_file.write_text(json.dumps({"timer_id": timer_id, "name": name}, ensure_ascii=False), encoding="utf-8")
+    return target_file
+
+
+def _write_graph(graph_dir: Path, file_stem: str, graph_id: str) -> Path:
+    graph_dir.mkdir(parents=True, exist_ok=True)
+    target_file = graph_dir / f"{file_stem}.py"
+    target_file.write_text(f'"""\ngraph_id: {graph_id}\ngraph_name: {file_stem}\n"""\n', encoding="utf-8")
+    return target_file
+
+
+def _bump_mtime(target_file: Path) -> None:
+    stat_result = target_file.stat()
+    os.utime(target_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+
+
+def test_incremental_load_rereads_only_changed_files(tmp_path: Path) -> None:
+    resource_library_dir = tmp_path / "assets" / "资源库"
+    timer_dir = resource_library_dir / ResourceType.TIMER.value
+    graph_root = resource_library_dir / ResourceType.GRAPH.value
+    _write_timer(timer_dir, "计时器A", "timer_a", "计时器A")
+    removed_timer = _write_timer(timer_dir, "计时器B", "timer_b", "计时器B")
+    edited_graph = _write_graph(graph_root / "server", "图一", "graph_1")
+    _write_graph(graph_root / "client" / "子目录", "图二", "graph_2")
+    _write_graph(graph_root / "server", "_prelude", "ignored")
+
+    ResourceIndexBuilder(tmp_path, resource_library_dir).build_index(lambda *args, **kwargs: False)
+
+    sync_calls = []
+
+    def record_sync(file_path, *args, **kwargs):
+        sync_calls.append(Path(file_path).name)
+        return False
+
+    unchanged = ResourceIndexBuilder(tmp_path, resource_library_dir).try_load_from_cache(record_sync)
+    assert unchanged is not None
+    assert unchanged.rescanned_file_count == 0
+    assert sync_calls == []
+
+    removed_timer.unlink()
+    _write_timer(timer_dir, "计时器C", "timer_c", "计时器C")
+    edited_graph.write_text('"""\ngraph_id: graph_1_renamed\ngraph_name: 图一\n"""\n', encoding="utf-8")
+    _bump_mtime(edited_graph)
+
+    patched = ResourceIndexBuilder(tmp_path, resource_library_dir).try_load_from_cache(record_sync)
+    assert patched is not None
+    assert patched.rescanned_file_count == 2
+    assert sorted(sync_calls) == sorted(["计时器C.json", "图一.py"])
+
+    full = ResourceIndexBuilder(tmp_path, resource_library_dir).build_index(lambda *args, **kwargs: False)
+    assert patched.resource_index == full.resource_index
+    assert patched.name_to_id_index == full.name_to_id_index
+    assert patched.id_to_filename_cache == full.id_to_filename_cache
+    assert set(patched.resource_index[ResourceType.GRAPH]) == {"graph_1_renamed", "graph_2"}
+    assert set(patched.resource_index[ResourceType.TIMER]) == {"timer_a", "timer_c"}
+
+
+def test_saved_in_memory_edits_survive_restart(tmp_path: Path) -> None:
+    resource_library_dir = tmp_path / "assets" / "资源库"
+    timer_dir = resource_library_dir / ResourceType.TIMER.value
+    timer_file = _write_timer(timer_dir, "计时器A", "timer_a", "旧名称")
+    builder = ResourceIndexBuilder(tmp_path, resource_library_dir)
+    index_data = builder.build_index(lambda *args, **kwargs: False)
+
+    # 模拟 ResourceManager 保存资源：写文件后直接更新内存索引并落盘
+    timer_file.write_text(json.dumps({"timer_id": "timer_a", "name": "新名称"}, ensure_ascii=False), encoding="utf-8")
+    _bump_mtime(timer_file)
+    index_data.name_to_id_index[ResourceType.TIMER] = {"新名称": "timer_a"}
+    builder._save_persistent_resource_index(  # type: ignore[attr-defined]
+        index_data.resource_index, index_data.name_to_id_index, index_data.id_to_filename_cache
+    )
+
+    restored = ResourceIndexBuilder(tmp_path, resource_library_dir).try_load_from_cache()
+    assert restored is not None
+    assert restored.rescanned_file_count == 0
+    assert restored.name_to_id_index[ResourceType.TIMER] == {"新名称": "timer_a"}
+
+
+def test_legacy_fingerprint_cache_is_ignored(tmp_path: Path) -> None:
+    cache_file = get_resource_index_cache_file(tmp_path)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(
+        json.dumps({"__manifest__": {"schema": "resource_index_cache/v1", "schema_version": 1}, "resources_fp": ""}),
+        encoding="utf-8",
+    )
+    builder = ResourceIndexBuilder(tmp_path, tmp_path / "assets" / "资源库")
+    assert builder.try_load_from_cache() is None
@@ -51,10 +51,10 @@ def test_all_item_json_files_are_indexed(tmp_path: Path) -> None:
     assert not missing_files, f"以下道具 JSON 未出现在 ResourceType.ITEM 索引中: {[p.name for p in missing_files]}"
 
 
-def test_stale_item_bucket_cache_is_invalidated(tmp_path: Path) -> None:
+def test_stale_item_bucket_cache_is_patched_from_disk(tmp_path: Path) -> None:
     """
     构造一个“磁盘上 JSON 文件已增加，但缓存中的 ITEM bucket 仍只包含部分条目”的场景，
-    验证 ResourceIndexBuilder.try_load_from_cache 会将该缓存判定为失效并返回 None。
+    验证 ResourceIndexBuilder.try_load_from_cache 会按文件增量修补，结果与磁盘一致而不是沿用过期条目。
     """
     workspace_path = tmp_path
     resource_library_dir = workspace_path / "assets" / "资源库"
@@ -71,7 +71,6 @@ def test_stale_item_bucket_cache_is_invalidated(tmp_path: Path) -> None:
     assert full_item_bucket, "测试依赖于至少一条战斗预设-道具资源"
 
     # 人为构造一个“过期”的 ITEM bucket：仅保留其中一条记录。
-    # 其他资源类型保持不变，模拟现实中“外部脚本直接写入 JSON，但未刷新索引”的情况。
     stale_resource_index = dict(full_index_data.resource_index)
     first_item_id, first_item_path = next(iter(full_item_bucket.items()))
     stale_resource_index[ResourceType.ITEM] = {first_item_id: first_item_path}
@@ -82,12 +81,10 @@ def test_stale_item_bucket_cache_is_invalidated(tmp_path: Path) -> None:
         id_to_filename_cache=full_index_data.id_to_filename_cache,
     )
 
-    # 在新的防御逻辑下，try_load_from_cache 应检测到“磁盘 JSON 数量 > 索引条目数”，
-    # 从而返回 None，强制后续走全量扫描路径。
-    cached_after_stale = builder.try_load_from_cache()
-    assert cached_after_stale is None, "对于 ITEM bucket 少于磁盘 JSON 数量的缓存，应视为无效"
-
-    # 为避免影响后续手动运行工具或 UI，再次构建一次完整索引写回磁盘。
-    builder.build_index(lambda *args, **kwargs: False)
-
+    # 模拟“外部脚本直接写入 JSON，但未刷新索引”的情况。
+    _write_item_json(items_dir / "item_c.json", item_id="item_c", item_name="示例道具C")
 
+    patched = ResourceIndexBuilder(workspace_path, resource_library_dir).try_load_from_cache()
+    assert patched is not None
+    assert set(patched.resource_index[ResourceType.ITEM]) == {"item_a", "item_b", "item_c"}
+    assert patched.rescanned_file_count == 1
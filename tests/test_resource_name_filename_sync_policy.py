@@ -92,3 +92,25 @@ def test_scan_overwrites_name_for_name_driven_filename_resource(tmp_path: Path)
     assert payload_after_scan.get("name") == "old_timer_name"
 
 
+
+
+def test_scan_sync_with_scanned_fields_rewrites_full_payload(tmp_path: Path) -> None:
+    """索引扫描只提供顶层字段时，需回写 name 的场景仍应基于完整 JSON 写回，保留其它字段。"""
+    index_service = _build_index_service(tmp_path)
+
+    file_path = tmp_path / "renamed_timer.json"
+    _write_json_file(file_path, {"timer_id": "timer_002", "name": "旧名称", "duration": 3.5})
+
+    did_sync = index_service._check_and_sync_name(
+        file_path,
+        ResourceType.TIMER,
+        "timer_002",
+        "renamed_timer",
+        None,
+        scanned_fields={"timer_id": "timer_002", "name": "旧名称"},
+    )
+    assert did_sync is True
+
+    payload_after_scan = _read_json_file(file_path)
+    assert payload_after_scan.get("name") == "renamed_timer"
+    assert payload_after_scan.get("duration") == 3.5
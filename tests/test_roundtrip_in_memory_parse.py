@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from app.codegen.executable_code_generator import ExecutableCodeGenerator
+from engine.configs.settings import settings
+from engine.graph.graph_code_parser import GraphCodeParser
+from engine.validate import validate_roundtrip_batch
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_GRAPH_DIR = PROJECT_ROOT / "assets" / "资源库" / "节点图" / "server" / "模板示例"
+_GRAPH_FILE = _GRAPH_DIR / "模板示例_计算1加1_写入自定义变量.py"
+
+
+def _forbid_temp_dirs(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("往返校验不应创建临时目录")
+
+    monkeypatch.setattr(tempfile, "mkdtemp", _fail)
+
+
+def test_parse_code_matches_parse_file_without_disk_io() -> None:
+    settings.set_config_path(PROJECT_ROOT)
+    parser = GraphCodeParser(PROJECT_ROOT)
+    from_file, file_metadata = parser.parse_file(_GRAPH_FILE)
+    from_memory, memory_metadata = parser.parse_code(_GRAPH_FILE.read_text(encoding="utf-8"), "<memory>/graph.py")
+
+    assert memory_metadata == file_metadata
+    assert len(from_memory.nodes) == len(from_file.nodes)
+    assert len(from_memory.edges) == len(from_file.edges)
+    assert sorted(node.title for node in from_memory.nodes.values()) == sorted(
+        node.title for node in from_file.nodes.values()
+    )
+    assert from_memory.metadata["source_file"] == "<memory>/graph.py"
+
+
+def test_roundtrip_batch_reports_per_file_results_in_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    settings.set_config_path(PROJECT_ROOT)
+    _forbid_temp_dirs(monkeypatch)
+    not_a_graph = _GRAPH_DIR.parent / "_prelude.py"
+
+    file_results = validate_roundtrip_batch(
+        [_GRAPH_FILE, not_a_graph],
+        PROJECT_ROOT,
+        code_generator_factory=ExecutableCodeGenerator,
+    )
+
+    assert [item.file_path for item in file_results] == [_GRAPH_FILE, not_a_graph]
+    assert file_results[0].result.success, file_results[0].result
+    assert not file_results[1].result.success
+    assert file_results[1].result.error_type == "source"
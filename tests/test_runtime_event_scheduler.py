@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from app.runtime.engine.event_scheduler import EventScheduler
+from app.runtime.engine.game_state import GameRuntime
+
+
+class _TimerGraph:
+    """模拟生成的可执行节点图：定时器事件只声明前三个参数。"""
+
+    def __init__(self, game: GameRuntime, owner_entity) -> None:
+        self.game = game
+        self.owner_entity = owner_entity
+        self.fired: list = []
+
+    def on_定时器触发时(self, 事件源实体, 事件源GUID, 定时器名称):
+        self.fired.append((self.game.now, 定时器名称))
+        if 定时器名称 == "单次":
+            self.game.start_timer(self.owner_entity, "单次", 5.0)
+
+    def register_handlers(self) -> None:
+        self.game.register_event_handler("定时器触发时", self.on_定时器触发时, owner=self.owner_entity)
+
+
+def test_timers_fire_in_virtual_time_order_for_owner_only() -> None:
+    game = GameRuntime()
+    owner = game.create_mock_entity("计时实体")
+    other = game.create_mock_entity("旁观实体")
+    graph = game.attach_graph(_TimerGraph, owner)
+    other_graph = game.attach_graph(_TimerGraph, other)
+
+    game.start_timer(owner, "心跳", 1.0, is_loop=True)
+    game.start_timer(owner, "单次", 5.0)
+    assert game.run_until(3 * 3600) > 0
+
+    assert game.now == 3 * 3600
+    heartbeat_times = [when for when, name in graph.fired if name == "心跳"]
+    assert heartbeat_times == [float(second) for second in range(1, 3 * 3600 + 1)]
+    assert [when for when, name in graph.fired if name == "单次"] == [5.0 * step for step in range(1, 2161)]
+    assert [when for when, _ in graph.fired] == sorted(when for when, _ in graph.fired)
+    assert other_graph.fired == []
+
+    game.stop_timer(owner, "心跳")
+    game.destroy_entity(owner)
+    assert game.timers == {}
+    assert game.run_until(4 * 3600) == 0
+
+
+def test_loop_timer_reports_loop_count_and_restart_resets_deadline() -> None:
+    game = GameRuntime()
+    owner = game.create_mock_entity("计时实体")
+    loops: list = []
+    game.register_event_handler(
+        "定时器触发时",
+        lambda **event_kwargs: loops.append((game.now, event_kwargs["循环次数"])),
+        owner=owner,
+    )
+
+    game.start_timer(owner, "波次", 2.0, is_loop=True)
+    game.run_until(5.0)
+    game.start_timer(owner, "波次", 2.0, is_loop=True)
+    game.run_until(8.0)
+
+    assert loops == [(2.0, 0), (4.0, 1), (7.0, 0)]
+    with pytest.raises(ValueError):
+        game.start_timer(owner, "无效", 0.0, is_loop=True)
+
+
+def test_nested_signals_are_queued_instead_of_recursing() -> None:
+    game = GameRuntime()
+    chain_length = sys.getrecursionlimit() * 2
+    visited: list = []
+
+    def _relay(**event_kwargs) -> None:
+        hop = event_kwargs["hop"]
+        visited.append(hop)
+        if hop < chain_length:
+            game.emit_signal("接力", params={"hop": hop + 1}, target_entity=event_kwargs["事件源实体"])
+
+    game.register_event_handler("接力", _relay)
+    game.emit_signal("接力", params={"hop": 1}, target_entity=game.get_entity("entity_1"))
+
+    assert visited == list(range(1, chain_length + 1))
+
+
+def test_same_time_events_keep_fifo_order_and_run_for_counts_events() -> None:
+    game = GameRuntime()
+    order: list = []
+
+    def _record(**event_kwargs) -> None:
+        order.append(event_kwargs["tag"])
+        if event_kwargs["tag"] == "a":
+            game.trigger_event("记录", tag="a-1")
+            game.trigger_event("记录", tag="a-2")
+
+    game.register_event_handler("记录", _record)
+    game.schedule_event(1.0, "记录", tag="a")
+    game.schedule_event(1.0, "记录", tag="b")
+    cancelled = game.schedule_event(0.5, "记录", tag="cancelled")
+    game.schedule_event(2.0, "记录", tag="c")
+    cancelled.cancel()
+
+    assert game.run_for(2) == 2
+    assert order == ["a", "b"]
+    assert game.run_for(10) == 3
+    assert order == ["a", "b", "a-1", "a-2", "c"]
+    assert game.now == 2.0
+
+
+def test_scheduler_paces_wall_clock_when_not_fast_forwarding() -> None:
+    slept: list = []
+    scheduler = EventScheduler(fast_forward=False, time_scale=4.0, sleep=slept.append)
+    fired: list = []
+    scheduler.call_later(2.0, fired.append, "x")
+
+    assert scheduler.run_until(6.0) == 1
+    assert fired == ["x"]
+    assert slept == [0.5, 1.0]
+    assert scheduler.now == 6.0
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+from app.runtime.engine.game_state import GameRuntime
+from engine.utils.logging import logger as engine_logger
+from engine.utils.logging.log_backend import (
+    LOG_LEVEL_INFO,
+    LOG_LEVEL_WARNING,
+    LogBackend,
+    Logger,
+    MemoryRingLogSink,
+    NullLogSink,
+    RotatingFileLogSink,
+    configure_logging,
+    get_log_backend,
+)
+
+
+class _FormatCounter:
+    """被格式化时计数，用于验证过滤掉的日志不会格式化参数。"""
+
+    def __init__(self) -> None:
+        self.format_count = 0
+
+    def __format__(self, spec: str) -> str:
+        self.format_count += 1
+        return "counted"
+
+
+@pytest.fixture
+def restore_global_backend():
+    previous_sinks = list(get_log_backend().sinks)
+    yield
+    configure_logging(previous_sinks)
+
+
+def test_level_gate_skips_formatting_and_null_sink_disables_backend() -> None:
+    ring = MemoryRingLogSink(capacity=10)
+    logger = Logger("unit", level=LOG_LEVEL_WARNING, backend=LogBackend([ring]))
+    counter = _FormatCounter()
+
+    logger.info("值 {}", counter)
+    logger.warn("值 {}", counter)
+    assert counter.format_count == 0
+    assert [record.template for record in ring.records()] == ["值 {}"]
+    assert ring.lines()[0].endswith("值 counted")
+    assert counter.format_count == 1
+
+    muted = Logger("muted", backend=LogBackend([NullLogSink()]))
+    assert not muted.is_enabled_for(LOG_LEVEL_WARNING)
+    muted.error("值 {}", counter)
+    assert counter.format_count == 1
+
+
+def test_memory_ring_keeps_latest_records() -> None:
+    ring = MemoryRingLogSink(capacity=3)
+    logger = Logger("unit", backend=LogBackend([ring]))
+    for index in range(5):
+        logger.info("第{}条", index)
+
+    assert [record.get_message() for record in ring.records()] == ["第2条", "第3条", "第4条"]
+    assert ring.total_count == 5
+
+
+def test_background_writer_batches_and_preserves_order() -> None:
+    ring = MemoryRingLogSink(capacity=5000)
+    backend = LogBackend([ring], background=True, batch_size=64)
+    logger = Logger("unit", backend=backend)
+    for index in range(2000):
+        logger.debug("事件{}", index)
+
+    backend.flush()
+    assert [record.args[0] for record in ring.records()] == list(range(2000))
+    backend.close()
+    assert not backend.background
+
+
+class _ExplodingSink:
+    def emit(self, records) -> None:
+        raise RuntimeError("sink broken")
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+def test_background_writer_survives_bad_format_and_failing_sink() -> None:
+    ring = MemoryRingLogSink(capacity=10)
+    backend = LogBackend([_ExplodingSink(), ring], background=True)
+    logger = Logger("unit", backend=backend)
+    payload = {"hp": 1}
+
+    logger.info("bad {0} {1}", 1)
+    logger.info("快照 {}", payload)
+    payload["hp"] = 99
+    logger.info("仍在工作 {:02d}", 7)
+    backend.flush()
+
+    assert [record.get_message() for record in ring.records()] == [
+        repr(("bad {0} {1}", (1,))),
+        "快照 {'hp': 1}",
+        "仍在工作 07",
+    ]
+    assert len(ring.lines()) == 3
+    backend.close()
+
+
+def test_rotating_file_sink_rolls_over(tmp_path: Path) -> None:
+    log_file = tmp_path / "logs" / "runtime.log"
+    sink = RotatingFileLogSink(log_file, max_bytes=200, backup_count=2)
+    logger = Logger("unit", backend=LogBackend([sink]))
+    for index in range(30):
+        logger.info("滚动日志行 {:02d}", index)
+    sink.close()
+
+    assert log_file.stat().st_size <= 200
+    assert (tmp_path / "logs" / "runtime.log.1").exists()
+    assert (tmp_path / "logs" / "runtime.log.2").exists()
+    assert not (tmp_path / "logs" / "runtime.log.3").exists()
+    assert log_file.read_text(encoding="utf-8").rstrip().endswith("滚动日志行 29")
+
+
+def test_engine_log_functions_keep_console_format(capsys, restore_global_backend) -> None:
+    configure_logging()
+    engine_logger.log_warn("缺少 {} 个节点", 3)
+    engine_logger.log_error("原样输出 {花括号}")
+
+    lines = capsys.readouterr().out.splitlines()
+    assert re.fullmatch(r"\[WARN \d\d:\d\d:\d\d\] 缺少 3 个节点", lines[0])
+    assert re.fullmatch(r"\[ERR  \d\d:\d\d:\d\d\] 原样输出 \{花括号\}", lines[1])
+
+
+def test_runtime_hot_path_logs_are_gated(capsys) -> None:
+    ring = MemoryRingLogSink()
+    game = GameRuntime(logger=Logger("runtime-test", level=LOG_LEVEL_INFO, backend=LogBackend([ring])))
+    game.trace_recorder = None
+    counter = _FormatCounter()
+
+    for _ in range(100):
+        game.set_graph_variable("计数", counter)
+        game.trigger_event("空事件")
+
+    assert counter.format_count == 0
+    assert all("节点图变量" not in line and "事件触发" not in line for line in ring.lines())
+    assert capsys.readouterr().out == ""
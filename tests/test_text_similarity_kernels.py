@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import random
+
+from engine.utils.text.text_similarity import (
+    EditDistanceIndex,
+    bounded_levenshtein_distance,
+    chinese_similar,
+    levenshtein_distance,
+)
+
+
+def _reference_distance(text_a: str, text_b: str) -> int:
+    previous_row = list(range(len(text_b) + 1))
+    for row, char_a in enumerate(text_a, start=1):
+        current_row = [row] + [0] * len(text_b)
+        for column, char_b in enumerate(text_b, start=1):
+            current_row[column] = min(
+                previous_row[column] + 1,
+                current_row[column - 1] + 1,
+                previous_row[column - 1] + (char_a != char_b),
+            )
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def _random_text(rng: random.Random, alphabet: str, max_length: int) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+
+
+def test_bit_parallel_and_banded_kernels_match_reference_dp() -> None:
+    rng = random.Random(20240601)
+    alphabet = "获取设置实体变量信号ab"
+    for _ in range(3000):
+        text_a = _random_text(rng, alphabet, 12)
+        text_b = _random_text(rng, alphabet, 12)
+        expected = _reference_distance(text_a, text_b)
+        assert levenshtein_distance(text_a, text_b) == expected, (text_a, text_b)
+        max_distance = rng.randint(0, 4)
+        bounded = bounded_levenshtein_distance(text_a, text_b, max_distance)
+        assert bounded == (expected if expected <= max_distance else max_distance + 1), (text_a, text_b)
+
+    # 超过 64 个字符的模式串同样适用（位向量为 Python 整数）
+    long_a = "甲" * 80 + "乙"
+    long_b = "乙" + "甲" * 80
+    assert levenshtein_distance(long_a, long_b) == _reference_distance(long_a, long_b) == 2
+
+
+def test_edit_distance_index_matches_brute_force() -> None:
+    rng = random.Random(7)
+    alphabet = "获取设置实体变量信号"
+    words = list(dict.fromkeys(_random_text(rng, alphabet, 7) for _ in range(600)))
+    index = EditDistanceIndex(words)
+    assert len(index) == len(words)
+    assert not index.add(words[0])
+
+    for _ in range(200):
+        query = _random_text(rng, alphabet, 7)
+        max_distance = rng.randint(0, 3)
+        expected = sorted(
+            (_reference_distance(query, word), position, word)
+            for position, word in enumerate(words)
+            if _reference_distance(query, word) <= max_distance
+        )
+        assert index.search(query, max_distance) == [(distance, word) for distance, _, word in expected]
+
+
+def test_chinese_similar_semantics_unchanged() -> None:
+    assert chinese_similar("获取自定义变量", "获取自定义变量(实体)")
+    assert chinese_similar("获取自定变量", "获取自定义变量", max_distance=1)
+    assert not chinese_similar("发送信号", "销毁实体", max_distance=2)
+    assert not chinese_similar("abc", "获取")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.runtime.engine.node_executor import NodeExecutor
+from app.runtime.engine.trace_logging import (
+    TRACE_LEVEL_DEBUG,
+    TRACE_LEVEL_INFO,
+    JsonlTraceSink,
+    TraceRecorder,
+    read_trace_events_jsonl,
+)
+
+
+class _RuntimeStub:
+    def __init__(self, recorder: TraceRecorder) -> None:
+        self.trace_recorder = recorder
+
+
+def test_ring_buffer_keeps_latest_events_in_order() -> None:
+    recorder = TraceRecorder(capacity=3)
+    for index in range(5):
+        recorder.record("runtime", "variable", f"e{index}", value=index)
+
+    assert [event.message for event in recorder.as_list()] == ["e2", "e3", "e4"]
+    assert recorder.dropped_count == 2
+    assert recorder.events[-1].details == {"value": 4}
+
+
+def test_level_kind_filter_and_debug_sampling() -> None:
+    recorder = TraceRecorder(min_level=TRACE_LEVEL_INFO)
+    assert not recorder.record("node_executor", "start", "n", level=TRACE_LEVEL_DEBUG)
+    assert recorder.record("runtime", "signal", "s")
+
+    kind_filtered = TraceRecorder(kinds={"signal"})
+    assert not kind_filtered.record("runtime", "variable", "v")
+    assert not kind_filtered.is_enabled_for("variable")
+
+    sampled = TraceRecorder(sample_every=3)
+    for index in range(9):
+        sampled.record("node_executor", "start", f"d{index}", level=TRACE_LEVEL_DEBUG)
+    sampled.record("runtime", "signal", "kept")
+    assert [event.message for event in sampled.events] == ["d2", "d5", "d8", "kept"]
+
+
+def test_debug_sampling_counts_each_kind_separately() -> None:
+    sampled = TraceRecorder(sample_every=2)
+    for index in range(10):
+        sampled.record("node_executor", "start", f"n{index}", level=TRACE_LEVEL_DEBUG)
+        sampled.record("node_executor", "finish", f"n{index}", level=TRACE_LEVEL_DEBUG)
+    assert [(event.kind, event.message) for event in sampled.events] == [
+        (kind, f"n{index}") for index in (1, 3, 5, 7, 9) for kind in ("start", "finish")
+    ]
+
+
+def test_node_executor_skips_filtered_traces() -> None:
+    recorder = TraceRecorder(min_level=TRACE_LEVEL_INFO)
+    executor = NodeExecutor(_RuntimeStub(recorder))
+    assert executor.execute_node("加法", lambda a, b: a + b, 1, 2) == 3
+    assert len(recorder) == 0
+
+    verbose = TraceRecorder()
+    NodeExecutor(_RuntimeStub(verbose)).execute_node("加法", lambda a, b: a + b, 1, b=2)
+    start_event, finish_event = verbose.events
+    assert (start_event.kind, finish_event.kind) == ("start", "finish")
+    assert start_event.stack == ["加法"]
+    assert start_event.details["call_signature"] == {"args": ["int"], "kwargs": {"b": "int"}}
+    assert finish_event.details["result_type"] == "int"
+
+
+def test_batch_sink_streams_jsonl_incrementally(tmp_path: Path) -> None:
+    trace_file = tmp_path / "trace" / "events.jsonl"
+    recorder = TraceRecorder(batch_sink=JsonlTraceSink(trace_file), batch_size=2)
+
+    recorder.record("runtime", "variable", "v1", value=object())
+    events, offset = read_trace_events_jsonl(trace_file)
+    assert events == []
+
+    recorder.record("runtime", "variable", "v2", value=[1, 2])
+    recorder.record("runtime", "signal", "s1")
+    events, offset = read_trace_events_jsonl(trace_file, offset)
+    assert [event.message for event in events] == ["v1", "v2"]
+    assert events[1].details == {"value": [1, 2]}
+
+    recorder.flush()
+    events, offset = read_trace_events_jsonl(trace_file, offset)
+    assert [event.message for event in events] == ["s1"]
+
+    export_file = tmp_path / "export.jsonl"
+    assert recorder.export_jsonl(export_file) == 3
+    exported, _ = read_trace_events_jsonl(export_file)
+    assert [event.message for event in exported] == ["v1", "v2", "s1"]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+
+from engine.validate.context import ValidationContext
+from engine.validate.rules.ast_node_index import get_module_node_index
+from engine.validate.rules.ast_utils import build_parent_map, get_cached_module, iter_class_methods
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_GRAPH_FILE = PROJECT_ROOT / "assets" / "资源库" / "节点图" / "server" / "模板示例" / "模板示例_复杂控制流综合测试.py"
+
+
+def _build_context() -> ValidationContext:
+    return ValidationContext(workspace_path=PROJECT_ROOT, file_path=_GRAPH_FILE)
+
+
+def test_method_buckets_match_filtered_walk_order() -> None:
+    ctx = _build_context()
+    tree = get_cached_module(ctx)
+    node_index = get_module_node_index(ctx)
+    assert get_module_node_index(ctx) is node_index
+
+    checked_calls = 0
+    for _, method in iter_class_methods(tree):
+        expected_calls = [node for node in ast.walk(method) if isinstance(node, ast.Call)]
+        assert node_index.method_nodes(method, ast.Call) == expected_calls
+        checked_calls += len(expected_calls)
+
+        expected_assigns = [node for node in ast.walk(method) if isinstance(node, (ast.Assign, ast.AnnAssign))]
+        assert node_index.method_nodes(method, ast.Assign, ast.AnnAssign) == expected_assigns
+    assert checked_calls > 0
+
+
+def test_module_buckets_and_parent_map_cover_whole_tree() -> None:
+    ctx = _build_context()
+    tree = get_cached_module(ctx)
+    node_index = get_module_node_index(ctx)
+
+    expected_ann_assigns = [node for node in ast.walk(tree) if isinstance(node, ast.AnnAssign)]
+    assert sorted(map(id, node_index.module_nodes(ast.AnnAssign))) == sorted(map(id, expected_ann_assigns))
+    # Load/Store 等上下文节点在 CPython 中是共享单例，其“父节点”没有意义，不参与比较
+    def _without_expr_context(parent_map):
+        return {child: parent for child, parent in parent_map.items() if not isinstance(child, ast.expr_context)}
+
+    assert _without_expr_context(node_index.parent_map) == _without_expr_context(build_parent_map(tree))
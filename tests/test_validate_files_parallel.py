@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from engine.validate.api import validate_files
+
+
+def _workspace_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+_GRAPH_CODE_TEMPLATE = '''
+"""
+graph_id: test_parallel_validate_{index}
+graph_name: 并行校验_{index}
+graph_type: server
+"""
+
+from __future__ import annotations
+
+from _prelude import *
+
+
+class 并行校验_{index}:
+    def __init__(self, game, owner_entity):
+        self.game = game
+        self.owner_entity = owner_entity
+
+    def on_实体创建时(self, 事件源实体, 事件源GUID):
+        未知节点函数_{index}(
+            self.game,
+            任意参数=1,
+        )
+'''
+
+
+def test_parallel_validate_files_matches_serial_order_and_issues(tmp_path: Path) -> None:
+    """workers>1 时应与串行校验产出完全一致的 Issue 列表（含顺序），保证多进程合并是确定性的。"""
+    workspace = _workspace_root()
+    graph_paths = []
+    for index in range(4):
+        target = tmp_path / f"temp_parallel_graph_{index}.py"
+        target.write_text(_GRAPH_CODE_TEMPLATE.format(index=index), encoding="utf-8")
+        graph_paths.append(target)
+
+    serial_report = validate_files(graph_paths, workspace, strict_entity_wire_only=False, use_cache=False)
+    parallel_report = validate_files(
+        graph_paths,
+        workspace,
+        strict_entity_wire_only=False,
+        use_cache=False,
+        workers=2,
+    )
+
+    assert serial_report.issues, "示例图包含未知节点调用，串行校验应产生 Issue"
+    assert [issue.to_dict() for issue in parallel_report.issues] == [
+        issue.to_dict() for issue in serial_report.issues
+    ]
+    assert parallel_report.stats == serial_report.stats
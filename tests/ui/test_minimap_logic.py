@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from engine.graph.models.graph_model import GraphModel
+
+from app.ui.graph.logic.minimap_logic import (
+    MiniMapProjection,
+    MiniMapTileGrid,
+    build_minimap_snapshot,
+    mark_footprints,
+    minimap_color_key,
+    minimap_scene_rect,
+)
+
+
+def _build_chain_model(count: int) -> GraphModel:
+    model = GraphModel(graph_name="小地图")
+    previous = None
+    for index in range(count):
+        node = model.add_node(f"节点{index}", "执行节点", ["流程入"], ["流程出"], pos=(index * 400.0, 0.0))
+        if previous is not None:
+            model.add_edge(previous.id, "流程出", node.id, "流程入")
+        previous = node
+    return model
+
+
+def test_snapshot_is_compact_geometry_from_model() -> None:
+    model = _build_chain_model(3)
+    snapshot = build_minimap_snapshot(model)
+
+    assert snapshot.node_count == 3 and snapshot.edge_count == 2
+    assert set(snapshot.color_keys) == {minimap_color_key(next(iter(model.nodes.values())))} == {"execution"}
+    first_id = next(iter(model.nodes))
+    assert snapshot.node_rect(snapshot.index_of(first_id)) == (0.0, 0.0, 280.0, 140.0)
+    start, *_middle, end = snapshot.edge_polyline(0)
+    assert start == (280.0, 70.0) and end == (400.0, 70.0)
+
+
+def test_moving_node_only_dirties_nearby_tiles() -> None:
+    model = _build_chain_model(12)
+    snapshot = build_minimap_snapshot(model)
+    projection = MiniMapProjection.fit(minimap_scene_rect(snapshot), 200, 150)
+    grid = MiniMapTileGrid(200, 150, tile_size=16)
+
+    last_id = list(model.nodes)[-1]
+    x, y, _w, _h = snapshot.node_rect(snapshot.index_of(last_id))
+    footprints = snapshot.move_node(last_id, x, y + 40.0)
+    assert footprints is not None and projection.contains_scene_rect(footprints[1])
+    assert snapshot.move_node(last_id, x, y + 40.0) is None
+
+    mark_footprints(grid, projection, footprints)
+    dirty = grid.take_dirty()
+    assert 0 < len(dirty) < grid.columns * grid.rows // 4
+    # 只涉及右侧（最后一个节点与其入边）的瓦片
+    assert min(column for column, _row in dirty) >= grid.columns // 2
+
+    node_indices, edge_indices = snapshot.query(footprints[1])
+    assert snapshot.index_of(last_id) in node_indices and snapshot.edge_count - 1 in edge_indices
+
+
+def test_projection_round_trips_scene_coordinates() -> None:
+    projection = MiniMapProjection.fit((-200.0, -100.0, 1600.0, 800.0), 200, 150)
+    mini_x, mini_y = projection.to_minimap(300.0, 250.0)
+    assert projection.to_scene(mini_x, mini_y) == (300.0, 250.0)
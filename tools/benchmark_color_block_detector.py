@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+"""
+色块检测性能基准：对比 `_detect_bright_regions` 的向量化实现与旧版逐窗口/逐条扫描实现。
+
+- 对每张截图分别运行两套实现，校验 mask_final 与 color_blocks 完全一致；
+- 输出每帧耗时（取多次重复的中位数）与加速比。
+
+使用示例（在项目根目录执行）：
+  python -X utf8 -m tools.benchmark_color_block_detector --images <截图目录或 PNG 文件> --repeat 5
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+if __package__:
+    from ._bootstrap import ensure_workspace_root_on_sys_path
+else:
+    from _bootstrap import ensure_workspace_root_on_sys_path
+
+ensure_workspace_root_on_sys_path()
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+# color_block_detector_internal 与 app.automation.vision 互相引用，需先加载 vision 包
+import app.automation.vision  # noqa: E402,F401
+from tools.color_block_detector_internal import (  # noqa: E402
+    _build_bright_mask,
+    _detect_bright_regions,
+)
+
+
+def _legacy_detect_bright_regions(image: Image.Image) -> Tuple[List[Dict], np.ndarray]:
+    """旧版实现（逐偏移窗口检查 + 逐竖条/逐行 findContours），仅用于基准对照。"""
+    mask_bright = _build_bright_mask(image)
+
+    min_rect_size = 20
+    contours_all, _ = cv2.findContours(mask_bright, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    mask_filtered = np.zeros_like(mask_bright)
+    for contour in contours_all:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w < min_rect_size or h < min_rect_size:
+            continue
+        roi_mask = mask_bright[y:y + h, x:x + w]
+
+        can_fit = False
+        for delta_y in range(h - min_rect_size + 1):
+            if can_fit:
+                break
+            for delta_x in range(w - min_rect_size + 1):
+                window = roi_mask[delta_y:delta_y + min_rect_size, delta_x:delta_x + min_rect_size]
+                if np.all(window == 255):
+                    can_fit = True
+                    break
+
+        if can_fit:
+            cv2.drawContours(mask_filtered, [contour], -1, 255, thickness=-1)
+
+    scan_width = 5
+    min_height_threshold = 15
+    mask_no_lines = mask_filtered.copy()
+    image_height, image_width = mask_filtered.shape
+    for position_x in range(0, image_width, scan_width):
+        position_x_end = min(position_x + scan_width, image_width)
+        scan_strip = mask_no_lines[:, position_x:position_x_end].copy()
+        contours_in_strip, _ = cv2.findContours(scan_strip, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for contour in contours_in_strip:
+            if cv2.boundingRect(contour)[3] < min_height_threshold:
+                cv2.drawContours(scan_strip, [contour], -1, 0, thickness=-1)
+        mask_no_lines[:, position_x:position_x_end] = scan_strip
+
+    min_width_threshold = 50
+    mask_no_lines_h = mask_no_lines.copy()
+    for position_y in range(0, image_height):
+        scan_strip = mask_no_lines_h[position_y:position_y + 1, :].copy()
+        contours_in_strip, _ = cv2.findContours(scan_strip, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for contour in contours_in_strip:
+            if cv2.boundingRect(contour)[2] < min_width_threshold:
+                cv2.drawContours(scan_strip, [contour], -1, 0, thickness=-1)
+        mask_no_lines_h[position_y:position_y + 1, :] = scan_strip
+
+    mask_final = mask_no_lines_h
+    contours, _ = cv2.findContours(mask_final, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    color_blocks: List[Dict] = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        color_blocks.append({"x": int(x), "y": int(y), "width": int(w), "height": int(h), "area": int(w * h)})
+    color_blocks.sort(key=lambda block: block["area"], reverse=True)
+    return color_blocks, mask_final
+
+
+def _collect_image_paths(targets: List[str]) -> List[Path]:
+    image_paths: List[Path] = []
+    for target in targets:
+        target_path = Path(target)
+        if target_path.is_dir():
+            image_paths.extend(sorted(target_path.rglob("*.png")))
+        elif target_path.is_file():
+            image_paths.append(target_path)
+    return image_paths
+
+
+def _median_seconds(function, image: Image.Image, repeat: int) -> float:
+    durations: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(image)
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="色块检测（_detect_bright_regions）新旧实现的逐帧耗时对比")
+    parser.add_argument("--images", nargs="+", required=True, help="截图 PNG 文件或目录（目录递归查找 *.png）")
+    parser.add_argument("--repeat", type=int, default=3, help="每张图每种实现的重复次数（取中位数）")
+    args = parser.parse_args()
+
+    image_paths = _collect_image_paths(list(args.images))
+    if not image_paths:
+        print("[ERROR] 未找到任何 PNG 截图。")
+        return 1
+
+    repeat = max(1, int(args.repeat))
+    mismatches = 0
+    legacy_total = 0.0
+    current_total = 0.0
+    print("=" * 80)
+    for image_path in image_paths:
+        image = Image.open(image_path).convert("RGB")
+        legacy_blocks, legacy_mask = _legacy_detect_bright_regions(image)
+        current_blocks, current_mask = _detect_bright_regions(image)
+        identical = legacy_blocks == current_blocks and np.array_equal(legacy_mask, current_mask)
+        if not identical:
+            mismatches += 1
+
+        legacy_seconds = _median_seconds(_legacy_detect_bright_regions, image, repeat)
+        current_seconds = _median_seconds(_detect_bright_regions, image, repeat)
+        legacy_total += legacy_seconds
+        current_total += current_seconds
+        speedup = legacy_seconds / current_seconds if current_seconds > 0 else 0.0
+        print(
+            f"{image_path.name}: {image.size[0]}x{image.size[1]}, 色块 {len(current_blocks)}, "
+            f"旧 {legacy_seconds * 1000:.1f}ms, 新 {current_seconds * 1000:.1f}ms, "
+            f"加速 {speedup:.1f}x, {'一致' if identical else '不一致'}"
+        )
+
+    print("=" * 80)
+    frame_count = len(image_paths)
+    print(f"帧数: {frame_count}")
+    print(f"旧实现平均: {legacy_total / frame_count * 1000:.1f}ms/帧")
+    print(f"新实现平均: {current_total / frame_count * 1000:.1f}ms/帧")
+    print(f"结果不一致帧数: {mismatches}")
+    print("=" * 80)
+    return 1 if mismatches > 0 else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+"""
+节点图持久化缓存格式基准：对比旧版 JSON（indent=2）与紧凑二进制格式（.gcache）的体积与读取耗时。
+
+- 以 graph_cache 目录下现有的 .gcache 文件为样本（可用 --rebuild 先通过 ResourceManager 预构建全部节点图缓存）；
+- 对每个样本分别编码为旧版 JSON 与新格式，写入临时目录；
+- 统计：磁盘总字节数、"仅校验头部" 耗时、完整加载（校验 + 反序列化正文）耗时，并校验两种格式还原出的 result_data 一致。
+
+使用示例（在项目根目录执行）：
+  python -X utf8 -m tools.benchmark_graph_cache_format --rebuild --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+if __package__:
+    from ._bootstrap import ensure_workspace_root_on_sys_path
+else:
+    from _bootstrap import ensure_workspace_root_on_sys_path
+
+WORKSPACE = ensure_workspace_root_on_sys_path()
+
+from engine.utils.cache.cache_paths import get_graph_cache_dir  # noqa: E402
+from engine.utils.cache.graph_cache_format import (  # noqa: E402
+    GRAPH_CACHE_FILE_SUFFIX,
+    encode_graph_cache,
+    load_graph_cache_payload,
+    read_graph_cache_entry,
+    write_graph_cache_file,
+)
+
+
+def _rebuild_graph_caches() -> None:
+    from engine.configs.resource_types import ResourceType
+    from engine.configs.settings import settings
+    from engine.resources.resource_manager import ResourceManager
+
+    settings.set_config_path(WORKSPACE)
+    resource_manager = ResourceManager(WORKSPACE)
+    for graph_id in sorted(resource_manager.list_resources(ResourceType.GRAPH)):
+        resource_manager.load_resource(ResourceType.GRAPH, graph_id)
+
+
+def _median_seconds(function: Callable[[], object], repeat: int) -> float:
+    durations: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="节点图持久化缓存：旧版 JSON vs 紧凑二进制格式的体积与读取耗时对比")
+    parser.add_argument("--rebuild", action="store_true", help="先加载全部节点图以生成 graph_cache")
+    parser.add_argument("--repeat", type=int, default=3, help="每种格式的重复次数（取中位数）")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        _rebuild_graph_caches()
+
+    cache_files = sorted(get_graph_cache_dir(WORKSPACE).glob(f"*{GRAPH_CACHE_FILE_SUFFIX}"))
+    payloads = [payload for payload in (load_graph_cache_payload(path) for path in cache_files) if payload]
+    if not payloads:
+        print("[ERROR] graph_cache 中没有可用的 .gcache 样本，请加 --rebuild 或先运行主程序。")
+        return 1
+
+    repeat = max(1, int(args.repeat))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_root = Path(temp_dir)
+        json_files: List[Path] = []
+        binary_files: List[Path] = []
+        for index, payload in enumerate(payloads):
+            json_file = temp_root / f"{index}.json"
+            json_file.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            json_files.append(json_file)
+            binary_file = temp_root / f"{index}{GRAPH_CACHE_FILE_SUFFIX}"
+            write_graph_cache_file(
+                binary_file,
+                encode_graph_cache(
+                    file_hash=payload["file_hash"],
+                    file_size=0,
+                    node_defs_fp=payload["node_defs_fp"],
+                    cached_at=payload["cached_at"],
+                    result_data=payload["result_data"],
+                ),
+            )
+            binary_files.append(binary_file)
+
+        def load_json_headers() -> None:
+            for path in json_files:
+                json.loads(path.read_text(encoding="utf-8"))["file_hash"]
+
+        def load_binary_headers() -> None:
+            for path in binary_files:
+                read_graph_cache_entry(path).file_hash
+
+        def load_json_full() -> List[dict]:
+            return [json.loads(path.read_text(encoding="utf-8"))["result_data"] for path in json_files]
+
+        def load_binary_full() -> List[dict]:
+            return [read_graph_cache_entry(path).load_result_data() for path in binary_files]
+
+        identical = load_json_full() == load_binary_full()
+        json_bytes = sum(path.stat().st_size for path in json_files)
+        binary_bytes = sum(path.stat().st_size for path in binary_files)
+        json_header_seconds = _median_seconds(load_json_headers, repeat)
+        binary_header_seconds = _median_seconds(load_binary_headers, repeat)
+        json_full_seconds = _median_seconds(load_json_full, repeat)
+        binary_full_seconds = _median_seconds(load_binary_full, repeat)
+
+    print("=" * 80)
+    print(f"样本图数: {len(payloads)}")
+    print(f"磁盘体积: JSON {json_bytes / 1024:.1f}KB, 二进制 {binary_bytes / 1024:.1f}KB "
+          f"({binary_bytes / json_bytes * 100:.0f}%)")
+    print(f"仅校验头部: JSON {json_header_seconds * 1000:.1f}ms, 二进制 {binary_header_seconds * 1000:.1f}ms")
+    print(f"完整加载: JSON {json_full_seconds * 1000:.1f}ms, 二进制 {binary_full_seconds * 1000:.1f}ms")
+    print(f"结果一致: {'是' if identical else '否'}")
+    print("=" * 80)
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+"""
+节点绘制基准：在离屏 QPA（QT_QPA_PLATFORM=offscreen）下测量 GraphScene 单帧渲染耗时。
+
+- 构造 N 个节点的网格图与 E 条连线（每个节点两个输入、两个输出，随机连线），通过 `populate_scene_from_model` 装配场景；
+- 以若干缩放比例将场景渲染到 QImage，模拟视图平移/缩放时的整帧重绘；
+- 统计每个缩放比例下单帧耗时的中位数，用于跟踪 `NodeGraphicsItem.paint` 的帧开销与细节层级（LOD）效果。
+
+使用示例（在项目根目录执行）：
+  python -X utf8 -m tools.benchmark_node_paint --nodes 1500 --edges 3000 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from typing import Callable, List
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+if __package__:
+    from ._bootstrap import ensure_workspace_root_on_sys_path
+else:
+    from _bootstrap import ensure_workspace_root_on_sys_path
+
+WORKSPACE = ensure_workspace_root_on_sys_path()
+
+from PyQt6 import QtCore, QtGui, QtWidgets  # noqa: E402
+
+from engine.configs.settings import settings  # noqa: E402
+from engine.graph.models.graph_model import GraphModel  # noqa: E402
+
+_NODE_COLUMN_COUNT = 40
+_NODE_SPACING_X = 360.0
+_NODE_SPACING_Y = 220.0
+_VIEWPORT_SIZE = (1920, 1080)
+
+
+def _build_model(node_count: int, edge_count: int, seed: int) -> GraphModel:
+    model = GraphModel(graph_name="绘制基准")
+    node_ids: List[str] = []
+    for index in range(node_count):
+        column, row = index % _NODE_COLUMN_COUNT, index // _NODE_COLUMN_COUNT
+        node = model.add_node(
+            title=f"节点{index}",
+            category="执行节点",
+            input_names=["流程入", "目标实体", "数值"],
+            output_names=["流程出", "结果"],
+            pos=(column * _NODE_SPACING_X, row * _NODE_SPACING_Y),
+        )
+        node_ids.append(node.id)
+    rng = random.Random(seed)
+    for _ in range(edge_count):
+        src_id, dst_id = rng.sample(node_ids, 2)
+        model.add_edge_if_absent(src_id, "结果", dst_id, rng.choice(["目标实体", "数值"]))
+    return model
+
+
+def _median_seconds(function: Callable[[], object], repeat: int) -> float:
+    durations: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="离屏渲染 GraphScene，统计不同缩放比例下的单帧耗时")
+    parser.add_argument("--nodes", type=int, default=1500, help="节点数量")
+    parser.add_argument("--edges", type=int, default=3000, help="连线数量（重复连线会被跳过）")
+    parser.add_argument("--repeat", type=int, default=5, help="每个缩放比例的重复次数（取中位数）")
+    parser.add_argument("--scales", type=str, default="1.0,0.6,0.4,0.2", help="逗号分隔的缩放比例")
+    parser.add_argument("--seed", type=int, default=7, help="随机连线种子")
+    args = parser.parse_args()
+
+    app_instance = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    settings.set_config_path(WORKSPACE)
+
+    from app.ui.graph.graph_scene import GraphScene
+    from app.ui.graph.scene_builder import populate_scene_from_model
+
+    model = _build_model(int(args.nodes), int(args.edges), int(args.seed))
+    build_started = time.perf_counter()
+    scene = GraphScene(model, read_only=True)
+    populate_scene_from_model(scene)
+    build_seconds = time.perf_counter() - build_started
+    print(f"[SCENE] 节点 {len(scene.node_items)}，连线 {len(scene.edge_items)}，装配耗时 {build_seconds * 1000:.1f} ms")
+
+    width, height = _VIEWPORT_SIZE
+    image = QtGui.QImage(width, height, QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+    items_rect = scene.itemsBoundingRect()
+    repeat = max(1, int(args.repeat))
+
+    for scale_text in str(args.scales).split(","):
+        scale = float(scale_text)
+        # 以场景左上角为起点，取与视口等大的可见区域（缩放越小可见节点越多）
+        source = QtCore.QRectF(items_rect.left(), items_rect.top(), width / scale, height / scale)
+        visible_count = len(scene.items(source))
+
+        def _render_frame() -> None:
+            image.fill(0)
+            painter = QtGui.QPainter(image)
+            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+            scene.render(painter, QtCore.QRectF(0, 0, width, height), source)
+            painter.end()
+
+        frame_seconds = _median_seconds(_render_frame, repeat)
+        print(f"[FRAME] 缩放 {scale:>4.2f}：可见图形项 {visible_count:>6}，单帧 {frame_seconds * 1000:8.1f} ms")
+
+    app_instance.processEvents()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
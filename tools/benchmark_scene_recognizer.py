@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+"""
+一步式场景识别端口匹配基准：对比 "batched"（搜索区域合成一张图后单次匹配 + 空间索引分桶）与 "rectangle"（逐矩形匹配）两种模式。
+
+- 对每张截图先检测节点矩形，再分别用两种模式完成端口模板匹配与去重；
+- 校验两种模式得到的端口（侧别/序号/模板/坐标/置信度）完全一致；
+- 输出每帧耗时（取多次重复的中位数）与加速比。标题 OCR 两种模式共享，不计入对比。
+
+使用示例（在项目根目录执行）：
+  python -X utf8 -m tools.benchmark_scene_recognizer --images <截图目录或 PNG 文件> \\
+      --templates assets/ocr_templates/4K-100-CN/Node --repeat 3 --workers 4
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+if __package__:
+    from ._bootstrap import ensure_workspace_root_on_sys_path
+else:
+    from _bootstrap import ensure_workspace_root_on_sys_path
+
+ensure_workspace_root_on_sys_path()
+
+from PIL import Image  # noqa: E402
+
+from tools.one_shot_scene_recognizer import (  # noqa: E402
+    _collect_template_hits_in_rectangle,
+    _collect_template_hits_batched,
+    _detect_rectangles_from_canvas,
+    _load_template_images,
+    _resolve_rectangle_template_matches,
+)
+
+PortKey = Tuple[int, str, object, str, int, int, int, int, float]
+
+
+def _collect_image_paths(targets: List[str]) -> List[Path]:
+    image_paths: List[Path] = []
+    for target in targets:
+        target_path = Path(target)
+        if target_path.is_dir():
+            image_paths.extend(sorted(target_path.rglob("*.png")))
+        elif target_path.is_file():
+            image_paths.append(target_path)
+    return image_paths
+
+
+def _resolve_ports(rectangles: List[dict], hits_by_rect: List[List[dict]]) -> List[PortKey]:
+    ports: List[PortKey] = []
+    for rect_index, (rect, hits) in enumerate(zip(rectangles, hits_by_rect)):
+        for match in _resolve_rectangle_template_matches(rect, hits):
+            key: PortKey = (
+                rect_index,
+                str(match["side"]),
+                match.get("index"),
+                str(match["template_name"]),
+                int(match["x"]),
+                int(match["y"]),
+                int(match["width"]),
+                int(match["height"]),
+                float(match["confidence"]),
+            )
+            ports.append(key)
+    return ports
+
+
+def _median_seconds(function: Callable[[], object], repeat: int) -> float:
+    durations: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="端口模板匹配：批量模式 vs 逐矩形模式的逐帧耗时与结果一致性对比")
+    parser.add_argument("--images", nargs="+", required=True, help="画布截图 PNG 文件或目录（目录递归查找 *.png）")
+    parser.add_argument("--templates", required=True, help="端口模板目录（PNG）")
+    parser.add_argument("--header-height", type=int, default=28, help="节点标题栏高度（像素）")
+    parser.add_argument("--threshold", type=float, default=0.8, help="模板匹配阈值")
+    parser.add_argument("--repeat", type=int, default=3, help="每张图每种模式的重复次数（取中位数）")
+    parser.add_argument("--workers", type=int, default=1, help="批量模式按模板并行的线程数")
+    args = parser.parse_args()
+
+    image_paths = _collect_image_paths(list(args.images))
+    if not image_paths:
+        print("[ERROR] 未找到任何 PNG 截图。")
+        return 1
+    templates = _load_template_images(str(args.templates))
+    if not templates:
+        print(f"[ERROR] 模板目录为空或不存在：{args.templates}")
+        return 1
+
+    header_height = int(args.header_height)
+    threshold = float(args.threshold)
+    repeat = max(1, int(args.repeat))
+    workers = max(1, int(args.workers))
+
+    mismatches = 0
+    rectangle_total = 0.0
+    batched_total = 0.0
+    print("=" * 80)
+    for image_path in image_paths:
+        image = Image.open(image_path).convert("RGB")
+        rectangles = _detect_rectangles_from_canvas(image)
+
+        def run_rectangle_mode() -> List[List[dict]]:
+            return [
+                _collect_template_hits_in_rectangle(image, rect, templates, header_height, threshold)
+                for rect in rectangles
+            ]
+
+        def run_batched_mode() -> List[List[dict]]:
+            return _collect_template_hits_batched(
+                image, rectangles, templates, header_height, threshold, max_workers=workers
+            )
+
+        rectangle_ports = _resolve_ports(rectangles, run_rectangle_mode())
+        batched_ports = _resolve_ports(rectangles, run_batched_mode())
+        identical = rectangle_ports == batched_ports
+        if not identical:
+            mismatches += 1
+
+        rectangle_seconds = _median_seconds(run_rectangle_mode, repeat)
+        batched_seconds = _median_seconds(run_batched_mode, repeat)
+        rectangle_total += rectangle_seconds
+        batched_total += batched_seconds
+        speedup = rectangle_seconds / batched_seconds if batched_seconds > 0 else 0.0
+        print(
+            f"{image_path.name}: 节点 {len(rectangles)}, 端口 {len(batched_ports)}, "
+            f"逐矩形 {rectangle_seconds * 1000:.1f}ms, 批量 {batched_seconds * 1000:.1f}ms, "
+            f"加速 {speedup:.1f}x, {'一致' if identical else '不一致'}"
+        )
+
+    print("=" * 80)
+    frame_count = len(image_paths)
+    print(f"帧数: {frame_count}，模板数: {len(templates)}，批量模式线程数: {workers}")
+    print(f"逐矩形模式平均: {rectangle_total / frame_count * 1000:.1f}ms/帧")
+    print(f"批量模式平均: {batched_total / frame_count * 1000:.1f}ms/帧")
+    print(f"结果不一致帧数: {mismatches}")
+    print("=" * 80)
+    return 1 if mismatches > 0 else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
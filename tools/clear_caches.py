@@ -7,7 +7,7 @@ from __future__ import annotations
 - 清空磁盘缓存：运行时缓存根目录（默认 app/runtime/cache）下的 graph_cache/resource_cache/node_cache
 - 清空内存缓存（ResourceManager 内部）
 - 重建资源索引缓存（扫描资源库并写入 resource_cache/resource_index.json）
-- 预构建节点图持久化缓存（遍历全部节点图并加载，以生成 graph_cache/*.json）
+- 预构建节点图持久化缓存（遍历全部节点图并加载，以生成 graph_cache/*.gcache）
 
 使用示例（在项目根目录执行）：
   python -X utf8 -m tools.clear_caches --clear
@@ -140,7 +140,7 @@ def run_rebuild_operations(
 
         built_count = 0
         for index, graph_id in enumerate(graph_ids, start=1):
-            # 触发解析 + 增强布局 + 写入 app/runtime/cache/graph_cache/<graph_id>.json
+            # 触发解析 + 增强布局 + 写入 app/runtime/cache/graph_cache/<graph_id>.gcache
             _ = resource_manager.load_resource(ResourceType.GRAPH, graph_id)
             built_count += 1
             if index == 1 or index % 50 == 0 or index == len(graph_ids):
@@ -32,11 +32,8 @@ class NodeDetected:
     area: int
 
 
-def _detect_bright_regions(image: Image.Image) -> Tuple[List[Dict], np.ndarray]:
-    """
-    基于 HSV + 形态学 + 20x20窗口 + 双向扫描去飞线，生成稳定的色块区域。
-    返回：color_blocks（带 x,y,w,h, area），mask_final（二值图）
-    """
+def _build_bright_mask(image: Image.Image) -> np.ndarray:
+    """HSV 阈值 + 形态学，得到彩色/白色亮区的并集二值图（0/255）。"""
     image_array_rgb = np.array(image)
     image_bgr = cv2.cvtColor(image_array_rgb, cv2.COLOR_RGB2BGR)
     image_hsv = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2HSV)
@@ -56,59 +53,109 @@ def _detect_bright_regions(image: Image.Image) -> Tuple[List[Dict], np.ndarray]:
     mask_white = cv2.morphologyEx(mask_white, cv2.MORPH_CLOSE, kernel_close_white, iterations=1)
     mask_white = cv2.morphologyEx(mask_white, cv2.MORPH_OPEN, kernel_open, iterations=1)
 
-    mask_bright = cv2.bitwise_or(mask_colorful, mask_white)
+    return cv2.bitwise_or(mask_colorful, mask_white)
 
-    min_rect_size = 20
+
+def _keep_contours_fitting_solid_window(mask_bright: np.ndarray, min_rect_size: int) -> np.ndarray:
+    """
+    保留外接矩形内能放下 min_rect_size×min_rect_size 全白窗口的外轮廓（实心填充）。
+
+    以左上角为锚点做一次矩形腐蚀：fit_map[y, x] == 255 表示以 (x, y) 为左上角的窗口全白；
+    每个轮廓只需检查其外接矩形内的合法左上角区域是否存在命中，
+    与逐偏移 `np.all(window == 255)` 的双重循环结果一致。
+    """
     contours_all, _ = cv2.findContours(mask_bright, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
+    window_kernel = np.ones((min_rect_size, min_rect_size), dtype=np.uint8)
+    fit_map = cv2.erode(mask_bright, window_kernel, anchor=(0, 0))
+
     mask_filtered = np.zeros_like(mask_bright)
     for contour in contours_all:
         x, y, w, h = cv2.boundingRect(contour)
         if w < min_rect_size or h < min_rect_size:
             continue
-        roi_mask = mask_bright[y:y + h, x:x + w]
-
-        can_fit = False
-        for delta_y in range(h - min_rect_size + 1):
-            if can_fit:
-                break
-            for delta_x in range(w - min_rect_size + 1):
-                window = roi_mask[delta_y:delta_y + min_rect_size, delta_x:delta_x + min_rect_size]
-                if np.all(window == 255):
-                    can_fit = True
-                    break
-
-        if can_fit:
+        anchor_region = fit_map[y:y + h - min_rect_size + 1, x:x + w - min_rect_size + 1]
+        if np.any(anchor_region == 255):
             cv2.drawContours(mask_filtered, [contour], -1, 255, thickness=-1)
+    return mask_filtered
+
+
+def _remove_short_vertical_segments(mask: np.ndarray, scan_width: int, min_height_threshold: int) -> np.ndarray:
+    """
+    垂直扫描去除细小飞线：按 scan_width 宽的竖条独立查找外轮廓，删除高度不足阈值者（实心填充置零）。
+
+    所有竖条并排放入一张画布、竖条之间插入一列 0 隔断（8 连通也无法跨越），
+    一次 findContours 即得到与逐竖条处理相同的外轮廓集合。
+    """
+    image_height, image_width = mask.shape
+    strip_count = (image_width + scan_width - 1) // scan_width
+    cell_width = scan_width + 1
+
+    padded = np.zeros((image_height, strip_count * scan_width), dtype=np.uint8)
+    padded[:, :image_width] = mask
+    cells = np.zeros((image_height, strip_count, cell_width), dtype=np.uint8)
+    cells[:, :, :scan_width] = padded.reshape(image_height, strip_count, scan_width)
+    canvas = cells.reshape(image_height, strip_count * cell_width)
+
+    contours, _ = cv2.findContours(canvas, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for contour in contours:
+        if cv2.boundingRect(contour)[3] < min_height_threshold:
+            cv2.drawContours(canvas, [contour], -1, 0, thickness=-1)
+
+    restored = cells[:, :, :scan_width].reshape(image_height, strip_count * scan_width)
+    return np.ascontiguousarray(restored[:, :image_width])
+
+
+def _find_runs(flags: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """返回一维布尔数组中连续 True 游程的 (起点, 终点[不含])。"""
+    transitions = np.diff(flags.astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+    return np.flatnonzero(transitions == 1), np.flatnonzero(transitions == -1)
+
+
+def _remove_short_horizontal_runs(mask: np.ndarray, min_width_threshold: int) -> np.ndarray:
+    """
+    横向扫描去除细小飞线：逐行删除长度不足阈值的连续白色游程。
+
+    单行图像中的外轮廓即连续游程：将各行首尾相接（行间补一个 0 隔断）展平为一维，
+    一次求出全部游程并把过短者置零，与逐行 findContours 的结果一致。
+    """
+    image_height, image_width = mask.shape
+    row_stride = image_width + 1
+    flat = np.zeros((image_height, row_stride), dtype=bool)
+    flat[:, :image_width] = mask != 0
+    flat = flat.reshape(-1)
+
+    run_starts, run_ends = _find_runs(flat)
+    short_runs = (run_ends - run_starts) < min_width_threshold
+    markers = np.zeros(flat.size + 1, dtype=np.int8)
+    markers[run_starts[short_runs]] = 1
+    markers[run_ends[short_runs]] = -1
+    remove_flat = np.cumsum(markers[:-1], dtype=np.int32) > 0
+    remove_mask = remove_flat.reshape(image_height, row_stride)[:, :image_width]
+
+    result = mask.copy()
+    result[remove_mask] = 0
+    return result
+
+
+def _detect_bright_regions(image: Image.Image) -> Tuple[List[Dict], np.ndarray]:
+    """
+    基于 HSV + 形态学 + 20x20窗口 + 双向扫描去飞线，生成稳定的色块区域。
+    返回：color_blocks（带 x,y,w,h, area），mask_final（二值图）
+    """
+    mask_bright = _build_bright_mask(image)
+
+    min_rect_size = 20
+    mask_filtered = _keep_contours_fitting_solid_window(mask_bright, min_rect_size)
 
     # 垂直扫描去除细小飞线
     scan_width = 5
     min_height_threshold = 15
-    mask_no_lines = mask_filtered.copy()
-    image_height, image_width = mask_filtered.shape
-    for position_x in range(0, image_width, scan_width):
-        position_x_end = min(position_x + scan_width, image_width)
-        scan_strip = mask_no_lines[:, position_x:position_x_end].copy()
-        contours_in_strip, _ = cv2.findContours(scan_strip, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        for contour in contours_in_strip:
-            coordinate_x, coordinate_y, coordinate_w, coordinate_h = cv2.boundingRect(contour)
-            if coordinate_h < min_height_threshold:
-                cv2.drawContours(scan_strip, [contour], -1, 0, thickness=-1)
-        mask_no_lines[:, position_x:position_x_end] = scan_strip
+    mask_no_lines = _remove_short_vertical_segments(mask_filtered, scan_width, min_height_threshold)
 
     # 横向扫描去除细小飞线
-    scan_height = 1
     min_width_threshold = 50
-    mask_no_lines_h = mask_no_lines.copy()
-    for position_y in range(0, image_height, scan_height):
-        position_y_end = min(position_y + scan_height, image_height)
-        scan_strip = mask_no_lines_h[position_y:position_y_end, :].copy()
-        contours_in_strip, _ = cv2.findContours(scan_strip, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        for contour in contours_in_strip:
-            coordinate_x, coordinate_y, coordinate_w, coordinate_h = cv2.boundingRect(contour)
-            if coordinate_w < min_width_threshold:
-                cv2.drawContours(scan_strip, [contour], -1, 0, thickness=-1)
-        mask_no_lines_h[position_y:position_y_end, :] = scan_strip
+    mask_no_lines_h = _remove_short_horizontal_runs(mask_no_lines, min_width_threshold)
 
     mask_final = mask_no_lines_h
     contours, _ = cv2.findContours(mask_final, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
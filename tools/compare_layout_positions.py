@@ -12,7 +12,6 @@
 from __future__ import annotations
 
 import io
-import json
 import sys
 from pathlib import Path
 from typing import Dict, Tuple, List, Set
@@ -33,6 +32,7 @@ from engine.graph.models import GraphModel  # noqa: E402
 from engine.layout import LayoutService  # noqa: E402
 from engine.configs.settings import settings  # noqa: E402
 from engine.utils.graph.graph_utils import is_flow_port_name  # noqa: E402
+from engine.utils.cache.graph_cache_format import GRAPH_CACHE_FILE_SUFFIX, load_graph_cache_payload  # noqa: E402
 
 
 def _load_graph(target_name: str) -> Tuple[GraphModel, Path]:
@@ -41,8 +41,8 @@ def _load_graph(target_name: str) -> Tuple[GraphModel, Path]:
         print("[ERROR] 未找到 app/runtime/cache/graph_cache")
         sys.exit(2)
     normalized = target_name.strip().lower()
-    for entry in sorted(cache_dir.glob("*.json")):
-        data = json.loads(entry.read_text(encoding="utf-8"))
+    for entry in sorted(cache_dir.glob(f"*{GRAPH_CACHE_FILE_SUFFIX}")):
+        data = load_graph_cache_payload(entry) or {}
         payload = data.get("result_data", {}) or {}
         graph_data = payload.get("data", {}) or {}
         graph_id = str(graph_data.get("graph_id") or "").lower()
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import io
-import json
 import sys
 from pathlib import Path
 
@@ -19,6 +18,7 @@ from engine.configs.resource_types import ResourceType
 from engine.graph.utils.metadata_extractor import load_graph_metadata_from_file
 from engine.resources.resource_manager import ResourceManager
 from engine.utils.cache.cache_paths import get_graph_cache_dir
+from engine.utils.cache.graph_cache_format import get_graph_cache_file, load_graph_cache_payload
 
 
 def _find_var_default(graph_variables: list[dict], variable_name: str):
@@ -73,12 +73,12 @@ def main() -> None:
 
     # 3) 读取持久化缓存文件（若存在）
     cache_dir = get_graph_cache_dir(workspace_path)
-    cache_file = cache_dir / f"{graph_id}.json"
+    cache_file = get_graph_cache_file(cache_dir, graph_id)
     print("[C] graph_cache:")
     print(f"cache_dir: {cache_dir}")
     print(f"cache_file_exists: {cache_file.exists()}")
     if cache_file.exists():
-        root = json.loads(cache_file.read_text(encoding="utf-8"))
+        root = load_graph_cache_payload(cache_file) or {}
         result_data = root.get("result_data", {})
         data = result_data.get("data", {})
         cached_default = None
@@ -11,7 +11,6 @@
 from __future__ import annotations
 
 import io
-import json
 import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -30,6 +29,7 @@ WORKSPACE = ensure_workspace_root_on_sys_path()
 from engine.graph.models import GraphModel  # noqa: E402
 from engine.layout import LayoutService  # noqa: E402
 from engine.configs.settings import settings  # noqa: E402
+from engine.utils.cache.graph_cache_format import GRAPH_CACHE_FILE_SUFFIX, load_graph_cache_payload  # noqa: E402
 
 
 def _load_graph_from_cache(target_name: str) -> Tuple[GraphModel, Path]:
@@ -38,8 +38,8 @@ def _load_graph_from_cache(target_name: str) -> Tuple[GraphModel, Path]:
         print("[ERROR] 未找到缓存目录 app/runtime/cache/graph_cache")
         sys.exit(2)
     normalized_target = target_name.strip().lower()
-    for entry in sorted(cache_dir.glob("*.json")):
-        data = json.loads(entry.read_text(encoding="utf-8"))
+    for entry in sorted(cache_dir.glob(f"*{GRAPH_CACHE_FILE_SUFFIX}")):
+        data = load_graph_cache_payload(entry) or {}
         payload = data.get("result_data", {}) or {}
         graph_data = payload.get("data", {}) or {}
         graph_id = str(graph_data.get("graph_id") or "").lower()
@@ -12,6 +12,7 @@
 - 变量命名清晰可读，避免难以理解的缩写；
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional, Any
 from pathlib import Path
@@ -666,28 +667,98 @@ def _get_effective_template_threshold(
     return float(min(base_threshold, minimum_threshold))
 
 
-def _match_templates_in_rectangle(
+def _compute_template_search_bounds(
+    rect: Dict,
+    header_height: int,
+    image_width: int,
+    image_height: int,
+) -> Optional[Tuple[int, int, int, int]]:
+    """返回节点矩形内端口模板的搜索区域 (left, top, right, bottom)，区域为空时返回 None。"""
+    search_top = rect['y'] + header_height
+    search_bottom = rect['y'] + rect['height']
+    search_left = rect['x']
+    search_right = rect['x'] + rect['width']
+    if search_top >= search_bottom or search_left >= search_right:
+        return None
+    if search_top >= image_height or search_left >= image_width:
+        return None
+    return search_left, search_top, min(search_right, image_width), min(search_bottom, image_height)
+
+
+def _build_template_hit(template_name: str, template_image: np.ndarray, match_x: int, match_y: int, confidence: float) -> Dict:
+    template_height, template_width = template_image.shape[:2]
+    return {
+        "template_name": template_name,
+        "x": int(match_x),
+        "y": int(match_y),
+        "width": int(template_width),
+        "height": int(template_height),
+        "confidence": float(confidence),
+    }
+
+
+# matchTemplate 走 DFT 分块计算，同一位置的得分会随搜索图尺寸产生 1e-7 量级的浮点差异；
+# 先以略低的阈值取候选，再按像素块直接重算得分并用原阈值判定，使不同匹配方式的结果逐位一致。
+_TEMPLATE_CANDIDATE_MARGIN = 1e-3
+
+
+def _score_template_patches(
+    search_array: np.ndarray,
+    template_image: np.ndarray,
+    patch_xs: np.ndarray,
+    patch_ys: np.ndarray,
+) -> np.ndarray:
+    """按 TM_CCOEFF_NORMED 定义（含 OpenCV 的退化处理）直接计算给定左上角处的匹配得分。"""
+    template_height, template_width = template_image.shape[:2]
+    template_centered = template_image.astype(np.float64)
+    template_centered -= template_centered.reshape(-1, template_centered.shape[2]).mean(axis=0)
+    template_norm = float(np.sqrt(np.sum(template_centered * template_centered)))
+    if template_norm < np.finfo(np.float64).eps:
+        return np.ones(len(patch_xs), dtype=np.float64)
+
+    row_offsets = np.arange(template_height)[None, :, None]
+    column_offsets = np.arange(template_width)[None, None, :]
+    patches = search_array[
+        patch_ys[:, None, None] + row_offsets,
+        patch_xs[:, None, None] + column_offsets,
+    ].astype(np.float64)
+    patches -= patches.mean(axis=(1, 2), keepdims=True)
+    numerator = np.einsum("nhwc,hwc->n", patches, template_centered)
+    denominator = np.sqrt(np.einsum("nhwc,nhwc->n", patches, patches)) * template_norm
+
+    scores = np.zeros(len(patch_xs), dtype=np.float64)
+    regular = np.abs(numerator) < denominator
+    scores[regular] = numerator[regular] / denominator[regular]
+    saturated = (~regular) & (np.abs(numerator) < denominator * 1.125)
+    scores[saturated] = np.sign(numerator[saturated])
+    return scores
+
+
+def _find_template_hits(
+    search_array: np.ndarray,
+    template_image: np.ndarray,
+    threshold: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """在搜索图上匹配单个模板，返回行优先顺序的命中 (xs, ys, confidences)。"""
+    result = cv2.matchTemplate(search_array, template_image, cv2.TM_CCOEFF_NORMED)
+    candidate_ys, candidate_xs = np.nonzero(result >= threshold - _TEMPLATE_CANDIDATE_MARGIN)
+    scores = _score_template_patches(search_array, template_image, candidate_xs, candidate_ys)
+    accepted = scores >= threshold
+    return candidate_xs[accepted], candidate_ys[accepted], scores[accepted]
+
+
+def _collect_template_hits_in_rectangle(
     screenshot: Image.Image,
     rect: Dict,
     templates: Dict[str, np.ndarray],
-    header_height: int = 28,
-    threshold: float = 0.7,
-    debug_entries: Optional[List[TemplateMatchDebugInfo]] = None,
+    header_height: int,
+    threshold: float,
 ) -> List[Dict]:
-    rect_x = rect['x']
-    rect_y = rect['y']
-    rect_width = rect['width']
-    rect_height = rect['height']
-    search_top = rect_y + header_height
-    search_bottom = rect_y + rect_height
-    search_left = rect_x
-    search_right = rect_x + rect_width
-    if search_top >= search_bottom or search_left >= search_right:
-        return []
-    if search_top >= screenshot.size[1] or search_left >= screenshot.size[0]:
+    """逐矩形模式：裁剪节点矩形搜索区域，对每个模板单独执行 matchTemplate。"""
+    search_bounds = _compute_template_search_bounds(rect, header_height, screenshot.size[0], screenshot.size[1])
+    if search_bounds is None:
         return []
-    search_bottom = min(search_bottom, screenshot.size[1])
-    search_right = min(search_right, screenshot.size[0])
+    search_left, search_top, search_right, search_bottom = search_bounds
     search_region = screenshot.crop((search_left, search_top, search_right, search_bottom))
     search_array = cv2.cvtColor(np.array(search_region), cv2.COLOR_RGB2BGR)
     matches: List[Dict] = []
@@ -696,23 +767,222 @@ def _match_templates_in_rectangle(
         per_template_threshold = _get_effective_template_threshold(template_name, float(threshold))
         if search_array.shape[0] < template_height or search_array.shape[1] < template_width:
             continue
-        result = cv2.matchTemplate(search_array, template_image, cv2.TM_CCOEFF_NORMED)
-        locations = np.where(result >= per_template_threshold)
-        for location in zip(*locations[::-1]):
-            match_x = search_left + location[0]
-            match_y = search_top + location[1]
-            confidence_value = float(result[location[1], location[0]])
+        hit_xs, hit_ys, confidences = _find_template_hits(search_array, template_image, per_template_threshold)
+        for hit_x, hit_y, confidence in zip(hit_xs, hit_ys, confidences):
             matches.append(
-                {
-                    "template_name": template_name,
-                    "x": int(match_x),
-                    "y": int(match_y),
-                    "width": int(template_width),
-                    "height": int(template_height),
-                    "confidence": confidence_value,
-                }
+                _build_template_hit(template_name, template_image, search_left + hit_x, search_top + hit_y, confidence)
             )
+    return matches
+
+
+class _TileGridIndex:
+    """
+    搜索图中各搜索区域（图块）的网格空间索引：把模板命中点（左上角坐标）归属回所属图块。
 
+    命中点 (x, y) 属于某图块，当且仅当模板以 (x, y) 为左上角时完整落在该图块内，
+    与逐矩形裁剪后 matchTemplate 的合法位置一致（越出图块边界的位置一律丢弃）；图块之间允许重叠。
+    """
+
+    def __init__(self, tile_bounds: List[Optional[Tuple[int, int, int, int]]], cell_size: int = 128) -> None:
+        self._tile_bounds = tile_bounds
+        self._cell_size = int(cell_size)
+        self._tile_indices_by_cell: Dict[Tuple[int, int], List[int]] = {}
+        for tile_index, bounds in enumerate(tile_bounds):
+            if bounds is None:
+                continue
+            left, top, right, bottom = bounds
+            for cell_y in range(top // self._cell_size, (bottom - 1) // self._cell_size + 1):
+                for cell_x in range(left // self._cell_size, (right - 1) // self._cell_size + 1):
+                    self._tile_indices_by_cell.setdefault((cell_x, cell_y), []).append(tile_index)
+
+    def bucket_hits(
+        self,
+        hit_xs: np.ndarray,
+        hit_ys: np.ndarray,
+        template_width: int,
+        template_height: int,
+    ) -> Dict[int, np.ndarray]:
+        """返回 {图块序号: 命中下标数组}；下标保持输入顺序（即 matchTemplate 结果的行优先顺序）。"""
+        if hit_xs.size == 0:
+            return {}
+        cell_keys = np.stack([hit_xs // self._cell_size, hit_ys // self._cell_size], axis=1)
+        unique_cells, cell_inverse = np.unique(cell_keys, axis=0, return_inverse=True)
+        cell_inverse = cell_inverse.reshape(-1)
+        hit_indices_by_tile: Dict[int, List[np.ndarray]] = {}
+        for cell_position, (cell_x, cell_y) in enumerate(unique_cells):
+            tile_indices = self._tile_indices_by_cell.get((int(cell_x), int(cell_y)))
+            if not tile_indices:
+                continue
+            hits_in_cell = np.flatnonzero(cell_inverse == cell_position)
+            xs_in_cell = hit_xs[hits_in_cell]
+            ys_in_cell = hit_ys[hits_in_cell]
+            for tile_index in tile_indices:
+                left, top, right, bottom = self._tile_bounds[tile_index]  # type: ignore[misc]
+                inside = (
+                    (xs_in_cell >= left)
+                    & (ys_in_cell >= top)
+                    & (xs_in_cell + template_width <= right)
+                    & (ys_in_cell + template_height <= bottom)
+                )
+                if np.any(inside):
+                    hit_indices_by_tile.setdefault(tile_index, []).append(hits_in_cell[inside])
+        return {
+            tile_index: np.sort(np.concatenate(index_chunks))
+            for tile_index, index_chunks in hit_indices_by_tile.items()
+        }
+
+
+def _pack_search_regions(
+    search_bounds: List[Optional[Tuple[int, int, int, int]]],
+    max_row_width: int = 4096,
+) -> Tuple[int, int, List[Optional[Tuple[int, int, int, int]]]]:
+    """按高度降序分行（shelf）把各搜索区域紧密排入一张拼图，返回 (拼图宽, 拼图高, 各区域在拼图中的 bounds)。"""
+    widest = max((bounds[2] - bounds[0] for bounds in search_bounds if bounds is not None), default=0)
+    row_limit = max(int(max_row_width), widest)
+    tile_bounds: List[Optional[Tuple[int, int, int, int]]] = [None] * len(search_bounds)
+    packing_order = sorted(
+        (index for index, bounds in enumerate(search_bounds) if bounds is not None),
+        key=lambda index: search_bounds[index][3] - search_bounds[index][1],  # type: ignore[index]
+        reverse=True,
+    )
+    cursor_x = 0
+    cursor_y = 0
+    row_height = 0
+    mosaic_width = 0
+    for index in packing_order:
+        left, top, right, bottom = search_bounds[index]  # type: ignore[misc]
+        tile_width = right - left
+        tile_height = bottom - top
+        if cursor_x + tile_width > row_limit:
+            cursor_x = 0
+            cursor_y += row_height
+            row_height = 0
+        tile_bounds[index] = (cursor_x, cursor_y, cursor_x + tile_width, cursor_y + tile_height)
+        cursor_x += tile_width
+        mosaic_width = max(mosaic_width, cursor_x)
+        row_height = max(row_height, tile_height)
+    return mosaic_width, cursor_y + row_height, tile_bounds
+
+
+def _build_batched_search_image(
+    screenshot_bgr: np.ndarray,
+    search_bounds: List[Optional[Tuple[int, int, int, int]]],
+) -> Tuple[np.ndarray, List[Optional[Tuple[int, int, int, int]]]]:
+    """
+    为批量匹配构建一张搜索图，返回 (搜索图, 各搜索区域在搜索图中的 bounds)。
+
+    在“所有搜索区域的外接矩形”与“搜索区域紧密拼图”之间取面积更小者：
+    节点密集时外接矩形不重复计算重叠区域，节点稀疏时拼图跳过大片空白画布。
+    """
+    valid_bounds = [bounds for bounds in search_bounds if bounds is not None]
+    union_left = min(bounds[0] for bounds in valid_bounds)
+    union_top = min(bounds[1] for bounds in valid_bounds)
+    union_right = max(bounds[2] for bounds in valid_bounds)
+    union_bottom = max(bounds[3] for bounds in valid_bounds)
+    union_area = (union_right - union_left) * (union_bottom - union_top)
+
+    mosaic_width, mosaic_height, packed_bounds = _pack_search_regions(search_bounds)
+    if union_area <= mosaic_width * mosaic_height:
+        union_image = np.ascontiguousarray(screenshot_bgr[union_top:union_bottom, union_left:union_right])
+        shifted_bounds: List[Optional[Tuple[int, int, int, int]]] = [
+            None
+            if bounds is None
+            else (bounds[0] - union_left, bounds[1] - union_top, bounds[2] - union_left, bounds[3] - union_top)
+            for bounds in search_bounds
+        ]
+        return union_image, shifted_bounds
+
+    mosaic = np.zeros((mosaic_height, mosaic_width, 3), dtype=np.uint8)
+    for bounds, tile in zip(search_bounds, packed_bounds):
+        if bounds is None or tile is None:
+            continue
+        mosaic[tile[1]:tile[3], tile[0]:tile[2]] = screenshot_bgr[bounds[1]:bounds[3], bounds[0]:bounds[2]]
+    return mosaic, packed_bounds
+
+
+def _collect_template_hits_batched(
+    screenshot: Image.Image,
+    rectangles: List[Dict],
+    templates: Dict[str, np.ndarray],
+    header_height: int,
+    threshold: float,
+    max_workers: int = 1,
+) -> List[List[Dict]]:
+    """
+    批量模式：所有节点矩形的搜索区域合成一张搜索图（整图只做一次 BGR 转换），
+    每个模板只执行一次 matchTemplate，再通过网格空间索引把命中点分桶回各节点矩形。
+
+    返回与 rectangles 等长的列表，每项的命中与逐矩形模式逐位一致（模板顺序 → 行优先位置）：
+    只保留模板完整落在某个搜索区域内的位置，与逐矩形裁剪后的合法位置相同。
+    max_workers > 1 时按模板并行（OpenCV 计算期间释放 GIL）。
+    """
+    image_width, image_height = screenshot.size
+    search_bounds = [
+        _compute_template_search_bounds(rect, header_height, image_width, image_height) for rect in rectangles
+    ]
+    hits_by_rect: List[List[Dict]] = [[] for _ in rectangles]
+    if all(bounds is None for bounds in search_bounds):
+        return hits_by_rect
+
+    screenshot_bgr = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+    search_image, tile_bounds = _build_batched_search_image(screenshot_bgr, search_bounds)
+    tile_index = _TileGridIndex(tile_bounds)
+
+    def match_single_template(template_item: Tuple[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        template_name, template_image = template_item
+        template_height, template_width = template_image.shape[:2]
+        if search_image.shape[0] < template_height or search_image.shape[1] < template_width:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=np.float64)
+        per_template_threshold = _get_effective_template_threshold(template_name, float(threshold))
+        return _find_template_hits(search_image, template_image, per_template_threshold)
+
+    template_items = list(templates.items())
+    if max_workers > 1 and len(template_items) > 1:
+        with ThreadPoolExecutor(max_workers=int(max_workers)) as executor:
+            template_results = list(executor.map(match_single_template, template_items))
+    else:
+        template_results = [match_single_template(item) for item in template_items]
+
+    for (template_name, template_image), (hit_xs, hit_ys, confidences) in zip(template_items, template_results):
+        template_height, template_width = template_image.shape[:2]
+        for rect_index, hit_indices in tile_index.bucket_hits(hit_xs, hit_ys, template_width, template_height).items():
+            search_left, search_top = search_bounds[rect_index][:2]  # type: ignore[index]
+            tile_left, tile_top = tile_bounds[rect_index][:2]  # type: ignore[index]
+            rect_hits = hits_by_rect[rect_index]
+            for hit_index in hit_indices:
+                rect_hits.append(
+                    _build_template_hit(
+                        template_name,
+                        template_image,
+                        search_left + hit_xs[hit_index] - tile_left,
+                        search_top + hit_ys[hit_index] - tile_top,
+                        confidences[hit_index],
+                    )
+                )
+    return hits_by_rect
+
+
+def _match_templates_in_rectangle(
+    screenshot: Image.Image,
+    rect: Dict,
+    templates: Dict[str, np.ndarray],
+    header_height: int = 28,
+    threshold: float = 0.7,
+    debug_entries: Optional[List[TemplateMatchDebugInfo]] = None,
+) -> List[Dict]:
+    matches = _collect_template_hits_in_rectangle(screenshot, rect, templates, header_height, threshold)
+    return _resolve_rectangle_template_matches(rect, matches, debug_entries)
+
+
+def _resolve_rectangle_template_matches(
+    rect: Dict,
+    matches: List[Dict],
+    debug_entries: Optional[List[TemplateMatchDebugInfo]] = None,
+) -> List[Dict]:
+    """对单个节点矩形内的模板命中执行 NMS、侧别判定与同行去重，返回最终端口命中。"""
+    rect_x = rect['x']
+    rect_width = rect['width']
     matches_after_nms, suppressed_by_nms = _non_maximum_suppression(matches, overlap_threshold=0.1)
     rect_center_x = rect_x + rect_width / 2.0
     for match in matches_after_nms:
@@ -1088,7 +1358,9 @@ def _detect_rectangles_from_canvas(canvas_image: Image.Image) -> List[Dict]:
 def recognize_scene(canvas_image: Image.Image,
                     template_dir: str,
                     header_height: int = 28,
-                    threshold: float = 0.7) -> List[RecognizedNode]:
+                    threshold: float = 0.7,
+                    template_match_mode: str = "batched",
+                    template_match_workers: int = 1) -> List[RecognizedNode]:
     """
     在一次调用中识别节点矩形、标题与端口。
 
@@ -1097,6 +1369,10 @@ def recognize_scene(canvas_image: Image.Image,
         template_dir: 端口模板目录（PNG），例如 'assets/ocr_templates/4K-CN/Node'。
         header_height: 节点卡片顶部标题高度（像素）。
         threshold: 模板匹配阈值。
+        template_match_mode: 端口模板匹配方式：
+            - "batched"：各节点搜索区域合成一张搜索图，每个模板只匹配一次，再按空间索引分桶回各节点；
+            - "rectangle"：逐节点矩形裁剪后分别匹配（旧方式，结果一致，用于对照）。
+        template_match_workers: "batched" 模式下按模板并行的线程数（1 表示串行）。
 
     Returns:
         List[RecognizedNode]:
@@ -1111,17 +1387,28 @@ def recognize_scene(canvas_image: Image.Image,
     titles_by_index = _ocr_titles_for_rectangles(canvas_image, rectangles, header_height=header_height)
     templates = _load_template_images(template_dir)
 
-    recognized_nodes: List[RecognizedNode] = []
-    for idx, rect in enumerate(rectangles, 1):
-        node_title = titles_by_index.get(idx, "")
-        node_title_cn = extract_chinese(node_title)
-        template_matches = _match_templates_in_rectangle(
+    if template_match_mode == "batched":
+        template_hits_by_rect = _collect_template_hits_batched(
             canvas_image,
-            rect,
+            rectangles,
             templates,
             header_height,
             threshold,
+            max_workers=int(template_match_workers),
         )
+    elif template_match_mode == "rectangle":
+        template_hits_by_rect = [
+            _collect_template_hits_in_rectangle(canvas_image, rect, templates, header_height, threshold)
+            for rect in rectangles
+        ]
+    else:
+        raise ValueError(f"未知的模板匹配模式：{template_match_mode}")
+
+    recognized_nodes: List[RecognizedNode] = []
+    for idx, rect in enumerate(rectangles, 1):
+        node_title = titles_by_index.get(idx, "")
+        node_title_cn = extract_chinese(node_title)
+        template_matches = _resolve_rectangle_template_matches(rect, template_hits_by_rect[idx - 1])
         recognized_ports: List[RecognizedPort] = []
         for match in template_matches:
             center_x = int(match['x'] + match['width'] / 2)
@@ -4,15 +4,15 @@ from __future__ import annotations
 graph_cache 结构一致性检查脚本。
 
 功能：
-- 校验 graph_cache JSON 中的 nodes / edges / 端口名称是否自洽；
+- 校验 graph_cache 缓存文件（.gcache 二进制格式或导出的 .json）中的 nodes / edges / 端口名称是否自洽；
 - 列出：
   - 幽灵节点（edges 引用的节点 ID 在 nodes 中不存在）；
   - 端口不匹配（edges 上的 src_port/dst_port 不在对应节点的输出/输入端口集合内，考虑流程占位符）；
   - 孤立节点（在任何一条边中都未出现的节点）。
 
 用法（在项目根目录运行）：
-  python -m tools.validate.validate_graph_cache_integrity                # 扫描 app/runtime/cache/graph_cache 下所有 .json
-  python -m tools.validate.validate_graph_cache_integrity path/to/file.json [more.json ...]
+  python -m tools.validate.validate_graph_cache_integrity                # 扫描 app/runtime/cache/graph_cache 下所有 .gcache/.json
+  python -m tools.validate.validate_graph_cache_integrity path/to/file.gcache [more.json ...]
   python -m tools.validate.validate_graph_cache_integrity app/runtime/cache/graph_cache
 """
 
@@ -43,6 +43,9 @@ from engine.graph.common import (  # type: ignore[import]
     FLOW_OUT_PORT_NAMES,
     FLOW_PORT_PLACEHOLDER,
 )
+from engine.utils.cache.graph_cache_format import GRAPH_CACHE_FILE_SUFFIX, load_graph_cache_payload
+
+_CACHE_FILE_SUFFIXES = (GRAPH_CACHE_FILE_SUFFIX, ".json")
 
 
 def _extract_graph_data(raw: Dict) -> Dict:
@@ -71,7 +74,12 @@ def _extract_graph_data(raw: Dict) -> Dict:
     raise ValueError("输入 JSON 不包含可识别的 graph_data 结构（缺少 nodes/edges）")
 
 
-def _load_json(path: Path) -> Dict:
+def _load_cache_file(path: Path) -> Dict:
+    if path.suffix.lower() == GRAPH_CACHE_FILE_SUFFIX:
+        payload = load_graph_cache_payload(path)
+        if payload is None:
+            raise ValueError(f"无法读取图缓存文件（格式版本不匹配或文件被截断）：{path}")
+        return payload
     text = path.read_text(encoding="utf-8")
     return json.loads(text)
 
@@ -242,7 +250,7 @@ def validate_graph_cache_file(path: Path) -> bool:
     - False 表示未发现严重问题（但可能仍有孤立节点，仅作为提示）。
     """
     print(f"=== 检查文件: {path} ===")
-    data = _load_json(path)
+    data = _load_cache_file(path)
     graph_data = _extract_graph_data(data)
     has_error, report = _analyze_graph_data(graph_data)
 
@@ -300,11 +308,11 @@ def validate_graph_cache_file(path: Path) -> bool:
     return has_error
 
 
-def _iter_json_files(targets: List[Path]) -> List[Path]:
+def _iter_cache_files(targets: List[Path]) -> List[Path]:
     """
-    根据命令行参数收集要检查的 JSON 文件。
+    根据命令行参数收集要检查的缓存文件。
     - 若传入文件：直接使用；
-    - 若传入目录：递归收集目录下的 *.json；
+    - 若传入目录：递归收集目录下的 *.gcache / *.json；
     - 若无参数：默认扫描 app/runtime/cache/graph_cache。
     """
     files: List[Path] = []
@@ -312,15 +320,17 @@ def _iter_json_files(targets: List[Path]) -> List[Path]:
     if not targets:
         default_dir = Path("app/runtime/cache/graph_cache")
         if default_dir.is_dir():
-            for p in sorted(default_dir.rglob("*.json")):
-                files.append(p)
+            for p in sorted(default_dir.rglob("*")):
+                if p.is_file() and p.suffix.lower() in _CACHE_FILE_SUFFIXES:
+                    files.append(p)
         return files
 
     for target in targets:
         if target.is_dir():
-            for p in sorted(target.rglob("*.json")):
-                files.append(p)
-        elif target.is_file() and target.suffix.lower() == ".json":
+            for p in sorted(target.rglob("*")):
+                if p.is_file() and p.suffix.lower() in _CACHE_FILE_SUFFIXES:
+                    files.append(p)
+        elif target.is_file() and target.suffix.lower() in _CACHE_FILE_SUFFIXES:
             files.append(target)
     return files
 
@@ -328,10 +338,10 @@ def _iter_json_files(targets: List[Path]) -> List[Path]:
 def main() -> None:
     argv = sys.argv[1:]
     targets = [Path(arg) for arg in argv]
-    files = _iter_json_files(targets)
+    files = _iter_cache_files(targets)
 
     if not files:
-        print("未找到任何待检查的 .json 文件。")
+        print("未找到任何待检查的 .gcache/.json 文件。")
         sys.exit(0)
 
     has_any_error = False
@@ -23,6 +23,8 @@
       python -X utf8 tools/validate/validate_graphs.py "assets/资源库/节点图/**/*.py"
   - 行为开关：实体入参严格模式（仅允许连线/事件参数）
       python -X utf8 tools/validate/validate_graphs.py --all --strict
+  - 多进程并行校验（0 表示使用全部 CPU 核心）：
+      python -X utf8 -m tools.validate.validate_graphs --all --jobs 8
 """
 
 from __future__ import annotations
@@ -30,6 +32,7 @@ from __future__ import annotations
 import argparse
 import glob
 import io
+import os
 import sys
 from collections import Counter
 from pathlib import Path
@@ -341,6 +344,14 @@ def parse_cli(argv: Sequence[str]) -> argparse.Namespace:
         action="store_true",
         help="禁用校验缓存（默认启用）",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="并行校验的进程数（默认 1 为串行；0 表示使用全部 CPU 核心）",
+    )
     parser.add_argument(
         "--no-composite-struct-check",
         dest="disable_composite_struct_check",
@@ -381,6 +392,7 @@ def main() -> None:
         WORKSPACE,
         strict_entity_wire_only=parsed_args.strict_entity_wire_only,
         use_cache=not parsed_args.disable_cache,
+        workers=(os.cpu_count() or 1) if parsed_args.jobs == 0 else parsed_args.jobs,
     )
 
     all_issues: List[EngineIssue] = list(report.issues)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+"""
+节点图往返校验 CLI（源码 -> GraphModel -> 生成代码 -> 编译 -> 内存重解析）。
+
+功能：
+- 对节点图库逐个执行与“保存前往返校验”相同的流程，全程在内存中完成，不创建临时目录；
+- 支持多进程并行（每个 worker 只加载一次节点库与代码生成器），适合在 CI 中对全库做往返检查。
+
+用法（在项目根目录运行）：
+  python -X utf8 -m tools.validate.validate_roundtrip --all
+  python -X utf8 -m tools.validate.validate_roundtrip --all --jobs 0      # 0 表示使用全部 CPU 核心
+  python -X utf8 -m tools.validate.validate_roundtrip assets/资源库/节点图/server/某图.py
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Sequence
+
+# 工作空间根目录（脚本位于 tools/validate/ 下）
+WORKSPACE = Path(__file__).resolve().parents[2]
+
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")  # type: ignore[attr-defined]
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8")  # type: ignore[attr-defined]
+
+if not __package__:
+    raise SystemExit(
+        "请从项目根目录使用模块方式运行：\n"
+        "  python -X utf8 -m tools.validate.validate_roundtrip --all\n"
+        "（不再支持通过脚本内 sys.path.insert 的方式运行）"
+    )
+
+from app.codegen.executable_code_generator import ExecutableCodeGenerator  # noqa: E402
+from engine.configs.settings import settings  # noqa: E402
+from engine.validate import validate_roundtrip_batch  # noqa: E402
+
+settings.set_config_path(WORKSPACE)
+
+
+def _collect_graph_files(workspace: Path) -> List[Path]:
+    graphs_dir = workspace / "assets" / "资源库" / "节点图"
+    if not graphs_dir.exists():
+        return []
+    return sorted(
+        path
+        for path in graphs_dir.rglob("*.py")
+        if not path.name.startswith("_")
+        # 跳过校验脚本（如 校验节点图.py），这些不是真正的节点图文件
+        and ("校验" not in path.stem)
+    )
+
+
+def _resolve_targets(raw_targets: Sequence[str], validate_all: bool, workspace: Path) -> List[Path]:
+    if validate_all or not raw_targets:
+        return _collect_graph_files(workspace)
+    files: List[Path] = []
+    for text in raw_targets:
+        path = Path(text)
+        absolute_path = path if path.is_absolute() else workspace / path
+        if absolute_path.is_dir():
+            files.extend(
+                sorted(p for p in absolute_path.rglob("*.py") if not p.name.startswith("_") and "校验" not in p.stem)
+            )
+        elif absolute_path.is_file():
+            files.append(absolute_path)
+        else:
+            print(f"[ERROR] 文件或目录不存在: {absolute_path}")
+            sys.exit(1)
+    return files
+
+
+def parse_cli(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="节点图往返校验（内存解析，支持多进程）")
+    parser.add_argument("targets", nargs="*", help="节点图文件或目录（相对项目根目录）")
+    parser.add_argument("--all", dest="validate_all", action="store_true", help="校验 assets/资源库/节点图 全量")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="并行进程数（默认 1 为串行；0 表示使用全部 CPU 核心）",
+    )
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    parsed_args = parse_cli(sys.argv[1:])
+    targets = _resolve_targets(parsed_args.targets, parsed_args.validate_all, WORKSPACE)
+    workers = (os.cpu_count() or 1) if parsed_args.jobs == 0 else parsed_args.jobs
+
+    print(f"开始往返校验 {len(targets)} 个节点图（进程数: {workers}）...")
+    started = time.perf_counter()
+    file_results = validate_roundtrip_batch(
+        targets,
+        WORKSPACE,
+        code_generator_factory=ExecutableCodeGenerator,
+        workers=workers,
+    )
+    elapsed = time.perf_counter() - started
+
+    failed = [item for item in file_results if not item.result.success]
+    for item in failed:
+        try:
+            display = item.file_path.resolve().relative_to(WORKSPACE).as_posix()
+        except ValueError:
+            display = str(item.file_path)
+        result = item.result
+        line_info = f" (第 {result.line_number} 行)" if result.line_number else ""
+        print(f"[FAIL] {display} [{result.error_type}]{line_info}: {result.error_message}")
+        if result.error_details:
+            print(f"       {result.error_details}")
+
+    print(f"\n完成：{len(file_results) - len(failed)}/{len(file_results)} 通过，耗时 {elapsed:.2f}s")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
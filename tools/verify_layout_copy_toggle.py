@@ -20,7 +20,6 @@ from __future__ import annotations
 
 import argparse
 import io
-import json
 import sys
 from pathlib import Path
 from typing import Dict, Iterable, List, Set, Tuple
@@ -41,6 +40,7 @@ from engine.configs.settings import settings  # noqa: E402
 from engine.graph.models import BasicBlock, EdgeModel, GraphModel  # noqa: E402
 from engine.layout import LayoutService  # noqa: E402
 from engine.utils.cache.cache_paths import get_graph_cache_dir  # noqa: E402
+from engine.utils.cache.graph_cache_format import GRAPH_CACHE_FILE_SUFFIX, load_graph_cache_payload  # noqa: E402
 
 
 def parse_args() -> argparse.Namespace:
@@ -78,8 +78,8 @@ def resolve_cache_dir(root: Path) -> Path:
 def load_cached_graph_data(cache_dir: Path, max_files: int = 0) -> List[tuple[str, dict]]:
     items: List[tuple[str, dict]] = []
     count_limit = max_files if max_files > 0 else None
-    for file_path in sorted(cache_dir.glob("*.json")):
-        data = json.loads(file_path.read_text(encoding="utf-8"))
+    for file_path in sorted(cache_dir.glob(f"*{GRAPH_CACHE_FILE_SUFFIX}")):
+        data = load_graph_cache_payload(file_path) or {}
         payload = data.get("result_data", {}) or {}
         graph_data = payload.get("data", {}) or {}
         graph_name = graph_data.get("graph_name", file_path.stem)
@@ -3,19 +3,25 @@
 
 用法：
   python -X utf8 -m tools.verify_layout_equivalence
+  python -X utf8 -m tools.verify_layout_equivalence --parallel-regions [--workers 4] [--graph-root assets/资源库/节点图/server]
 
 判定：
   - 同一图内，节点集合必须一致；
   - 所有节点的 |dx|、|dy| <= 1.0 视为等价；
   - 统计总文件数、通过数、失败数，失败详细打印差异摘要。
+
+--parallel-regions 模式：
+  - 解析 graph-root 下的全部节点图源文件，分别以串行与“按事件区域并行”模式布局，
+    要求两者的坐标、基本块、调试信息与增强模型的节点/连线逐字节一致；
+  - 另将全部节点图合并为一张多事件大图再比对一次，覆盖事件区域很多的场景。
 """
 from __future__ import annotations
 
+import argparse
 import sys
 import io
-import json
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 # Windows 控制台 UTF-8
 if sys.platform == "win32":
@@ -29,15 +35,19 @@ else:
 
 WORKSPACE = ensure_workspace_root_on_sys_path()
 
+from engine.configs.settings import settings  # noqa: E402
+from engine.graph.graph_code_parser import GraphCodeParser  # noqa: E402
 from engine.graph.models import GraphModel  # noqa: E402
 from engine.layout import LayoutService  # noqa: E402
+from engine.layout.internal.layout_service import LayoutResult  # noqa: E402
 from engine.utils.cache.cache_paths import get_graph_cache_dir  # noqa: E402
+from engine.utils.cache.graph_cache_format import GRAPH_CACHE_FILE_SUFFIX, load_graph_cache_payload  # noqa: E402
 
 
 def _load_cached_graphs(cache_dir: Path) -> list[tuple[str, GraphModel, Dict[str, Tuple[float, float]]]]:
     items = []
-    for fp in sorted(cache_dir.glob("*.json")):
-        data = json.loads(fp.read_text(encoding="utf-8"))
+    for fp in sorted(cache_dir.glob(f"*{GRAPH_CACHE_FILE_SUFFIX}")):
+        data = load_graph_cache_payload(fp) or {}
         payload = data.get("result_data", {}) or {}
         graph_data = payload.get("data", {}) or {}
         model = GraphModel.deserialize(graph_data)
@@ -100,7 +110,93 @@ def verify_equivalence(tol: float = 1.0) -> int:
     return 0 if failures == 0 else 1
 
 
+def _layout_fingerprint(result: LayoutResult) -> bytes:
+    """布局结果的确定性字节表示（repr 保留字典顺序与浮点数的精确值，用于逐字节比对）。"""
+    augmented = result.augmented_model
+    snapshot = (
+        list(result.positions.items()),
+        [(list(block.nodes), block.color, block.alpha) for block in result.basic_blocks],
+        list(result.y_debug_info.items()),
+        list(augmented.nodes) if augmented is not None else [],
+        [
+            (edge.id, edge.src_node, edge.src_port, edge.dst_node, edge.dst_port)
+            for edge in (augmented.edges.values() if augmented is not None else [])
+        ],
+    )
+    return repr(snapshot).encode("utf-8")
+
+
+def _compute_layout_fingerprint(model: GraphModel, *, parallel_workers: int) -> bytes:
+    overrides = {
+        "LAYOUT_PARALLEL_EVENT_REGIONS": parallel_workers > 0,
+        "LAYOUT_PARALLEL_WORKERS": parallel_workers,
+        "LAYOUT_PARALLEL_MIN_EVENT_REGIONS": 2,
+        # 关闭区域缓存，确保两次都真实计算块内布局
+        "LAYOUT_REGION_CACHE_ENABLED": False,
+    }
+    previous = {key: getattr(settings, key) for key in overrides}
+    for key, value in overrides.items():
+        setattr(settings, key, value)
+    try:
+        result = LayoutService.compute_layout(model.clone(), workspace_path=WORKSPACE)
+    finally:
+        for key, value in previous.items():
+            setattr(settings, key, value)
+    return _layout_fingerprint(result)
+
+
+def _load_source_graphs(graph_root: Path) -> List[Tuple[str, GraphModel]]:
+    parser = GraphCodeParser(WORKSPACE)
+    items: List[Tuple[str, GraphModel]] = []
+    for fp in sorted(graph_root.rglob("*.py")):
+        if fp.name.startswith("_"):
+            continue
+        model, _ = parser.parse_file(fp)
+        items.append((str(fp.relative_to(graph_root)), model))
+    return items
+
+
+def verify_parallel_region_equivalence(graph_root: Path, workers: int) -> int:
+    settings.set_config_path(WORKSPACE)
+    entries = _load_source_graphs(graph_root)
+    if not entries:
+        print(f"[ERROR] 未在 {graph_root} 下找到节点图源文件。")
+        return 2
+
+    merged = GraphModel(graph_name="合并大图")
+    for _, model in entries:
+        merged.nodes.update(model.nodes)
+        merged.edges.update(model.edges)
+    entries.append((f"<合并大图：{len(entries)} 个文件>", merged))
+
+    failures = 0
+    for graph_name, model in entries:
+        serial = _compute_layout_fingerprint(model, parallel_workers=0)
+        parallel = _compute_layout_fingerprint(model, parallel_workers=workers)
+        if serial == parallel:
+            print(f"[OK] 串行/并行一致：{graph_name}")
+        else:
+            failures += 1
+            print(f"[DIFF] 串行/并行结果不一致：{graph_name}")
+
+    print("=" * 72)
+    print(f"总图数: {len(entries)}  失败: {failures}  通过: {len(entries) - failures}")
+    return 0 if failures == 0 else 1
+
+
 def main() -> int:
+    parser = argparse.ArgumentParser(description="布局等价性校验")
+    parser.add_argument("--parallel-regions", action="store_true", help="比对串行与按事件区域并行布局的结果")
+    parser.add_argument("--workers", type=int, default=4, help="并行模式的 worker 数")
+    parser.add_argument(
+        "--graph-root",
+        type=str,
+        default="assets/资源库/节点图/server",
+        help="并行模式下解析的节点图源文件根目录（相对项目根目录）",
+    )
+    args = parser.parse_args()
+    if args.parallel_regions:
+        return verify_parallel_region_equivalence(WORKSPACE / args.graph_root, max(2, int(args.workers)))
     return verify_equivalence(tol=1.0)
 
 